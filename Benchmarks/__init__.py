@@ -0,0 +1 @@
+# Benchmarks/__init__.py
@@ -0,0 +1,2 @@
+# Benchmarks/llm_clients/__init__.py
+from ._stub import StubServer
@@ -0,0 +1,227 @@
+# Benchmarks/llm_clients/__main__.py
+"""
+Micro-benchmark do pool de clientes dos drivers de IA, totalmente offline.
+
+    python -m Benchmarks.llm_clients                       # 200 chamadas por modo
+    python -m Benchmarks.llm_clients --calls 500 --handshake-ms 40 --out clientes.json
+
+Para o Ollama e o Groq, o driver real fala com um servidor local (`_stub.py`) em dois
+modos: `por_chamada` (um cliente novo a cada pedido, como antes do pool) e `pool`
+(o cliente mantido pelo driver). `--handshake-ms` atrasa cada conexão nova para
+simular o TCP + TLS até a nuvem. Para o Gemini mede-se só a preparação do modelo
+(configure + GenerativeModel contra o cache por chave/instrução), sem rede.
+Drivers cuja biblioteca não está instalada são saltados.
+
+O modo `http` não depende de nenhum SDK: faz o mesmo pedido ao servidor local com
+um cliente HTTP novo por chamada e com um só cliente keep-alive. Usa o httpx (o
+transporte dos SDKs do Ollama e do Groq) quando instalado, senão o `ClienteHTTP`
+do `_stub.py`, e corre sempre.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+from ._stub import ClienteHTTP, StubServer
+
+try:
+    import httpx
+
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+MODOS = ("por_chamada", "pool")
+
+
+def _percentil(amostras: List[float], pct: float) -> float:
+    ordenadas = sorted(amostras)
+    idx = min(len(ordenadas) - 1, max(0, round(pct / 100 * len(ordenadas)) - 1))
+    return ordenadas[idx]
+
+
+async def _medir(chamada: Callable[[], Awaitable[Any]], calls: int) -> Dict[str, float]:
+    await chamada()  # aquecimento (imports preguiçosos, primeira conexão do pool)
+    tempos = []
+    for _ in range(calls):
+        inicio = time.perf_counter()
+        await chamada()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return {
+        "calls": calls,
+        "avg_ms": round(statistics.fmean(tempos), 3),
+        "p50_ms": round(_percentil(tempos, 50), 3),
+        "p95_ms": round(_percentil(tempos, 95), 3),
+    }
+
+
+async def _bench_http(stub: StubServer, calls: int) -> Dict[str, Any]:
+    """HTTP cru contra o stub (rota do Ollama): cliente por chamada vs um cliente keep-alive."""
+    corpo = {"model": "bench", "messages": [{"role": "user", "content": "oi"}], "stream": False}
+
+    def novo_cliente():
+        return httpx.AsyncClient(base_url=stub.url) if HTTPX_AVAILABLE else ClienteHTTP(stub.url)
+
+    async def pedir(cliente):
+        if HTTPX_AVAILABLE:
+            resposta = await cliente.post("/api/chat", json=corpo)
+            resposta.raise_for_status()
+            return resposta.json()
+        return await cliente.post("/api/chat", corpo)
+
+    async def por_chamada():
+        cliente = novo_cliente()
+        try:
+            await pedir(cliente)
+        finally:
+            await cliente.aclose()
+
+    resultados: Dict[str, Any] = {"transporte": "httpx" if HTTPX_AVAILABLE else "asyncio"}
+    stub.reset()
+    resultados["por_chamada"] = await _medir(por_chamada, calls)
+    resultados["por_chamada"]["conexoes"] = stub.conexoes
+
+    cliente = novo_cliente()
+    stub.reset()
+    try:
+        resultados["pool"] = await _medir(lambda: pedir(cliente), calls)
+        resultados["pool"]["conexoes"] = stub.conexoes
+    finally:
+        await cliente.aclose()
+    return resultados
+
+
+async def _bench_ollama(stub: StubServer, calls: int, log) -> Dict[str, Any]:
+    from Brain.Providers.Clients.OllamaProvider import OLLAMA_AVAILABLE, OllamaDriver
+
+    if not OLLAMA_AVAILABLE:
+        return {"skipped": "biblioteca 'ollama' não instalada"}
+    from ollama import AsyncClient
+
+    resultados = {}
+    for modo in MODOS:
+        driver = OllamaDriver(log)
+        driver.remote_url, driver.local_url = None, stub.url
+        if modo == "por_chamada":
+            driver._cliente = lambda host: AsyncClient(host=host)
+        stub.reset()
+        resultados[modo] = await _medir(lambda: driver.generate(["oi"]), calls)
+        resultados[modo]["conexoes"] = stub.conexoes
+        await driver.close()
+    return resultados
+
+
+async def _bench_groq(stub: StubServer, calls: int, log) -> Dict[str, Any]:
+    from Brain.Providers.Clients.GroqProvider import GROQ_AVAILABLE, GroqDriver
+
+    if not GROQ_AVAILABLE:
+        return {"skipped": "biblioteca 'groq' não instalada"}
+    from groq import AsyncGroq
+
+    os.environ["GROQ_BASE_URL"] = stub.url
+    resultados = {}
+    for modo in MODOS:
+        driver = GroqDriver(log)
+        driver.groq_key = "bench"
+        if modo == "por_chamada":
+            driver._cliente_groq = lambda: AsyncGroq(api_key="bench")
+        stub.reset()
+        resultados[modo] = await _medir(lambda: driver.generate(["oi"]), calls)
+        resultados[modo]["conexoes"] = stub.conexoes
+        await driver.close()
+    return resultados
+
+
+async def _bench_gemini(calls: int, log) -> Dict[str, Any]:
+    from Brain.Providers.Clients.GeminiProvider import GEMINI_AVAILABLE, GeminiDriver
+
+    if not GEMINI_AVAILABLE:
+        return {"skipped": "biblioteca 'google-generativeai' não instalada"}
+    import google.generativeai as genai
+
+    driver = GeminiDriver(log)
+    driver.keys = ["bench-1", "bench-2"]
+    instrucao = "Você é a SamBot."
+
+    async def por_chamada():
+        genai.configure(api_key=driver.keys[0])
+        driver._criar_modelo(instrucao)
+
+    async def pool():
+        driver._modelo(driver.keys[0], instrucao)
+
+    resultados = {
+        "por_chamada": await _medir(por_chamada, calls),
+        "pool": await _medir(pool, calls),
+    }
+    await driver.close()
+    return resultados
+
+
+def _imprimir(nome: str, resultado: Dict[str, Any]):
+    if "skipped" in resultado:
+        print(f"⏭️  {nome}: {resultado['skipped']}")
+        return
+    transporte = f" ({resultado['transporte']})" if "transporte" in resultado else ""
+    print(f"\n📡 {nome}{transporte}")
+    for modo in MODOS:
+        st = resultado[modo]
+        conexoes = f" • conexões {st['conexoes']}" if "conexoes" in st else ""
+        print(
+            f"   {modo:<12} média {st['avg_ms']:8.3f} ms • p50 {st['p50_ms']:8.3f} • p95 {st['p95_ms']:8.3f}{conexoes}"
+        )
+    antes, depois = resultado["por_chamada"]["avg_ms"], resultado["pool"]["avg_ms"]
+    if antes:
+        print(f"   ⚡ pool poupa {antes - depois:.3f} ms por chamada ({(antes - depois) / antes:.0%})")
+
+
+async def _executar(args) -> Dict[str, Any]:
+    log = logging.getLogger("SamBot.Bench")
+    stub = StubServer(handshake_ms=args.handshake_ms)
+    await stub.start()
+    try:
+        documento = {
+            "calls": args.calls,
+            "handshake_ms": args.handshake_ms,
+            "results": {
+                "http": await _bench_http(stub, args.calls),
+                "ollama": await _bench_ollama(stub, args.calls, log),
+                "groq": await _bench_groq(stub, args.calls, log),
+                "gemini": await _bench_gemini(args.calls, log),
+            },
+        }
+    finally:
+        await stub.stop()
+    return documento
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m Benchmarks.llm_clients")
+    parser.add_argument("--calls", type=int, default=200, help="Chamadas medidas por modo.")
+    parser.add_argument(
+        "--handshake-ms", type=float, default=0.0,
+        help="Atraso de cada conexão nova no servidor local (simula TCP + TLS).",
+    )
+    parser.add_argument("--out", type=Path, default=None, help="Grava os resultados em JSON.")
+    args = parser.parse_args(argv)
+
+    print(f"⏳ {args.calls} chamadas por modo, handshake simulado de {args.handshake_ms:g} ms")
+    documento = asyncio.run(_executar(args))
+    for nome, resultado in documento["results"].items():
+        _imprimir(nome, resultado)
+
+    if args.out:
+        args.out.write_text(json.dumps(documento, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n💾 Resultados gravados em {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+# Benchmarks/llm_clients/_stub.py
+"""
+Servidor HTTP/1.1 mínimo que imita o Ollama (/api/chat) e o Groq
+(/openai/v1/chat/completions), com keep-alive. Conta as conexões abertas e pode
+atrasar cada conexão nova (`handshake_ms`) para simular TCP + TLS até a nuvem.
+`ClienteHTTP` é o cliente keep-alive equivalente, para medir sem httpx instalado.
+"""
+
+import asyncio
+import json
+import time
+from typing import Optional, Set
+from urllib.parse import urlsplit
+
+
+def _resposta_ollama(modelo: str) -> dict:
+    return {
+        "model": modelo,
+        "created_at": "2024-01-01T00:00:00Z",
+        "message": {"role": "assistant", "content": "ok"},
+        "done": True,
+    }
+
+
+def _resposta_groq(modelo: str) -> dict:
+    return {
+        "id": "chatcmpl-bench",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": modelo,
+        "choices": [
+            {"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}
+        ],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+    }
+
+
+class StubServer:
+    def __init__(self, handshake_ms: float = 0.0, host: str = "127.0.0.1"):
+        self.handshake_ms = handshake_ms
+        self.host = host
+        self.port: Optional[int] = None
+        self.conexoes = 0
+        self.pedidos = 0
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._abertas: Set[asyncio.Task] = set()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._atender, self.host, 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            # Conexões keep-alive ficam à espera de outro pedido; encerra-as aqui
+            for task in list(self._abertas):
+                task.cancel()
+            await asyncio.gather(*self._abertas, return_exceptions=True)
+            await self._server.wait_closed()
+
+    def reset(self):
+        self.conexoes = 0
+        self.pedidos = 0
+
+    async def _atender(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.conexoes += 1
+        task = asyncio.current_task()
+        self._abertas.add(task)
+        if self.handshake_ms:
+            await asyncio.sleep(self.handshake_ms / 1000)
+        try:
+            while True:
+                cabecalho = await reader.readuntil(b"\r\n\r\n")
+                linhas = cabecalho.decode("latin-1").split("\r\n")
+                _, caminho, _ = linhas[0].split(" ", 2)
+                tamanho = 0
+                for linha in linhas[1:]:
+                    if linha.lower().startswith("content-length:"):
+                        tamanho = int(linha.split(":", 1)[1])
+                corpo = json.loads(await reader.readexactly(tamanho) or b"{}") if tamanho else {}
+                self.pedidos += 1
+
+                modelo = corpo.get("model", "bench")
+                dados = _resposta_groq(modelo) if "chat/completions" in caminho else _resposta_ollama(modelo)
+                payload = json.dumps(dados).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(payload)}\r\nConnection: keep-alive\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError, asyncio.CancelledError):
+            pass
+        finally:
+            self._abertas.discard(task)
+            writer.close()
+
+
+class ClienteHTTP:
+    """Cliente HTTP/1.1 mínimo com keep-alive: abre a conexão no primeiro pedido e reaproveita-a."""
+
+    def __init__(self, url: str):
+        partes = urlsplit(url)
+        self.host = partes.hostname
+        self.port = partes.port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def post(self, caminho: str, corpo: dict) -> dict:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        payload = json.dumps(corpo).encode()
+        self._writer.write(
+            f"POST {caminho} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n".encode()
+            + b"Content-Type: application/json\r\nConnection: keep-alive\r\n"
+            + f"Content-Length: {len(payload)}\r\n\r\n".encode()
+            + payload
+        )
+        await self._writer.drain()
+
+        cabecalho = await self._reader.readuntil(b"\r\n\r\n")
+        tamanho = 0
+        for linha in cabecalho.decode("latin-1").split("\r\n")[1:]:
+            if linha.lower().startswith("content-length:"):
+                tamanho = int(linha.split(":", 1)[1])
+        return json.loads(await self._reader.readexactly(tamanho)) if tamanho else {}
+
+    async def aclose(self):
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+            self._reader = self._writer = None
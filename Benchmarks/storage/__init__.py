@@ -0,0 +1,5 @@
+# Benchmarks/storage/__init__.py
+from ._runner import run_suite, BACKENDS
+from ._report import compare_results
+from ._synthetic import build_dataset
+from ._workloads import MIXES, StorageWorkload, parse_mix
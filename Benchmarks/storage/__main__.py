@@ -0,0 +1,77 @@
+# Benchmarks/storage/__main__.py
+"""
+Benchmark e gerador de carga da camada de dados, totalmente offline.
+
+    python -m Benchmarks.storage run                               # json e sqlite, 10k usuários, mistura 'mixed'
+    python -m Benchmarks.storage run --users 1000 10000 100000 --mix chat --out bench.json
+    python -m Benchmarks.storage run --mix xp=70,economy=30 --format msgpack
+    python -m Benchmarks.storage compare antes.json depois.json --threshold 10
+
+Cada backend corre num processo próprio sobre uma pasta Data/ sintética em diretório
+temporário (DATA_ROOT); os ficheiros reais do bot nunca são tocados.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from ._report import compare_results, print_result
+from ._runner import BACKENDS, run_suite
+from ._workloads import MIXES, parse_mix
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m Benchmarks.storage")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_run = sub.add_parser("run", help="Gera dados sintéticos e mede cada backend.")
+    p_run.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    p_run.add_argument("--users", type=int, nargs="+", default=[10_000], help="Uma ou mais escalas.")
+    p_run.add_argument("--guilds", type=int, default=50)
+    p_run.add_argument(
+        "--mix", default="mixed",
+        help=f"Mistura pronta ({', '.join(MIXES)}) ou pesos 'xp=70,economy=30'.",
+    )
+    p_run.add_argument("--ops", type=int, default=5_000)
+    p_run.add_argument("--concurrency", type=int, default=8)
+    p_run.add_argument("--format", default=None, help="DATA_FORMAT dos processos (json, pretty, msgpack).")
+    p_run.add_argument("--seed", type=int, default=42)
+    p_run.add_argument("--out", type=Path, default=None, help="Grava os resultados em JSON.")
+
+    p_cmp = sub.add_parser("compare", help="Compara dois ficheiros de resultados.")
+    p_cmp.add_argument("base", type=Path)
+    p_cmp.add_argument("novo", type=Path)
+    p_cmp.add_argument("--threshold", type=float, default=10.0, help="Regressão tolerada, em %%.")
+
+    args = parser.parse_args(argv)
+
+    if args.comando == "compare":
+        base = json.loads(args.base.read_text(encoding="utf-8"))
+        novo = json.loads(args.novo.read_text(encoding="utf-8"))
+        regressoes = compare_results(base, novo, args.threshold)
+        if regressoes:
+            print(f"\n❌ {len(regressoes)} regressão(ões):\n  " + "\n  ".join(regressoes))
+            return 1
+        print("\n✅ Sem regressões acima do limite.")
+        return 0
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"⏳ {args.ops:,} operações por backend, {args.concurrency} simultâneas, mistura {mix}")
+    documento = run_suite(
+        args.backends, args.users, args.guilds, args.mix, mix,
+        args.ops, args.concurrency, fmt=args.format, seed=args.seed,
+        on_result=print_result,
+    )
+    if args.out:
+        args.out.write_text(json.dumps(documento, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n💾 Resultados gravados em {args.out}")
+    return 1 if any("error" in r for r in documento["results"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
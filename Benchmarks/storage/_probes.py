@@ -0,0 +1,67 @@
+# Benchmarks/storage/_probes.py
+
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def bytes_written() -> Optional[int]:
+    """Bytes que o processo (todas as threads) pediu para escrever. None se não houver como medir."""
+    try:
+        with open("/proc/self/io", encoding="ascii") as f:
+            for linha in f:
+                if linha.startswith("wchar:"):
+                    return int(linha.split()[1])
+    except OSError:
+        pass
+    if psutil is not None:
+        try:
+            counters = psutil.Process().io_counters()
+            return getattr(counters, "write_chars", counters.write_bytes)
+        except (AttributeError, psutil.Error):
+            pass
+    return None
+
+
+def peak_rss_kb() -> Optional[int]:
+    """Pico de memória residente do processo, em KiB."""
+    if resource is not None:
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS devolve bytes; Linux devolve KiB
+        return pico // 1024 if sys.platform == "darwin" else pico
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) // 1024
+    return None
+
+
+def disk_usage(root: Path) -> int:
+    return sum(p.stat().st_size for p in root.rglob("*") if p.is_file())
+
+
+def percentile(ordenados: List[float], pct: float) -> float:
+    if not ordenados:
+        return 0.0
+    indice = min(len(ordenados) - 1, max(0, int(round(pct / 100 * len(ordenados))) - 1))
+    return ordenados[indice]
+
+
+def summarize(latencias: List[float], elapsed: float) -> Dict[str, float]:
+    ordenados = sorted(latencias)
+    return {
+        "count": len(ordenados),
+        "ops_per_s": round(len(ordenados) / elapsed, 1) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(ordenados, 50), 3),
+        "p99_ms": round(percentile(ordenados, 99), 3),
+        "max_ms": round(ordenados[-1], 3) if ordenados else 0.0,
+    }
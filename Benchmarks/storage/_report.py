@@ -0,0 +1,66 @@
+# Benchmarks/storage/_report.py
+
+from typing import Any, Dict, List, Tuple
+
+# (métrica, maior é melhor?)
+COMPARED_METRICS = (
+    ("ops_per_s", True),
+    ("p50_ms", False),
+    ("p99_ms", False),
+    ("bytes_written", False),
+    ("peak_rss_kb", False),
+)
+
+
+def _fmt(value, spec: str) -> str:
+    return "n/d" if value is None else format(value, spec)
+
+
+def print_result(r: Dict[str, Any]) -> None:
+    cabecalho = f"\n📊 {r['backend']} ({r.get('format', '?')}) · {r['users']:,} usuários · mistura '{r['mix']}'"
+    if "error" in r:
+        print(f"{cabecalho}\n❌ Falhou: {r['error']}")
+        return
+    print(cabecalho)
+    print(
+        f"   {r['ops_per_s']:,.0f} ops/s · p50 {r['p50_ms']:.2f} ms · p99 {r['p99_ms']:.2f} ms · "
+        f"escritos {_fmt(r['bytes_written'], ',')} B · RSS pico {_fmt(r['peak_rss_kb'], ',')} KiB · "
+        f"arranque {r['setup_s']:.2f} s · flush {r['flush_s']:.2f} s"
+    )
+    print(f"   {'operação':<10}{'n':>8}{'ops/s':>12}{'p50 (ms)':>11}{'p99 (ms)':>11}{'máx (ms)':>11}")
+    for nome, s in r["by_op"].items():
+        print(
+            f"   {nome:<10}{s['count']:>8,}{s['ops_per_s']:>12,.0f}"
+            f"{s['p50_ms']:>11.2f}{s['p99_ms']:>11.2f}{s['max_ms']:>11.2f}"
+        )
+
+
+def _key(r: Dict[str, Any]) -> Tuple:
+    return r.get("backend"), r.get("format"), r.get("users"), r.get("mix")
+
+
+def compare_results(base: Dict[str, Any], novo: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compara dois documentos de resultados (mesmo backend/formato/escala/mistura)
+    e devolve as regressões acima de `threshold` por cento.
+    """
+    anteriores = {_key(r): r for r in base.get("results", []) if "error" not in r}
+    regressoes = []
+    print(f"🔎 {base['meta'].get('commit')} → {novo['meta'].get('commit')} (limite {threshold:.0f}%)")
+    for r in novo.get("results", []):
+        anterior = anteriores.get(_key(r))
+        if anterior is None or "error" in r:
+            continue
+        backend, fmt, users, mix = _key(r)
+        print(f"\n{backend} ({fmt}) · {users:,} usuários · '{mix}'")
+        for metrica, maior_melhor in COMPARED_METRICS:
+            antes, depois = anterior.get(metrica), r.get(metrica)
+            if not antes or depois is None:
+                continue
+            delta = (depois - antes) / antes * 100
+            piorou = -delta if maior_melhor else delta
+            marca = "⚠️" if piorou > threshold else "  "
+            print(f"  {marca} {metrica:<14}{antes:>14,.2f} → {depois:>14,.2f} ({delta:+.1f}%)")
+            if piorou > threshold:
+                regressoes.append(f"{backend}/{fmt}/{users}/{mix}: {metrica} {delta:+.1f}%")
+    return regressoes
@@ -0,0 +1,126 @@
+# Benchmarks/storage/_runner.py
+
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ._synthetic import build_dataset
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+BACKENDS = ("json", "sqlite")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT, capture_output=True, text=True, timeout=10,
+        ).stdout.strip()
+        sujo = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=REPO_ROOT, capture_output=True, text=True, timeout=30,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return f"{commit}-dirty" if commit and sujo else commit or None
+
+
+def _worker_env(data_root: Path, backend: str, fmt: Optional[str]) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update(
+        DATA_ROOT=str(data_root),
+        DB_TYPE=backend,
+        DATA_WATCH_INTERVAL="0",
+        PYTHONPATH=os.pathsep.join(filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")])),
+    )
+    # Base SQLite dentro da pasta sintética, nunca a de produção
+    env.pop("SQLITE_PATH", None)
+    if fmt:
+        env["DATA_FORMAT"] = fmt
+    return env
+
+
+def _run_one(template: Path, workdir: Path, backend: str, spec: Dict[str, Any], fmt: Optional[str]) -> Dict[str, Any]:
+    data_root = workdir / f"data-{backend}"
+    shutil.copytree(template, data_root)
+    spec = dict(spec, backend=backend, result=str(workdir / f"result-{backend}.json"))
+    spec_path = workdir / f"spec-{backend}.json"
+    spec_path.write_text(json.dumps(spec), encoding="utf-8")
+
+    proc = subprocess.run(
+        [sys.executable, "-m", "Benchmarks.storage._worker", str(spec_path)],
+        cwd=REPO_ROOT, env=_worker_env(data_root, backend, fmt),
+        capture_output=True, text=True,
+    )
+    try:
+        if proc.returncode != 0:
+            erro = (proc.stderr or proc.stdout).strip().splitlines()[-1:] or ["sem saída"]
+            return {"backend": backend, "error": f"código {proc.returncode}: {erro[0]}"}
+        return json.loads(Path(spec["result"]).read_text(encoding="utf-8"))
+    finally:
+        shutil.rmtree(data_root, ignore_errors=True)
+
+
+def run_suite(
+    backends: List[str],
+    user_scales: List[int],
+    guilds: int,
+    mix_name: str,
+    mix: Dict[str, float],
+    ops: int,
+    concurrency: int,
+    fmt: Optional[str] = None,
+    seed: int = 42,
+    on_result=None,
+) -> Dict[str, Any]:
+    """
+    Para cada escala gera a pasta Data/ sintética uma vez e corre cada backend
+    num processo próprio sobre uma cópia dela. Devolve o documento de resultados.
+    """
+    resultados = []
+    workdir = Path(tempfile.mkdtemp(prefix="sambot-storage-bench-"))
+    try:
+        for users in user_scales:
+            template = workdir / f"template-{users}"
+            manifest = build_dataset(template, users, guilds, seed)
+            manifest_path = workdir / f"manifest-{users}.json"
+            manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+
+            spec = {
+                "manifest": str(manifest_path),
+                "mix_name": mix_name,
+                "mix": mix,
+                "ops": ops,
+                "concurrency": concurrency,
+                "seed": seed,
+            }
+            for backend in backends:
+                resultado = _run_one(template, workdir, backend, spec, fmt)
+                resultado.setdefault("users", users)
+                resultado.setdefault("mix", mix_name)
+                resultados.append(resultado)
+                if on_result:
+                    on_result(resultado)
+            shutil.rmtree(template, ignore_errors=True)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "guilds": guilds,
+            "seed": seed,
+            "format": fmt or os.getenv("DATA_FORMAT", "json"),
+        },
+        "results": resultados,
+    }
@@ -0,0 +1,129 @@
+# Benchmarks/storage/_synthetic.py
+
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Mesma forma do Knowledge/mercado.json: FIIs pagam dividendos, ações só oscilam
+MERCADO = {
+    "SAMS11": {"nome": "Sam Shopping", "tipo": "FII", "preco_atual": 105, "dividendo_estimado": 1.20},
+    "SAMR11": {"nome": "Sam Recebíveis", "tipo": "FII", "preco_atual": 9.50, "dividendo_estimado": 0.12},
+    "SAML11": {"nome": "Sam Logística", "tipo": "FII", "preco_atual": 88, "dividendo_estimado": 0.85},
+    "SAMT3": {"nome": "SamTech Inc.", "tipo": "Ação", "preco_atual": 45, "volatilidade": "alta"},
+    "SAMB4": {"nome": "Banco Central da Sam", "tipo": "Ação", "preco_atual": 22, "volatilidade": "media"},
+    "SAMG3": {"nome": "Sam Games", "tipo": "Ação", "preco_atual": 31, "volatilidade": "alta"},
+}
+
+MOTIVOS = ["spam", "flood no chat", "linguagem imprópria", "divulgação", "desrespeito à staff"]
+EMPREGOS = ["estagiario", "programador", "chef", "designer", None]
+
+
+def _snowflake(rng: random.Random) -> str:
+    return str(rng.randrange(10**17, 10**18))
+
+
+def _user_record(rng: random.Random, guild_ids: List[str]) -> Dict[str, Any]:
+    """Registro unificado (economia + XP global + XP por servidor), como o UserStore grava."""
+    servidores = rng.sample(guild_ids, k=min(len(guild_ids), rng.choice((1, 1, 1, 2, 3))))
+    guilds = {}
+    for gid in servidores:
+        guilds[gid] = {"xp": rng.randint(0, 40_000), "mensagens": rng.randint(0, 4_000)}
+
+    record = {
+        "carteira": rng.randint(0, 100_000),
+        "banco": rng.randint(0, 1_000_000),
+        "daily_streak": rng.randint(0, 60),
+        "ultimo_daily": time.time() - rng.randint(0, 86_400 * 7),
+        "emprego_atual": rng.choice(EMPREGOS),
+        "bio": "Olá! Eu uso a SamBot ♡" if rng.random() < 0.3 else "",
+        "emblemas": rng.sample(["🏆", "💎", "🎮", "🔥", "⭐"], k=rng.randint(0, 3)),
+        "xp": sum(g["xp"] for g in guilds.values()),
+        "mensagens": sum(g["mensagens"] for g in guilds.values()),
+        "guilds": guilds,
+    }
+    # Cerca de um terço dos usuários investe
+    if rng.random() < 0.35:
+        record["portfolio"] = {
+            ticker: {"quantidade": rng.randint(1, 500), "preco_medio": round(rng.uniform(5, 120), 2)}
+            for ticker in rng.sample(list(MERCADO), k=rng.randint(1, 3))
+        }
+    return record
+
+
+def _guild_config(rng: random.Random, user_ids: List[str]) -> Dict[str, Any]:
+    canais = [int(_snowflake(rng)) for _ in range(4)]
+    cargos = [int(_snowflake(rng)) for _ in range(3)]
+    warns = {}
+    for uid in rng.sample(user_ids, k=min(len(user_ids), rng.randint(0, 25))):
+        warns[uid] = [
+            {
+                "mod_id": int(_snowflake(rng)),
+                "motivo": rng.choice(MOTIVOS),
+                "data": int(time.time()) - rng.randint(0, 86_400 * 90),
+            }
+            for _ in range(rng.randint(1, 4))
+        ]
+    return {
+        "automod": {
+            "anti_link": rng.random() < 0.6,
+            "anti_invite": rng.random() < 0.5,
+            "anti_words": rng.random() < 0.4,
+            "anti_spam": rng.random() < 0.7,
+            "blocked_words": ["palavrao", "golpe", "free nitro"],
+            "link_whitelist_channels": canais[:1],
+        },
+        "leveling": {
+            "no_xp_channels": canais[1:2],
+            "role_boosts": {str(cargos[0]): 1.5, str(cargos[1]): 2.0},
+            "rewards": {"5": cargos[2]},
+        },
+        "auditoria": {"canal_id": canais[3], "preset": rng.randint(1, 5)},
+        "avisos_channel": canais[2],
+        "warns": warns,
+    }
+
+
+def _playlists(rng: random.Random, user_ids: List[str], fraction: float) -> Dict[str, Any]:
+    data = {}
+    for uid in rng.sample(user_ids, k=int(len(user_ids) * fraction)):
+        data[uid] = {
+            f"playlist {n}": [
+                {"url": f"https://youtu.be/{rng.randrange(16**10):010x}", "title": f"Faixa {i}"}
+                for i in range(rng.randint(3, 30))
+            ]
+            for n in range(rng.randint(1, 3))
+        }
+    return data
+
+
+def build_dataset(root: Path, users: int, guilds: int, seed: int = 42) -> Dict[str, Any]:
+    """
+    Grava em `root` uma pasta Data/ sintética (usuários, guild_configs com warns,
+    mercado e playlists) e devolve o manifesto com os ids usados pelas cargas.
+    Usa só a stdlib: o processo pai nunca importa o DataManager.
+    """
+    rng = random.Random(seed)
+    guild_ids = [_snowflake(rng) for _ in range(max(1, guilds))]
+    user_ids = [_snowflake(rng) for _ in range(max(1, users))]
+
+    for folder in ("Config", "Knowledge", "Persistence", "Prompts", "Users"):
+        (root / folder).mkdir(parents=True, exist_ok=True)
+
+    documentos = {
+        root / "Users" / "users.json": {uid: _user_record(rng, guild_ids) for uid in user_ids},
+        root / "Knowledge" / "guild_configs.json": {gid: _guild_config(rng, user_ids) for gid in guild_ids},
+        root / "Knowledge" / "mercado.json": MERCADO,
+        root / "Persistence" / "playlists.json": _playlists(rng, user_ids, fraction=0.05),
+    }
+    for path, data in documentos.items():
+        path.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
+    return {
+        "seed": seed,
+        "user_ids": user_ids,
+        "guild_ids": guild_ids,
+        "tickers": list(MERCADO),
+        "dataset_bytes": sum(path.stat().st_size for path in documentos),
+    }
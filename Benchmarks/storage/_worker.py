@@ -0,0 +1,81 @@
+# Benchmarks/storage/_worker.py
+"""
+Processo filho de uma execução: importa o `data_manager` já apontado (por variáveis
+de ambiente definidas pelo pai) para a pasta sintética, corre a mistura e grava o
+resultado em JSON. Um processo por backend mantém o pico de RSS e os bytes escritos isolados.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from . import _probes
+from ._workloads import StorageWorkload, run_mix
+
+
+async def _run(dm, spec: Dict[str, Any], manifest: Dict[str, Any]) -> Dict[str, Any]:
+    workload = StorageWorkload(dm, manifest, seed=spec["seed"])
+    sequence = workload.sequence(spec["mix"], spec["ops"])
+
+    escritos_antes = _probes.bytes_written()
+    latencias, elapsed = await run_mix(workload, sequence, spec["concurrency"])
+
+    # O write-behind tem de chegar ao disco para os bytes escritos serem comparáveis
+    inicio_flush = time.perf_counter()
+    await dm.aio.flush()
+    flush_s = time.perf_counter() - inicio_flush
+    escritos_depois = _probes.bytes_written()
+
+    todas = [ms for valores in latencias.values() for ms in valores]
+    return {
+        **_probes.summarize(todas, elapsed),
+        "elapsed_s": round(elapsed, 3),
+        "flush_s": round(flush_s, 3),
+        "bytes_written": (
+            escritos_depois - escritos_antes
+            if escritos_antes is not None and escritos_depois is not None
+            else None
+        ),
+        "by_op": {nome: _probes.summarize(valores, elapsed) for nome, valores in sorted(latencias.items())},
+    }
+
+
+def run_worker(spec_path: Path) -> int:
+    spec = json.loads(Path(spec_path).read_text(encoding="utf-8"))
+    manifest = json.loads(Path(spec["manifest"]).read_text(encoding="utf-8"))
+
+    inicio = time.perf_counter()
+    from Brain.Memory.DataManager import data_manager as dm
+
+    # Índice de XP e snapshot de configs fora da medição (custo de arranque, não por operação)
+    dm.user_store.leaderboard(None, 1)
+    dm.guild_configs.get(manifest["guild_ids"][0])
+    setup_s = time.perf_counter() - inicio
+
+    resultado = asyncio.run(_run(dm, spec, manifest))
+    dm.aio.close()
+
+    resultado.update(
+        backend=spec["backend"],
+        provider=type(dm).__name__,
+        format=dm.io.codec.name,
+        users=len(manifest["user_ids"]),
+        guilds=len(manifest["guild_ids"]),
+        mix=spec["mix_name"],
+        ops=spec["ops"],
+        concurrency=spec["concurrency"],
+        setup_s=round(setup_s, 3),
+        dataset_bytes=manifest["dataset_bytes"],
+        disk_bytes=_probes.disk_usage(Path(os.environ["DATA_ROOT"])),
+        peak_rss_kb=_probes.peak_rss_kb(),
+    )
+    Path(spec["result"]).write_text(json.dumps(resultado), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_worker(Path(sys.argv[1])))
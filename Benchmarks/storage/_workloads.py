@@ -0,0 +1,191 @@
+# Benchmarks/storage/_workloads.py
+
+import asyncio
+import bisect
+import itertools
+import random
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+# Misturas prontas (pesos relativos). `market` reescreve a base inteira, então pesa pouco.
+MIXES: Dict[str, Dict[str, float]] = {
+    "chat": {"xp": 80, "config": 15, "rank": 3, "economy": 2},
+    "economy": {"economy": 60, "xp": 30, "config": 10},
+    "moderation": {"config": 60, "warn": 30, "xp": 10},
+    "night": {"market": 1},
+    "mixed": {"xp": 60, "config": 20, "economy": 12, "rank": 4, "warn": 2, "playlist": 2, "market": 0.1},
+}
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Aceita o nome de uma mistura pronta ou pesos explícitos: 'xp=70,economy=30'."""
+    if spec in MIXES:
+        return dict(MIXES[spec])
+    pesos = {}
+    for parte in spec.split(","):
+        nome, _, peso = parte.partition("=")
+        nome = nome.strip()
+        if nome not in StorageWorkload.OPS:
+            raise ValueError(f"operação desconhecida '{nome}' (disponíveis: {', '.join(StorageWorkload.OPS)})")
+        pesos[nome] = float(peso or 1)
+    if not pesos or sum(pesos.values()) <= 0:
+        raise ValueError(f"mistura vazia: '{spec}'")
+    return pesos
+
+
+class StorageWorkload:
+    """
+    Operações que reproduzem os caminhos reais do bot sobre o `data_manager`:
+    o tick de XP do LevelingSystem.on_message, os comandos de economia em transação,
+    o ciclo de mercado do NightCycle, as leituras de guild_configs das cogs quentes,
+    o +warn da Punicao e o PlaylistManager.
+    """
+
+    OPS = ("xp", "config", "economy", "rank", "warn", "playlist", "market")
+
+    def __init__(self, dm, manifest: Dict[str, Any], seed: int = 42):
+        self.dm = dm
+        self.rng = random.Random(seed)
+        self.user_ids: List[str] = manifest["user_ids"]
+        self.guild_ids: List[str] = manifest["guild_ids"]
+        self.tickers: List[str] = manifest["tickers"]
+        self.playlists_path = dm.folders["persistence"] / "playlists.json"
+
+        # Atividade concentrada: poucos usuários falam muito (distribuição tipo Zipf)
+        pesos = (1.0 / (rank + 1) ** 1.1 for rank in range(len(self.user_ids)))
+        self._cum_weights = list(itertools.accumulate(pesos))
+
+    # --- SORTEIO ---
+    def _user(self) -> str:
+        alvo = self.rng.random() * self._cum_weights[-1]
+        return self.user_ids[bisect.bisect_left(self._cum_weights, alvo)]
+
+    def _guild(self) -> str:
+        return self.rng.choice(self.guild_ids)
+
+    def sequence(self, mix: Dict[str, float], total: int) -> List[str]:
+        nomes = list(mix)
+        return self.rng.choices(nomes, weights=[mix[n] for n in nomes], k=total)
+
+    def op(self, name: str) -> Callable[[], Any]:
+        return getattr(self, f"op_{name}")
+
+    # --- OPERAÇÕES ---
+    async def op_xp(self):
+        """LevelingSystem.on_message: config tipada + add_xp na thread de disco."""
+        dm = self.dm
+        guild_id = self._guild()
+        level_config = dm.guild_configs.get(guild_id).leveling
+        multiplicador = level_config.multiplier_for(())
+        xp_ganho = int(self.rng.randint(3, 35) * multiplicador)
+        await dm.aio.call(dm.user_store.add_xp, self._user(), guild_id, xp_ganho)
+
+    async def op_config(self):
+        """Leituras por mensagem do AutoMod/Auditoria/Leveling."""
+        cfg = self.dm.guild_configs.get(self._guild())
+        return cfg.automod.enabled, cfg.leveling.no_xp_channels, cfg.auditoria.should_log(2, "msg_delete")
+
+    async def op_economy(self):
+        """Banco/Daily/Investimento: transações atómicas por usuário."""
+        dm = self.dm
+        tipo = self.rng.random()
+        user_id = self._user()
+
+        if tipo < 0.35:  # depositar / sacar
+            async with dm.transaction(user_id) as conta:
+                quantia = min(conta.get("carteira", 0), self.rng.randint(1, 5_000))
+                conta["carteira"] = conta.get("carteira", 0) - quantia
+                conta["banco"] = conta.get("banco", 0) + quantia
+        elif tipo < 0.6:  # daily
+            async with dm.transaction(user_id) as conta:
+                conta["carteira"] = conta.get("carteira", 0) + 500
+                conta["daily_streak"] = conta.get("daily_streak", 0) + 1
+                conta["ultimo_daily"] = time.time()
+        elif tipo < 0.85:  # transferir (ordem fixa de locks, como no Banco)
+            outro = self._user()
+            if outro == user_id:
+                return
+            primeiro, segundo = sorted((user_id, outro))
+            async with dm.transaction(primeiro) as conta_a, dm.transaction(segundo) as conta_b:
+                valor = min(conta_a.get("carteira", 0), 100)
+                conta_a["carteira"] = conta_a.get("carteira", 0) - valor
+                conta_b["carteira"] = conta_b.get("carteira", 0) + valor
+        else:  # comprar cotas
+            ticker = self.rng.choice(self.tickers)
+            quantidade = self.rng.randint(1, 20)
+            async with dm.transaction(user_id) as conta:
+                portfolio = conta.setdefault("portfolio", {})
+                posse = portfolio.setdefault(ticker, {"quantidade": 0, "preco_medio": 0})
+                posse["quantidade"] += quantidade
+                conta["carteira"] = conta.get("carteira", 0) - quantidade * 10
+
+    async def op_rank(self):
+        """Comandos `level` (posição) e `rank` (top 5)."""
+        dm = self.dm
+        if self.rng.random() < 0.7:
+            await dm.aio.call(dm.user_store.standing, self._user(), self._guild())
+        else:
+            await dm.aio.call(dm.user_store.leaderboard, self._guild(), 5)
+
+    async def op_warn(self):
+        """Punicao.warn: acrescenta o aviso no snapshot do servidor (gravação agendada)."""
+        dm = self.dm
+        guild_id, user_id = self._guild(), self._user()
+        with dm.guild_configs.edit(guild_id) as guild_cfg:
+            avisos = guild_cfg.setdefault("warns", {}).setdefault(user_id, [])
+            avisos.append({"mod_id": 1, "motivo": "benchmark", "data": int(time.time())})
+
+    async def op_playlist(self):
+        """PlaylistManager: leitura do ficheiro em thread; 1 em cada 4 grava."""
+        io = self.dm.io
+        data = await asyncio.to_thread(io.read, self.playlists_path, dict)
+        if self.rng.random() < 0.25:
+            data.setdefault(self._user(), {})["bench"] = [
+                {"url": "https://youtu.be/bench", "title": "Faixa"}
+            ]
+            await asyncio.to_thread(io.save, self.playlists_path, data)
+
+    async def op_market(self):
+        """NightCycle._update_market_calculations, passo a passo."""
+        dm = self.dm
+        ativos = dm.get_knowledge("mercado") or {}
+        for info in ativos.values():
+            if info["tipo"] == "Ação":
+                volatilidade = 0.08 if info.get("volatilidade") == "alta" else 0.04
+            else:
+                volatilidade = 0.02
+            info["preco_atual"] = round(
+                info["preco_atual"] * (1 + self.rng.uniform(-volatilidade, volatilidade + 0.01)), 2
+            )
+        dm.save_knowledge("mercado", ativos)
+
+        users_path = dm.folders["users"] / "users.json"
+        todos_usuarios = dm._io_read_json(users_path)
+        for user_data in todos_usuarios.values():
+            portfolio = user_data.get("portfolio", {})
+            total = 0
+            for ticker, posse in portfolio.items():
+                if ticker in ativos and ativos[ticker]["tipo"] == "FII":
+                    total += ativos[ticker].get("dividendo_estimado", 0) * posse["quantidade"]
+            if total > 0:
+                user_data["banco"] = round(user_data.get("banco", 0) + total, 2)
+        dm._io_save_json(users_path, todos_usuarios)
+
+
+async def run_mix(
+    workload: StorageWorkload, sequence: List[str], concurrency: int
+) -> Tuple[Dict[str, List[float]], float]:
+    """Executa a sequência com `concurrency` tarefas. Devolve latências (ms) por operação e o tempo total (s)."""
+    latencias: Dict[str, List[float]] = {nome: [] for nome in set(sequence)}
+    fila = iter(sequence)
+
+    async def trabalhador():
+        for nome in fila:
+            operacao = workload.op(nome)
+            inicio = time.perf_counter()
+            await operacao()
+            latencias[nome].append((time.perf_counter() - inicio) * 1000)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(trabalhador() for _ in range(max(1, concurrency))))
+    return latencias, time.perf_counter() - inicio
@@ -6,6 +6,7 @@ import random
 import logging
 
 from Brain.Core.Pipeline import CognitionPipeline
+from Brain.Core.Tracing import tracer
 from Brain.Memory.DataManager import data_manager
 
 logger = logging.getLogger("SamBot.Agent")
@@ -54,6 +55,9 @@ class CerebroIA(commands.Cog):
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
+        # Toda mensagem alimenta a memória de curto prazo dos canais acompanhados
+        self.pipeline.historico.registrar(message, self.bot.user)
+
         if message.author.bot or message.author.id == self.bot.user.id:
             return
 
@@ -82,7 +86,8 @@ class CerebroIA(commands.Cog):
 
                 input_text = clean_text
                 try:
-                    res = self.pipeline.limpeza.identify(clean_text)
+                    with tracer.span("nlp.normalizacao"):
+                        res = self.pipeline.limpeza.identify(clean_text)
                     input_text = (
                         res.get("normalized", clean_text)
                         if isinstance(res, dict)
@@ -3,9 +3,12 @@ import re
 import logging
 from typing import Optional, Dict, Any
 
+from Brain.Memory.Cache import get_cache
+from Brain.Core._intents import IntentIndex
+
 try:
     import spacy
-    from rapidfuzz import process, fuzz
+    import rapidfuzz
 
     SPACY_AVAILABLE = True
 except ImportError:
@@ -52,6 +55,12 @@ class LimpezaManager:
         else:
             self.nlp = None
 
+        # Memo por mensagem: Agent e Pipeline perguntam pelo mesmo texto, o spaCy corre uma vez
+        self._normalizados = get_cache("nlp.normalizacao", max_entries=512, ttl=600)
+        self._classificacoes = get_cache("nlp.intencoes", max_entries=512, ttl=600)
+        self._index: Optional[IntentIndex] = None
+        self._index_fonte = None
+
     def _remove_emojis(self, text: str) -> str:
         return self.emoji_pattern.sub(r"", text)
 
@@ -87,33 +96,59 @@ class LimpezaManager:
         ]
         return " ".join(tokens_limpos)
 
+    def normalize(self, text: str) -> str:
+        """Versão memoizada de `_normalize_with_spacy`."""
+        if not text:
+            return ""
+        normalized = self._normalizados.get(text)
+        if normalized is None:
+            normalized = self._normalize_with_spacy(text)
+            self._normalizados.set(text, normalized)
+            # O Pipeline recebe o texto já normalizado: não lematizar de novo
+            self._normalizados.set(normalized, normalized)
+        return normalized
+
+    # --- ÍNDICE DE INTENÇÕES ---
+    def _intent_index(self, intents_config: Dict[str, Any]) -> IntentIndex:
+        # O watcher troca o objeto quando o nlp_data muda, então a identidade basta
+        if self._index is None or self._index_fonte is not intents_config:
+            self._index = IntentIndex(intents_config)
+            self._index_fonte = intents_config
+            self._classificacoes.clear()
+        return self._index
+
+    def on_knowledge_changed(self, key: str, value: Any):
+        """Listener do hot-reload: refaz o índice assim que o nlp_data.json muda."""
+        if key != "nlp_data" or not isinstance(value, dict):
+            return
+        index = self._intent_index(value.get("intents", {}))
+        self.logger.info(f"♻️ Índice de intenções refeito ({len(index)} gatilhos).")
+
     def identify_intent_hybrid(
         self, content: str, intents_config: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Camada 0: Mapeia intenções com casamento elástico e lematização."""
-        normalized = self._normalize_with_spacy(content)
+        normalized = self.normalize(content)
         mejor_intencao = "conversa"
         maior_score = 0
         termo_extraido = None
 
-        if SPACY_AVAILABLE and self.nlp:
-            for intent, data in intents_config.items():
-                triggers = data.get("triggers", [])
-                if not triggers:
-                    continue
+        if SPACY_AVAILABLE and self.nlp and intents_config:
+            index = self._intent_index(intents_config)
+            memo = self._classificacoes.get(normalized)
+            if memo is None:
+                intent, score, gatilho_encontrado = index.match(normalized)
+                if intent is not None:
+                    memo = (
+                        intent,
+                        score,
+                        normalized.replace(gatilho_encontrado, "").strip(),
+                    )
+                else:
+                    memo = (mejor_intencao, maior_score, termo_extraido)
+                self._classificacoes.set(normalized, memo)
+            mejor_intencao, maior_score, termo_extraido = memo
 
-                match = process.extractOne(
-                    normalized, triggers, scorer=fuzz.token_set_ratio
-                )
-                if match:
-                    gatilho_encontrado, score, _ = match
-
-                    if score > 85 and score > maior_score:
-                        maior_score = score
-                        mejor_intencao = intent
-                        termo_extraido = normalized.replace(
-                            gatilho_encontrado, ""
-                        ).strip()
         return {
             "intent": mejor_intencao,
             "query": termo_extraido,
@@ -95,7 +95,7 @@ class NightCycle:
                 await self.aux_chain.setup_chain()
 
             fatos_extraidos = await self.aux_chain.generate_response(
-                prompt_parts=[logs_text], system_instruction=prompt_resumo
+                prompt_parts=[logs_text], system_instruction=prompt_resumo, priority="fundo"
             )
 
             if not fatos_extraidos or "Todos os motores de IA" in fatos_extraidos:
@@ -1,11 +1,13 @@
 # Brain/Core/Pipeline.py
 import discord
+import os
 import re
 import random
 import logging
 import json
 import traceback
 import asyncio
+from contextlib import aclosing
 from datetime import datetime
 import time
 
@@ -18,6 +20,12 @@ from Brain.Memory.ShortTerm.Context import HistoricoManager
 from Brain.Memory.ShortTerm._expressions import ExpressoesManager
 from Brain.Memory.SelfKnowledge.Identity import AutoConhecimentoManager
 from Brain.Core.Limpeza import LimpezaManager
+from Brain.Core._stages import Stage, StageGraph, format_timings
+from Brain.Core._router import ToolRouter, load_classifier
+from Brain.Core._streaming import StreamingReply, ponto_de_corte, DISCORD_LIMIT
+from Brain.Core.Tracing import tracer
+from Brain.Core.SingleFlight import fingerprint, get_flight
+from Brain.Core._response_cache import response_cache
 
 logger = logging.getLogger("SamBot.Pipeline")
 
@@ -47,6 +55,14 @@ tentar_importar_tool("pokemon", "Brain.Tools.PokemonTool", "PokemonTool")
 
 TOOLS_AVAILABLE = len(TOOL_CLASSES) > 0
 
+# Limite (s) de cada estágio de preparação do prompt; PIPELINE_TIMEOUT_<ESTAGIO> sobrescreve
+STAGE_TIMEOUTS = {
+    "anexos": 15.0,
+    "memoria": 4.0,
+    "ferramentas": 12.0,
+    "historico": 8.0,
+}
+
 
 class CognitionPipeline:
     """
@@ -69,13 +85,36 @@ class CognitionPipeline:
         self.expressoes = ExpressoesManager()
         self.auto_conhecimento = AutoConhecimentoManager
         self.limpeza = LimpezaManager()
+        self.data_manager.watcher.add_listener(self.limpeza.on_knowledge_changed)
 
         self.identity = self.data_manager.get_identity()
 
+        # Resposta em streaming: a mensagem aparece cedo e é editada enquanto o texto chega
+        self.streaming = os.getenv("STREAM_RESPONSES", "true").lower() in ("1", "true", "yes")
+        self.stream_interval = float(os.getenv("STREAM_EDIT_INTERVAL", "1.0"))
+
+        self.stage_timeouts = {
+            nome: float(os.getenv(f"PIPELINE_TIMEOUT_{nome.upper()}", padrao))
+            for nome, padrao in STAGE_TIMEOUTS.items()
+        }
+
         # Ferramentas
         self.tools = {}
         self.vision_tool = None
         self._inicializar_ferramentas()
+        self._ferramentas_em_voo = get_flight("ferramentas")
+
+        # Cache semântico de respostas: perguntas quase iguais não voltam ao LLM
+        self.respostas = (
+            response_cache
+            if os.getenv("RESPONSE_CACHE", "true").lower() in ("1", "true", "yes")
+            else None
+        )
+
+        # Roteamento local de ferramentas (o LLM só entra quando há dúvida)
+        self._router = None
+        self._router_fonte = None
+        self._router_classifier = load_classifier(os.getenv("ROUTER_CLASSIFIER_PATH"))
 
         self.logger.info(
             f"🧠 Pipeline Cognitivo Pronto. Entidade: {self.identity.get('name')}"
@@ -120,44 +159,68 @@ class CognitionPipeline:
             self.logger.warning(f"⚠️ Aviso RAG: {e}")
             return ""
 
+    def _roteador_local(self) -> ToolRouter:
+        """Router local; refeito quando o nlp_data muda (hot-reload ou gravação)."""
+        nlp_config = self.data_manager.get_knowledge("nlp_data") or {}
+        if self._router is None or self._router_fonte is not nlp_config:
+            anterior = self._router
+            self._router = ToolRouter(
+                nlp_config,
+                accept=float(os.getenv("ROUTER_ACCEPT", "88")),
+                reject=float(os.getenv("ROUTER_REJECT", "60")),
+                margin=float(os.getenv("ROUTER_MARGIN", "8")),
+                classifier_min=float(os.getenv("ROUTER_CLASSIFIER_MIN", "0.75")),
+                classifier=self._router_classifier,
+                min_arg_chars=int(os.getenv("ROUTER_MIN_ARG_CHARS", "3")),
+            )
+            if anterior is not None:
+                self._router.counters = anterior.counters
+            self._router_fonte = nlp_config
+        return self._router
+
+    def _assinatura_de_ferramentas(self, content: str):
+        """
+        Impressão digital das ferramentas que o router local escolheria ("" = nenhuma,
+        None = sem certeza). Só espia: a contagem fica para o roteamento de verdade.
+        """
+        decisao = self._roteador_local().route(content, count=False)
+        if decisao is None:
+            return None
+        if not decisao.actions:
+            return ""
+        return fingerprint(decisao.actions, casefold=True)
+
     async def _rotear_ferramentas(self, content: str) -> str:
         if not self.tools or not self.llm_factory:
             return ""
 
-        nlp_config = self.data_manager.get_knowledge("nlp_data") or {}
-        intents = nlp_config.get("intents", {})
-
-        analise_intencao = self.limpeza.identify_intent_hybrid(content, intents)
-        intencao_detectada = analise_intencao.get("intent")
-        score = analise_intencao.get("score_confianca", 0)
-
-        intencoes_estaticas = [
-            "identity_check",
-            "general_greetings",
-            "farewells",
-            "conversa",
-        ]
-
-        if intencao_detectada in intencoes_estaticas or score < 60:
-            palavras_chave_gerais = [
-                "clima",
-                "tempo",
-                "jogo",
-                "game",
-                "imagem",
-                "foto",
-                "pesquisa",
-                "busca",
-                "musica",
-                "anime",
-                "pokemon",
-                "pokémon",
-                "status",
-                "item",
-            ]
-            if not any(t in content.lower() for t in palavras_chave_gerais):
-                return ""  # Ignora o roteador se realmente for papo furado
+        roteador = self._roteador_local()
+        with tracer.span("nlp.roteamento"):
+            decisao = roteador.route(content)
+
+        if decisao is not None:
+            actions = decisao.actions
+            if actions:
+                self.logger.info(
+                    f"  [Roteador] Decisão local ({decisao.tier}, {decisao.confidence:.0f}): {actions}"
+                )
+        else:
+            actions = await self._rotear_com_llm(content)
+            roteador.count_llm(actions)
 
+        if not actions:
+            return ""
+        try:
+            return await self._executar_ferramentas(actions)
+        except Exception as e:
+            self.logger.error(
+                f"❌ Erro crítico no ecossistema de ferramentas do Pipeline: {e}",
+                exc_info=True,
+            )
+            return ""
+
+    async def _rotear_com_llm(self, content: str) -> list:
+        """Camada final do roteamento: só chamada quando o router local não tem certeza."""
         ferramentas_disponiveis = "', '".join(self.tools.keys())
         router_instruction = (
             "Você é o Roteador de Ferramentas central. Sua única função é analisar a mensagem do usuário e decidir se ela precisa de uma das ferramentas ativas listadas abaixo.\n\n"
@@ -182,14 +245,16 @@ class CognitionPipeline:
             "Usuário: 'Olá, tudo bem?' -> Saída: []"
         )
 
+        decisao_raw = ""
         try:
             decisao_raw = await self.ai_chain.generate_response(
                 prompt_parts=[f"Usuário: {content}"],
                 system_instruction=router_instruction,
+                priority="roteador",
             )
             json_str = decisao_raw.replace("```json", "").replace("```", "").strip()
             if not json_str or json_str == "[]" or "{" not in json_str:
-                return ""
+                return []
 
             actions = json.loads(json_str)
             if isinstance(actions, dict):
@@ -197,67 +262,75 @@ class CognitionPipeline:
                     f"  [Roteador] Intenção gerada pelo modelo de IA: {actions}"
                 )
                 actions = [actions]
-
-            results = []
-            for action in actions:
-                name = action.get("tool")
-                args = str(action.get("args", ""))
-                if name in self.tools:
-                    self.logger.info(
-                        f"  [Roteador] Executando ferramenta ativa: '{name}' | Argumento: '{args}'"
-                    )
-                    tool = self.tools[name]
-                    res = ""
-                    try:
-                        if name == "image_search":
-                            res = (
-                                await tool.search(args)
-                                if hasattr(tool, "search")
-                                else tool.obter_imagem(args)
-                            )
-                        elif name == "weather":
-                            res = await tool.get_weather(args)
-                        elif name == "anime":
-                            if args.startswith("http"):
-                                res = await tool.identify_anime_by_image(args)
-                            else:
-                                res = await tool.search_anime(args)
-                        elif name == "music_recommend":
-                            res = await tool.recommend_music(args)
-                        elif name == "game_search":
-                            res = await tool.search_game(args)
-                        elif name == "jellyfin":
-                            res = await tool.search_content(args)
-                        elif name == "web_search":
-                            res = (
-                                await tool.buscar_na_cascata(args)
-                                if hasattr(tool, "buscar_na_cascata")
-                                else await tool.search(args)
-                            )
-                        elif name == "pokemon":
-                            res = await tool.executar(action, args)
-                        self.logger.info(
-                            f"  [Roteador] Retorno da ferramenta '{name}' obtido com sucesso."
-                        )
-                        results.append(f"\n[{name.upper()}]: {res}")
-                    except Exception as e:
-                        self.logger.error(
-                            f"❌ Erro ao executar a ferramenta '{name}' com os argumentos '{args}': {e}",
-                            exc_info=True,
-                        )
-            return "".join(results) + "\n"
+            return [a for a in actions if isinstance(a, dict)]
 
         except json.JSONDecodeError:
             self.logger.warning(
                 f"🤖 A IA gerou um JSON inválido no roteamento de ferramentas. Resposta recebida: '{decisao_raw}'"
             )
-            return ""
+            return []
         except Exception as e:
-            self.logger.error(
-                f"❌ Erro crítico no ecossistema de ferramentas do Pipeline: {e}",
-                exc_info=True,
+            self.logger.error(f"❌ Erro no roteador por LLM: {e}", exc_info=True)
+            return []
+
+    async def _executar_ferramentas(self, actions: list) -> str:
+        results = []
+        for action in actions:
+            name = action.get("tool")
+            args = str(action.get("args", ""))
+            if name in self.tools:
+                self.logger.info(
+                    f"  [Roteador] Executando ferramenta ativa: '{name}' | Argumento: '{args}'"
+                )
+                try:
+                    # A mesma consulta em vários canais ao mesmo tempo vira uma só chamada à API
+                    chave = fingerprint(
+                        name, action.get("acao"), args, casefold=not args.startswith("http")
+                    )
+                    with tracer.span(f"tool.{name}"):
+                        res = await self._ferramentas_em_voo.do(
+                            chave, lambda: self._chamar_ferramenta(name, action, args)
+                        )
+                        self.logger.info(
+                            f"  [Roteador] Retorno da ferramenta '{name}' obtido com sucesso."
+                        )
+                    results.append(f"\n[{name.upper()}]: {res}")
+                except Exception as e:
+                    self.logger.error(
+                        f"❌ Erro ao executar a ferramenta '{name}' com os argumentos '{args}': {e}",
+                        exc_info=True,
+                    )
+        return "".join(results) + "\n"
+
+    async def _chamar_ferramenta(self, name: str, action: dict, args: str):
+        tool = self.tools[name]
+        if name == "image_search":
+            return (
+                await tool.search(args)
+                if hasattr(tool, "search")
+                else tool.obter_imagem(args)
             )
-            return ""
+        elif name == "weather":
+            return await tool.get_weather(args)
+        elif name == "anime":
+            if args.startswith("http"):
+                return await tool.identify_anime_by_image(args)
+            return await tool.search_anime(args)
+        elif name == "music_recommend":
+            return await tool.recommend_music(args)
+        elif name == "game_search":
+            return await tool.search_game(args)
+        elif name == "jellyfin":
+            return await tool.search_content(args)
+        elif name == "web_search":
+            return (
+                await tool.buscar_na_cascata(args)
+                if hasattr(tool, "buscar_na_cascata")
+                else await tool.search(args)
+            )
+        elif name == "pokemon":
+            return await tool.executar(action.get("acao", "buscar_pokemon"), args)
+        return ""
 
     async def _processar_anexos(self, message: discord.Message):
         if self.vision_tool and self.vision_tool.is_image_message(message):
@@ -297,31 +370,162 @@ class CognitionPipeline:
     async def _enviar_resposta(self, message: discord.Message, texto: str):
         if not texto:
             return
-        LIMIT = 1900
-        while len(texto) > LIMIT:
-            idx = texto[:LIMIT].rfind("\n")
-            if idx == -1:
-                idx = texto[:LIMIT].rfind(". ")
-            if idx == -1:
-                idx = texto[:LIMIT].rfind(" ")
-            if idx == -1:
-                idx = LIMIT
+        with tracer.span("discord.envio"):
+            await self._enviar_blocos(message, texto)
+
+    async def _enviar_blocos(self, message: discord.Message, texto: str):
+        while len(texto) > DISCORD_LIMIT:
+            idx = ponto_de_corte(texto, DISCORD_LIMIT)
 
             chunk = texto[:idx].strip()
             if chunk:
-                await message.channel.send(chunk)
+                enviada = await message.channel.send(chunk)
+                self.historico.registrar(enviada, self.bot.user)
             texto = texto[idx:].strip()
             await asyncio.sleep(0.4)
 
         if texto:
-            await message.reply(texto, mention_author=False)
+            enviada = await message.reply(texto, mention_author=False)
+            # Já entra no anel; o eco do gateway é descartado como duplicado
+            self.historico.registrar(enviada, self.bot.user)
+
+    async def _responder_em_streaming(
+        self, message: discord.Message, parts: list, full_sys: str, clean_text: str, inicio: float
+    ) -> StreamingReply:
+        saida = StreamingReply(
+            message,
+            lambda enviada, editada: self.historico.registrar(enviada, self.bot.user, editada),
+            started_at=inicio,
+            interval=self.stream_interval,
+        )
+        async with aclosing(
+            self.ai_chain.generate_stream(prompt_parts=parts, system_instruction=full_sys)
+        ) as pedacos:
+            async for pedaco in pedacos:
+                await saida.feed(pedaco)
+
+        # 4. Expressões e Reações (na última edição)
+        await saida.finish(self._sufixo_de_reacao(saida.texto, clean_text))
+        return saida
+
+    def _sufixo_de_reacao(self, resposta: str, clean_text: str) -> str:
+        if self.expressoes and not any(
+            e in resposta for e in ["😀", "💜", "✨", "🎮"]
+        ):
+            reacao = self.expressoes.get_reaction(clean_text)
+            if reacao:
+                return f" {reacao}"
+        return ""
+
+    async def _buscar_resposta_em_cache(
+        self, message: discord.Message, clean_text: str, persona_key: str
+    ):
+        """
+        Camada 1.5: procura uma resposta já gerada para uma pergunta quase igual.
+        A consulta RAG é lançada em simultâneo (divide o embedding com a busca) porque
+        decide se a resposta é pessoal: com fatos do usuário o cache não vale. A tarefa
+        volta para ser reaproveitada pelo estágio "memoria" quando não há acerto.
+        """
+        consulta = {
+            "resposta": None,
+            "vetor": None,
+            "assinatura": None,
+            "memoria": None,
+            # O histórico do canal entra no prompt: a resposta só serve para o mesmo canal
+            "escopo": str(message.channel.id),
+        }
+        if self.respostas is None:
+            return consulta
+
+        motivo = self.respostas.bypass_reason(
+            clean_text,
+            anexos=bool(message.attachments),
+            resposta_a=message.reference is not None,
+        )
+        if motivo:
+            self.respostas.record_bypass(motivo)
+            return consulta
 
-    async def processar_cognicao(
-        self, message: discord.Message, clean_text: str, persona_name: str = None
+        consulta["memoria"] = memoria = asyncio.ensure_future(
+            self._consultar_memoria_longa(clean_text)
+        )
+        consulta["assinatura"] = self._assinatura_de_ferramentas(clean_text)
+        with tracer.span("cache.resposta"):
+            em_cache, consulta["vetor"] = await self.respostas.lookup(
+                persona_key,
+                consulta["escopo"],
+                clean_text,
+                consulta["assinatura"],
+                self.vector_store.embedding_fn.get_single_embedding,
+            )
+        if em_cache is None:
+            return consulta
+
+        try:
+            rag = await asyncio.wait_for(asyncio.shield(memoria), self.stage_timeouts["memoria"])
+        except asyncio.TimeoutError:
+            rag = None
+        if rag == "":
+            self.respostas.hit(em_cache, semantico=consulta["vetor"] is not None)
+            consulta["resposta"] = em_cache
+        else:
+            self.respostas.record_bypass("memoria")
+        return consulta
+
+    def _guardar_resposta_em_cache(
+        self, consulta: dict, clean_text: str, persona_key: str, user_name: str,
+        resposta: str, full_sys: str, contexto: dict,
     ):
-        start = time.time()
-        if not self.llm_factory:
+        """Só guarda respostas genéricas: sem RAG, fato a aprender, anexos, falha ou o nome de quem perguntou."""
+        if self.respostas is None or consulta["vetor"] is None:
+            return
+        if contexto["memoria"] or contexto["aprendizado"] or contexto["anexos"]:
+            return
+        if not resposta or resposta.startswith("🤯") or (user_name and user_name in resposta):
             return
+        self.respostas.store(
+            persona_key,
+            consulta["escopo"],
+            clean_text,
+            resposta,
+            consulta["vetor"],
+            consulta["assinatura"],
+            # Estimativa de ~4 caracteres por token para o pedido que deixa de ser feito
+            tokens=(len(full_sys) + len(clean_text) + len(resposta)) // 4,
+            com_ferramentas=bool(contexto["ferramentas"].strip()),
+        )
+
+    async def _historico_recente(self, message: discord.Message) -> str:
+        # Anel em RAM do canal; a REST do Discord só é usada quando o canal está frio
+        return await self.historico.get_formatted_history(message, self.bot.user)
+
+    async def _preparar_contexto(
+        self, message: discord.Message, clean_text: str, user_id: str, memoria=None
+    ):
+        """
+        Camada 2: anexos, RAG, ferramentas e histórico não dependem uns dos outros,
+        então correm em simultâneo. Cada um tem o seu limite de tempo e, se estourar
+        ou falhar, o prompt é montado sem ele. `memoria` é a consulta RAG já lançada
+        durante a busca no cache de respostas, se houve. O aprendizado de fatos só
+        enfileira a mensagem: a extração corre em lote, fora da resposta.
+        """
+        aprendendo = self.aprendizado.aprender_fatos(message, clean_text)
+        t = self.stage_timeouts
+        if memoria is None:
+            memoria = self._consultar_memoria_longa(clean_text)
+        grafo = StageGraph(
+            [
+                Stage("anexos", lambda: self._processar_anexos(message), t["anexos"], fallback=[]),
+                Stage("memoria", lambda: memoria, t["memoria"], fallback=""),
+                Stage("ferramentas", lambda: self._rotear_ferramentas(clean_text), t["ferramentas"], fallback=""),
+                Stage("historico", lambda: self._historico_recente(message), t["historico"], fallback=""),
+            ]
+        )
+        resultados = await grafo.run()
+        self.logger.info(f"⏱️ Estágios: {format_timings(resultados)}")
+        contexto = {nome: r.value for nome, r in resultados.items()}
+        contexto["aprendizado"] = aprendendo
+        return contexto
 
     async def _interceptar_resposta_estatica(
         self, clean_text: str, intents_config: dict
@@ -330,7 +534,8 @@ class CognitionPipeline:
         if not hasattr(self.limpeza, "identify_intent_hybrid"):
             return None
 
-        resultado = self.limpeza.identify_intent_hybrid(clean_text, intents_config)
+        with tracer.span("nlp.intencao"):
+            resultado = self.limpeza.identify_intent_hybrid(clean_text, intents_config)
         intent = resultado.get("intent")
         score = resultado.get("score_confianca", 0)
 
@@ -342,8 +547,15 @@ class CognitionPipeline:
 
     async def processar_cognicao(
         self, message: discord.Message, clean_text: str, persona_name: str = None
+    ):
+        with tracer.span("pipeline.total"):
+            await self._processar_cognicao(message, clean_text, persona_name)
+
+    async def _processar_cognicao(
+        self, message: discord.Message, clean_text: str, persona_name: str = None
     ):
         start = time.time()
+        inicio = time.perf_counter()
         if not self.llm_factory:
             return
 
@@ -364,16 +576,14 @@ class CognitionPipeline:
                     "⚡ [Camada 0] Mensagem interceptada estaticamente. Custo: 0 tokens."
                 )
 
-                if hasattr(self.historico, "add_message"):
-                    self.historico.add_message(user_id, "user", clean_text)
-                    self.historico.add_message(user_id, "model", resposta_pronta)
-
                 return await self._enviar_resposta(message, resposta_pronta)
 
             # 1. Autoconhecimento
-            if hasattr(
-                self.auto_conhecimento, "is_self_inquiry"
-            ) and self.auto_conhecimento.is_self_inquiry(clean_text):
+            with tracer.span("nlp.autoconhecimento"):
+                sobre_mim = hasattr(
+                    self.auto_conhecimento, "is_self_inquiry"
+                ) and self.auto_conhecimento.is_self_inquiry(clean_text)
+            if sobre_mim:
                 prompt_id = (
                     self.auto_conhecimento.get_identity_prompt()
                     if hasattr(self.auto_conhecimento, "get_identity_prompt")
@@ -382,23 +592,24 @@ class CognitionPipeline:
                 resp = await self.ai_chain.generate_response(clean_text, prompt_id)
                 return await self._enviar_resposta(message, resp)
 
-            # 2. Pipeline de Dados
-            anexos = await self._processar_anexos(message)
-            fato_novo = await self.aprendizado.aprender_fatos(message, clean_text)
-            rag = await self._consultar_memoria_longa(clean_text)
-            tools = await self._rotear_ferramentas(clean_text)
-
-            # Histórico
-            hist_str = ""
-            if hasattr(self.historico, "get_context"):
-                hist_data = self.historico.get_context(user_id)
-            else:
-                hist_data = await self.historico.get_formatted_history(
-                    message, self.bot.user
+            # 1.5 Cache semântico de respostas
+            persona_key = persona_name or "padrao"
+            consulta = await self._buscar_resposta_em_cache(message, clean_text, persona_key)
+            if consulta["resposta"] is not None:
+                self.logger.info(
+                    f"⚡ [Cache] Resposta reaproveitada. Custo: 0 tokens "
+                    f"(~{consulta['resposta'].tokens} poupados)."
                 )
-            hist_str = (
-                "\n".join(hist_data) if isinstance(hist_data, list) else str(hist_data)
+                return await self._enviar_resposta(message, consulta["resposta"].texto)
+
+            # 2. Pipeline de Dados (estágios em simultâneo)
+            contexto = await self._preparar_contexto(
+                message, clean_text, user_id, memoria=consulta["memoria"]
             )
+            anexos = contexto["anexos"]
+            rag = contexto["memoria"]
+            tools = contexto["ferramentas"]
+            hist_str = contexto["historico"]
 
             # 3. Prompt Final
             sys_prompt_base = self._carregar_prompt(persona_name)
@@ -415,35 +626,38 @@ class CognitionPipeline:
                 f"Histórico Recente:\n{hist_str}"
             )
 
-            if fato_novo:
-                full_sys += f"\n[SISTEMA]: Você acabou de aprender isto agora: '{fato_novo}'. Comente brevemente!"
-
             parts = [f"{user_name}: {clean_text}"] if clean_text else []
             if anexos:
                 parts.extend(anexos)
                 if not clean_text:
                     parts.append("Analise estas imagens.")
 
+            if self.streaming:
+                saida = await self._responder_em_streaming(
+                    message, parts, full_sys, clean_text, inicio
+                )
+                self.logger.info(
+                    f"🗣️ Resposta gerada em {time.time()-start:.2f}s "
+                    f"(primeiro texto visível em {(saida.ttft_ms or 0) / 1000:.2f}s)"
+                )
+                self._guardar_resposta_em_cache(
+                    consulta, clean_text, persona_key, user_name, saida.texto, full_sys, contexto
+                )
+                return
+
             resposta = await self.ai_chain.generate_response(
                 prompt_parts=parts, system_instruction=full_sys
             )
 
             # 4. Expressões e Reações
-            if self.expressoes and not any(
-                e in resposta for e in ["😀", "💜", "✨", "🎮"]
-            ):
-                reacao = self.expressoes.get_reaction(clean_text)
-                if reacao:
-                    resposta += f" {reacao}"
+            resposta += self._sufixo_de_reacao(resposta, clean_text)
 
             self.logger.info(f"🗣️ Resposta gerada em {time.time()-start:.2f}s")
 
-            if hasattr(self.historico, "add_message"):
-                log_in = clean_text + (" [Anexo]" if anexos else "")
-                self.historico.add_message(user_id, "user", log_in)
-                self.historico.add_message(user_id, "model", resposta)
-
             await self._enviar_resposta(message, resposta)
+            self._guardar_resposta_em_cache(
+                consulta, clean_text, persona_key, user_name, resposta, full_sys, contexto
+            )
 
         except Exception:
             self.logger.error(traceback.format_exc())
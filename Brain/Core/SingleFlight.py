@@ -0,0 +1,121 @@
+# Brain/Core/SingleFlight.py
+
+import re
+import json
+import asyncio
+import hashlib
+import threading
+import unicodedata
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+_ESPACOS = re.compile(r"\s+")
+
+
+def _normalizar(valor: Any, casefold: bool) -> Any:
+    if isinstance(valor, str):
+        texto = _ESPACOS.sub(" ", valor).strip()
+        if casefold:
+            # "São  Paulo" e "sao paulo" viram o mesmo pedido
+            texto = unicodedata.normalize("NFKD", texto.casefold())
+            texto = "".join(c for c in texto if not unicodedata.combining(c))
+        return texto
+    if isinstance(valor, (list, tuple)):
+        return [_normalizar(v, casefold) for v in valor]
+    if isinstance(valor, dict):
+        return {str(k): _normalizar(v, casefold) for k, v in valor.items()}
+    if valor is None or isinstance(valor, (int, float, bool)):
+        return valor
+    raise TypeError(f"Valor sem impressão digital estável: {type(valor).__name__}")
+
+
+def fingerprint(*parts: Any, casefold: bool = False) -> Optional[str]:
+    """
+    Impressão digital de um pedido: espaços colapsados (e, com `casefold`, sem
+    maiúsculas nem acentos). Devolve None se alguma parte não for serializável
+    (ex.: bytes de uma imagem) — nesse caso o pedido não deve ser agrupado.
+    """
+    try:
+        normalizado = json.dumps(_normalizar(list(parts), casefold), ensure_ascii=False, sort_keys=True)
+    except TypeError:
+        return None
+    return hashlib.blake2b(normalizado.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class SingleFlight:
+    """
+    Agrupa chamadas idênticas em curso: a primeira com uma chave executa `factory()`
+    numa tarefa própria e as seguintes esperam o mesmo resultado (ou exceção). Nada
+    é guardado depois de terminar — para isso existe o `BoundedCache`. Se todos os
+    interessados desistirem (cancelamento), a tarefa partilhada é cancelada.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Optional[Hashable], factory: Callable[[], Awaitable[Any]]) -> Any:
+        if key is None:
+            return await factory()
+
+        with self._lock:
+            self.calls += 1
+            task = self._inflight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(factory())
+                self._inflight[key] = task
+                task.add_done_callback(lambda t, k=key: self._terminar(k, t))
+            else:
+                self.coalesced += 1
+            self._waiters[key] = self._waiters.get(key, 0) + 1
+
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done():
+                with self._lock:
+                    restantes = self._waiters.get(key, 1) - 1
+                    self._waiters[key] = restantes
+                if restantes <= 0:
+                    task.cancel()
+            raise
+
+    def _terminar(self, key: Hashable, task: asyncio.Task):
+        with self._lock:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+                self._waiters.pop(key, None)
+        if not task.cancelled():
+            # Evita "exception was never retrieved" quando ninguém mais esperava
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "inflight": len(self._inflight),
+                "coalesced_rate": self.coalesced / self.calls if self.calls else 0.0,
+            }
+
+
+_grupos: Dict[str, SingleFlight] = {}
+_grupos_lock = threading.Lock()
+
+
+def get_flight(name: str) -> SingleFlight:
+    """Grupo de single-flight nomeado; o mesmo nome devolve sempre a mesma instância."""
+    with _grupos_lock:
+        grupo = _grupos.get(name)
+        if grupo is None:
+            grupo = _grupos[name] = SingleFlight(name)
+        return grupo
+
+
+def flight_stats() -> Dict[str, Dict[str, Any]]:
+    with _grupos_lock:
+        grupos = list(_grupos.items())
+    return {name: grupo.stats() for name, grupo in sorted(grupos)}
@@ -0,0 +1,217 @@
+# Brain/Core/Tracing.py
+
+import os
+import json
+import math
+import time
+import logging
+import threading
+import contextvars
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger("SamBot.Tracing")
+
+# Buckets logarítmicos de 0,1 ms a ~10 min (fator 1,2): erro máximo de ~10% nos percentis
+_BASE_MS = 0.1
+_FACTOR = 1.2
+_BUCKETS = 90
+
+
+class LatencyHistogram:
+    """Histograma de latências com memória constante. Percentis pelo limite superior do bucket."""
+
+    __slots__ = ("counts", "count", "total_ms", "max_ms", "errors")
+
+    def __init__(self):
+        self.counts = [0] * (_BUCKETS + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.errors = 0
+
+    @staticmethod
+    def _bucket(ms: float) -> int:
+        if ms <= _BASE_MS:
+            return 0
+        return min(_BUCKETS, int(math.log(ms / _BASE_MS, _FACTOR)) + 1)
+
+    def record(self, ms: float, ok: bool = True):
+        self.counts[self._bucket(ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        if not ok:
+            self.errors += 1
+
+    def percentile(self, pct: float) -> float:
+        if not self.count:
+            return 0.0
+        alvo = math.ceil(self.count * pct / 100)
+        acumulado = 0
+        for i, n in enumerate(self.counts):
+            acumulado += n
+            if acumulado >= alvo:
+                return min(self.max_ms, _BASE_MS * _FACTOR**i)
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50), 2),
+            "p95_ms": round(self.percentile(95), 2),
+            "p99_ms": round(self.percentile(99), 2),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class Span:
+    """
+    Um trecho medido. `provider` diz quem atendeu (ex.: gemini, groq, ollama). Ao
+    terminar, o span passa o seu provedor ao pai, então "pipeline.memoria" fica
+    marcado com quem gerou o embedding e "pipeline.total" com quem gerou a resposta
+    (o último filho a terminar). Um provedor dado na criação fica fixo.
+    """
+
+    __slots__ = ("name", "provider", "pinned", "status", "parent", "_start", "elapsed_ms")
+
+    def __init__(self, name: str, provider: Optional[str], parent: Optional["Span"]):
+        self.name = name
+        self.provider = provider
+        self.pinned = provider is not None
+        self.status = "ok"
+        self.parent = parent
+        self._start = 0.0
+        self.elapsed_ms = 0.0
+
+    def set_provider(self, provider: Optional[str]):
+        if provider and not self.pinned:
+            self.provider = provider
+
+
+class _SpanContext:
+    """Gestor de contexto (sync e async) devolvido por `tracer.span()`."""
+
+    __slots__ = ("tracer", "span", "token")
+
+    def __init__(self, tracer: "Tracer", name: str, provider: Optional[str]):
+        self.tracer = tracer
+        self.span = Span(name, provider, _current.get())
+        self.token = None
+
+    def __enter__(self) -> Span:
+        self.token = _current.set(self.span)
+        self.span._start = time.perf_counter()
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        span = self.span
+        span.elapsed_ms = (time.perf_counter() - span._start) * 1000
+        if exc_type is not None and span.status == "ok":
+            span.status = "timeout" if exc_type.__name__ in ("TimeoutError", "CancelledError") else "error"
+        _current.reset(self.token)
+        if span.provider and span.parent is not None:
+            span.parent.set_provider(span.provider)
+        self.tracer._record(span)
+        return False
+
+    async def __aenter__(self) -> Span:
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "sambot_span", default=None
+)
+
+
+class Tracer:
+    """
+    Instrumentação por spans do pipeline cognitivo:
+
+        with tracer.span("rag.embedding"):
+            ...
+
+        with tracer.span("historico.leitura", provider="discord"):
+            ...
+
+    Cada nome de span (e cada par nome/provedor) acumula um histograma em processo
+    com p50/p95/p99. O comando de dono `latencia` mostra os números e
+    `dump_rolling()` grava snapshots em logs/ para o launcher.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, Optional[str]], LatencyHistogram] = {}
+        self.started_at = time.time()
+
+    def span(self, name: str, provider: Optional[str] = None) -> _SpanContext:
+        return _SpanContext(self, name, provider)
+
+    def current(self) -> Optional[Span]:
+        return _current.get()
+
+    def set_provider(self, provider: Optional[str]):
+        """Marca o provedor que atendeu o span atual."""
+        span = _current.get()
+        if span is not None:
+            span.set_provider(provider)
+
+    def record(self, name: str, elapsed_ms: float, provider: Optional[str] = None, status: str = "ok"):
+        """Regista uma medida feita fora de um `with` (ex.: dentro de um gerador assíncrono)."""
+        span = Span(name, provider, None)
+        span.elapsed_ms = elapsed_ms
+        span.status = status
+        self._record(span)
+
+    def _record(self, span: Span):
+        ok = span.status == "ok"
+        with self._lock:
+            for key in ((span.name, None), (span.name, span.provider)):
+                hist = self._histograms.get(key)
+                if hist is None:
+                    hist = self._histograms[key] = LatencyHistogram()
+                hist.record(span.elapsed_ms, ok)
+                if span.provider is None:
+                    break
+
+    # --- LEITURA ---
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """{nome: {p50_ms, p95_ms, ..., "providers": {provedor: {...}}}} ordenado por nome."""
+        with self._lock:
+            itens = [(k, h.snapshot()) for k, h in self._histograms.items()]
+        resultado: Dict[str, Dict[str, Any]] = {}
+        for (nome, provedor), snap in sorted(itens, key=lambda i: (i[0][0], i[0][1] or "")):
+            if provedor is None:
+                resultado.setdefault(nome, {}).update(snap)
+            else:
+                resultado.setdefault(nome, {}).setdefault("providers", {})[provedor] = snap
+        return resultado
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+        self.started_at = time.time()
+
+    def dump_rolling(self, path: Path, max_bytes: int = 1024 * 1024):
+        """Acrescenta um snapshot (uma linha JSON) e roda o ficheiro para `.1` ao passar de `max_bytes`."""
+        path = Path(path)
+        linha = json.dumps(
+            {"ts": int(time.time()), "since": int(self.started_at), "spans": self.stats()},
+            ensure_ascii=False,
+        )
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if path.exists() and path.stat().st_size > max_bytes:
+                os.replace(path, path.with_name(path.name + ".1"))
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(linha + "\n")
+        except OSError as e:
+            logger.warning(f"⚠️ Não foi possível gravar as latências em {path}: {e}")
+
+
+tracer = Tracer()
@@ -0,0 +1,70 @@
+# Brain/Core/_intents.py
+
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from rapidfuzz import process, fuzz
+
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+# Score mínimo (exclusivo) para uma intenção valer, igual ao casamento antigo
+MIN_SCORE = 85
+
+
+class IntentIndex:
+    """
+    Índice de intenções montado uma vez a partir de `nlp_data["intents"]`: todos os
+    gatilhos num único array, com o id da intenção dona de cada um. Uma mensagem é
+    pontuada contra o array inteiro numa só chamada ao RapidFuzz, em vez de um
+    `extractOne` por intenção.
+    """
+
+    def __init__(self, intents_config: Dict[str, Any]):
+        self.intents: List[str] = []
+        self.triggers: List[str] = []
+        self.owners: List[int] = []
+        for intent, data in intents_config.items():
+            triggers = data.get("triggers", [])
+            if not triggers:
+                continue
+            intent_id = len(self.intents)
+            self.intents.append(intent)
+            for gatilho in triggers:
+                self.triggers.append(gatilho)
+                self.owners.append(intent_id)
+
+    def __len__(self) -> int:
+        return len(self.triggers)
+
+    def match(self, normalized: str) -> Tuple[Optional[str], float, Optional[str]]:
+        """(intenção, score, gatilho) do melhor casamento acima de MIN_SCORE, ou (None, 0, None)."""
+        if not RAPIDFUZZ_AVAILABLE or not self.triggers:
+            return None, 0, None
+
+        resultados = process.extract(
+            normalized,
+            self.triggers,
+            scorer=fuzz.token_set_ratio,
+            limit=None,
+            score_cutoff=MIN_SCORE,
+        )
+
+        # Melhor gatilho por intenção (o primeiro da lista em caso de empate)
+        melhores: Dict[int, Tuple[float, int]] = {}
+        for _, score, idx in resultados:
+            if score <= MIN_SCORE:
+                continue
+            intent_id = self.owners[idx]
+            atual = melhores.get(intent_id)
+            if atual is None or score > atual[0] or (score == atual[0] and idx < atual[1]):
+                melhores[intent_id] = (score, idx)
+
+        # Entre intenções, vence o maior score; empate fica com a que vem antes no ficheiro
+        escolhida, maior_score, gatilho = None, 0, None
+        for intent_id in sorted(melhores):
+            score, idx = melhores[intent_id]
+            if score > maior_score:
+                escolhida, maior_score, gatilho = self.intents[intent_id], score, self.triggers[idx]
+        return escolhida, maior_score, gatilho
@@ -0,0 +1,222 @@
+# Brain/Core/_response_cache.py
+
+import os
+import re
+import math
+import threading
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from Brain.Memory.Cache import get_cache
+from Brain.Core.SingleFlight import fingerprint
+
+_ESPACOS = re.compile(r"\s+")
+_PALAVRAS = re.compile(r"\w+", re.UNICODE)
+
+# Perguntas sobre o próprio usuário ou que retomam a conversa ("e ele?", "lembra disso?")
+# dependem do histórico/memória de quem pergunta; a resposta de outro não serve.
+_DEPENDENTES = frozenset(
+    {
+        # pessoais
+        "eu", "meu", "minha", "meus", "minhas", "me", "mim", "comigo",
+        "nosso", "nossa", "nossos", "nossas", "lembra", "lembras", "lembrar",
+        # anafóricas
+        "ele", "ela", "eles", "elas", "dele", "dela", "deles", "delas",
+        "isso", "isto", "aquilo", "disso", "disto", "nisso", "daquilo",
+        "esse", "essa", "esses", "essas", "desse", "dessa", "nesse", "nessa",
+        "tambem", "mesmo", "mesma", "anterior", "antes", "acima", "entao", "outro", "outra",
+    }
+)
+
+# A resposta vem do "Data Atual" do prompt: guardada por horas, diria a hora ou o dia errado
+_TEMPORAIS = frozenset(
+    {
+        "hoje", "agora", "amanha", "ontem", "hora", "horas", "horario", "data", "dia",
+        "semana", "mes", "ano", "atual", "atualmente", "ultimo", "ultima", "recente",
+    }
+)
+
+
+def _sem_acentos(texto: str) -> str:
+    texto = unicodedata.normalize("NFKD", texto.casefold())
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+
+def normalize_query(texto: str) -> str:
+    """Espaços colapsados e sem pontuação final: "Quem é você??" ≈ "quem é você"."""
+    return _ESPACOS.sub(" ", texto or "").strip().rstrip("?!.… ")
+
+
+def _unitario(vetor: List[float]) -> Optional[Tuple[float, ...]]:
+    norma = math.sqrt(sum(x * x for x in vetor))
+    if not norma:
+        # Vetor de zeros = o embedding falhou; não dá para comparar
+        return None
+    return tuple(x / norma for x in vetor)
+
+
+@dataclass
+class CachedReply:
+    persona: str
+    escopo: str
+    texto: str
+    vetor: Tuple[float, ...]
+    assinatura: Optional[str]
+    tokens: int
+    com_ferramentas: bool
+
+
+class ResponseCache:
+    """
+    Respostas já geradas, reaproveitadas para perguntas quase iguais da mesma persona
+    no mesmo `escopo` (o canal: o histórico recente dele entrou no prompt). A busca
+    tenta primeiro o texto normalizado exato (sem embedding) e depois a similaridade
+    de cosseno com o vetor da pergunta, acima de `threshold`.
+
+    `assinatura` resume as ferramentas que o router local escolheria para a pergunta:
+    "qual o clima em SP" e "qual o clima no RJ" ficam próximos no espaço vetorial, mas
+    só se casam se pedirem a mesma ferramenta com o mesmo argumento. Sem assinatura
+    (router na dúvida) só vale o acerto exato. Respostas com dados de ferramentas
+    vencem em `tool_ttl`; as restantes em `ttl`. O LRU fica a cargo do `BoundedCache`.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        threshold: float = 0.92,
+        ttl: float = 6 * 3600,
+        tool_ttl: float = 600,
+        max_chars: int = 160,
+    ):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.tool_ttl = tool_ttl
+        self.max_chars = max_chars
+        self._cache = get_cache("pipeline.respostas", max_entries=max_entries)
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+        self.semantic_hits = 0
+        self.saved_tokens = 0
+        self.bypasses: Counter = Counter()
+
+    # --- ELEGIBILIDADE ---
+    def bypass_reason(self, texto: str, anexos: bool = False, resposta_a: bool = False) -> Optional[str]:
+        """Motivo para não usar o cache nesta mensagem (None = pode usar)."""
+        texto = normalize_query(texto)
+        if not texto:
+            return "vazia"
+        if anexos:
+            return "anexos"
+        if resposta_a:
+            return "historico"
+        if len(texto) > self.max_chars:
+            return "longa"
+        palavras = _PALAVRAS.findall(_sem_acentos(texto))
+        if any(p in _DEPENDENTES for p in palavras):
+            return "historico"
+        if any(p in _TEMPORAIS for p in palavras):
+            return "tempo"
+        return None
+
+    def record_bypass(self, motivo: str):
+        with self._lock:
+            self.bypasses[motivo] += 1
+
+    # --- BUSCA ---
+    @staticmethod
+    def _chave(persona: str, escopo: str, texto: str) -> Tuple[str, str, Optional[str]]:
+        return (persona, escopo, fingerprint(normalize_query(texto), casefold=True))
+
+    async def lookup(
+        self,
+        persona: str,
+        escopo: str,
+        texto: str,
+        assinatura: Optional[str],
+        embed: Callable[[str], Awaitable[List[float]]],
+    ) -> Tuple[Optional[CachedReply], Optional[Tuple[float, ...]]]:
+        """
+        Devolve (resposta em cache ou None, vetor unitário da pergunta). O vetor volta
+        para ser reaproveitado em `store`; no acerto exato não chega a ser calculado.
+        """
+        with self._lock:
+            self.lookups += 1
+
+        exata = self._cache.get(self._chave(persona, escopo, texto))
+        if exata is not None:
+            return exata, None
+
+        vetor = _unitario(await embed(normalize_query(texto)))
+        if vetor is None or assinatura is None:
+            return None, vetor
+
+        melhor, melhor_chave, melhor_sim = None, None, self.threshold
+        for chave, entrada in self._cache.items():
+            if (
+                entrada.persona != persona
+                or entrada.escopo != escopo
+                or entrada.assinatura != assinatura
+            ):
+                continue
+            sim = sum(a * b for a, b in zip(vetor, entrada.vetor))
+            if sim >= melhor_sim:
+                melhor, melhor_chave, melhor_sim = entrada, chave, sim
+        if melhor is not None:
+            # Conta o acerto e renova a posição no LRU
+            self._cache.get(melhor_chave)
+        return melhor, vetor
+
+    def hit(self, entrada: CachedReply, semantico: bool):
+        """A resposta em cache foi enviada: uma chamada ao LLM a menos."""
+        with self._lock:
+            self.hits += 1
+            self.semantic_hits += semantico
+            self.saved_tokens += entrada.tokens
+
+    # --- ESCRITA ---
+    def store(
+        self,
+        persona: str,
+        escopo: str,
+        texto: str,
+        resposta: str,
+        vetor: Optional[Tuple[float, ...]],
+        assinatura: Optional[str],
+        tokens: int,
+        com_ferramentas: bool,
+    ):
+        if vetor is None or not resposta:
+            return
+        entrada = CachedReply(persona, escopo, resposta, vetor, assinatura, tokens, com_ferramentas)
+        self._cache.set(
+            self._chave(persona, escopo, texto),
+            entrada,
+            ttl=self.tool_ttl if com_ferramentas else self.ttl,
+        )
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "semantic_hits": self.semantic_hits,
+                "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+                "saved_tokens": self.saved_tokens,
+                "bypasses": dict(self.bypasses),
+                "entries": len(self._cache),
+            }
+
+
+response_cache = ResponseCache(
+    max_entries=int(os.getenv("RESPONSE_CACHE_MAX", "256")),
+    threshold=float(os.getenv("RESPONSE_CACHE_SIMILARITY", "0.92")),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", str(6 * 3600))),
+    tool_ttl=float(os.getenv("RESPONSE_CACHE_TOOL_TTL", "600")),
+    max_chars=int(os.getenv("RESPONSE_CACHE_MAX_CHARS", "160")),
+)
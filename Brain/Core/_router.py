@@ -0,0 +1,356 @@
+# Brain/Core/_router.py
+
+import os
+import re
+import logging
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from rapidfuzz import process, fuzz
+
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+try:
+    import joblib
+
+    JOBLIB_AVAILABLE = True
+except ImportError:
+    JOBLIB_AVAILABLE = False
+
+logger = logging.getLogger("SamBot.Router")
+
+# Intenções sem ferramenta que competem com as rotas ("quanto é 2+2" não é preço de jogo)
+SEM_FERRAMENTA = "__nenhuma__"
+
+_PONTUACAO = re.compile(r"[^\w\s+\-']", re.UNICODE)
+_ESPACOS = re.compile(r"\s+")
+
+
+@dataclass
+class RouteDecision:
+    """Resultado do roteamento. `actions` vazio = nenhuma ferramenta; `tier` diz quem decidiu."""
+
+    tier: str
+    actions: List[Dict[str, Any]] = field(default_factory=list)
+    confidence: float = 0.0
+
+
+@dataclass
+class _Route:
+    name: str
+    patterns: List[Tuple[re.Pattern, float]]  # (padrão, confiança)
+    stopwords: frozenset
+    ambiguous: frozenset
+    requires_arg: bool
+    default_arg: str
+    extra: Dict[str, Any]
+
+
+def _normalizar(texto: str) -> str:
+    texto = _PONTUACAO.sub(" ", texto.lower())
+    return _ESPACOS.sub(" ", texto).strip()
+
+
+class ToolRouter:
+    """
+    Decide localmente que ferramentas uma mensagem precisa, por camadas:
+
+    1. `regex`: padrões com o slot `(?P<arg>...)` (ex.: "clima em <cidade>").
+    2. `fuzzy`: gatilhos de cada rota (os da intenção em `nlp_data.json` + os da rota)
+       pontuados de uma vez com RapidFuzz; intenções sem ferramenta também competem.
+    3. `classificador`: modelo local opcional (`ROUTER_CLASSIFIER_PATH`, joblib com
+       `predict_proba`), consultado só quando o fuzzy fica na zona cinzenta.
+
+    Quando nada disso tem confiança suficiente, `route()` devolve None e o chamador
+    usa o roteador por LLM. A configuração vem de `nlp_data["tool_routes"]`; os
+    gatilhos em `fuzzy_exclude` de uma rota (prefixos genéricos como "o que é") não
+    entram no fuzzy e ficam só para os padrões regex, que exigem o argumento.
+
+    Um padrão pode vir como `{"regex": ..., "confidence": 70}`. Abaixo de `accept`
+    (ou com uma das `ambiguous_words` da rota no argumento: comparativos, pronomes),
+    o regex não decide sozinho: `route()` devolve None e quem escolhe é o LLM.
+    """
+
+    def __init__(
+        self,
+        nlp_config: Dict[str, Any],
+        accept: float = 88,
+        reject: float = 60,
+        margin: float = 8,
+        classifier_min: float = 0.75,
+        classifier=None,
+        min_arg_chars: int = 3,
+    ):
+        self.accept = accept
+        self.reject = reject
+        self.margin = margin
+        self.classifier_min = classifier_min
+        self.min_arg_chars = min_arg_chars
+        self.classifier = classifier
+
+        intents = nlp_config.get("intents", {})
+        comuns = [_normalizar(s) for s in nlp_config.get("common_stopwords", [])]
+        self.common_stopwords = frozenset(s for s in comuns if s)
+
+        self.routes: Dict[str, _Route] = {}
+        self._choices: List[str] = []
+        self._owners: List[Tuple[str, str]] = []  # (rota, gatilho original)
+        rotas_de_intencao = set()
+
+        for name, cfg in nlp_config.get("tool_routes", {}).items():
+            intent = intents.get(cfg.get("intent"), {})
+            if cfg.get("intent"):
+                rotas_de_intencao.add(cfg["intent"])
+            stopwords = set(intent.get("stopwords", [])) | set(cfg.get("stopwords", []))
+            self.routes[name] = _Route(
+                name=name,
+                patterns=[self._padrao(p) for p in cfg.get("patterns", [])],
+                stopwords=frozenset(_normalizar(s) for s in stopwords),
+                ambiguous=frozenset(_normalizar(s) for s in cfg.get("ambiguous_words", [])),
+                requires_arg=cfg.get("requires_arg", True),
+                default_arg=cfg.get("default_arg", ""),
+                extra={
+                    chave: self._sub_acao(regra, intent)
+                    for chave, regra in cfg.get("extra", {}).items()
+                },
+            )
+            excluidos = {_normalizar(g) for g in cfg.get("fuzzy_exclude", [])}
+            for gatilho in list(intent.get("triggers", [])) + list(cfg.get("triggers", [])):
+                if _normalizar(gatilho) not in excluidos:
+                    self._add_choice(name, gatilho)
+
+        # Intenções que não levam a ferramenta nenhuma entram como concorrentes
+        for intent_name, data in intents.items():
+            if intent_name in rotas_de_intencao:
+                continue
+            for gatilho in data.get("triggers", []):
+                self._add_choice(SEM_FERRAMENTA, gatilho)
+
+        self.counters: Counter = Counter()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _padrao(cfg) -> Tuple[re.Pattern, float]:
+        if isinstance(cfg, dict):
+            return re.compile(cfg["regex"], re.IGNORECASE), float(cfg.get("confidence", 100))
+        return re.compile(cfg, re.IGNORECASE), 100.0
+
+    @staticmethod
+    def _sub_acao(regra: Dict[str, Any], intent: Dict[str, Any]) -> Dict[str, Any]:
+        # `triggers_from` reaproveita uma lista da intenção (ex.: item_triggers)
+        gatilhos = list(regra.get("triggers", [])) + list(intent.get(regra.get("triggers_from"), []))
+        resolvida = dict(regra)
+        resolvida["triggers"] = [g for g in (_normalizar(g) for g in gatilhos) if g]
+        return resolvida
+
+    def _add_choice(self, route: str, gatilho: str):
+        normalizado = _normalizar(gatilho)
+        if normalizado:
+            self._choices.append(normalizado)
+            self._owners.append((route, normalizado))
+
+    # --- API ---
+    def route(self, content: str, count: bool = True) -> Optional[RouteDecision]:
+        """Decisão local (None = sem certeza). `count=False` só espia, sem mexer nas métricas."""
+        texto = _normalizar(content)
+        if not texto:
+            decisao = RouteDecision("fuzzy")
+            return self._count(decisao) if count else decisao
+
+        decisao = self._por_regex(texto)
+        if decisao is not None and decisao.confidence < self.accept:
+            # O padrão casou mas a frase é ambígua ("o que é melhor, x ou y"): decide o LLM
+            return None
+        if decisao is None:
+            decisao = self._por_fuzzy(texto)
+        if decisao is None and self.classifier is not None:
+            decisao = self._por_classificador(texto)
+        if decisao is None or not count:
+            return decisao
+        return self._count(decisao)
+
+    def count_llm(self, actions: List[Dict[str, Any]]):
+        """O chamador caiu no roteador por LLM; contabiliza o resultado."""
+        self._count(RouteDecision("llm", actions))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            tiers = {k: v for k, v in self.counters.items() if not k.startswith("_")}
+            return {
+                "total": sum(tiers.values()),
+                "tiers": tiers,
+                "sem_ferramenta": self.counters["_sem_ferramenta"],
+                "regras": len(self.routes),
+                "gatilhos": len(self._choices),
+                "classificador": self.classifier is not None,
+            }
+
+    def _count(self, decisao: RouteDecision) -> RouteDecision:
+        with self._lock:
+            self.counters[decisao.tier] += 1
+            if not decisao.actions:
+                self.counters["_sem_ferramenta"] += 1
+        return decisao
+
+    # --- CAMADA 1: REGEX ---
+    def _por_regex(self, texto: str) -> Optional[RouteDecision]:
+        for route in self.routes.values():
+            for pattern, confianca in route.patterns:
+                match = pattern.search(texto)
+                if not match:
+                    continue
+                bruto = match.groupdict().get("arg") or ""
+                arg = self._aparar(bruto)
+                if not self._arg_util(route, arg, 1):
+                    if route.requires_arg:
+                        continue
+                    arg = ""
+                if route.ambiguous and any(p in route.ambiguous for p in bruto.split()):
+                    confianca = min(confianca, self.reject)
+                return RouteDecision(
+                    "regex", [self._action(route, arg or route.default_arg, texto)], confianca
+                )
+        return None
+
+    # --- CAMADA 2: FUZZY ---
+    def _pontuar(self, texto: str) -> Dict[str, Tuple[float, int, List[str]]]:
+        """{rota: (melhor score, nº de gatilhos acima do aceite, gatilhos casados)}."""
+        if not RAPIDFUZZ_AVAILABLE or not self._choices:
+            return {}
+        resultados = process.extract(
+            texto,
+            self._choices,
+            scorer=fuzz.token_set_ratio,
+            limit=None,
+            score_cutoff=self.reject,
+        )
+        por_rota: Dict[str, Tuple[float, int, List[str]]] = {}
+        for _, score, idx in resultados:
+            rota, gatilho = self._owners[idx]
+            melhor, hits, casados = por_rota.get(rota, (0.0, 0, []))
+            if score >= self.accept:
+                hits += 1
+                casados = casados + [gatilho]
+            por_rota[rota] = (max(melhor, score), hits, casados)
+        return por_rota
+
+    def _por_fuzzy(self, texto: str) -> Optional[RouteDecision]:
+        por_rota = self._pontuar(texto)
+        if not RAPIDFUZZ_AVAILABLE:
+            return None
+        if not por_rota:
+            # Nenhum gatilho passou do mínimo: papo furado, dispensa o LLM
+            return RouteDecision("fuzzy")
+
+        # Cada gatilho extra casado reforça a rota (desempate entre rotas com 100)
+        ranking = sorted(
+            ((min(100.0, s + 2 * max(0, h - 1)), rota, casados) for rota, (s, h, casados) in por_rota.items()),
+            reverse=True,
+        )
+        score, rota, casados = ranking[0]
+        segundo = ranking[1][0] if len(ranking) > 1 else 0.0
+
+        if score < self.accept or score - segundo < self.margin:
+            return None
+        if rota == SEM_FERRAMENTA:
+            return RouteDecision("fuzzy", confidence=score)
+
+        # Uma única palavra solta ("servidor", "status") é pouco para chamar uma API
+        if len(casados) < 2 and not any(" " in g for g in casados):
+            return None
+        route = self.routes[rota]
+        arg = self.extract_arg(rota, texto, casados)
+        # O resto da frase tem de ter conteúdo ("sabe o que é isso" não vira uma busca por "isso")
+        if not self._arg_util(route, arg, self.min_arg_chars):
+            if route.requires_arg:
+                return None
+            arg = ""
+        arg = arg or route.default_arg
+        return RouteDecision("fuzzy", [self._action(route, arg, texto)], score)
+
+    # --- CAMADA 3: CLASSIFICADOR ---
+    def _por_classificador(self, texto: str) -> Optional[RouteDecision]:
+        try:
+            probs = self.classifier.predict_proba([texto])[0]
+        except Exception as e:
+            logger.warning(f"⚠️ Classificador de rotas falhou: {e}")
+            return None
+        melhor = max(range(len(probs)), key=lambda i: probs[i])
+        confianca = float(probs[melhor])
+        rota = str(self.classifier.classes_[melhor])
+        if confianca < self.classifier_min:
+            return None
+        if rota not in self.routes:
+            return RouteDecision("classificador", confidence=confianca * 100)
+
+        route = self.routes[rota]
+        arg = self.extract_arg(rota, texto, []) or route.default_arg
+        if not arg and route.requires_arg:
+            return None
+        return RouteDecision("classificador", [self._action(route, arg, texto)], confianca * 100)
+
+    # --- SLOTS ---
+    def extract_arg(self, rota: str, texto: str, casados: List[str]) -> str:
+        """O argumento é o que sobra da frase sem os gatilhos casados e as stopwords."""
+        route = self.routes[rota]
+        for gatilho in sorted(casados, key=len, reverse=True):
+            texto = re.sub(rf"\b{re.escape(gatilho)}\b", " ", texto)
+        palavras = [
+            p
+            for p in texto.split()
+            if p not in self.common_stopwords and p not in route.stopwords
+        ]
+        return " ".join(palavras)
+
+    def _arg_util(self, route: _Route, arg: str, min_chars: int) -> bool:
+        """Há no argumento alguma palavra de conteúdo (fora das stopwords, com `min_chars`+ letras)?"""
+        return any(
+            len(p) >= min_chars and p not in self.common_stopwords and p not in route.stopwords
+            for p in arg.split()
+        )
+
+    def _aparar(self, arg: str) -> str:
+        """Tira stopwords das pontas do slot ("o gta v" → "gta v")."""
+        palavras = arg.split()
+        while palavras and palavras[0] in self.common_stopwords:
+            palavras.pop(0)
+        while palavras and palavras[-1] in self.common_stopwords:
+            palavras.pop()
+        return " ".join(palavras)
+
+    def _action(self, route: _Route, arg: str, texto: str) -> Dict[str, Any]:
+        action = {"tool": route.name, "args": arg}
+        # Sub-ação por palavra-chave (ex.: pokemon → buscar_item quando fala de itens)
+        for chave, regra in route.extra.items():
+            if any(re.search(rf"\b{re.escape(g)}\b", texto) for g in regra["triggers"]):
+                action[chave] = regra.get("value")
+            elif "default" in regra:
+                action[chave] = regra["default"]
+        return action
+
+
+def load_classifier(path: Optional[str]):
+    """Carrega o classificador opcional; sem joblib ou sem ficheiro, a camada fica desligada."""
+    if not path:
+        return None
+    if not JOBLIB_AVAILABLE:
+        logger.warning("⚠️ ROUTER_CLASSIFIER_PATH definido mas 'joblib' não está instalado.")
+        return None
+    if not os.path.exists(path):
+        logger.warning(f"⚠️ Classificador de rotas não encontrado em {path}.")
+        return None
+    try:
+        modelo = joblib.load(path)
+        if not hasattr(modelo, "predict_proba") or not hasattr(modelo, "classes_"):
+            logger.warning("⚠️ O classificador de rotas precisa de predict_proba e classes_.")
+            return None
+        logger.info(f"🧭 Classificador de rotas carregado: {path}")
+        return modelo
+    except Exception as e:
+        logger.error(f"❌ Falha ao carregar o classificador de rotas: {e}")
+        return None
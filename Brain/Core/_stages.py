@@ -0,0 +1,132 @@
+# Brain/Core/_stages.py
+
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from .Tracing import tracer
+
+logger = logging.getLogger("SamBot.Pipeline.Stages")
+
+# Tarefas que passaram do tempo mas foram deixadas a terminar (ex.: gravação de memória)
+_background: Set[asyncio.Task] = set()
+
+
+@dataclass
+class Stage:
+    """
+    Um passo da preparação do prompt. `run` recebe os resultados dos estágios de
+    que depende (`depends_on`). Se estourar `timeout` ou falhar, o estágio devolve
+    `fallback` e o prompt é montado sem ele. Com `detach_on_timeout`, a tarefa
+    continua em segundo plano depois do timeout (útil para efeitos colaterais).
+    """
+
+    name: str
+    run: Callable[..., Awaitable[Any]]
+    timeout: Optional[float] = None
+    fallback: Any = None
+    depends_on: Tuple[str, ...] = ()
+    detach_on_timeout: bool = False
+
+
+@dataclass
+class StageResult:
+    name: str
+    value: Any
+    status: str = "ok"  # ok | timeout | error
+    elapsed: float = 0.0
+    error: Optional[str] = field(default=None, repr=False)
+
+
+class StageGraph:
+    """
+    Executa estágios independentes em simultâneo (TaskGroup) e respeita as
+    dependências declaradas. O tempo total passa a ser o do caminho mais lento,
+    não a soma de todos. Cada estágio vira um span `<trace_prefix>.<nome>`.
+    """
+
+    def __init__(self, stages: Iterable[Stage], trace_prefix: str = "pipeline"):
+        self.trace_prefix = trace_prefix
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Estágio duplicado: {stage.name}")
+            self.stages[stage.name] = stage
+        for stage in self.stages.values():
+            for dep in stage.depends_on:
+                if dep not in self.stages:
+                    raise ValueError(f"Estágio '{stage.name}' depende de '{dep}', que não existe")
+
+    async def run(self) -> Dict[str, StageResult]:
+        tasks: Dict[str, asyncio.Task] = {}
+        async with asyncio.TaskGroup() as group:
+            # A ordem de declaração basta: cada estágio só espera tarefas já criadas
+            for stage in self._ordered():
+                deps = {dep: tasks[dep] for dep in stage.depends_on}
+                tasks[stage.name] = group.create_task(
+                    self._run_stage(stage, deps), name=f"stage:{stage.name}"
+                )
+        return {name: task.result() for name, task in tasks.items()}
+
+    def _ordered(self):
+        feitos, ordem = set(), []
+        pendentes = list(self.stages.values())
+        while pendentes:
+            prontos = [s for s in pendentes if set(s.depends_on) <= feitos]
+            if not prontos:
+                ciclo = ", ".join(s.name for s in pendentes)
+                raise ValueError(f"Dependência circular entre estágios: {ciclo}")
+            for stage in prontos:
+                ordem.append(stage)
+                feitos.add(stage.name)
+                pendentes.remove(stage)
+        return ordem
+
+    async def _run_stage(self, stage: Stage, deps: Dict[str, asyncio.Task]) -> StageResult:
+        inputs = {}
+        for name, task in deps.items():
+            inputs[name] = (await task).value
+
+        with tracer.span(f"{self.trace_prefix}.{stage.name}") as span:
+            resultado = await self._execute(stage, inputs)
+            span.status = resultado.status
+        return resultado
+
+    async def _execute(self, stage: Stage, inputs: Dict[str, Any]) -> StageResult:
+        inicio = time.perf_counter()
+        task = asyncio.ensure_future(stage.run(**inputs))
+        try:
+            if stage.detach_on_timeout:
+                value = await asyncio.wait_for(asyncio.shield(task), stage.timeout)
+            else:
+                value = await asyncio.wait_for(task, stage.timeout)
+            return StageResult(stage.name, value, "ok", time.perf_counter() - inicio)
+        except asyncio.TimeoutError:
+            if stage.detach_on_timeout and not task.done():
+                _background.add(task)
+                task.add_done_callback(_finish_background)
+            logger.warning(
+                f"⏳ Estágio '{stage.name}' excedeu {stage.timeout:g}s. Seguindo sem ele."
+            )
+            return StageResult(stage.name, stage.fallback, "timeout", time.perf_counter() - inicio)
+        except Exception as e:
+            logger.warning(f"⚠️ Estágio '{stage.name}' falhou: {e}. Seguindo sem ele.")
+            return StageResult(
+                stage.name, stage.fallback, "error", time.perf_counter() - inicio, str(e)
+            )
+
+
+def _finish_background(task: asyncio.Task):
+    _background.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"⚠️ Estágio em segundo plano terminou com erro: {task.exception()}")
+
+
+def format_timings(results: Dict[str, StageResult]) -> str:
+    partes = []
+    for r in results.values():
+        marca = "" if r.status == "ok" else f" ({r.status})"
+        partes.append(f"{r.name} {r.elapsed:.2f}s{marca}")
+    return ", ".join(partes)
@@ -0,0 +1,126 @@
+# Brain/Core/_streaming.py
+
+import time
+import logging
+from typing import Callable, Optional
+
+import discord
+
+from .Tracing import tracer
+
+logger = logging.getLogger("SamBot.Pipeline.Streaming")
+
+# Margem abaixo dos 2000 caracteres do Discord
+DISCORD_LIMIT = 1900
+
+
+def ponto_de_corte(texto: str, limite: int = DISCORD_LIMIT) -> int:
+    """Onde partir um bloco grande: quebra de linha, fim de frase, espaço ou o próprio limite."""
+    idx = texto[:limite].rfind("\n")
+    if idx == -1:
+        idx = texto[:limite].rfind(". ")
+        if idx != -1:
+            idx += 1  # o ponto fica no bloco de cima
+    if idx == -1:
+        idx = texto[:limite].rfind(" ")
+    if idx <= 0:
+        idx = limite
+    return idx
+
+
+class StreamingReply:
+    """
+    Mostra a resposta enquanto ela é gerada. A primeira parte sai como reply assim
+    que há texto, e essa mensagem é editada no máximo a cada `interval` segundos.
+    Passando de `limit` caracteres, a mensagem é fechada num ponto natural e o resto
+    continua numa nova. O tempo até o primeiro texto visível vai para o span
+    `discord.primeiro_token`.
+    """
+
+    def __init__(
+        self,
+        message: discord.Message,
+        on_sent: Callable[[discord.Message, bool], None],
+        started_at: float,
+        interval: float = 1.0,
+        limit: int = DISCORD_LIMIT,
+    ):
+        self.message = message
+        self.on_sent = on_sent  # on_sent(mensagem, editada)
+        self.started_at = started_at  # time.perf_counter() do início do processamento
+        self.interval = interval
+        self.limit = limit
+
+        self.texto = ""  # resposta completa até agora
+        self.ttft_ms: Optional[float] = None
+        self._atual = ""  # texto da mensagem do Discord em curso
+        self._mostrado = ""  # o que já está na tela
+        self._enviada: Optional[discord.Message] = None
+        self._primeira = True
+        self._ultima_edicao = 0.0
+
+    async def feed(self, pedaco: str):
+        self.texto += pedaco
+        self._atual += pedaco
+        rolou = await self._rolar()
+        if rolou and time.perf_counter() - self._ultima_edicao >= self.interval:
+            await self._mostrar()
+
+    async def finish(self, sufixo: str = ""):
+        if sufixo:
+            self.texto += sufixo
+            self._atual += sufixo
+        if await self._rolar():
+            await self._mostrar()
+        else:
+            logger.warning(
+                f"⚠️ {len(self._atual)} caracteres da resposta ficaram por enviar."
+            )
+        self._fechar()
+
+    async def _rolar(self) -> bool:
+        """Fecha os blocos acima do limite. False se um envio falhou (o texto fica em `_atual`)."""
+        while len(self._atual) > self.limit:
+            corte = ponto_de_corte(self._atual, self.limit)
+            cabeca, resto = self._atual[:corte], self._atual[corte:].lstrip()
+            if not await self._mostrar(cabeca):
+                # Nada se perde: o próximo pedaço (ou o finish) tenta de novo
+                return False
+            self._fechar()
+            self._atual = resto
+        return True
+
+    def _fechar(self):
+        if self._enviada is not None:
+            self.on_sent(self._enviada, True)
+        self._enviada = None
+        self._mostrado = ""
+
+    async def _mostrar(self, texto: Optional[str] = None) -> bool:
+        """Põe `texto` (por omissão, o bloco em curso) na tela. False se o Discord recusou."""
+        conteudo = (self._atual if texto is None else texto).strip()
+        if not conteudo or conteudo == self._mostrado:
+            return True
+        try:
+            if self._enviada is None:
+                with tracer.span("discord.envio"):
+                    if self._primeira:
+                        self._enviada = await self.message.reply(conteudo, mention_author=False)
+                    else:
+                        self._enviada = await self.message.channel.send(conteudo)
+                self._primeira = False
+                self.on_sent(self._enviada, False)
+                if self.ttft_ms is None:
+                    self.ttft_ms = (time.perf_counter() - self.started_at) * 1000
+                    tracer.record("discord.primeiro_token", self.ttft_ms)
+            else:
+                with tracer.span("discord.edicao"):
+                    editada = await self._enviada.edit(content=conteudo)
+                self._enviada = editada or self._enviada
+            self._mostrado = conteudo
+            return True
+        except discord.HTTPException as e:
+            logger.warning(f"⚠️ Falha ao atualizar a resposta em streaming: {e}")
+            return False
+        finally:
+            self._ultima_edicao = time.perf_counter()
@@ -0,0 +1,50 @@
+# Brain/Memory/Cache/Manager.py
+
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from ._lru import BoundedCache
+
+
+class CacheManager:
+    """
+    Registro central de caches nomeados. Cada módulo pede o seu pelo nome e
+    recebe sempre a mesma instância, então os limites e as métricas ficam num
+    único lugar (comando `caches` do Developer).
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger("SamBot.Cache")
+        self._lock = threading.Lock()
+        self._caches: Dict[str, BoundedCache] = {}
+
+    def get_cache(
+        self,
+        name: str,
+        max_entries: Optional[int] = 1024,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ) -> BoundedCache:
+        with self._lock:
+            cache = self._caches.get(name)
+            if cache is None:
+                cache = BoundedCache(
+                    name, max_entries=max_entries, max_bytes=max_bytes, ttl=ttl
+                )
+                self._caches[name] = cache
+            return cache
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            caches = list(self._caches.items())
+        return {name: cache.stats() for name, cache in sorted(caches)}
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            caches = list(self._caches.values())
+        return sum(cache.purge_expired() for cache in caches)
+
+
+cache_manager = CacheManager()
+get_cache = cache_manager.get_cache
@@ -0,0 +1,3 @@
+# Brain/Memory/Cache/__init__.py
+from .Manager import cache_manager, get_cache, CacheManager
+from ._lru import BoundedCache, approx_size
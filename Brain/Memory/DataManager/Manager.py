@@ -1,6 +1,7 @@
 # Brain/Memory/DataManager/Manager.py
 
 import os
+import atexit
 import logging
 from pathlib import Path
 from typing import Dict, List, Any
@@ -9,9 +10,19 @@ from dotenv import load_dotenv
 
 from ._json_provider import JsonIO
 from ._cache import DataCache
+from ._write_behind import WriteBehindStore
+from ._sqlite_provider import SqliteIO, migrate_json_to_sqlite
+from ._transaction import UserLockRegistry, UserTransaction
+from ._guild_config import GuildConfigService
+from ._async_facade import AsyncDataManager
+from ._user_store import UserStore, merge_legacy_xp
+from ._watcher import FileWatcher
 
 load_dotenv()
 
+# Ficheiros de conhecimento mantidos em RAM e recarregados quando editados no disco
+HOT_RELOAD_KNOWLEDGE = ("nlp_data", "expressoes_data", "jobs", "shop", "atividades")
+
 
 # --- 1. O CONTRATO (INTERFACE UNIVERSAL) ---
 class DatabaseProvider(ABC):
@@ -39,6 +50,10 @@ class DatabaseProvider(ABC):
     def set_user_data(self, user_id: str, key: str, value: Any):
         pass
 
+    def flush(self):
+        """Grava escritas pendentes. Provedores sem buffer não precisam sobrescrever."""
+        pass
+
 
 # --- 2. ORQUESTRADOR JSON ---
 class JsonProvider(DatabaseProvider):
@@ -55,7 +70,8 @@ class JsonProvider(DatabaseProvider):
 
         # Ajuste de rota: Agora estamos dentro de Brain/Memory/DataManager
         self.base_dir = Path(__file__).resolve().parent.parent
-        self.root = self.base_dir.parent.parent / "Data"
+        # DATA_ROOT permite apontar para outra pasta (ex.: benchmarks em diretório temporário)
+        self.root = Path(os.getenv("DATA_ROOT") or self.base_dir.parent.parent / "Data")
 
         self.folders = {
             "config": self.root / "Config",
@@ -68,11 +84,77 @@ class JsonProvider(DatabaseProvider):
         for folder in self.folders.values():
             folder.mkdir(parents=True, exist_ok=True)
 
+        self.users_path = self.folders["users"] / "users.json"
+        self.user_locks = UserLockRegistry()
+        self._init_storage()
+
+        # Registro unificado por usuário (economia + XP global e por servidor)
+        self.user_store = UserStore(
+            self._load_user_record, self._commit_user_record, self._all_user_records
+        )
+
+        # Snapshot tipado do guild_configs (lido do disco uma única vez)
+        self.guild_configs = GuildConfigService(
+            load=lambda: self._read_knowledge("guild_configs"),
+            save=lambda data: self._write_knowledge("guild_configs", data),
+            # A gravação agendada pelos painéis corre na thread de disco, fora do loop
+            submit=lambda fn: self.aio.call(fn),
+        )
+        atexit.register(self.guild_configs.flush)
+
+        self._init_watcher()
+
+        # Fachada assíncrona: o disco fica numa única thread de escrita, fora do event loop.
+        # Registrada por último no atexit para esvaziar a fila antes dos flushes acima.
+        self.aio = AsyncDataManager(
+            self, max_pending=int(os.getenv("DATA_QUEUE_SIZE", "256"))
+        )
+        atexit.register(self.aio.close)
+
+    def _init_watcher(self):
+        self.watcher = FileWatcher(
+            interval=float(os.getenv("DATA_WATCH_INTERVAL", "2"))
+        )
+        for name in HOT_RELOAD_KNOWLEDGE:
+            self.watcher.watch(
+                name,
+                self.folders["knowledge"] / f"{name}.json",
+                load=self.io.read_strict,
+                initial=lambda name=name: self._read_knowledge(name),
+            )
+        self.watcher.add_listener(self._on_knowledge_file_changed)
+        self.watcher.watch_dir(self.folders["prompts"], "*.txt", self._on_prompt_changed)
+        atexit.register(self.watcher.close)
+
+    def _on_knowledge_file_changed(self, name: str, data: Any):
+        """Neste provedor o ficheiro já é a fonte da verdade; nada a propagar."""
+        pass
+
+    def _on_prompt_changed(self, path: Path):
+        self.cache.prompts.pop(path.name)
+        self.logger.info(f"♻️ Hot-reload: prompt {path.name} será relido.")
+
+    def _init_storage(self):
+        # Documento de usuários em RAM com escrita adiada
+        self.users = WriteBehindStore(
+            self.io,
+            self.users_path,
+            flush_interval=float(os.getenv("DATA_FLUSH_INTERVAL", "5")),
+            max_dirty=int(os.getenv("DATA_FLUSH_MAX_DIRTY", "50")),
+        )
+        atexit.register(self.users.close)
+
     # --- ATALHOS DE COMPATIBILIDADE (Para NightCycle.py) ---
     def _io_read_json(self, path: Path, default_type: Any = dict) -> Any:
+        if Path(path) == self.users_path:
+            return self.users.snapshot()
         return self.io.read(path, default_type)
 
     def _io_save_json(self, path: Path, data: Any):
+        if Path(path) == self.users_path:
+            self.users.replace(data)
+            self.user_store.invalidate()
+            return
         self.io.save(path, data)
 
     # --- IDENTIDADE E CONFIGURAÇÃO ---
@@ -119,51 +201,106 @@ class JsonProvider(DatabaseProvider):
 
     # --- CONHECIMENTO E NLP ---
     def get_knowledge(self, key: str) -> Any:
-        if key == "nlp_data" and self.cache.get("nlp"):
-            return self.cache.get("nlp")
-        if key == "expressoes_data" and self.cache.get("expressions"):
-            return self.cache.get("expressions")
+        name = key.replace(".json", "")
+        if name == "guild_configs":
+            return self.guild_configs.raw_copy()
+        if name in self.watcher:
+            # Versão em RAM, trocada pelo watcher quando o ficheiro é editado
+            return self.watcher.get(name)
+        return self._read_knowledge(name)
 
-        path = self.folders["knowledge"] / f"{key.replace('.json', '')}.json"
-        data = self.io.read(path)
+    def save_knowledge(self, key: str, data: Any):
+        name = key.replace(".json", "")
+        self._write_knowledge(name, data)
+        if name == "guild_configs":
+            self.guild_configs.replace(data)
+        if name in self.watcher:
+            self.watcher.update(name, data)
 
-        if "nlp" in key:
-            self.cache.set("nlp", data)
-        if "expressoes" in key:
-            self.cache.set("expressions", data)
-        return data
+    def _read_knowledge(self, name: str) -> Any:
+        return self.io.read(self.folders["knowledge"] / f"{name}.json")
 
-    def save_knowledge(self, key: str, data: Any):
-        path = self.folders["knowledge"] / f"{key.replace('.json', '')}.json"
-        self.io.save(path, data)
-        if "nlp" in key:
-            self.cache.set("nlp", data)
-        if "expressoes" in key:
-            self.cache.set("expressions", data)
+    def _write_knowledge(self, name: str, data: Any):
+        self.io.save(self.folders["knowledge"] / f"{name}.json", data)
 
     def get_expressions(self) -> Dict:
         return self.get_knowledge("expressoes_data")
 
     # --- SISTEMA DINÂMICO DE USUÁRIOS ---
     def get_user_data(self, user_id: str, key: str, default_value: Any = None) -> Any:
-        path = self.folders["users"] / "users.json"
-        data = self.io.read(path)
-        user_str = str(user_id)
-
-        if user_str not in data:
-            return default_value
-        return data[user_str].get(key, default_value)
+        return self.users.get(user_id, key, default_value)
 
     def set_user_data(self, user_id: str, key: str, value: Any):
-        path = self.folders["users"] / "users.json"
-        data = self.io.read(path)
-        user_str = str(user_id)
-
-        if user_str not in data:
-            data[user_str] = {}
-
-        data[user_str][key] = value
-        self.io.save(path, data)
+        self.users.set(user_id, key, value)
+        self.user_store.note_changes(user_id, {key: value})
+
+    def transaction(self, user_id: str) -> UserTransaction:
+        """
+        Acesso atómico ao registro de um usuário:
+
+            async with data_manager.transaction(user_id) as conta:
+                conta["carteira"] = conta.get("carteira", 0) - 10
+
+        Só comandos do mesmo usuário esperam uns pelos outros. A leitura e a
+        gravação correm na thread de disco da fachada assíncrona.
+        """
+        return UserTransaction(
+            user_id,
+            self.user_locks.get(user_id),
+            lambda uid: self.aio.call(self._load_user_record, uid),
+            lambda uid, changes: self.aio.call(self._commit_user_record, uid, changes),
+        )
+
+    def _load_user_record(self, user_id: str) -> Dict[str, Any]:
+        return self.users.get_record(user_id)
+
+    def _commit_user_record(self, user_id: str, changes: Dict[str, Any]):
+        self.users.update_record(user_id, changes)
+        self.user_store.note_changes(user_id, changes)
+
+    def _all_user_records(self) -> Dict[str, Dict[str, Any]]:
+        return self.users.snapshot()
+
+    # --- MIGRAÇÃO DO XP LEGADO (Knowledge/users.json) ---
+    def migrate_legacy_xp(self) -> int:
+        """
+        Funde o antigo Knowledge/users.json nos registros de usuário. Passo explícito
+        de arranque (Bot.setup_hook ou `python -m Brain.Memory.DataManager migrate`),
+        nunca na importação. Devolve quantos registros foram fundidos.
+        """
+        legacy = self._read_legacy_xp()
+        if not legacy:
+            return 0
+        total = merge_legacy_xp(
+            legacy, self._load_user_record, self._commit_user_record
+        )
+        self.user_store.invalidate()
+        if not self._retire_legacy_xp():
+            # A fusão fica pela maior: rodar de novo na próxima vez não duplica nada
+            self.logger.error(
+                "❌ Falha ao gravar a fusão do XP legado; Knowledge/users.json mantido."
+            )
+            return 0
+        self.logger.info(
+            f"🔀 XP do Knowledge/users.json unificado em {total} registros de usuário."
+        )
+        return total
+
+    def _read_legacy_xp(self) -> Dict[str, Any]:
+        path = self.folders["knowledge"] / "users.json"
+        return self.io.read(path) if path.exists() else {}
+
+    def _retire_legacy_xp(self) -> bool:
+        # Grava a fusão antes de tirar o ficheiro antigo do caminho (fica como backup)
+        if not self.users.flush() and self.users.dirty_count:
+            return False
+        path = self.folders["knowledge"] / "users.json"
+        path.replace(path.with_name("users.migrated.json"))
+        return True
+
+    def flush(self):
+        self.users.flush()
+        self.guild_configs.flush()
 
     # --- LEGADO ---
     def save_music_preference(self, user_id, genre_or_artist):
@@ -187,29 +324,116 @@ class JsonProvider(DatabaseProvider):
         if cached:
             return cached
 
-        path = self.folders["config"] / "channels.json"
-        if not path.exists():
-            path = self.folders["persistence"] / "channels.json"
-
-        data = self.io.read(path, default_type=dict)
+        data = self._read_channels()
         self.cache.set("channels", data)
         return data
 
     def save_active_channels(self, data: Dict):
         if not isinstance(data, dict):
             return
-        path = self.folders["config"] / "channels.json"
         self.cache.set("channels", data)
-        self.io.save(path, data)
+        self._write_channels(data)
+
+    def _read_channels(self) -> Dict:
+        path = self.folders["config"] / "channels.json"
+        if not path.exists():
+            path = self.folders["persistence"] / "channels.json"
+        return self.io.read(path, default_type=dict)
+
+    def _write_channels(self, data: Dict):
+        self.io.save(self.folders["config"] / "channels.json", data)
 
     def reload_all(self):
         self.cache.reset()
+        self.guild_configs.reload()
+        self.watcher.check()
         self.logger.info("♻️ DataManager: Cache limpo com sucesso.")
 
 
-db_type = os.getenv("DB_TYPE", "json")
+# --- 3. ORQUESTRADOR SQLITE ---
+class SqliteProvider(JsonProvider):
+    """
+    Gestor de Dados em SQLite (DB_TYPE=sqlite).
+    Usuários, conhecimento, guild_configs e canais vivem em tabelas indexadas
+    com upsert por chave; prompts e identidade continuam nos ficheiros de Data/.
+    """
+
+    def _init_storage(self):
+        db_path = os.getenv(
+            "SQLITE_PATH", str(self.folders["persistence"] / "sambot.db")
+        )
+        self.db = SqliteIO(Path(db_path))
+        migrate_json_to_sqlite(self.db, self.folders, self.io)
+        atexit.register(self.db.close)
+        self.logger.info(f"🗄️ DataManager em modo SQLite: {db_path}")
 
-if db_type == "json":
-    data_manager = JsonProvider()
+    def _io_read_json(self, path: Path, default_type: Any = dict) -> Any:
+        if Path(path) == self.users_path:
+            return self.db.get_all_users()
+        return self.io.read(path, default_type)
+
+    def _io_save_json(self, path: Path, data: Any):
+        if Path(path) == self.users_path:
+            self.db.replace_users(data)
+            self.user_store.invalidate()
+            return
+        self.io.save(path, data)
+
+    def _read_knowledge(self, name: str) -> Any:
+        if name == "guild_configs":
+            return self.db.get_guild_configs()
+        data = self.db.get_knowledge(name)
+        return data if data is not None else {}
+
+    def _write_knowledge(self, name: str, data: Any):
+        if name == "guild_configs":
+            self.db.save_guild_configs(data if isinstance(data, dict) else {})
+        else:
+            self.db.save_knowledge(name, data)
+
+    def get_user_data(self, user_id: str, key: str, default_value: Any = None) -> Any:
+        found, value = self.db.get_user_value(user_id, key)
+        return value if found else default_value
+
+    def set_user_data(self, user_id: str, key: str, value: Any):
+        self.db.set_user_value(user_id, key, value)
+        self.user_store.note_changes(user_id, {key: value})
+
+    def _load_user_record(self, user_id: str) -> Dict[str, Any]:
+        return self.db.get_user_record(user_id)
+
+    def _commit_user_record(self, user_id: str, changes: Dict[str, Any]):
+        self.db.set_user_values(user_id, changes)
+        self.user_store.note_changes(user_id, changes)
+
+    def _all_user_records(self) -> Dict[str, Dict[str, Any]]:
+        return self.db.get_all_users()
+
+    def _read_legacy_xp(self) -> Dict[str, Any]:
+        return self.db.get_knowledge("users") or {}
+
+    def _retire_legacy_xp(self) -> bool:
+        # As escritas do SQLite já estão gravadas quando chegam aqui
+        self.db.save_knowledge("users", {})
+        return True
+
+    def flush(self):
+        self.guild_configs.flush()
+
+    def _on_knowledge_file_changed(self, name: str, data: Any):
+        # Edição manual do JSON em Knowledge/: importa para a base
+        self.db.save_knowledge(name, data)
+
+    def _read_channels(self) -> Dict:
+        return self.db.get_channels()
+
+    def _write_channels(self, data: Dict):
+        self.db.save_channels(data)
+
+
+db_type = os.getenv("DB_TYPE", "json").lower()
+
+if db_type == "sqlite":
+    data_manager = SqliteProvider()
 else:
     data_manager = JsonProvider()
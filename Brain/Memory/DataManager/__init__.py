@@ -1,2 +1,5 @@
 # Brain/Memory/DataManager/__init__.py
-from .Manager import data_manager, JsonProvider
+from .Manager import data_manager, JsonProvider, SqliteProvider
+from ._async_facade import AsyncDataManager
+
+async_data_manager = data_manager.aio
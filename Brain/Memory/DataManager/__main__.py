@@ -0,0 +1,262 @@
+# Brain/Memory/DataManager/__main__.py
+"""
+Ferramentas de linha de comando do DataManager.
+
+    python -m Brain.Memory.DataManager export --pretty    # volta tudo a JSON legível
+    python -m Brain.Memory.DataManager export             # regrava no DATA_FORMAT atual
+    python -m Brain.Memory.DataManager bench              # compara os codecs (1k/10k/100k)
+    python -m Brain.Memory.DataManager looplag            # lag do event loop: I/O síncrono vs fachada
+    python -m Brain.Memory.DataManager migrate            # funde o Knowledge/users.json legado
+
+Rode com o bot desligado: o write-behind do bot regravaria os ficheiros no formato configurado.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from . import _codecs
+from ._async_facade import AsyncDataManager
+from ._json_provider import JsonIO
+
+
+DATA_ROOT = Path(os.getenv("DATA_ROOT") or Path(__file__).resolve().parents[3] / "Data")
+DATA_FOLDERS = ("Config", "Knowledge", "Persistence", "Users")
+
+
+# --- EXPORTAÇÃO ---
+def _iter_data_files(root: Path):
+    for folder in DATA_FOLDERS:
+        base = root / folder
+        if base.is_dir():
+            yield from sorted(base.rglob("*.json"))
+
+
+def export(root: Path, pretty: bool, out_dir: Path = None) -> int:
+    """Regrava os ficheiros de dados no formato pedido. Devolve quantos falharam."""
+    io = JsonIO("pretty" if pretty else None)
+    falhas = 0
+    for path in _iter_data_files(root):
+        try:
+            data = _codecs.decode(path.read_bytes())
+        except Exception as e:
+            # Nunca sobrescreve um ficheiro que não conseguimos ler
+            print(f"❌ {path.relative_to(root)}: ilegível ({e}), ignorado.")
+            falhas += 1
+            continue
+
+        target = out_dir / path.relative_to(root) if out_dir else path
+        antes = path.stat().st_size
+        if io.write_atomic(target, io.dumps(data)):
+            print(f"✅ {path.relative_to(root)}: {antes:,} → {target.stat().st_size:,} bytes")
+        else:
+            falhas += 1
+    return falhas
+
+
+# --- BENCHMARK ---
+def _synthetic_users(count: int, seed: int = 42) -> dict:
+    """Documento no formato do Users/users.json, com os campos que a economia grava."""
+    rng = random.Random(seed)
+    tickers = ["SAM", "BOT", "DSC", "PYT", "GEM", "LLM"]
+    users = {}
+    for _ in range(count):
+        uid = str(rng.randrange(10**17, 10**18))
+        users[uid] = {
+            "xp": rng.randint(0, 50_000),
+            "carteira": rng.randint(0, 100_000),
+            "banco": rng.randint(0, 1_000_000),
+            "daily_streak": rng.randint(0, 60),
+            "ultimo_daily": time.time() - rng.randint(0, 86_400 * 7),
+            "emprego_atual": rng.choice(["estagiario", "programador", "chef", None]),
+            "bio": "Olá! Eu uso a SamBot ♡" if rng.random() < 0.3 else "",
+            "emblemas": rng.sample(["🏆", "💎", "🎮", "🔥", "⭐"], k=rng.randint(0, 3)),
+            "portfolio": {
+                t: {"qtd": rng.randint(1, 500), "preco_medio": round(rng.uniform(1, 900), 2)}
+                for t in rng.sample(tickers, k=rng.randint(0, 3))
+            },
+        }
+    return users
+
+
+def _bench_codec(label: str, codec: _codecs.Codec, data: dict, workdir: Path, repeat: int):
+    io = JsonIO()
+    io.codec = codec
+    path = workdir / f"users.{codec.name}"
+
+    save_times, load_times = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        io.write_atomic(path, io.dumps(data))
+        save_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        loaded = _codecs.decode(path.read_bytes())
+        load_times.append(time.perf_counter() - start)
+
+    assert len(loaded) == len(data), f"{label}: dados divergentes após leitura"
+    return min(save_times) * 1000, min(load_times) * 1000, path.stat().st_size
+
+
+def bench(sizes, repeat: int) -> None:
+    codecs = [("json (indent=4, antigo)", _codecs.JsonCodec(pretty=True)),
+              ("json compacto (stdlib)", _codecs.JsonCodec())]
+    if _codecs.orjson is not None:
+        codecs.append(("json compacto (orjson)", _codecs.OrjsonCodec()))
+    if _codecs.msgpack is not None:
+        codecs.append(("msgpack", _codecs.MsgpackCodec()))
+
+    ausentes = [n for n, ok in (("orjson", _codecs.orjson), ("msgpack", _codecs.msgpack)) if ok is None]
+    if ausentes:
+        print(f"ℹ️ Não instalados (fora do benchmark): {', '.join(ausentes)}")
+
+    workdir = Path(tempfile.mkdtemp(prefix="sambot-bench-"))
+    try:
+        for size in sizes:
+            data = _synthetic_users(size)
+            print(f"\n📊 {size:,} usuários (melhor de {repeat})")
+            print(f"{'codec':<26}{'save (ms)':>12}{'load (ms)':>12}{'tamanho':>14}")
+            for label, codec in codecs:
+                save_ms, load_ms, size_b = _bench_codec(label, codec, data, workdir, repeat)
+                print(f"{label:<26}{save_ms:>12.1f}{load_ms:>12.1f}{size_b:>14,}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# --- LAG DO EVENT LOOP ---
+class _FileProvider:
+    """Provedor mínimo sobre um único ficheiro, para medir a fachada isoladamente."""
+
+    def __init__(self, io: JsonIO, path: Path):
+        self.io, self.path = io, path
+
+    def get_knowledge(self, key):
+        return self.io.read(self.path)
+
+    def save_knowledge(self, key, data):
+        self.io.save(self.path, data)
+
+    def flush(self):
+        pass
+
+
+def _xp_tick(users: dict, i: int):
+    registro = users.setdefault("global", {}).setdefault(str(i % 500), {"xp": 0})
+    registro["xp"] += 10
+
+
+async def _measure_lag(workload, interval: float = 0.005):
+    """Corre `workload` enquanto uma sonda mede o atraso de cada sleep(interval)."""
+    atrasos = []
+    parar = asyncio.Event()
+
+    async def sonda():
+        loop = asyncio.get_running_loop()
+        while not parar.is_set():
+            inicio = loop.time()
+            await asyncio.sleep(interval)
+            atrasos.append(max(0.0, loop.time() - inicio - interval) * 1000)
+
+    tarefa = asyncio.create_task(sonda())
+    inicio = time.perf_counter()
+    await workload()
+    total = time.perf_counter() - inicio
+    parar.set()
+    await tarefa
+
+    atrasos.sort()
+    p99 = atrasos[int(len(atrasos) * 0.99) - 1] if atrasos else 0.0
+    return total * 1000, p99, atrasos[-1] if atrasos else 0.0
+
+
+def looplag(users: int, ticks: int, concurrency: int) -> None:
+    workdir = Path(tempfile.mkdtemp(prefix="sambot-lag-"))
+    try:
+        io = JsonIO()
+        path = workdir / "users.json"
+        io.save(path, {"global": {str(i): {"xp": i} for i in range(users)}})
+        provider = _FileProvider(io, path)
+
+        async def sincrono():
+            # O padrão antigo do on_message: leitura e gravação no próprio event loop
+            async def mensagem(i):
+                dados = provider.get_knowledge("users")
+                _xp_tick(dados, i)
+                provider.save_knowledge("users", dados)
+
+            for lote in range(0, ticks, concurrency):
+                await asyncio.gather(*(mensagem(i) for i in range(lote, lote + concurrency)))
+
+        async def fachada():
+            aio = AsyncDataManager(provider)
+            try:
+                for lote in range(0, ticks, concurrency):
+                    await asyncio.gather(
+                        *(
+                            aio.update_knowledge("users", lambda d, i=i: _xp_tick(d, i))
+                            for i in range(lote, lote + concurrency)
+                        )
+                    )
+            finally:
+                aio.close()
+
+        print(f"📊 {ticks} ticks de XP sobre {users:,} usuários ({concurrency} simultâneos)")
+        print(f"{'modo':<18}{'total (ms)':>12}{'lag p99 (ms)':>15}{'lag máx (ms)':>15}")
+        for nome, carga in (("síncrono", sincrono), ("fachada async", fachada)):
+            total, p99, maximo = asyncio.run(_measure_lag(carga))
+            print(f"{nome:<18}{total:>12.1f}{p99:>15.1f}{maximo:>15.1f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# --- MIGRAÇÃO ---
+def migrate() -> int:
+    """Funde o XP legado nos registros de usuário (o mesmo passo do arranque do bot)."""
+    from .Manager import data_manager
+
+    total = data_manager.migrate_legacy_xp()
+    data_manager.flush()
+    print(f"🔀 {total} registro(s) de usuário com XP legado fundido.")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m Brain.Memory.DataManager")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_export = sub.add_parser("export", help="Regrava os ficheiros de Data/ noutro formato.")
+    p_export.add_argument("--pretty", action="store_true", help="JSON com indent=4, legível à mão.")
+    p_export.add_argument("--out", type=Path, default=None, help="Grava cópias nesta pasta em vez de substituir.")
+    p_export.add_argument("--root", type=Path, default=DATA_ROOT, help=argparse.SUPPRESS)
+
+    p_bench = sub.add_parser("bench", help="Compara tempo de save/load e tamanho por codec.")
+    p_bench.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    p_bench.add_argument("--repeat", type=int, default=3)
+
+    p_lag = sub.add_parser("looplag", help="Mede o lag do event loop com I/O síncrono vs fachada async.")
+    p_lag.add_argument("--users", type=int, default=10_000)
+    p_lag.add_argument("--ticks", type=int, default=200)
+    p_lag.add_argument("--concurrency", type=int, default=8)
+
+    sub.add_parser("migrate", help="Funde o Knowledge/users.json legado nos registros de usuário.")
+
+    args = parser.parse_args(argv)
+    if args.comando == "migrate":
+        return migrate()
+    if args.comando == "export":
+        return 1 if export(args.root, args.pretty, args.out) else 0
+    if args.comando == "looplag":
+        looplag(args.users, args.ticks, args.concurrency)
+        return 0
+    bench(args.sizes, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
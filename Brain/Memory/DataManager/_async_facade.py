@@ -0,0 +1,193 @@
+# Brain/Memory/DataManager/_async_facade.py
+
+import queue
+import asyncio
+import logging
+import threading
+import concurrent.futures
+from typing import Any, Callable, Dict, Optional
+
+_STOP = object()
+
+
+class DiskWorker:
+    """
+    Thread única que executa o trabalho de disco em ordem de chegada (FIFO).
+    Como só existe um executor, uma escrita enfileirada antes de uma leitura é
+    sempre vista por ela. A fila é limitada: quando enche, quem chama espera
+    (de forma assíncrona) por uma vaga em vez de acumular trabalho sem fim.
+    """
+
+    def __init__(self, max_pending: int = 256, name: str = "SamBot-DataWriter"):
+        self.logger = logging.getLogger("SamBot.Archive.Worker")
+        self.max_pending = max(1, max_pending)
+        self.name = name
+
+        self._jobs: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+
+    # --- CICLO DE VIDA ---
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name=self.name, daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is _STOP:
+                return
+            fn, args, future, loop = job
+            try:
+                result, error = fn(*args), None
+            except BaseException as e:
+                result, error = None, e
+            self.completed += 1
+
+            if loop is None:
+                # Chamada do shim síncrono
+                if error is None:
+                    future.set_result(result)
+                else:
+                    future.set_exception(error)
+                continue
+            try:
+                loop.call_soon_threadsafe(self._resolve, future, result, error)
+            except RuntimeError:
+                # Loop já fechado (desligamento): o trabalho foi feito, ninguém espera
+                pass
+
+    def close(self, timeout: float = 10.0):
+        """Processa o que já está na fila e encerra a thread."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._jobs.put(_STOP)
+        thread.join(timeout)
+
+    # --- SUBMISSÃO ---
+    def _get_slots(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_pending)
+            self._slots_loop = loop
+        return self._slots
+
+    def _resolve(self, future: asyncio.Future, result: Any, error: Optional[BaseException]):
+        self.pending -= 1
+        if self._slots is not None:
+            self._slots.release()
+        if future.cancelled():
+            return
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+    async def submit(self, fn: Callable, *args) -> Any:
+        """Enfileira `fn(*args)` e aguarda o resultado sem bloquear o event loop."""
+        loop = asyncio.get_running_loop()
+        await self._get_slots(loop).acquire()
+
+        future = loop.create_future()
+        self.pending += 1
+        self.peak_pending = max(self.peak_pending, self.pending)
+        self._ensure_thread()
+        self._jobs.put((fn, args, future, loop))
+        # Se quem espera for cancelado o trabalho ainda corre; a vaga só é devolvida no fim
+        return await asyncio.shield(future)
+
+    def call_sync(self, fn: Callable, *args, timeout: Optional[float] = None) -> Any:
+        """
+        Shim síncrono: passa pela mesma fila (respeitando a ordem do que já foi
+        enfileirado) e bloqueia até terminar. Dentro da própria thread executa direto.
+        """
+        if threading.current_thread() is self._thread:
+            return fn(*args)
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        self._ensure_thread()
+        self._jobs.put((fn, args, future, None))
+        return future.result(timeout)
+
+
+class AsyncDataManager:
+    """
+    Fachada assíncrona do DataManager. Tudo o que pode tocar no disco corre na
+    DiskWorker, então os handlers do Discord nunca travam o event loop:
+
+        xp = await data_manager.aio.get_user_data(user_id, "xp", 0)
+        await data_manager.aio.save_knowledge("mercado", dados)
+
+    Os métodos síncronos do `data_manager` continuam disponíveis para o código legado.
+    """
+
+    def __init__(self, provider, max_pending: int = 256):
+        self.provider = provider
+        self.worker = DiskWorker(max_pending=max_pending)
+
+    @property
+    def sync(self):
+        """O provedor síncrono original (shim para quem ainda não migrou)."""
+        return self.provider
+
+    async def call(self, fn: Callable, *args) -> Any:
+        """Executa qualquer operação síncrona do provedor na thread de disco."""
+        return await self.worker.submit(fn, *args)
+
+    def call_sync(self, fn: Callable, *args, timeout: Optional[float] = None) -> Any:
+        return self.worker.call_sync(fn, *args, timeout=timeout)
+
+    # --- USUÁRIOS ---
+    async def get_user_data(self, user_id: str, key: str, default_value: Any = None) -> Any:
+        return await self.call(self.provider.get_user_data, user_id, key, default_value)
+
+    async def set_user_data(self, user_id: str, key: str, value: Any):
+        await self.call(self.provider.set_user_data, user_id, key, value)
+
+    # --- CONHECIMENTO ---
+    async def get_knowledge(self, key: str) -> Any:
+        return await self.call(self.provider.get_knowledge, key)
+
+    async def save_knowledge(self, key: str, data: Any):
+        await self.call(self.provider.save_knowledge, key, data)
+
+    async def update_knowledge(self, key: str, mutator: Callable[[Any], Any]) -> Any:
+        """
+        Lê, altera e grava um documento num único passo da thread de disco.
+        `mutator(dados)` altera o documento no lugar e o seu retorno é devolvido.
+        Nenhuma outra operação da fachada corre entre a leitura e a escrita.
+        """
+
+        def _apply():
+            data = self.provider.get_knowledge(key)
+            result = mutator(data)
+            self.provider.save_knowledge(key, data)
+            return result
+
+        return await self.call(_apply)
+
+    # --- MANUTENÇÃO ---
+    async def flush(self):
+        await self.call(self.provider.flush)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": self.worker.pending,
+            "peak_pending": self.worker.peak_pending,
+            "max_pending": self.worker.max_pending,
+            "completed": self.worker.completed,
+        }
+
+    def close(self):
+        self.worker.close()
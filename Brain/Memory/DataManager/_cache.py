@@ -1,32 +1,31 @@
 # Brain/Memory/DataManager/_cache.py
 
+from Brain.Memory.Cache import get_cache
+
 
 class DataCache:
     """
     Gerencia o armazenamento temporário em memória (RAM) para o DataManager.
+    Os documentos (identity, nlp, expressions, channels) e os prompts vivem em
+    caches nomeados e limitados do Brain.Memory.Cache.
     """
 
     def __init__(self):
-        self.data = {}
-        self.reset()
+        self.documents = get_cache("data.documents", max_entries=32)
+        self.prompts = get_cache("data.prompts", max_entries=64, max_bytes=2 * 1024 * 1024)
 
     def reset(self):
-        self.data = {
-            "identity": None,
-            "prompts": {},
-            "nlp": None,
-            "expressions": None,
-            "channels": None,
-        }
+        self.documents.clear()
+        self.prompts.clear()
 
     def get(self, key: str):
-        return self.data.get(key)
+        return self.documents.get(key)
 
     def set(self, key: str, value: any):
-        self.data[key] = value
+        self.documents.set(key, value)
 
     def get_prompt(self, filename: str):
-        return self.data["prompts"].get(filename)
+        return self.prompts.get(filename)
 
     def set_prompt(self, filename: str, content: str):
-        self.data["prompts"][filename] = content
+        self.prompts.set(filename, content)
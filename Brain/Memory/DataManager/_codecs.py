@@ -0,0 +1,148 @@
+# Brain/Memory/DataManager/_codecs.py
+
+import json
+import logging
+from typing import Any, Dict
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - depende do ambiente
+    msgpack = None
+
+
+logger = logging.getLogger("SamBot.Archive.Codec")
+
+# Cabeçalho dos formatos binários: MAGIC + nome do codec + "\n".
+# Ficheiros sem cabeçalho são JSON (compacto ou o antigo com indent=4).
+MAGIC = b"\x00SAMDATA:"
+_BOM = b"\xef\xbb\xbf"
+
+
+class Codec:
+    """Contrato mínimo de um formato de disco."""
+
+    name = "base"
+    header = False  # Formatos binários gravam o cabeçalho MAGIC
+
+    def encode(self, data: Any) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, raw: bytes) -> Any:
+        raise NotImplementedError
+
+
+class JsonCodec(Codec):
+    """JSON da biblioteca padrão. `pretty` reproduz o formato antigo (indent=4)."""
+
+    name = "json"
+
+    def __init__(self, pretty: bool = False):
+        self.pretty = pretty
+
+    def encode(self, data: Any) -> bytes:
+        if self.pretty:
+            text = json.dumps(data, indent=4, ensure_ascii=False)
+        else:
+            text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        return text.encode("utf-8")
+
+    def decode(self, raw: bytes) -> Any:
+        return json.loads(raw.decode("utf-8"))
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    Caminho rápido com orjson. Gera o mesmo JSON compacto que o JsonCodec;
+    o que o orjson não aceita (inteiros > 64 bits, chaves exóticas) cai no stdlib.
+    """
+
+    name = "orjson"
+
+    def encode(self, data: Any) -> bytes:
+        if self.pretty:
+            return super().encode(data)
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            return super().encode(data)
+
+    def decode(self, raw: bytes) -> Any:
+        return orjson.loads(raw)
+
+
+class MsgpackCodec(Codec):
+    """Formato binário compacto (msgpack). Opcional: exige `pip install msgpack`."""
+
+    name = "msgpack"
+    header = True
+
+    def encode(self, data: Any) -> bytes:
+        return msgpack.packb(data, use_bin_type=True)
+
+    def decode(self, raw: bytes) -> Any:
+        return msgpack.unpackb(raw, raw=False, strict_map_key=False)
+
+
+def _fast_json(pretty: bool = False) -> JsonCodec:
+    return OrjsonCodec(pretty) if orjson is not None else JsonCodec(pretty)
+
+
+def available_formats() -> Dict[str, bool]:
+    """Formatos aceites em DATA_FORMAT e se podem ser usados neste ambiente."""
+    return {"json": True, "pretty": True, "msgpack": msgpack is not None}
+
+
+def get_codec(fmt: str = "json") -> Codec:
+    """
+    Resolve o codec de escrita:
+      - "json"    → JSON compacto (orjson quando instalado)
+      - "pretty"  → JSON com indent=4, legível à mão
+      - "msgpack" → binário com cabeçalho (cai para JSON se msgpack faltar)
+    """
+    fmt = (fmt or "json").strip().lower()
+    if fmt == "pretty":
+        return _fast_json(pretty=True)
+    if fmt == "msgpack":
+        if msgpack is not None:
+            return MsgpackCodec()
+        logger.warning("⚠️ DATA_FORMAT=msgpack mas o pacote 'msgpack' não está instalado. Usando JSON.")
+        return _fast_json()
+    if fmt != "json":
+        logger.warning(f"⚠️ DATA_FORMAT '{fmt}' desconhecido. Usando JSON.")
+    return _fast_json()
+
+
+_HEADER_CODECS = {"msgpack": MsgpackCodec}
+
+
+def encode(codec: Codec, data: Any) -> bytes:
+    """Serializa com o codec dado, prefixando o cabeçalho quando o formato é binário."""
+    body = codec.encode(data)
+    if codec.header:
+        return MAGIC + codec.name.encode("ascii") + b"\n" + body
+    return body
+
+
+def decode(raw: bytes) -> Any:
+    """
+    Lê qualquer formato suportado. O cabeçalho decide o codec; sem ele o conteúdo
+    é tratado como JSON, então os ficheiros antigos continuam a abrir.
+    """
+    if raw.startswith(MAGIC):
+        end = raw.index(b"\n", len(MAGIC))
+        name = raw[len(MAGIC) : end].decode("ascii")
+        codec_cls = _HEADER_CODECS.get(name)
+        if codec_cls is None:
+            raise ValueError(f"Formato de dados desconhecido: {name}")
+        if name == "msgpack" and msgpack is None:
+            raise RuntimeError("Ficheiro em msgpack, mas o pacote 'msgpack' não está instalado")
+        return codec_cls().decode(raw[end + 1 :])
+
+    if raw.startswith(_BOM):
+        raw = raw[len(_BOM) :]
+    return _fast_json().decode(raw)
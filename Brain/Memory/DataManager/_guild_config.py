@@ -0,0 +1,339 @@
+# Brain/Memory/DataManager/_guild_config.py
+
+import copy
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional
+
+
+def _ids(values: Iterable[Any]) -> FrozenSet[int]:
+    """Normaliza listas de IDs do Discord (int ou str) num frozenset de inteiros."""
+    result = set()
+    for value in values or []:
+        try:
+            result.add(int(value))
+        except (TypeError, ValueError):
+            continue
+    return frozenset(result)
+
+
+def _opt_int(value: Any) -> Optional[int]:
+    try:
+        return int(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class AutoModConfig:
+    anti_link: bool = False
+    anti_invite: bool = False
+    anti_words: bool = False
+    anti_spam: bool = False
+    blocked_words: FrozenSet[str] = frozenset()
+    words_whitelist_channels: FrozenSet[int] = frozenset()
+    link_whitelist_channels: FrozenSet[int] = frozenset()
+    link_blacklist_domains: FrozenSet[str] = frozenset()
+    invite_whitelist_channels: FrozenSet[int] = frozenset()
+    invite_whitelist_roles: FrozenSet[int] = frozenset()
+    invite_whitelist_members: FrozenSet[int] = frozenset()
+    spam_whitelist: FrozenSet[int] = frozenset()
+    spam_max_msgs: int = 5
+    spam_time_window: float = 5.0
+    spam_max_reps: int = 3
+
+    @property
+    def enabled(self) -> bool:
+        return self.anti_link or self.anti_invite or self.anti_words or self.anti_spam
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "AutoModConfig":
+        return cls(
+            anti_link=bool(data.get("anti_link", False)),
+            anti_invite=bool(data.get("anti_invite", False)),
+            anti_words=bool(data.get("anti_words", False)),
+            anti_spam=bool(data.get("anti_spam", False)),
+            blocked_words=frozenset(
+                str(p).lower().strip() for p in data.get("blocked_words", []) if p
+            ),
+            words_whitelist_channels=_ids(data.get("words_whitelist_channels")),
+            link_whitelist_channels=_ids(data.get("link_whitelist_channels")),
+            link_blacklist_domains=frozenset(
+                str(d).lower() for d in data.get("link_blacklist_domains", []) if d
+            ),
+            invite_whitelist_channels=_ids(data.get("invite_whitelist_channels")),
+            invite_whitelist_roles=_ids(data.get("invite_whitelist_roles")),
+            invite_whitelist_members=_ids(data.get("invite_whitelist_members")),
+            spam_whitelist=_ids(data.get("spam_whitelist")),
+            spam_max_msgs=int(data.get("spam_max_msgs", 5)),
+            spam_time_window=float(data.get("spam_time_window", 5.0)),
+            spam_max_reps=int(data.get("spam_max_reps", 3)),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class LevelingConfig:
+    no_xp_channels: FrozenSet[int] = frozenset()
+    role_boosts: Mapping[int, float] = field(default_factory=dict)
+    rewards: Mapping[int, int] = field(default_factory=dict)
+
+    def multiplier_for(self, role_ids: Iterable[int]) -> float:
+        """Maior multiplicador entre os cargos do membro (mínimo 1.0)."""
+        maior = 1.0
+        if self.role_boosts:
+            for role_id in role_ids:
+                maior = max(maior, self.role_boosts.get(role_id, 1.0))
+        return maior
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "LevelingConfig":
+        boosts = {}
+        for role_id, mult in (data.get("role_boosts") or {}).items():
+            try:
+                boosts[int(role_id)] = float(mult)
+            except (TypeError, ValueError):
+                continue
+        rewards = {}
+        for nivel, role_id in (data.get("rewards") or {}).items():
+            try:
+                rewards[int(nivel)] = int(role_id)
+            except (TypeError, ValueError):
+                continue
+        return cls(
+            no_xp_channels=_ids(data.get("no_xp_channels")),
+            role_boosts=boosts,
+            rewards=rewards,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class LevelUpConfig:
+    """Painel /configxp: chaves na raiz do servidor (`enabled`, `mensagem`, `canal_id`, `roles`)."""
+
+    enabled: bool = True
+    mensagem: Optional[str] = None
+    canal_id: Optional[int] = None
+    roles: Mapping[int, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "LevelUpConfig":
+        roles = {}
+        for nivel, role_id in (data.get("roles") or {}).items():
+            try:
+                roles[int(nivel)] = int(role_id)
+            except (TypeError, ValueError):
+                continue
+        return cls(
+            enabled=bool(data.get("enabled", True)),
+            mensagem=data.get("mensagem") or None,
+            canal_id=_opt_int(data.get("canal_id")),
+            roles=roles,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class AuditConfig:
+    canal_id: Optional[int] = None
+    preset: int = 1
+    custom_flags: FrozenSet[str] = frozenset()
+
+    def should_log(self, event_level: int, flag_name: str) -> bool:
+        if not self.canal_id:
+            return False
+        if self.preset == 6:
+            return flag_name in self.custom_flags
+        return self.preset >= event_level
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "AuditConfig":
+        return cls(
+            canal_id=_opt_int(data.get("canal_id")),
+            preset=int(data.get("preset", 1)),
+            custom_flags=frozenset(data.get("custom_flags", [])),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class GuildConfig:
+    automod: AutoModConfig = AutoModConfig()
+    leveling: LevelingConfig = LevelingConfig()
+    level_up: LevelUpConfig = LevelUpConfig()
+    auditoria: AuditConfig = AuditConfig()
+    avisos_channel: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "GuildConfig":
+        return cls(
+            automod=AutoModConfig.from_dict(data.get("automod") or {}),
+            leveling=LevelingConfig.from_dict(data.get("leveling") or {}),
+            level_up=LevelUpConfig.from_dict(data),
+            auditoria=AuditConfig.from_dict(data.get("auditoria") or {}),
+            avisos_channel=_opt_int(data.get("avisos_channel")),
+        )
+
+
+_EMPTY = GuildConfig()
+
+
+class GuildConfigService:
+    """
+    Snapshot em RAM do guild_configs.
+    O documento é lido do disco uma única vez; cada servidor é convertido em objetos
+    tipados imutáveis sob demanda. Escritas dos painéis alteram o snapshot na hora
+    e agendam a gravação, então os listeners quentes nunca tocam no disco.
+
+    `submit(fn)` devolve um awaitable que corre `fn` fora do event loop (a thread
+    de disco da fachada assíncrona); sem ele, a gravação agendada corre no loop.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[], Dict[str, Any]],
+        save: Callable[[Dict[str, Any]], None],
+        save_delay: float = 2.0,
+        submit: Optional[Callable[[Callable[[], None]], Awaitable[Any]]] = None,
+    ):
+        self.logger = logging.getLogger("SamBot.Archive.GuildConfig")
+        self._load = load
+        self._save = save
+        self._submit = submit
+        self.save_delay = save_delay
+
+        self._lock = threading.RLock()
+        self._raw: Optional[Dict[str, Any]] = None
+        self._snapshots: Dict[str, GuildConfig] = {}
+        self._listeners: List[Callable[[str], None]] = []
+        self._dirty = False
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+        self._save_task: Optional[asyncio.Future] = None
+
+    def _ensure_loaded(self) -> Dict[str, Any]:
+        if self._raw is None:
+            with self._lock:
+                if self._raw is None:
+                    data = self._load()
+                    self._raw = data if isinstance(data, dict) else {}
+        return self._raw
+
+    # --- LEITURA ---
+    def get(self, guild_id) -> GuildConfig:
+        """Configuração tipada do servidor. Nunca lê o disco depois do primeiro acesso."""
+        guild_id = str(guild_id)
+        snap = self._snapshots.get(guild_id)
+        if snap is not None:
+            return snap
+
+        raw = self._ensure_loaded()
+        with self._lock:
+            data = raw.get(guild_id)
+            snap = GuildConfig.from_dict(data) if isinstance(data, dict) else _EMPTY
+            self._snapshots[guild_id] = snap
+        return snap
+
+    def raw(self, guild_id) -> Dict[str, Any]:
+        """Cópia do dict bruto de um servidor, para painéis que mostram chaves sem tipo."""
+        raw = self._ensure_loaded()
+        with self._lock:
+            return copy.deepcopy(raw.get(str(guild_id)) or {})
+
+    def raw_copy(self) -> Dict[str, Any]:
+        """Cópia do documento bruto, para o código legado que ainda trabalha com dicts."""
+        raw = self._ensure_loaded()
+        with self._lock:
+            return copy.deepcopy(raw)
+
+    # --- ESCRITA ---
+    @contextmanager
+    def edit(self, guild_id):
+        """
+        Edita o dict bruto de um servidor. Ao sair do bloco o snapshot é refeito
+        e a gravação em disco é agendada:
+
+            with data_manager.guild_configs.edit(guild_id) as cfg:
+                cfg.setdefault("automod", {})["anti_link"] = True
+
+        Se o bloco falhar a meio, o que já mudou no dict também é publicado e gravado.
+        """
+        guild_id = str(guild_id)
+        try:
+            with self._lock:
+                # Dentro do lock: um `replace` concorrente troca o documento inteiro
+                guild_data = self._ensure_loaded().setdefault(guild_id, {})
+                try:
+                    yield guild_data
+                finally:
+                    self._snapshots.pop(guild_id, None)
+                    self._dirty = True
+        finally:
+            self._notify(guild_id)
+            self._schedule_save()
+
+    def replace(self, data: Dict[str, Any]):
+        """Hook de invalidação: chamado quando alguém grava o guild_configs inteiro."""
+        if not isinstance(data, dict):
+            return
+        with self._lock:
+            old = self._raw or {}
+            self._raw = copy.deepcopy(data)
+            changed = [
+                gid
+                for gid in set(old) | set(self._raw)
+                if old.get(gid) != self._raw.get(gid)
+            ]
+            for gid in changed:
+                self._snapshots.pop(gid, None)
+        for gid in changed:
+            self._notify(gid)
+
+    def reload(self):
+        """Descarta o snapshot; a próxima leitura volta ao disco."""
+        self.flush()
+        with self._lock:
+            self._raw = None
+            self._snapshots.clear()
+
+    def add_listener(self, callback: Callable[[str], None]):
+        """Regista um callback chamado com o guild_id sempre que a configuração muda."""
+        self._listeners.append(callback)
+
+    def _notify(self, guild_id: str):
+        for callback in list(self._listeners):
+            try:
+                callback(guild_id)
+            except Exception as e:
+                self.logger.warning(f"⚠️ Listener de guild_configs falhou: {e}")
+
+    # --- PERSISTÊNCIA ---
+    def _schedule_save(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        with self._lock:
+            if self._save_handle is None or self._save_handle.cancelled():
+                self._save_handle = loop.call_later(self.save_delay, self._flush_em_fundo)
+
+    def _flush_em_fundo(self):
+        """Dispara a gravação agendada na thread de disco, sem travar o event loop."""
+        if self._submit is None:
+            self.flush()
+            return
+        self._save_task = asyncio.ensure_future(self._submit(self.flush))
+        self._save_task.add_done_callback(self._flush_terminado)
+
+    def _flush_terminado(self, task: asyncio.Future):
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error(f"❌ Falha ao gravar o guild_configs: {task.exception()}")
+
+    def flush(self):
+        with self._lock:
+            self._save_handle = None
+            if not self._dirty or self._raw is None:
+                return
+            self._dirty = False
+            data = copy.deepcopy(self._raw)
+        self._save(data)
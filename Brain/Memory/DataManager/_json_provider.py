@@ -1,39 +1,79 @@
 # Brain/Memory/DataManager/_json_provider.py
 
-import json
+import os
 import logging
+import tempfile
 import threading
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional, Union
+
+from . import _codecs
 
 
 class JsonIO:
     """
     Motor de I/O isolado. Lida exclusivamente com leitura, escrita e travas de thread.
+    O formato de escrita vem de DATA_FORMAT (json, pretty ou msgpack); a leitura
+    reconhece qualquer um deles, incluindo o JSON antigo com indent=4.
     """
 
-    def __init__(self):
+    def __init__(self, fmt: Optional[str] = None):
         self.logger = logging.getLogger("SamBot.Archive.IO")
         self._lock = threading.Lock()
+        self.codec = _codecs.get_codec(fmt or os.getenv("DATA_FORMAT", "json"))
 
     def read(self, path: Path, default_type: Any = dict) -> Any:
         if not path.exists():
             return default_type()
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                if default_type is dict and not isinstance(data, dict):
-                    return {}
-                return data
-        except (json.JSONDecodeError, Exception) as e:
-            self.logger.error(f"Erro ao ler JSON em {path.name}: {e}")
+            data = _codecs.decode(path.read_bytes())
+            if default_type is dict and not isinstance(data, dict):
+                return {}
+            return data
+        except Exception as e:
+            self.logger.error(f"Erro ao ler dados em {path.name}: {e}")
             return default_type()
 
-    def save(self, path: Path, data: Any):
+    def read_strict(self, path: Path) -> Any:
+        """Como `read`, mas levanta erro em vez de devolver um valor vazio."""
+        return _codecs.decode(path.read_bytes())
+
+    def dumps(self, data: Any) -> bytes:
+        """Serializa os dados no formato usado em disco."""
+        return _codecs.encode(self.codec, data)
+
+    def write_atomic(self, path: Path, content: Union[bytes, str]) -> bool:
+        """
+        Grava o conteúdo num ficheiro temporário vizinho e troca-o pelo destino com os.replace.
+        Um crash a meio da escrita nunca deixa o JSON original truncado.
+        """
         with self._lock:
+            tmp_name = None
             try:
                 path.parent.mkdir(parents=True, exist_ok=True)
-                with open(path, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=4, ensure_ascii=False)
+                fd, tmp_name = tempfile.mkstemp(
+                    prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+                )
+                if isinstance(content, str):
+                    content = content.encode("utf-8")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(content)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_name, path)
+                tmp_name = None
+                return True
             except Exception as e:
                 self.logger.error(f"Falha crítica ao salvar {path.name}: {e}")
+                return False
+            finally:
+                if tmp_name and os.path.exists(tmp_name):
+                    os.remove(tmp_name)
+
+    def save(self, path: Path, data: Any):
+        try:
+            content = self.dumps(data)
+        except (TypeError, ValueError) as e:
+            self.logger.error(f"Falha crítica ao serializar {path.name}: {e}")
+            return
+        self.write_atomic(path, content)
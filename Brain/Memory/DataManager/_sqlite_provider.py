@@ -0,0 +1,310 @@
+# Brain/Memory/DataManager/_sqlite_provider.py
+
+import json
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Tuple
+
+from ._json_provider import JsonIO
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS user_data (
+    user_id TEXT NOT NULL,
+    key     TEXT NOT NULL,
+    value   TEXT NOT NULL,
+    PRIMARY KEY (user_id, key)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS knowledge_items (
+    namespace TEXT NOT NULL,
+    item      TEXT NOT NULL,
+    value     TEXT NOT NULL,
+    PRIMARY KEY (namespace, item)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS knowledge_blobs (
+    namespace TEXT PRIMARY KEY,
+    value     TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS guild_configs (
+    guild_id TEXT PRIMARY KEY,
+    config   TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS channels (
+    channel_id TEXT PRIMARY KEY,
+    persona    TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Consultas fixas: o sqlite3 guarda-as no cache de statements preparados da conexão
+_SQL_USER_GET = "SELECT value FROM user_data WHERE user_id = ? AND key = ?"
+_SQL_USER_UPSERT = (
+    "INSERT INTO user_data (user_id, key, value) VALUES (?, ?, ?) "
+    "ON CONFLICT (user_id, key) DO UPDATE SET value = excluded.value"
+)
+_SQL_USER_RECORD = "SELECT key, value FROM user_data WHERE user_id = ?"
+_SQL_USER_ALL = "SELECT user_id, key, value FROM user_data"
+_SQL_USER_DELETE = "DELETE FROM user_data WHERE user_id = ? AND key = ?"
+
+_SQL_ITEMS_GET = "SELECT item, value FROM knowledge_items WHERE namespace = ?"
+_SQL_ITEMS_UPSERT = (
+    "INSERT INTO knowledge_items (namespace, item, value) VALUES (?, ?, ?) "
+    "ON CONFLICT (namespace, item) DO UPDATE SET value = excluded.value"
+)
+_SQL_ITEMS_DELETE = "DELETE FROM knowledge_items WHERE namespace = ? AND item = ?"
+_SQL_ITEMS_CLEAR = "DELETE FROM knowledge_items WHERE namespace = ?"
+
+_SQL_BLOB_GET = "SELECT value FROM knowledge_blobs WHERE namespace = ?"
+_SQL_BLOB_UPSERT = (
+    "INSERT INTO knowledge_blobs (namespace, value) VALUES (?, ?) "
+    "ON CONFLICT (namespace) DO UPDATE SET value = excluded.value"
+)
+_SQL_BLOB_DELETE = "DELETE FROM knowledge_blobs WHERE namespace = ?"
+
+_SQL_GUILD_ALL = "SELECT guild_id, config FROM guild_configs"
+_SQL_GUILD_UPSERT = (
+    "INSERT INTO guild_configs (guild_id, config) VALUES (?, ?) "
+    "ON CONFLICT (guild_id) DO UPDATE SET config = excluded.config"
+)
+_SQL_GUILD_DELETE = "DELETE FROM guild_configs WHERE guild_id = ?"
+
+_SQL_CHANNEL_ALL = "SELECT channel_id, persona FROM channels"
+_SQL_CHANNEL_UPSERT = (
+    "INSERT INTO channels (channel_id, persona) VALUES (?, ?) "
+    "ON CONFLICT (channel_id) DO UPDATE SET persona = excluded.persona"
+)
+_SQL_CHANNEL_DELETE = "DELETE FROM channels WHERE channel_id = ?"
+
+_SQL_META_GET = "SELECT value FROM meta WHERE key = ?"
+_SQL_META_SET = (
+    "INSERT INTO meta (key, value) VALUES (?, ?) "
+    "ON CONFLICT (key) DO UPDATE SET value = excluded.value"
+)
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _decode(raw: str) -> Any:
+    return json.loads(raw)
+
+
+class SqliteIO:
+    """
+    Motor de I/O em SQLite (modo WAL). Cada chave vive na sua própria linha,
+    então uma escrita custa o mesmo independentemente do tamanho da base.
+    """
+
+    def __init__(self, path: Path):
+        self.logger = logging.getLogger("SamBot.Archive.SQLite")
+        self.path = path
+        self._lock = threading.Lock()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(
+            str(path), check_same_thread=False, cached_statements=64
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    # --- META ---
+    def get_meta(self, key: str, default: str = None) -> str:
+        with self._lock:
+            row = self.conn.execute(_SQL_META_GET, (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value: str):
+        with self._lock, self.conn:
+            self.conn.execute(_SQL_META_SET, (key, value))
+
+    # --- USUÁRIOS ---
+    def get_user_value(self, user_id: str, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            row = self.conn.execute(_SQL_USER_GET, (str(user_id), key)).fetchone()
+        if row is None:
+            return False, None
+        return True, _decode(row[0])
+
+    def set_user_value(self, user_id: str, key: str, value: Any):
+        with self._lock, self.conn:
+            self.conn.execute(_SQL_USER_UPSERT, (str(user_id), key, _encode(value)))
+
+    def get_user_record(self, user_id: str) -> Dict[str, Any]:
+        with self._lock:
+            rows = self.conn.execute(_SQL_USER_RECORD, (str(user_id),)).fetchall()
+        return {key: _decode(raw) for key, raw in rows}
+
+    def set_user_values(self, user_id: str, changes: Dict[str, Any]):
+        """Grava várias chaves do mesmo usuário numa única transação."""
+        user_id = str(user_id)
+        with self._lock, self.conn:
+            self.conn.executemany(
+                _SQL_USER_UPSERT,
+                [(user_id, key, _encode(value)) for key, value in changes.items()],
+            )
+
+    def get_all_users(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            rows = self.conn.execute(_SQL_USER_ALL).fetchall()
+        data: Dict[str, Dict[str, Any]] = {}
+        for user_id, key, raw in rows:
+            data.setdefault(user_id, {})[key] = _decode(raw)
+        return data
+
+    def replace_users(self, data: Dict[str, Dict[str, Any]]):
+        """Sincroniza o documento inteiro gravando apenas as linhas que mudaram."""
+        wanted = {
+            (str(user_id), key): _encode(value)
+            for user_id, record in data.items()
+            if isinstance(record, dict)
+            for key, value in record.items()
+        }
+        with self._lock, self.conn:
+            current = {
+                (user_id, key): raw
+                for user_id, key, raw in self.conn.execute(_SQL_USER_ALL)
+            }
+            self.conn.executemany(
+                _SQL_USER_UPSERT,
+                [(u, k, raw) for (u, k), raw in wanted.items() if current.get((u, k)) != raw],
+            )
+            self.conn.executemany(
+                _SQL_USER_DELETE, [pk for pk in current if pk not in wanted]
+            )
+
+    # --- CONHECIMENTO ---
+    def get_knowledge(self, namespace: str) -> Any:
+        with self._lock:
+            rows = self.conn.execute(_SQL_ITEMS_GET, (namespace,)).fetchall()
+            if rows:
+                return {item: _decode(raw) for item, raw in rows}
+            row = self.conn.execute(_SQL_BLOB_GET, (namespace,)).fetchone()
+        return _decode(row[0]) if row else None
+
+    def save_knowledge(self, namespace: str, data: Any):
+        with self._lock, self.conn:
+            if isinstance(data, dict):
+                self.conn.execute(_SQL_BLOB_DELETE, (namespace,))
+                self._sync_rows(
+                    self.conn.execute(_SQL_ITEMS_GET, (namespace,)),
+                    data.items(),
+                    upsert=lambda item, raw: (namespace, item, raw),
+                    delete=lambda item: (namespace, item),
+                    sql_upsert=_SQL_ITEMS_UPSERT,
+                    sql_delete=_SQL_ITEMS_DELETE,
+                )
+            else:
+                self.conn.execute(_SQL_ITEMS_CLEAR, (namespace,))
+                self.conn.execute(_SQL_BLOB_UPSERT, (namespace, _encode(data)))
+
+    # --- CONFIGURAÇÕES DE SERVIDOR ---
+    def get_guild_configs(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self.conn.execute(_SQL_GUILD_ALL).fetchall()
+        return {guild_id: _decode(raw) for guild_id, raw in rows}
+
+    def save_guild_configs(self, data: Dict[str, Any]):
+        with self._lock, self.conn:
+            self._sync_rows(
+                self.conn.execute(_SQL_GUILD_ALL),
+                data.items(),
+                upsert=lambda guild_id, raw: (guild_id, raw),
+                delete=lambda guild_id: (guild_id,),
+                sql_upsert=_SQL_GUILD_UPSERT,
+                sql_delete=_SQL_GUILD_DELETE,
+            )
+
+    # --- CANAIS ATIVOS ---
+    def get_channels(self) -> Dict[str, str]:
+        with self._lock:
+            rows = self.conn.execute(_SQL_CHANNEL_ALL).fetchall()
+        return {channel_id: _decode(raw) for channel_id, raw in rows}
+
+    def save_channels(self, data: Dict[str, Any]):
+        with self._lock, self.conn:
+            self._sync_rows(
+                self.conn.execute(_SQL_CHANNEL_ALL),
+                data.items(),
+                upsert=lambda channel_id, raw: (channel_id, raw),
+                delete=lambda channel_id: (channel_id,),
+                sql_upsert=_SQL_CHANNEL_UPSERT,
+                sql_delete=_SQL_CHANNEL_DELETE,
+            )
+
+    def _sync_rows(
+        self,
+        current_rows: Iterable[Tuple[str, str]],
+        wanted_items: Iterable[Tuple[Any, Any]],
+        upsert,
+        delete,
+        sql_upsert: str,
+        sql_delete: str,
+    ):
+        """Compara o estado gravado com o desejado e executa só os upserts/deletes necessários."""
+        current = dict(current_rows)
+        wanted = {str(k): _encode(v) for k, v in wanted_items}
+        self.conn.executemany(
+            sql_upsert,
+            [upsert(k, raw) for k, raw in wanted.items() if current.get(k) != raw],
+        )
+        self.conn.executemany(sql_delete, [delete(k) for k in current if k not in wanted])
+
+    def close(self):
+        with self._lock:
+            try:
+                self.conn.commit()
+                self.conn.close()
+            except sqlite3.ProgrammingError:
+                pass
+
+
+def migrate_json_to_sqlite(db: SqliteIO, folders: Dict[str, Path], io: JsonIO = None) -> bool:
+    """
+    Migração única dos ficheiros JSON legados para o SQLite.
+    Importa Users/users.json, Knowledge/*.json (guild_configs vai para a própria tabela)
+    e channels.json. Só corre uma vez: o resultado fica marcado na tabela meta.
+    """
+    logger = logging.getLogger("SamBot.Archive.Migration")
+    if db.get_meta("migrated_from_json"):
+        return False
+
+    io = io or JsonIO()
+    logger.info("📦 Migrando dados JSON legados para SQLite...")
+
+    users = io.read(folders["users"] / "users.json", default_type=dict)
+    if users:
+        db.replace_users(users)
+    logger.info(f"   - users.json: {len(users)} usuário(s)")
+
+    for path in sorted(folders["knowledge"].glob("*.json")):
+        data = io.read(path, default_type=dict)
+        if path.stem == "guild_configs":
+            db.save_guild_configs(data if isinstance(data, dict) else {})
+        else:
+            db.save_knowledge(path.stem, data)
+        logger.info(f"   - {path.name} importado")
+
+    channels_path = folders["config"] / "channels.json"
+    if not channels_path.exists():
+        channels_path = folders["persistence"] / "channels.json"
+    channels = io.read(channels_path, default_type=dict)
+    if channels:
+        db.save_channels(channels)
+        logger.info(f"   - channels.json: {len(channels)} canal(is)")
+
+    db.set_meta("migrated_from_json", "1")
+    logger.info("✅ Migração para SQLite concluída.")
+    return True
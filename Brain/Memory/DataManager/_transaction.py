@@ -0,0 +1,81 @@
+# Brain/Memory/DataManager/_transaction.py
+
+import copy
+import asyncio
+import inspect
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Union
+
+_MISSING = object()
+
+
+class UserLockRegistry:
+    """
+    Registro de travas assíncronas por usuário.
+    As travas são guardadas por referência fraca e somem assim que nenhum comando as usa.
+    """
+
+    def __init__(self):
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+
+    def get(self, user_id: str) -> asyncio.Lock:
+        user_id = str(user_id)
+        lock = self._locks.get(user_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[user_id] = lock
+        return lock
+
+
+class UserTransaction:
+    """
+    Contexto assíncrono que carrega o registro do usuário uma vez, expõe-no como dict
+    mutável e grava todas as chaves alteradas numa única escrita ao sair sem exceção.
+    Se o bloco levantar erro, as alterações são descartadas.
+    `load` e `commit` podem ser síncronos ou corrotinas (fachada assíncrona).
+    """
+
+    def __init__(
+        self,
+        user_id: str,
+        lock: asyncio.Lock,
+        load: Callable[[str], Union[Dict[str, Any], Awaitable[Dict[str, Any]]]],
+        commit: Callable[[str, Dict[str, Any]], Any],
+    ):
+        self.user_id = str(user_id)
+        self._lock = lock
+        self._load = load
+        self._commit = commit
+        self._original: Dict[str, Any] = {}
+        self.record: Dict[str, Any] = {}
+
+    async def __aenter__(self) -> Dict[str, Any]:
+        await self._lock.acquire()
+        try:
+            record = self._load(self.user_id)
+            if inspect.isawaitable(record):
+                record = await record
+            self.record = record
+            self._original = copy.deepcopy(self.record)
+        except BaseException:
+            self._lock.release()
+            raise
+        return self.record
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                changes = {
+                    key: value
+                    for key, value in self.record.items()
+                    if self._original.get(key, _MISSING) != value
+                }
+                if changes:
+                    result = self._commit(self.user_id, changes)
+                    if inspect.isawaitable(result):
+                        await result
+        finally:
+            self._lock.release()
+        return False
@@ -0,0 +1,180 @@
+# Brain/Memory/DataManager/_user_store.py
+
+import heapq
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+LoadRecord = Callable[[str], Dict[str, Any]]
+CommitRecord = Callable[[str, Dict[str, Any]], None]
+
+
+class UserStore:
+    """
+    Registro único por usuário, partilhado por todas as cogs.
+
+    Layout de cada registro (no mesmo armazenamento de get_user_data):
+        {
+            "carteira": ..., "banco": ..., "portfolio": {...},   # economia
+            "xp": 1234, "mensagens": 56,                         # XP global
+            "guilds": {"<guild_id>": {"xp": 900, "mensagens": 40}}
+        }
+
+    Para os rankings é mantido um índice em RAM (xp global e xp por servidor),
+    construído uma vez e atualizado pelo provedor a cada escrita (note_changes),
+    então perfil/rank nunca precisam carregar a base inteira.
+    """
+
+    def __init__(
+        self,
+        load_record: LoadRecord,
+        commit_record: CommitRecord,
+        all_records: Callable[[], Dict[str, Dict[str, Any]]],
+    ):
+        self.logger = logging.getLogger("SamBot.Archive.Users")
+        self._load = load_record
+        self._commit = commit_record
+        self._all_records = all_records
+
+        self._lock = threading.RLock()
+        self._global: Optional[Dict[str, int]] = None
+        self._guilds: Dict[str, Dict[str, int]] = {}
+
+    # --- ÍNDICE ---
+    def _ensure_index(self):
+        if self._global is not None:
+            return
+        with self._lock:
+            if self._global is not None:
+                return
+            global_xp, guilds = {}, {}
+            for user_id, record in self._all_records().items():
+                if not isinstance(record, dict):
+                    continue
+                global_xp[user_id] = int(record.get("xp", 0) or 0)
+                for guild_id, sub in (record.get("guilds") or {}).items():
+                    guilds.setdefault(guild_id, {})[user_id] = int(sub.get("xp", 0) or 0)
+            self._guilds = guilds
+            self._global = global_xp
+
+    def invalidate(self):
+        """Descarta o índice (ex.: alguém substituiu a base inteira)."""
+        with self._lock:
+            self._global = None
+            self._guilds = {}
+
+    def note_changes(self, user_id: str, changes: Dict[str, Any]):
+        """Hook chamado pelo provedor sempre que chaves de um registro são gravadas."""
+        if self._global is None or not ("xp" in changes or "guilds" in changes):
+            return
+        user_id = str(user_id)
+        with self._lock:
+            if self._global is None:
+                return
+            if "xp" in changes:
+                self._global[user_id] = int(changes["xp"] or 0)
+            if "guilds" in changes:
+                for guild_id, sub in (changes["guilds"] or {}).items():
+                    self._guilds.setdefault(guild_id, {})[user_id] = int(
+                        sub.get("xp", 0) or 0
+                    )
+
+    # --- LEITURA ---
+    def get(self, user_id: str) -> Dict[str, Any]:
+        """Registro completo do usuário (cópia), numa única leitura."""
+        return self._load(str(user_id))
+
+    def guild_xp(self, user_id: str, guild_id: Optional[str] = None) -> int:
+        self._ensure_index()
+        tabela = self._global if guild_id is None else self._guilds.get(str(guild_id), {})
+        return tabela.get(str(user_id), 0)
+
+    def standing(self, user_id: str, guild_id: Optional[str] = None) -> Tuple[int, Optional[int]]:
+        """(xp, posição no ranking) do usuário; posição é None quando não tem XP."""
+        self._ensure_index()
+        with self._lock:
+            tabela = self._global if guild_id is None else self._guilds.get(str(guild_id), {})
+            xp = tabela.get(str(user_id), 0)
+            if xp <= 0:
+                return xp, None
+            return xp, 1 + sum(1 for outro in tabela.values() if outro > xp)
+
+    def leaderboard(self, guild_id: Optional[str] = None, limit: int = 5) -> List[Tuple[str, int]]:
+        """Top N (user_id, xp) com XP > 0, global ou de um servidor."""
+        self._ensure_index()
+        with self._lock:
+            tabela = self._global if guild_id is None else self._guilds.get(str(guild_id), {})
+            return heapq.nlargest(
+                limit,
+                ((uid, xp) for uid, xp in tabela.items() if xp > 0),
+                key=lambda item: item[1],
+            )
+
+    # --- ESCRITA ---
+    def add_xp(
+        self, user_id: str, guild_id: Optional[str], amount: int, mensagens: int = 1
+    ) -> Tuple[int, int]:
+        """
+        Soma XP ao servidor (se houver) e ao global numa única escrita.
+        Devolve (xp_antigo, xp_novo) do escopo local — ou do global sem servidor.
+        """
+        user_id = str(user_id)
+        with self._lock:
+            record = self._load(user_id)
+            changes = {
+                "xp": int(record.get("xp", 0) or 0) + amount,
+                "mensagens": int(record.get("mensagens", 0) or 0) + mensagens,
+            }
+            antes, depois = changes["xp"] - amount, changes["xp"]
+
+            if guild_id is not None:
+                guild_id = str(guild_id)
+                guilds = record.get("guilds") or {}
+                sub = guilds.setdefault(guild_id, {"xp": 0, "mensagens": 0})
+                antes = int(sub.get("xp", 0) or 0)
+                sub["xp"] = depois = antes + amount
+                sub["mensagens"] = int(sub.get("mensagens", 0) or 0) + mensagens
+                changes["guilds"] = guilds
+
+            self._commit(user_id, changes)
+        return antes, depois
+
+
+def _maior(atual: Dict[str, Any], novo: Dict[str, Any], chave: str) -> int:
+    return max(int(atual.get(chave, 0) or 0), int(novo.get(chave, 0) or 0))
+
+
+def merge_legacy_xp(
+    legacy: Dict[str, Any], load_record: LoadRecord, commit_record: CommitRecord
+) -> int:
+    """
+    Funde o antigo Knowledge/users.json ({guild_id|"global": {user_id: {xp, mensagens}}})
+    nos registros unificados. Em caso de conflito fica o maior valor, para ninguém
+    perder nível. Devolve quantos usuários foram alterados.
+    """
+    por_usuario: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for escopo, usuarios in (legacy or {}).items():
+        if not isinstance(usuarios, dict):
+            continue
+        for user_id, dados in usuarios.items():
+            if isinstance(dados, dict):
+                por_usuario.setdefault(str(user_id), {})[str(escopo)] = dados
+
+    for user_id, escopos in por_usuario.items():
+        record = load_record(user_id)
+        changes: Dict[str, Any] = {}
+        guilds = record.get("guilds") or {}
+        for escopo, dados in escopos.items():
+            if escopo == "global":
+                changes["xp"] = _maior(record, dados, "xp")
+                changes["mensagens"] = _maior(record, dados, "mensagens")
+            else:
+                atual = guilds.get(escopo, {})
+                guilds[escopo] = {
+                    "xp": _maior(atual, dados, "xp"),
+                    "mensagens": _maior(atual, dados, "mensagens"),
+                }
+        if guilds:
+            changes["guilds"] = guilds
+        commit_record(user_id, changes)
+    return len(por_usuario)
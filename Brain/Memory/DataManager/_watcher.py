@@ -0,0 +1,183 @@
+# Brain/Memory/DataManager/_watcher.py
+
+import os
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Stamp = Optional[Tuple[int, int]]  # (mtime_ns, tamanho) ou None se o ficheiro não existe
+
+
+def _stamp(path: Path) -> Stamp:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class _WatchedFile:
+    __slots__ = ("path", "load", "stamp", "value")
+
+    def __init__(self, path: Path, load: Callable[[Path], Any], stamp: Stamp, value: Any):
+        self.path = path
+        self.load = load
+        self.stamp = stamp
+        self.value = value
+
+
+class _WatchedDir:
+    __slots__ = ("path", "pattern", "callback", "stamps")
+
+    def __init__(self, path: Path, pattern: str, callback: Callable[[Path], None]):
+        self.path = path
+        self.pattern = pattern
+        self.callback = callback
+        self.stamps: Dict[Path, Stamp] = {}
+
+
+class FileWatcher:
+    """
+    Mantém versões já interpretadas de ficheiros em RAM e troca-as quando o ficheiro
+    muda no disco. Uma thread daemon verifica mtime/tamanho a cada `interval`
+    segundos (um os.stat por ficheiro, custo desprezível). Os leitores só fazem
+    `get(chave)`: a troca é uma atribuição de referência, então nunca veem um
+    documento pela metade. Se o novo conteúdo não interpretar (editor a meio da
+    gravação, JSON inválido), a versão anterior continua em uso.
+    """
+
+    def __init__(self, interval: float = 2.0):
+        self.logger = logging.getLogger("SamBot.Archive.Watcher")
+        self.interval = interval
+        self._files: Dict[str, _WatchedFile] = {}
+        self._dirs: List[_WatchedDir] = []
+        self._listeners: List[Callable[[str, Any], None]] = []
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- REGISTRO ---
+    def watch(
+        self,
+        key: str,
+        path: Path,
+        load: Callable[[Path], Any],
+        initial: Optional[Callable[[], Any]] = None,
+    ):
+        """
+        Passa a vigiar `path`. `load(path)` interpreta o ficheiro e deve levantar erro
+        se o conteúdo for inválido. `initial()` fornece o valor de arranque quando a
+        fonte da verdade não é o próprio ficheiro (ex.: SQLite).
+        """
+        path = Path(path)
+        stamp = _stamp(path)
+        if initial is not None:
+            value = initial()
+        else:
+            value = self._safe_load(key, path, load)
+        with self._lock:
+            self._files[key] = _WatchedFile(path, load, stamp, value)
+        self._ensure_thread()
+
+    def watch_dir(self, path: Path, pattern: str, callback: Callable[[Path], None]):
+        """Chama `callback(ficheiro)` quando um ficheiro do padrão muda, surge ou some."""
+        watched = _WatchedDir(Path(path), pattern, callback)
+        watched.stamps = {p: _stamp(p) for p in watched.path.glob(pattern)}
+        with self._lock:
+            self._dirs.append(watched)
+        self._ensure_thread()
+
+    def add_listener(self, callback: Callable[[str, Any], None]):
+        """Regista `callback(chave, novo_valor)`, chamado depois de cada troca vinda do disco."""
+        self._listeners.append(callback)
+
+    # --- LEITURA E ESCRITA ---
+    def __contains__(self, key: str) -> bool:
+        return key in self._files
+
+    def get(self, key: str, default: Any = None) -> Any:
+        watched = self._files.get(key)
+        return default if watched is None else watched.value
+
+    def update(self, key: str, value: Any):
+        """O próprio bot gravou o ficheiro: troca o valor e aceita o novo mtime sem reler."""
+        with self._lock:
+            watched = self._files.get(key)
+            if watched is not None:
+                watched.value = value
+                watched.stamp = _stamp(watched.path)
+
+    def check(self) -> List[str]:
+        """Uma passagem de verificação. Devolve as chaves recarregadas."""
+        alteradas = []
+        with self._lock:
+            files = list(self._files.items())
+            dirs = list(self._dirs)
+
+        for key, watched in files:
+            stamp = _stamp(watched.path)
+            if stamp == watched.stamp or stamp is None:
+                continue
+            try:
+                value = watched.load(watched.path)
+            except Exception as e:
+                self.logger.warning(f"⚠️ {watched.path.name} alterado mas inválido, mantendo a versão anterior: {e}")
+                watched.stamp = stamp
+                continue
+            with self._lock:
+                watched.value = value
+                watched.stamp = stamp
+            alteradas.append(key)
+            self.logger.info(f"♻️ Hot-reload: {watched.path.name} recarregado.")
+            self._notify(key, value)
+
+        for watched in dirs:
+            atuais = {p: _stamp(p) for p in watched.path.glob(watched.pattern)}
+            mudaram = [
+                p
+                for p in set(atuais) | set(watched.stamps)
+                if atuais.get(p) != watched.stamps.get(p)
+            ]
+            watched.stamps = atuais
+            for path in mudaram:
+                try:
+                    watched.callback(path)
+                except Exception as e:
+                    self.logger.warning(f"⚠️ Falha ao recarregar {path.name}: {e}")
+        return alteradas
+
+    def _safe_load(self, key: str, path: Path, load: Callable[[Path], Any]) -> Any:
+        if not path.exists():
+            return {}
+        try:
+            return load(path)
+        except Exception as e:
+            self.logger.error(f"Erro ao ler {path.name} para '{key}': {e}")
+            return {}
+
+    def _notify(self, key: str, value: Any):
+        for callback in list(self._listeners):
+            try:
+                callback(key, value)
+            except Exception as e:
+                self.logger.warning(f"⚠️ Listener de hot-reload falhou para '{key}': {e}")
+
+    # --- THREAD ---
+    def _ensure_thread(self):
+        if self.interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="SamBot-FileWatcher", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                self.logger.error(f"❌ Erro no vigia de ficheiros: {e}")
+
+    def close(self):
+        self._stop.set()
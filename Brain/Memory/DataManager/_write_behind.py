@@ -0,0 +1,166 @@
+# Brain/Memory/DataManager/_write_behind.py
+
+import copy
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Set
+
+from ._json_provider import JsonIO
+
+
+class WriteBehindStore:
+    """
+    Documento JSON mantido em RAM com escrita adiada (write-behind).
+    As escritas só marcam a chave como suja; várias alterações são fundidas
+    num único flush atómico, disparado por intervalo ou por excesso de chaves sujas.
+
+    `replace` pode trocar `self._data` a qualquer momento, por isso leituras e
+    escritas usam `self._data` sempre dentro do lock, nunca uma referência antiga.
+    Os valores de cada registro entram por cópia e nunca são alterados no lugar:
+    o flush tira só uma cópia rasa dos registros sob o lock e serializa fora dele.
+    """
+
+    def __init__(
+        self,
+        io: JsonIO,
+        path: Path,
+        flush_interval: float = 5.0,
+        max_dirty: int = 50,
+    ):
+        self.logger = logging.getLogger("SamBot.Archive.WriteBehind")
+        self.io = io
+        self.path = path
+        self.flush_interval = max(0.1, flush_interval)
+        self.max_dirty = max(1, max_dirty)
+
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._data: Dict[str, Any] = None
+        self._dirty: Set[str] = set()
+        self._wake = threading.Event()
+        self._closed = False
+        self._worker: threading.Thread = None
+
+    # --- CARREGAMENTO ---
+    def _ensure_loaded(self) -> Dict[str, Any]:
+        if self._data is None:
+            with self._lock:
+                if self._data is None:
+                    self._data = self.io.read(self.path, default_type=dict)
+        return self._data
+
+    def _start_worker(self):
+        if self._worker and self._worker.is_alive():
+            return
+        self._worker = threading.Thread(
+            target=self._run, name="SamBot-WriteBehind", daemon=True
+        )
+        self._worker.start()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    # --- LEITURA E ESCRITA ---
+    def get(self, record_id: str, key: str, default_value: Any = None) -> Any:
+        self._ensure_loaded()
+        with self._lock:
+            record = self._data.get(str(record_id))
+            if record is None or key not in record:
+                return default_value
+            return copy.deepcopy(record[key])
+
+    def set(self, record_id: str, key: str, value: Any):
+        self.update_record(record_id, {key: value})
+
+    def get_record(self, record_id: str) -> Dict[str, Any]:
+        """Cópia do registro inteiro de um usuário."""
+        self._ensure_loaded()
+        with self._lock:
+            return copy.deepcopy(self._data.get(str(record_id), {}))
+
+    def update_record(self, record_id: str, changes: Dict[str, Any]):
+        """Aplica várias chaves de uma vez, marcando o registro como sujo uma única vez."""
+        if not changes:
+            return
+        changes = copy.deepcopy(changes)
+        self._ensure_loaded()
+        record_id = str(record_id)
+        with self._lock:
+            self._data.setdefault(record_id, {}).update(changes)
+            self._dirty.add(record_id)
+            dirty_count = len(self._dirty)
+
+        if dirty_count >= self.max_dirty:
+            self._wake.set()
+        self._start_worker()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cópia independente do documento inteiro (para rotinas em lote)."""
+        self._ensure_loaded()
+        with self._lock:
+            return copy.deepcopy(self._data)
+
+    def replace(self, new_data: Dict[str, Any]):
+        """Substitui o documento inteiro, marcando todas as chaves como sujas."""
+        if not isinstance(new_data, dict):
+            return
+        new_data = copy.deepcopy(new_data)
+        with self._lock:
+            self._data = new_data
+            self._dirty.update(self._data.keys())
+            self._dirty.add("*")
+        self._wake.set()
+        self._start_worker()
+
+    @property
+    def dirty_count(self) -> int:
+        return len(self._dirty)
+
+    # --- PERSISTÊNCIA ---
+    def flush(self) -> bool:
+        """Serializa o estado atual e grava-o de uma só vez. Retorna True se escreveu algo."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty or self._data is None:
+                    return False
+                # Cópia rasa por registro: os valores nunca mudam no lugar (ver a classe)
+                estado = {
+                    rid: dict(record) if isinstance(record, dict) else record
+                    for rid, record in self._data.items()
+                }
+                sujos = set(self._dirty)
+                # O que mudar daqui em diante volta a sujar
+                self._dirty.clear()
+
+            pending = len(sujos)
+            try:
+                content = self.io.dumps(estado)
+            except (TypeError, ValueError) as e:
+                # Continua sujo: a próxima tentativa volta a serializar
+                self.logger.error(f"❌ Falha ao serializar {self.path.name}: {e}")
+                with self._lock:
+                    self._dirty.update(sujos)
+                return False
+
+            start = time.perf_counter()
+            if not self.io.write_atomic(self.path, content):
+                # Mantém o documento sujo para a próxima tentativa
+                with self._lock:
+                    self._dirty.add("*")
+                return False
+            self.logger.debug(
+                f"💾 Flush de {pending} registro(s) em {self.path.name} "
+                f"({len(content)} bytes, {(time.perf_counter() - start) * 1000:.1f}ms)"
+            )
+            return True
+
+    def close(self):
+        """Encerra o worker e garante que nada fica por gravar."""
+        self._closed = True
+        self._wake.set()
+        self.flush()
@@ -4,6 +4,7 @@ import uuid
 import time
 import logging
 from ._embeddings import SmartEmbeddingFunction
+from Brain.Core.Tracing import tracer
 
 logger = logging.getLogger("SamBot.VectorStore")
 
@@ -62,6 +63,61 @@ class VectorStore:
         except Exception as e:
             logger.error(f"❌ Erro ao salvar memória: {e}")
 
+    async def add_memories(
+        self,
+        collection_name: str,
+        texts: list,
+        metadatas: list,
+        embeddings: list = None,
+    ) -> int:
+        """Grava vários documentos num só `add` (e um só lote de embeddings, se não vierem prontos)."""
+        if not self.client or not texts:
+            return 0
+
+        try:
+            col = self.collections.get(collection_name)
+            if not col:
+                return 0
+
+            if embeddings is None:
+                embeddings = await self.embedding_fn.get_embeddings(texts)
+            agora = int(time.time() * 1000)
+            col.add(
+                documents=list(texts),
+                embeddings=list(embeddings),
+                metadatas=list(metadatas),
+                ids=[f"mem_{agora}_{uuid.uuid4().hex[:4]}" for _ in texts],
+            )
+            logger.debug(
+                f"💾 {len(texts)} memórias salvas em {collection_name} ({self.embedding_fn.working_mode})"
+            )
+            return len(texts)
+        except Exception as e:
+            logger.error(f"❌ Erro ao salvar memórias em lote: {e}")
+            return 0
+
+    async def nearest_distances(
+        self, collection_name: str, embeddings: list, where: dict = None
+    ) -> list:
+        """
+        Distância de cosseno (0 = idêntico) de cada vetor ao documento mais próximo já
+        gravado, opcionalmente filtrado por metadados. None quando não há com quem comparar.
+        """
+        vazio = [None] * len(embeddings)
+        if not self.client or not embeddings:
+            return vazio
+
+        try:
+            col = self.collections.get(collection_name)
+            if not col or col.count() == 0:
+                return vazio
+            with tracer.span("rag.busca"):
+                res = col.query(query_embeddings=list(embeddings), n_results=1, where=where)
+            return [d[0] if d else None for d in res.get("distances") or vazio]
+        except Exception as e:
+            logger.error(f"❌ Erro ao comparar com as memórias existentes: {e}")
+            return vazio
+
     async def query_relevant(
         self, collection_name: str, query: str, n_results: int = 2
     ) -> list:
@@ -73,10 +129,12 @@ class VectorStore:
             if not col or col.count() == 0:
                 return []
 
-            embedding = await self.embedding_fn.get_single_embedding(query)
-            res = col.query(
-                query_embeddings=[embedding], n_results=min(n_results, col.count())
-            )
+            with tracer.span("rag.embedding"):
+                embedding = await self.embedding_fn.get_single_embedding(query)
+            with tracer.span("rag.busca"):
+                res = col.query(
+                    query_embeddings=[embedding], n_results=min(n_results, col.count())
+                )
 
             if res and "documents" in res and res["documents"]:
                 return res["documents"][0]
@@ -6,6 +6,7 @@ from dotenv import load_dotenv
 
 from Brain.Memory.DataManager import data_manager
 from Brain.Providers.LLMFactory import llm_factory
+from Brain.Core.SingleFlight import fingerprint, get_flight
 
 load_dotenv()
 logger = logging.getLogger("SamBot.Embeddings")
@@ -17,6 +18,7 @@ class SmartEmbeddingFunction(EmbeddingFunction):
         self.working_mode = "IDLE"
 
         self.ai_chain = llm_factory.get_default_principal_chain()
+        self._em_voo = get_flight("embeddings")
 
         self._load_preference()
 
@@ -43,12 +45,15 @@ class SmartEmbeddingFunction(EmbeddingFunction):
         """
         Solicita o vetor à cadeia principal.
         A própria cadeia tenta o Gemini primeiro e, se falhar, aciona o Ollama local.
+        Pedidos simultâneos pelo mesmo texto partilham uma única chamada.
         """
         if not text:
             return [0.0] * 768
 
         try:
-            embedding = await self.ai_chain.get_embedding(text)
+            embedding = await self._em_voo.do(
+                fingerprint(text), lambda: self.ai_chain.get_embedding(text)
+            )
 
             if embedding:
                 self.working_mode = "CHAIN_ACTIVE"
@@ -60,10 +65,29 @@ class SmartEmbeddingFunction(EmbeddingFunction):
         self.working_mode = "ERROR"
         return [0.0] * 768
 
+    async def get_embeddings(self, texts: list) -> list:
+        """
+        Vetores de vários textos num só pedido à cadeia (um por texto, na mesma ordem).
+        Se o lote falhar em todos os provedores, cada texto leva o vetor de zeros.
+        """
+        if not texts:
+            return []
+
+        try:
+            vetores = await self.ai_chain.get_embeddings(list(texts))
+            if vetores:
+                self.working_mode = "CHAIN_ACTIVE"
+                return vetores
+        except Exception as e:
+            logger.error(f"❌ [Embeddings] Erro inesperado no lote de vetores: {e}")
+
+        self.working_mode = "ERROR"
+        return [[0.0] * 768 for _ in texts]
+
     def __call__(self, input):
         """Ponto de entrada síncrono exigido pelo ChromaDB."""
         import asyncio
 
         if isinstance(input, str):
             return [asyncio.run(self.get_single_embedding(input))]
-        return [asyncio.run(self.get_single_embedding(t)) for t in input]
+        return asyncio.run(self.get_embeddings(input))
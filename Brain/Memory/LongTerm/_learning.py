@@ -1,61 +1,250 @@
+import os
+import re
+import json
+import time
+import asyncio
 import logging
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Dict, List, Optional
 import discord
 
+GATILHOS = [
+    "meu nome",
+    "eu gosto",
+    "eu amo",
+    "eu odeio",
+    "eu moro",
+    "sou ",
+    "tenho ",
+    "trabalho com",
+]
+
+EXTRACTION_INSTRUCTION = (
+    "Você é o Núcleo de Memória da SamBot. Recebe mensagens numeradas de vários usuários "
+    "e extrai apenas fatos PERMANENTES sobre quem escreveu (gostos, nome, onde mora, trabalho).\n"
+    "Ignore lixo, piadas e estados temporários. Cada fato é curto, na terceira pessoa, sem o nome.\n"
+    "Ex: 'Eu amo pizza' -> 'Gosta de pizza'\n"
+    "Responda ESTRITAMENTE com JSON, sem markdown, no formato: "
+    '{"fatos": [{"id": 1, "fato": "Gosta de pizza"}]}. '
+    'Sem fatos, responda {"fatos": []}.'
+)
+
+_ESPACOS = re.compile(r"\s+")
+
+
+@dataclass
+class _Candidato:
+    message: discord.Message
+    user_id: str
+    user_name: str
+    texto: str
+
 
 class AprendizadoAtivo:
-    def __init__(self, llm_factory, vector_store):
+    """
+    Aprendizado de fatos fora do caminho da resposta. `aprender_fatos` só filtra a
+    mensagem pelos gatilhos e a põe numa fila; uma tarefa em segundo plano junta
+    até `batch_size` mensagens (de vários usuários, ou o que chegar em `max_wait`
+    segundos) num único pedido de extração com saída JSON, na cadeia auxiliar e
+    na classe "fundo" da fila de LLM. Os fatos repetidos (no lote ou já na memória
+    do mesmo usuário, acima de `dedupe_similarity`) são descartados, os restantes
+    vão para o VectorStore com um só lote de embeddings, e a mensagem de origem
+    ganha a reação 🧠.
+    """
+
+    def __init__(
+        self,
+        llm_factory,
+        vector_store,
+        batch_size: int = None,
+        max_wait: float = None,
+        dedupe_similarity: float = None,
+        queue_max: int = None,
+    ):
         self.llm_factory = llm_factory
         self.vector_store = vector_store
         self.logger = logging.getLogger("SamBot.Aprendizado")
 
-    async def aprender_fatos(self, message: discord.Message, clean_text: str) -> str:
-        if not clean_text or not self.llm_factory or not self.vector_store:
-            return None
-
-        gatilhos = [
-            "meu nome",
-            "eu gosto",
-            "eu amo",
-            "eu odeio",
-            "eu moro",
-            "sou ",
-            "tenho ",
-            "trabalho com",
+        self.ai_chain = llm_factory.get_default_auxiliary_chain() if llm_factory else None
+        self.batch_size = batch_size or int(os.getenv("LEARNING_BATCH_SIZE", "8"))
+        self.max_wait = max_wait if max_wait is not None else float(os.getenv("LEARNING_BATCH_WAIT", "20"))
+        self.dedupe_similarity = dedupe_similarity or float(
+            os.getenv("LEARNING_DEDUPE_SIMILARITY", "0.9")
+        )
+        self._fila: asyncio.Queue = asyncio.Queue(
+            maxsize=queue_max or int(os.getenv("LEARNING_QUEUE_MAX", "200"))
+        )
+        self._worker: Optional[asyncio.Task] = None
+        self._despejar = asyncio.Event()
+
+        self.contadores = {"enfileiradas": 0, "descartadas": 0, "lotes": 0, "fatos": 0, "duplicados": 0}
+
+    # --- ENTRADA ---
+    def aprender_fatos(self, message: discord.Message, clean_text: str) -> bool:
+        """Enfileira a mensagem se parecer trazer um fato. Não chama o LLM; devolve se entrou."""
+        if not clean_text or not self.ai_chain or not self.vector_store:
+            return False
+        if not any(g in clean_text.lower() for g in GATILHOS):
+            return False
+
+        candidato = _Candidato(
+            message, str(message.author.id), message.author.display_name, clean_text
+        )
+        try:
+            self._fila.put_nowait(candidato)
+        except asyncio.QueueFull:
+            self.contadores["descartadas"] += 1
+            self.logger.debug("🔕 Fila de aprendizado cheia; mensagem ignorada.")
+            return False
+
+        self.contadores["enfileiradas"] += 1
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._trabalhar(), name="aprendizado")
+        return True
+
+    # --- TRABALHO EM SEGUNDO PLANO ---
+    async def _trabalhar(self):
+        while True:
+            lote = await self._proximo_lote()
+            try:
+                await self._processar_lote(lote)
+            except Exception as e:
+                self.logger.error(f"❌ Erro ao aprender (lote de {len(lote)}): {e}")
+            finally:
+                for _ in lote:
+                    self._fila.task_done()
+
+    async def _proximo_lote(self) -> List[_Candidato]:
+        """Espera a primeira mensagem e junta as seguintes até encher o lote ou passar `max_wait`."""
+        lote = [await self._fila.get()]
+        prazo = time.monotonic() + self.max_wait
+        while len(lote) < self.batch_size and not self._despejar.is_set():
+            restante = prazo - time.monotonic()
+            if restante <= 0:
+                break
+            try:
+                # Fatias curtas para notar o `drain` sem esperar o prazo inteiro
+                lote.append(await asyncio.wait_for(self._fila.get(), min(restante, 0.5)))
+            except asyncio.TimeoutError:
+                continue
+        return lote
+
+    def _montar_prompt(self, lote: List[_Candidato]) -> str:
+        linhas = [
+            f"[{i}] {c.user_name}: {json.dumps(_ESPACOS.sub(' ', c.texto), ensure_ascii=False)}"
+            for i, c in enumerate(lote, 1)
         ]
-        if not any(g in clean_text.lower() for g in gatilhos):
-            return None
+        return "Mensagens:\n" + "\n".join(linhas)
 
+    def _ler_fatos(self, bruto: str, lote: List[_Candidato]) -> Dict[int, List[str]]:
+        """JSON da extração -> {índice no lote: [fatos]} (ids inválidos e fatos vazios ficam de fora)."""
+        texto = (bruto or "").replace("```json", "").replace("```", "").strip()
+        inicio, fim = texto.find("{"), texto.rfind("}")
+        if inicio < 0 or fim < inicio:
+            return {}
         try:
-            user_name = message.author.display_name
-            system_prompt = (
-                "Você é o Núcleo de Memória da SamBot. Extraia fatos PERMANENTES.\n"
-                "Se for relevante, extraia APENAS o fato curto. Se for lixo/piada/temporário, responda 'IGNORE'.\n"
-                "Ex: 'Eu amo pizza' -> 'Gosta de pizza'"
-            )
+            dados = json.loads(texto[inicio : fim + 1])
+        except json.JSONDecodeError:
+            self.logger.warning(f"🤖 Extração de fatos com JSON inválido: '{bruto[:200]}'")
+            return {}
+
+        fatos: Dict[int, List[str]] = {}
+        for item in dados.get("fatos") or []:
+            if not isinstance(item, dict):
+                continue
+            try:
+                idx = int(item.get("id")) - 1
+            except (TypeError, ValueError):
+                continue
+            fato = _ESPACOS.sub(" ", str(item.get("fato") or "")).strip()[:200]
+            if 0 <= idx < len(lote) and len(fato) >= 3 and fato.upper() != "IGNORE":
+                fatos.setdefault(idx, []).append(fato)
+        return fatos
+
+    async def _processar_lote(self, lote: List[_Candidato]):
+        self.contadores["lotes"] += 1
+        extracao = await self.ai_chain.generate_response(
+            prompt_parts=[self._montar_prompt(lote)],
+            system_instruction=EXTRACTION_INSTRUCTION,
+            priority="fundo",
+        )
+        if not extracao or extracao.startswith("🤯"):
+            self.logger.debug("🔕 Cadeia auxiliar sem resposta; lote de aprendizado perdido.")
+            return
+
+        # Um fato por (usuário, texto normalizado): o mesmo gosto dito duas vezes no lote conta uma
+        vistos = set()
+        novos = []
+        for idx, fatos in sorted(self._ler_fatos(extracao, lote).items()):
+            c = lote[idx]
+            for fato in fatos:
+                chave = (c.user_id, fato.casefold())
+                if chave not in vistos:
+                    vistos.add(chave)
+                    novos.append((c, fato))
+        if not novos:
+            return
 
-            extracao = await self.ai_chain.generate_response(
-                prompt_parts=[f"Usuário {user_name} disse: '{clean_text}'"],
-                system_instruction=system_prompt,
+        textos = [f"Fato sobre {c.user_name}: {fato}" for c, fato in novos]
+        vetores = await self.vector_store.embedding_fn.get_embeddings(textos)
+        if not any(any(v) for v in vetores):
+            self.logger.warning("⚠️ Embeddings indisponíveis; lote de aprendizado perdido.")
+            return
+
+        # Descarta o que já está na memória do mesmo usuário (distância de cosseno pequena)
+        limite = 1 - self.dedupe_similarity
+        por_usuario: Dict[str, List[int]] = {}
+        for i, (c, _) in enumerate(novos):
+            por_usuario.setdefault(c.user_id, []).append(i)
+        manter = set(range(len(novos)))
+        for user_id, indices in por_usuario.items():
+            distancias = await self.vector_store.nearest_distances(
+                "fatos_usuario", [vetores[i] for i in indices], where={"user_id": user_id}
             )
+            for i, dist in zip(indices, distancias):
+                if dist is not None and dist <= limite:
+                    manter.discard(i)
+        self.contadores["duplicados"] += len(novos) - len(manter)
+        if not manter:
+            return
+
+        ordem = sorted(manter)
+        agora = str(datetime.now())
+        gravados = await self.vector_store.add_memories(
+            "fatos_usuario",
+            [textos[i] for i in ordem],
+            [
+                {"user_id": novos[i][0].user_id, "user_name": novos[i][0].user_name, "timestamp": agora}
+                for i in ordem
+            ],
+            embeddings=[vetores[i] for i in ordem],
+        )
+        if not gravados:
+            return
+        self.contadores["fatos"] += gravados
+        self.logger.info(f"🧠 {gravados} fato(s) aprendido(s) num lote de {len(lote)} mensagem(ns).")
+
+        mensagens = {id(novos[i][0].message): novos[i][0].message for i in ordem}
+        for message in mensagens.values():
+            try:
+                await message.add_reaction("🧠")
+            except Exception as e:
+                self.logger.debug(f"🔕 Sem reação 🧠 na mensagem {message.id}: {e}")
 
-            if "IGNORE" in extracao.upper() or len(extracao.strip()) < 3:
-                return None
-
-            if hasattr(self.vector_store, "add_memory"):
-                # Bug corrigido: Parâmetro collection_name definido explicitamente
-                await self.vector_store.add_memory(
-                    collection_name="fatos_usuario",
-                    text=f"Fato sobre {user_name}: {extracao}",
-                    metadata={
-                        "user_id": str(message.author.id),
-                        "user_name": user_name,
-                        "timestamp": str(datetime.now()),
-                    },
-                )
-
-            await message.add_reaction("🧠")
-            return extracao
-        except Exception as e:
-            self.logger.error(f"❌ Erro ao aprender: {e}")
-            return None
+    def stats(self) -> Dict[str, int]:
+        return {**self.contadores, "fila": self._fila.qsize()}
+
+    async def drain(self, timeout: float = 10.0):
+        """Processa já o que está na fila (sem esperar `max_wait`) e encerra a tarefa. Usado ao desligar."""
+        if self._worker is None or self._worker.done():
+            return
+        self._despejar.set()
+        try:
+            await asyncio.wait_for(self._fila.join(), timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning(
+                f"⏳ {self._fila.qsize()} mensagem(ns) de aprendizado ficaram por processar."
+            )
+        self._worker.cancel()
+        await asyncio.gather(self._worker, return_exceptions=True)
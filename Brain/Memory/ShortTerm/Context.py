@@ -1,54 +1,120 @@
+import os
+import atexit
+import logging
 import discord
-from Brain.Providers.LLMFactory import LLMFactory
+from typing import List, Optional
+
+from Brain.Providers.LLMFactory import llm_factory
+from Brain.Core.Tracing import tracer
+from Brain.Memory.DataManager import data_manager
+from ._buffer import ConversationBuffer, HistoryEntry
+from ._summary import RollingSummarizer
+
+logger = logging.getLogger("SamBot.ShortTerm")
 
 
 class HistoricoManager:
+    """
+    Memória de trabalho por canal. As mensagens chegam pelo on_message (incluindo
+    as respostas do próprio bot) e ficam num anel em RAM; a API REST do Discord só
+    é consultada na primeira resposta num canal frio, para semear o anel.
+    O que sai da janela recente é resumido aos poucos pelo `RollingSummarizer`.
+    """
+
     def __init__(self):
-        self.llm = LLMFactory.get_instance()
+        self.buffer = ConversationBuffer(
+            size=int(os.getenv("HISTORY_BUFFER_SIZE", "32")),
+            max_channels=int(os.getenv("HISTORY_MAX_CHANNELS", "1000")),
+            idle_ttl=float(os.getenv("HISTORY_IDLE_TTL", str(6 * 3600))),
+        )
+        self.resumos = RollingSummarizer(
+            llm_factory.get_default_auxiliary_chain(),
+            window=int(os.getenv("HISTORY_SUMMARY_WINDOW", "10")),
+            batch=int(os.getenv("HISTORY_SUMMARY_BATCH", "5")),
+        )
 
-    async def get_formatted_history(
-        self, message: discord.Message, bot_user: discord.User, limit=20
-    ):
-        """
-        Lê o histórico. Se houver mais de 10 mensagens, sumariza as antigas
-        para economizar tokens e manter o contexto.
-        """
-        raw_messages = []
+        self.persist_path = None
+        if os.getenv("HISTORY_PERSIST", "false").lower() in ("1", "true", "yes"):
+            self.persist_path = data_manager.folders["persistence"] / "short_term.json"
+            restaurados = self.buffer.load(self.persist_path, data_manager.io.read)
+            if restaurados:
+                logger.info(f"💬 Histórico de curto prazo restaurado para {restaurados} canais.")
+            atexit.register(self.salvar)
 
-        async for msg in message.channel.history(limit=limit, before=message):
-            if not msg.content:
-                continue
+    def salvar(self):
+        if self.persist_path is not None:
+            self.buffer.save(self.persist_path, data_manager.io.save)
 
-            author_name = "SamBot" if msg.author == bot_user else "User"
-            clean_content = msg.content.replace("\n", " ").strip()
-            if clean_content:
-                raw_messages.append(f"{author_name}: {clean_content}")
+    # --- ALIMENTAÇÃO ---
+    @staticmethod
+    def _entrada(msg: discord.Message, bot_user: discord.User) -> Optional[HistoryEntry]:
+        if not msg.content:
+            return None
+        clean_content = msg.content.replace("\n", " ").strip()
+        if not clean_content:
+            return None
+        return HistoryEntry(
+            msg.id,
+            msg.author.id,
+            msg.author.display_name,
+            clean_content,
+            msg.created_at.timestamp(),
+            msg.author == bot_user,
+        )
 
-        raw_messages.reverse()
+    def registrar(
+        self, msg: discord.Message, bot_user: discord.User, editada: bool = False
+    ):
+        """
+        Chamado para toda mensagem vista; só canais já acompanhados guardam alguma coisa.
+        Com `editada`, o texto substitui o que já estava guardado para o mesmo id.
+        """
+        entrada = self._entrada(msg, bot_user)
+        if entrada is not None:
+            self.buffer.observe(msg.channel.id, entrada, replace=editada)
 
-        # Lógica de Compressão
-        if len(raw_messages) > 10:
-            to_summarize = raw_messages[:-10]
-            recent_context = raw_messages[-10:]
+    async def _mensagens_anteriores(
+        self, message: discord.Message, bot_user: discord.User, limit: int
+    ) -> List[HistoryEntry]:
+        entradas = self.buffer.recent(message.channel.id, message.id, limit)
+        if entradas is not None:
+            return entradas
 
-            text_block = "\n".join(to_summarize)
+        # Canal frio: começa a acompanhar já e semeia com a REST
+        self.buffer.prime(message.channel.id)
+        lidas = []
+        async with tracer.span("historico.leitura", provider="discord"):
+            async for msg in message.channel.history(limit=limit, before=message):
+                entrada = self._entrada(msg, bot_user)
+                if entrada is not None:
+                    lidas.append(entrada)
+        self.buffer.seed(message.channel.id, lidas)
+        return self.buffer.recent(message.channel.id, message.id, limit) or []
 
-            try:
-                summary = await self.llm.generate_response(
-                    prompt_parts=[f"Conversa antiga:\n{text_block}"],
-                    system_instruction="Você é um otimizador de memória. Resuma a conversa anterior em 1 parágrafo conciso, mantendo nomes e tópicos chave.",
-                )
+    async def get_formatted_history(
+        self, message: discord.Message, bot_user: discord.User, limit=20
+    ):
+        """
+        Lê o histórico. As mensagens que já saíram da janela recente entram pelo
+        resumo acumulado do canal, atualizado em segundo plano (nunca esperamos por ele).
+        """
+        entradas = await self._mensagens_anteriores(message, bot_user, limit)
 
-                # Formata: Resumo + Chat Recente
-                final_history = (
-                    f"[RESUMO DA CONVERSA ANTERIOR]: {summary}\n"
-                    f"[MENSAGENS RECENTES]:\n" + "\n".join(recent_context)
-                )
-                return final_history
+        resumo, marca = "", 0
+        buf = self.buffer.channel(message.channel.id)
+        if buf is not None:
+            resumo, marca = buf.summary, buf.watermark
+            self.resumos.schedule(message.channel.id, buf)
 
-            except Exception as e:
-                # Fallback em caso de erro na LLM
-                return "\n".join(raw_messages[-10:])
+        # O que ainda não foi dobrado no resumo vai cru, para não haver buracos
+        recentes = [e for e in entradas if e.message_id > marca] if resumo else entradas
+        raw_messages = [
+            f"{'SamBot' if e.is_self else 'User'}: {e.content}" for e in recentes
+        ]
 
-        # Se for curto, retorna tudo
+        if resumo:
+            return (
+                f"[RESUMO DA CONVERSA ANTERIOR]: {resumo}\n"
+                f"[MENSAGENS RECENTES]:\n" + "\n".join(raw_messages)
+            )
         return "\n".join(raw_messages)
@@ -0,0 +1,192 @@
+# Brain/Memory/ShortTerm/_buffer.py
+
+import time
+import logging
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from Brain.Memory.Cache import get_cache
+
+logger = logging.getLogger("SamBot.ShortTerm.Buffer")
+
+
+class HistoryEntry:
+    """Uma mensagem já limpa, do jeito que entra no prompt. Slots: ~100 bytes + o texto."""
+
+    __slots__ = ("message_id", "author_id", "author", "content", "ts", "is_self")
+
+    def __init__(
+        self,
+        message_id: int,
+        author_id: int,
+        author: str,
+        content: str,
+        ts: float,
+        is_self: bool,
+    ):
+        self.message_id = message_id
+        self.author_id = author_id
+        self.author = author
+        self.content = content
+        self.ts = ts
+        self.is_self = is_self
+
+    def to_row(self) -> list:
+        return [self.message_id, self.author_id, self.author, self.content, self.ts, self.is_self]
+
+    @classmethod
+    def from_row(cls, row: list) -> "HistoryEntry":
+        return cls(int(row[0]), int(row[1]), str(row[2]), str(row[3]), float(row[4]), bool(row[5]))
+
+
+class ChannelBuffer:
+    """
+    Anel limitado com as últimas mensagens de um canal, em ordem de id (snowflake).
+    Só fica `warm` depois de semeado (REST ou disco): antes disso pode ter lacunas.
+    `summary` é o resumo acumulado de tudo até `watermark` (id da última mensagem
+    já dobrada nele); o que vem depois da marca ainda não foi resumido.
+    """
+
+    __slots__ = ("entries", "warm", "last_active", "summary", "watermark")
+
+    def __init__(self, maxlen: int):
+        self.entries: deque = deque(maxlen=maxlen)
+        self.warm = False
+        self.last_active = time.time()
+        self.summary = ""
+        self.watermark = 0
+
+    def append(self, entry: HistoryEntry, replace: bool = False) -> bool:
+        # A resposta do bot é registrada no envio e de novo pelo eco do gateway
+        for existente in reversed(self.entries):
+            if existente.message_id == entry.message_id:
+                if replace:
+                    # Mensagem editada (ex.: resposta em streaming já completa)
+                    existente.content = entry.content
+                return False
+            if existente.message_id < entry.message_id:
+                break
+        if self.entries and self.entries[-1].message_id > entry.message_id:
+            self._merge([entry])
+        else:
+            self.entries.append(entry)
+        self.last_active = time.time()
+        return True
+
+    def seed(self, entries: Iterable[HistoryEntry]):
+        self._merge(entries)
+        self.warm = True
+
+    def _merge(self, entries: Iterable[HistoryEntry]):
+        por_id = {e.message_id: e for e in entries}
+        por_id.update((e.message_id, e) for e in self.entries)
+        ordenadas = sorted(por_id.values(), key=lambda e: e.message_id)
+        self.entries = deque(ordenadas, maxlen=self.entries.maxlen)
+
+    def before(self, message_id: int, limit: int) -> List[HistoryEntry]:
+        anteriores = [e for e in self.entries if e.message_id < message_id]
+        return anteriores[-limit:] if limit else anteriores
+
+    def pending(self, keep: int) -> List[HistoryEntry]:
+        """Mensagens depois da marca que já saíram da janela das `keep` mais recentes."""
+        antigas = list(self.entries)[:-keep] if keep else list(self.entries)
+        return [e for e in antigas if e.message_id > self.watermark]
+
+
+class ConversationBuffer:
+    """
+    Memória de curto prazo por canal/DM. Os canais vivem num cache nomeado
+    (`shortterm.channels`) limitado por quantidade e por inatividade (TTL renovado a
+    cada mensagem), então canais parados saem sozinhos. Acerto no cache = canal
+    quente, sem ida à API do Discord.
+    """
+
+    def __init__(self, size: int = 32, max_channels: int = 1000, idle_ttl: float = 6 * 3600):
+        self.size = max(1, size)
+        self.idle_ttl = idle_ttl
+        self.channels = get_cache(
+            "shortterm.channels", max_entries=max_channels, ttl=idle_ttl or None
+        )
+
+    # --- ALIMENTAÇÃO ---
+    def observe(self, channel_id: int, entry: HistoryEntry, replace: bool = False) -> bool:
+        """Acrescenta a mensagem se o canal já está a ser acompanhado (quente ou a aquecer)."""
+        buf = self.channels.peek(channel_id)
+        if buf is None:
+            return False
+        added = buf.append(entry, replace)
+        # Renova o TTL de inatividade e a posição no LRU
+        self.channels.set(channel_id, buf)
+        return added
+
+    def prime(self, channel_id: int) -> ChannelBuffer:
+        """Passa a acompanhar o canal já, para não perder mensagens enquanto a REST responde."""
+        buf = self.channels.peek(channel_id)
+        if buf is None:
+            buf = ChannelBuffer(self.size)
+            self.channels.set(channel_id, buf)
+        return buf
+
+    def seed(self, channel_id: int, entries: Iterable[HistoryEntry]):
+        buf = self.prime(channel_id)
+        buf.seed(entries)
+        self.channels.set(channel_id, buf)
+
+    # --- LEITURA ---
+    def recent(self, channel_id: int, before_id: int, limit: int) -> Optional[List[HistoryEntry]]:
+        """Mensagens anteriores a `before_id`, ou None quando o canal está frio."""
+        buf = self.channels.get(channel_id)
+        if buf is None or not buf.warm:
+            return None
+        return buf.before(before_id, limit)
+
+    def channel(self, channel_id: int) -> Optional[ChannelBuffer]:
+        """O anel do canal sem mexer nas estatísticas do cache."""
+        return self.channels.peek(channel_id)
+
+    # --- PERSISTÊNCIA ---
+    def dump(self) -> Dict[str, Any]:
+        return {
+            str(channel_id): {
+                "last_active": buf.last_active,
+                "summary": buf.summary,
+                "watermark": buf.watermark,
+                "entries": [e.to_row() for e in buf.entries],
+            }
+            for channel_id, buf in self.channels.items()
+            if buf.warm
+        }
+
+    def restore(self, data: Dict[str, Any]) -> int:
+        """Recarrega canais gravados; os que passaram do tempo de inatividade são descartados."""
+        limite = time.time() - self.idle_ttl if self.idle_ttl else 0
+        restaurados = 0
+        for channel_id, doc in sorted(data.items(), key=lambda i: i[1].get("last_active", 0)):
+            if doc.get("last_active", 0) < limite:
+                continue
+            try:
+                entries = [HistoryEntry.from_row(row) for row in doc.get("entries", [])]
+                buf = ChannelBuffer(self.size)
+                buf.seed(entries)
+                buf.last_active = doc.get("last_active", time.time())
+                buf.summary = str(doc.get("summary") or "")
+                buf.watermark = int(doc.get("watermark") or 0)
+                self.channels.set(int(channel_id), buf)
+                restaurados += 1
+            except (TypeError, ValueError, IndexError) as e:
+                logger.warning(f"⚠️ Histórico do canal {channel_id} ignorado: {e}")
+        return restaurados
+
+    def save(self, path: Path, writer: Callable[[Path, Any], None]):
+        try:
+            writer(path, self.dump())
+        except Exception as e:
+            logger.error(f"❌ Falha ao gravar o histórico de curto prazo: {e}")
+
+    def load(self, path: Path, reader: Callable[[Path], Any]) -> int:
+        try:
+            return self.restore(reader(path) or {})
+        except Exception as e:
+            logger.error(f"❌ Falha ao carregar o histórico de curto prazo: {e}")
+            return 0
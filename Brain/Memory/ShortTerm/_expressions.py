@@ -9,10 +9,11 @@ class ExpressoesManager:
     Carrega dados de 'IA/Data/Knowledge/expressoes_data.json' via DataManager.
     """
 
-    def __init__(self):
-        # Carrega o dicionário de expressões via DataManager
+    @property
+    def data(self) -> dict:
+        # Lido da RAM a cada uso: o watcher do DataManager troca a versão quando o JSON é editado
         # Espera estrutura: {"padrao": ["hmm", "olha só"], "risada": ["haha", "kkk"]}
-        self.data = data_manager.get_expressions()
+        return data_manager.get_expressions()
 
     def get_reaction(self, content: str) -> str:
         """Retorna uma reação curta baseada no conteúdo ou aleatória"""
@@ -0,0 +1,82 @@
+# Brain/Memory/ShortTerm/_summary.py
+
+import asyncio
+import logging
+from typing import Dict, List
+
+from Brain.Core.Tracing import tracer
+from ._buffer import ChannelBuffer, HistoryEntry
+
+logger = logging.getLogger("SamBot.ShortTerm.Summary")
+
+SUMMARY_INSTRUCTION = (
+    "Você é um otimizador de memória. Recebe o resumo atual de uma conversa e as "
+    "mensagens que vieram depois dele. Devolva o resumo atualizado em 1 parágrafo "
+    "conciso, mantendo nomes e tópicos chave. Responda só com o resumo."
+)
+
+# A cadeia devolve um aviso (e não uma exceção) quando todos os provedores falham
+_FALHA_DA_CADEIA = "🤯"
+
+
+class RollingSummarizer:
+    """
+    Resumo incremental por canal. Quando mensagens saem da janela recente, são
+    dobradas no resumo existente (resumo anterior + só as novas) numa tarefa em
+    segundo plano, na cadeia auxiliar. Quem responde lê `buf.summary` já pronto e
+    nunca espera por uma chamada de sumarização.
+    """
+
+    def __init__(self, chain, window: int = 10, batch: int = 5, max_chars: int = 1500):
+        self.chain = chain
+        self.window = max(1, window)
+        self.batch = max(1, batch)
+        self.max_chars = max_chars
+        self._tasks: Dict[int, asyncio.Task] = {}
+
+    def schedule(self, channel_id: int, buf: ChannelBuffer) -> bool:
+        """Dispara a dobra se houver mensagens suficientes fora da janela. Não bloqueia."""
+        if channel_id in self._tasks:
+            return False
+        if len(buf.pending(self.window)) < self.batch:
+            return False
+        task = asyncio.create_task(self._fold(buf), name=f"resumo:{channel_id}")
+        self._tasks[channel_id] = task
+        task.add_done_callback(lambda t, cid=channel_id: self._done(cid, t))
+        return True
+
+    def _done(self, channel_id: int, task: asyncio.Task):
+        self._tasks.pop(channel_id, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"⚠️ Resumo do canal {channel_id} falhou: {task.exception()}")
+
+    async def _fold(self, buf: ChannelBuffer):
+        # Fotografa o lote agora: o que chegar durante a chamada fica para a próxima
+        novas: List[HistoryEntry] = buf.pending(self.window)
+        if not novas:
+            return
+        anterior = buf.summary
+        linhas = "\n".join(
+            f"{'SamBot' if e.is_self else 'User'}: {e.content}" for e in novas
+        )
+        prompt = (
+            f"Resumo atual:\n{anterior or '(vazio)'}\n\n"
+            f"Mensagens novas:\n{linhas}"
+        )
+
+        async with tracer.span("historico.resumo"):
+            resumo = await self.chain.generate_response(
+                prompt_parts=[prompt], system_instruction=SUMMARY_INSTRUCTION, priority="resumo"
+            )
+
+        resumo = (resumo or "").strip()
+        if not resumo or resumo.startswith(_FALHA_DA_CADEIA):
+            logger.debug("🔕 Cadeia auxiliar sem resposta; o lote fica para a próxima.")
+            return
+        buf.summary = resumo[: self.max_chars]
+        buf.watermark = novas[-1].message_id
+
+    async def drain(self):
+        """Espera as dobras em curso (usado ao desligar e em testes)."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
@@ -1,10 +1,16 @@
 import abc
-from typing import List, Optional
+import asyncio
+from typing import AsyncIterator, List, Optional
 
 
 class BaseLLMProvider(abc.ABC):
     """Interface abstrata obrigatória para todas as IA."""
 
+    @property
+    def name(self) -> str:
+        """Rótulo curto do provedor (GeminiDriver -> "gemini"), usado em logs e métricas."""
+        return type(self).__name__.replace("Driver", "").lower()
+
     @abc.abstractmethod
     async def initialize(self) -> bool:
         """Testa a conectividade e chaves do provedor."""
@@ -17,7 +23,30 @@ class BaseLLMProvider(abc.ABC):
         """Gera resposta de texto a partir do prompt."""
         pass
 
+    async def generate_stream(
+        self, prompt_parts: any, system_instruction: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Gera a resposta em pedaços, à medida que o modelo produz o texto.
+        Por omissão entrega a resposta inteira de uma vez (provedores sem streaming).
+        """
+        resposta = await self.generate(prompt_parts, system_instruction)
+        if resposta:
+            yield resposta
+
     @abc.abstractmethod
     async def get_embedding(self, text: str) -> List[float]:
         """Gera vetores de busca (embeddings)."""
         pass
+
+    async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Vetores de vários textos, na mesma ordem. Por omissão, um pedido por texto em
+        simultâneo; drivers com API em lote sobrescrevem. Lista vazia se algum falhar.
+        """
+        vetores = await asyncio.gather(*(self.get_embedding(t) for t in texts))
+        return list(vetores) if all(vetores) else []
+
+    async def close(self):
+        """Fecha os clientes/conexões mantidos pelo driver. Por omissão não há nada a fechar."""
+        pass
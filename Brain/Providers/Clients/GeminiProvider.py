@@ -1,12 +1,17 @@
 import os
 import asyncio
 import random
+import threading
 import time
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from Brain.Providers.BaseLLM import BaseLLMProvider
+from Brain.Providers._health import provider_health, TTFT
+from Brain.Providers._rate import KeyScheduler, retry_after_from
+from Brain.Memory.Cache import get_cache
 
 try:
     import google.generativeai as genai
+    from google.generativeai import client as genai_client
     from google.api_core import exceptions as google_exceptions
 
     GEMINI_AVAILABLE = True
@@ -24,19 +29,43 @@ class GeminiDriver(BaseLLMProvider):
         self.keys = self._carregar_chaves()
         self.active_model = None
 
-        # --- CACHE DE CASTIGO (Blacklist temporária para chaves com Rate Limit) ---
-        # Guarda a estrutura: { "SUA_CHAVE_API": timestamp_do_bloqueio }
-        self.blacklist_chaves = {}
-        self.tempo_castigo = (
-            60  # Tempo em segundos que a chave fica ignorada (1 minuto)
+        # --- POOL DE CLIENTES ---
+        # Um par de clientes (assíncrono para gerar, síncrono para embeddings) por chave,
+        # criado na primeira vez que a chave é usada: as conexões ficam abertas entre
+        # pedidos. Os modelos prontos, por chave e instrução de sistema, ficam num LRU.
+        self._clientes: Dict[str, Tuple[Any, Any]] = {}
+        self._clientes_lock = threading.Lock()  # genai.configure() mexe em estado global
+        self._modelos = get_cache(
+            "llm.gemini_modelos", max_entries=int(os.getenv("GEMINI_MODEL_CACHE", "64"))
         )
 
+        # --- AGENDADOR DE COTAS ---
+        # RPM/TPM por chave (cotas documentadas do plano), escolhe a chave com mais folga
+        # e espera um pouco em vez de gastar um pedido que voltaria com 429. Um 429 tira a
+        # chave de jogo pelo Retry-After (ou `tempo_castigo` segundos se não vier).
+        self.tempo_castigo = 60
+        self._por_rotulo = {f"{self.name}#{i + 1}": k for i, k in enumerate(self.keys)}
+        self.agendador = KeyScheduler(
+            self._por_rotulo,
+            rpm=float(os.getenv("GEMINI_RPM", "15")),
+            tpm=float(os.getenv("GEMINI_TPM", "1000000")),
+            max_wait=float(os.getenv("GEMINI_QUEUE_MAX_WAIT", "2.0")),
+            default_cooldown=self.tempo_castigo,
+        )
+        # Tokens de saída assumidos na reserva; o acerto vem do usage_metadata da resposta
+        self.saida_estimada = int(os.getenv("GEMINI_OUTPUT_ESTIMATE", "512"))
+
         self.safety_settings = [
             {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
             {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
             {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
             {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
         ]
+        # Limite da resposta completa e do primeiro pedaço no streaming. O primeiro
+        # continua curto para trocar depressa de chave; o resto pode demorar o que precisar.
+        self.timeout = float(os.getenv("GEMINI_TIMEOUT", "30"))
+        self.first_token_timeout = float(os.getenv("GEMINI_FIRST_TOKEN_TIMEOUT", "2.5"))
+
         self.generation_config = {
             "temperature": 0.8,
             "top_p": 0.95,
@@ -80,12 +109,11 @@ class GeminiDriver(BaseLLMProvider):
 
         for index, key in enumerate(self.keys):
             try:
-                genai.configure(api_key=key)
-                model = genai.GenerativeModel(self.model_name)
+                model = self._modelo(key)
                 await model.generate_content_async(
                     "ping", generation_config={"max_output_tokens": 1}
                 )
-                self.active_model = self._criar_modelo()
+                self.active_model = model
                 self.log.info(
                     f"  [Gemini] Conectado com sucesso usando a Chave {index + 1} no setup."
                 )
@@ -112,90 +140,256 @@ class GeminiDriver(BaseLLMProvider):
             system_instruction=system_instruction,
         )
 
+    def _clientes_da_chave(self, key: str) -> Tuple[Any, Any]:
+        """(cliente assíncrono, cliente síncrono) da chave, criados uma única vez."""
+        clientes = self._clientes.get(key)
+        if clientes is None:
+            with self._clientes_lock:
+                clientes = self._clientes.get(key)
+                if clientes is None:
+                    # configure() só serve para montar os clientes com as opções da biblioteca;
+                    # depois cada modelo leva o seu e o estado global deixa de importar
+                    genai.configure(api_key=key)
+                    clientes = (
+                        genai_client.get_default_generative_async_client(),
+                        genai_client.get_default_generative_client(),
+                    )
+                    self._clientes[key] = clientes
+        return clientes
+
+    def _modelo(self, key: str, system_instruction: Optional[str] = None):
+        """Modelo já preso aos clientes da chave; reaproveitado por (chave, instrução)."""
+        cache_key = (self.keys.index(key), system_instruction)
+        model = self._modelos.get(cache_key)
+        if model is None:
+            model = self._criar_modelo(system_instruction)
+            model._async_client, model._client = self._clientes_da_chave(key)
+            self._modelos.set(cache_key, model)
+        return model
+
     async def generate(
         self, prompt_parts: any, system_instruction: Optional[str] = None
     ) -> Optional[str]:
         """
-        Gera a resposta do Gemini usando balanceamento de carga aleatório (Random)
-        e aplicando castigo automático em milissegundos para chaves com Rate Limit.
+        Gera a resposta do Gemini na chave com mais folga de cota (ver `agendador`),
+        passando para a próxima em caso de timeout, 429 ou erro.
         """
         if not GEMINI_AVAILABLE or not self.keys:
             return None
 
-        # 1. FILTRAGEM: Remove temporariamente as chaves que estão cumprindo castigo por 429
-        agora = time.time()
-        chaves_disponiveis = [
-            k
-            for k in self.keys
-            if k not in self.blacklist_chaves
-            or (agora - self.blacklist_chaves[k] > self.tempo_castigo)
-        ]
-
-        # Se TODAS as chaves estiverem no castigo, limpa o castigo para não deixar o bot offline
-        if not chaves_disponiveis:
-            self.log.warning(
-                "  [Gemini] Todas as chaves estão esgotadas no momento. Forçando limpeza do cache de castigo."
-            )
-            self.blacklist_chaves.clear()
-            chaves_disponiveis = self.keys.copy()
-
-        # 2. SELEÇÃO ALEATÓRIA: Embaralha a lista de chaves válidas para balancear o uso
-        random.shuffle(chaves_disponiveis)
-
-        # 3. LOOP DE TENTATIVAS ULTRA-RÁPIDO
-        for key in chaves_disponiveis:
+        reserva = self._estimar_tokens(prompt_parts, system_instruction)
+        async for key in self._chaves_agendadas(reserva):
             key_preview = f"{key[:6]}..."
+            rotulo = self._rotulo(key)
+            provider_health.begin(rotulo)
+            inicio = time.perf_counter()
 
             try:
-                genai.configure(api_key=key)
-                model = self._criar_modelo(system_instruction=system_instruction)
+                model = self._modelo(key, system_instruction)
 
-                # Timeout estrito de 2.5 segundos para não deixar a requisição mofando
                 response = await asyncio.wait_for(
-                    model.generate_content_async(prompt_parts), timeout=2.5
+                    model.generate_content_async(prompt_parts), timeout=self.timeout
                 )
 
+                self.agendador.settle(rotulo, reserva, self._tokens_usados(response))
                 if not response.candidates or not response.candidates[0].content.parts:
+                    provider_health.failure(rotulo, self._ms_desde(inicio), "resposta vazia")
                     continue
 
+                provider_health.success(rotulo, self._ms_desde(inicio))
                 self.active_model = model
                 return response.text
 
             except asyncio.TimeoutError:
+                provider_health.failure(rotulo, self._ms_desde(inicio), "timeout")
                 self.log.warning(
                     f"  [Gemini] Timeout na chave [{key_preview}]. Pulando em milissegundos..."
                 )
                 continue
 
-            except google_exceptions.ResourceExhausted:
-                # 🛑 CAPTURA O 429: Salva a assinatura da chave no cache de castigo imediatamente
-                self.log.warning(
-                    f"  [Gemini] Chave [{key_preview}] estourou a cota (429). Castigada por {self.tempo_castigo}s."
-                )
-                self.blacklist_chaves[key] = time.time()
-                continue  # Pula para a próxima chave embaralhada da fila na mesma hora
+            except google_exceptions.ResourceExhausted as e:
+                provider_health.failure(rotulo, self._ms_desde(inicio), e)
+                self._castigar(rotulo, e)
+                continue
 
             except Exception as e:
+                provider_health.failure(rotulo, self._ms_desde(inicio), e)
                 self.log.error(f"  [Gemini] Erro crítico na chave [{key_preview}]: {e}")
                 continue
 
         return None
 
+    async def generate_stream(
+        self, prompt_parts: any, system_instruction: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Streaming do Gemini. A troca de chave (timeout, 429) só acontece até chegar o
+        primeiro pedaço; depois disso o texto já está na tela e seguimos com essa chave.
+        """
+        if not GEMINI_AVAILABLE or not self.keys:
+            return
+
+        reserva = self._estimar_tokens(prompt_parts, system_instruction)
+        async for key in self._chaves_agendadas(reserva):
+            key_preview = f"{key[:6]}..."
+            rotulo = self._rotulo(key)
+            provider_health.begin(rotulo)
+            inicio = time.perf_counter()
+
+            try:
+                model = self._modelo(key, system_instruction)
+                pedacos, primeiro = await asyncio.wait_for(
+                    self._abrir_stream(model, prompt_parts),
+                    timeout=self.first_token_timeout,
+                )
+            except asyncio.TimeoutError:
+                provider_health.failure(rotulo, self._ms_desde(inicio), "timeout no primeiro pedaço", serie=TTFT)
+                self.log.warning(
+                    f"  [Gemini] Primeiro pedaço não chegou em {self.first_token_timeout:g}s na chave [{key_preview}]. Pulando..."
+                )
+                continue
+            except StopAsyncIteration:
+                provider_health.failure(rotulo, self._ms_desde(inicio), "resposta vazia", serie=TTFT)
+                continue
+            except google_exceptions.ResourceExhausted as e:
+                provider_health.failure(rotulo, self._ms_desde(inicio), e, serie=TTFT)
+                self._castigar(rotulo, e)
+                continue
+            except Exception as e:
+                provider_health.failure(rotulo, self._ms_desde(inicio), e, serie=TTFT)
+                self.log.error(f"  [Gemini] Erro crítico na chave [{key_preview}]: {e}")
+                continue
+
+            provider_health.success(rotulo, self._ms_desde(inicio), serie=TTFT)
+            self.active_model = model
+            usados = self._tokens_usados(primeiro)
+            try:
+                texto = self._texto_do_pedaco(primeiro)
+                if texto:
+                    yield texto
+                async for pedaco in pedacos:
+                    # O usage_metadata vem acumulado; o último pedaço tem o total
+                    usados = self._tokens_usados(pedaco) or usados
+                    texto = self._texto_do_pedaco(pedaco)
+                    if texto:
+                        yield texto
+            except Exception as e:
+                self.log.error(f"  [Gemini] Streaming interrompido na chave [{key_preview}]: {e}")
+            finally:
+                self.agendador.settle(rotulo, reserva, usados)
+            return
+
+    @staticmethod
+    async def _abrir_stream(model, prompt_parts):
+        response = await model.generate_content_async(prompt_parts, stream=True)
+        pedacos = response.__aiter__()
+        return pedacos, await pedacos.__anext__()
+
+    @staticmethod
+    def _texto_do_pedaco(pedaco) -> str:
+        try:
+            return pedaco.text
+        except ValueError:
+            # Pedaço sem texto (ex.: só metadados de segurança)
+            return ""
+
+    def _castigar(self, rotulo: str, erro: Exception):
+        # 🛑 CAPTURA O 429: a chave sai de jogo pelo tempo que o servidor pedir
+        espera = self.agendador.penalize(rotulo, retry_after_from(erro))
+        self.log.warning(
+            f"  [Gemini] Chave [{rotulo}] estourou a cota (429). Fora de jogo por {espera:.0f}s."
+        )
+
+    def _estimar_tokens(self, prompt_parts: any, system_instruction: Optional[str]) -> int:
+        """Estimativa para a reserva de TPM: ~4 caracteres por token, 258 por imagem."""
+        partes = prompt_parts if isinstance(prompt_parts, list) else [prompt_parts]
+        caracteres = sum(len(p) for p in partes if isinstance(p, str))
+        imagens = sum(1 for p in partes if not isinstance(p, str))
+        caracteres += len(system_instruction or "")
+        return caracteres // 4 + imagens * 258 + self.saida_estimada
+
+    @staticmethod
+    def _tokens_usados(resposta) -> Optional[int]:
+        uso = getattr(resposta, "usage_metadata", None)
+        total = getattr(uso, "total_token_count", None)
+        return total or None
+
+    def _rotulo(self, key: str) -> str:
+        """Nome da chave nas métricas de saúde ("gemini#2"); a chave em si nunca sai daqui."""
+        return f"{self.name}#{self.keys.index(key) + 1}"
+
+    @staticmethod
+    def _ms_desde(inicio: float) -> float:
+        return (time.perf_counter() - inicio) * 1000
+
+    async def _chaves_agendadas(self, tokens: int) -> AsyncIterator[str]:
+        """
+        Chaves na ordem do agendador, cada uma já com o pedido e os tokens reservados.
+        Chaves com o disjuntor aberto só entram se não houver outra. Acaba quando todas
+        foram tentadas ou nenhuma liberta cota dentro de GEMINI_QUEUE_MAX_WAIT.
+        """
+        tentadas = set()
+        while len(tentadas) < len(self._por_rotulo):
+            rotulo = await self.agendador.acquire(
+                tokens, exclude=tentadas, eligible=provider_health.available
+            )
+            if rotulo is None:
+                if not tentadas:
+                    self.log.warning(
+                        "  [Gemini] Todas as chaves sem cota livre no momento. Passando a vez na cadeia."
+                    )
+                return
+            tentadas.add(rotulo)
+            yield self._por_rotulo[rotulo]
+
     async def get_embedding(self, text: str) -> List[float]:
         # Para embeddings, vamos usar a primeira chave disponível (aleatória) para manter a velocidade
         if not GEMINI_AVAILABLE or not self.keys:
             return []
         try:
-            chaves_sadias = [k for k in self.keys if k not in self.blacklist_chaves]
-            key = random.choice(chaves_sadias) if chaves_sadias else self.keys[0]
-            genai.configure(api_key=key)
+            livres = self.agendador.available()
+            key = self._por_rotulo[random.choice(livres)] if livres else self.keys[0]
+            _, cliente = self._clientes_da_chave(key)
             result = await asyncio.to_thread(
                 genai.embed_content,
                 model=f"models/{self.embed_model_cloud}",
                 content=text,
                 task_type="retrieval_document",
+                client=cliente,
             )
             return result["embedding"]
         except Exception as e:
             self.log.warning(f"  [Gemini] Falha ao gerar embedding na nuvem: {e}")
             return []
+
+    async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Um só `embed_content` com a lista de textos (o Gemini devolve um vetor por texto)."""
+        if not GEMINI_AVAILABLE or not self.keys or not texts:
+            return []
+        try:
+            livres = self.agendador.available()
+            key = self._por_rotulo[random.choice(livres)] if livres else self.keys[0]
+            _, cliente = self._clientes_da_chave(key)
+            result = await asyncio.to_thread(
+                genai.embed_content,
+                model=f"models/{self.embed_model_cloud}",
+                content=list(texts),
+                task_type="retrieval_document",
+                client=cliente,
+            )
+            return result["embedding"]
+        except Exception as e:
+            self.log.warning(f"  [Gemini] Falha ao gerar embeddings em lote na nuvem: {e}")
+            return []
+
+    async def close(self):
+        with self._clientes_lock:
+            clientes = list(self._clientes.values())
+            self._clientes.clear()
+        self._modelos.clear()
+        for cliente_async, cliente_sync in clientes:
+            try:
+                await cliente_async.transport.close()
+                cliente_sync.transport.close()
+            except Exception as e:
+                self.log.warning(f"  [Gemini] Falha ao fechar clientes: {e}")
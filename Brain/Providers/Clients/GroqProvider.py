@@ -1,5 +1,5 @@
 import os
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from Brain.Providers.BaseLLM import BaseLLMProvider
 
 try:
@@ -29,6 +29,14 @@ class GroqDriver(BaseLLMProvider):
         if generation_config and "temperature" in generation_config:
             self.temperature = generation_config["temperature"]
 
+        # Cliente único, criado no primeiro uso e reaproveitado (mantém as conexões HTTP)
+        self._cliente = None
+
+    def _cliente_groq(self):
+        if self._cliente is None:
+            self._cliente = AsyncGroq(api_key=self.groq_key)
+        return self._cliente
+
     async def initialize(self) -> bool:
         """Verifica se a biblioteca está disponível e se a chave API foi configurada."""
         if not GROQ_AVAILABLE:
@@ -57,40 +65,11 @@ class GroqDriver(BaseLLMProvider):
         if not GROQ_AVAILABLE or not self.groq_key:
             return None
 
-        # Normaliza o prompt para texto puro (remover imagens que o Groq possa não suportar neste modelo)
-        text_only_prompt = prompt_parts
-        if isinstance(prompt_parts, list):
-            text_only_prompt = " ".join(
-                [p if isinstance(p, str) else "[Imagem omitida]" for p in prompt_parts]
-            )
-
         try:
-            client = AsyncGroq(api_key=self.groq_key)
-
-            # --- PODA DE SEGURANÇA PARA O GROQ (Evita Erro 413 / TPM) ---
-            # Se o prompt do sistema ultrapassar ~3.500 palavras, otimiza o histórico recente
-            sys_inst_filtrado = str(system_instruction) if system_instruction else ""
-
-            if sys_inst_filtrado and len(sys_inst_filtrado.split()) > 3500:
-                self.log.warning(
-                    "⚡ [Groq] Prompt muito longo para o plano gratuito. Otimizando histórico..."
-                )
-                if "Histórico Recente:" in sys_inst_filtrado:
-                    partes = sys_inst_filtrado.split("Histórico Recente:")
-                    linhas_historico = partes[1].strip().split("\n")
-                    historico_curto = "\n".join(linhas_historico[-4:])
-                    sys_inst_filtrado = (
-                        f"{partes[0]}\nHistórico Recente:\n{historico_curto}"
-                    )
-
-            messages = []
-            if system_instruction:
-                messages.append({"role": "system", "content": sys_inst_filtrado})
-            messages.append({"role": "user", "content": text_only_prompt})
-
+            client = self._cliente_groq()
             response = await client.chat.completions.create(
                 model=self.groq_model,
-                messages=messages,
+                messages=self._montar_mensagens(prompt_parts, system_instruction),
                 max_tokens=1024,
                 temperature=self.temperature,
             )
@@ -104,9 +83,73 @@ class GroqDriver(BaseLLMProvider):
 
         return None
 
+    async def generate_stream(
+        self, prompt_parts: any, system_instruction: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Mesma chamada do `generate`, com `stream=True`: devolve os deltas à medida que chegam."""
+        if not GROQ_AVAILABLE or not self.groq_key:
+            return
+
+        try:
+            client = self._cliente_groq()
+            stream = await client.chat.completions.create(
+                model=self.groq_model,
+                messages=self._montar_mensagens(prompt_parts, system_instruction),
+                max_tokens=1024,
+                temperature=self.temperature,
+                stream=True,
+            )
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+        except Exception as e:
+            self.log.warning(
+                f"⚠️ [Groq] Falha no streaming do modelo {self.groq_model}: {e}"
+            )
+
+    def _montar_mensagens(
+        self, prompt_parts: any, system_instruction: Optional[str]
+    ) -> List[dict]:
+        # Normaliza o prompt para texto puro (remover imagens que o Groq possa não suportar neste modelo)
+        text_only_prompt = prompt_parts
+        if isinstance(prompt_parts, list):
+            text_only_prompt = " ".join(
+                [p if isinstance(p, str) else "[Imagem omitida]" for p in prompt_parts]
+            )
+
+        # --- PODA DE SEGURANÇA PARA O GROQ (Evita Erro 413 / TPM) ---
+        # Se o prompt do sistema ultrapassar ~3.500 palavras, otimiza o histórico recente
+        sys_inst_filtrado = str(system_instruction) if system_instruction else ""
+
+        if sys_inst_filtrado and len(sys_inst_filtrado.split()) > 3500:
+            self.log.warning(
+                "⚡ [Groq] Prompt muito longo para o plano gratuito. Otimizando histórico..."
+            )
+            if "Histórico Recente:" in sys_inst_filtrado:
+                partes = sys_inst_filtrado.split("Histórico Recente:")
+                linhas_historico = partes[1].strip().split("\n")
+                historico_curto = "\n".join(linhas_historico[-4:])
+                sys_inst_filtrado = (
+                    f"{partes[0]}\nHistórico Recente:\n{historico_curto}"
+                )
+
+        messages = []
+        if system_instruction:
+            messages.append({"role": "system", "content": sys_inst_filtrado})
+        messages.append({"role": "user", "content": text_only_prompt})
+        return messages
+
     async def get_embedding(self, text: str) -> List[float]:
         """
         O Groq foca em inferência rápida de texto.
         Geralmente não é usado para embeddings neste ecossistema, retornando vazio.
         """
         return []
+
+    async def close(self):
+        cliente, self._cliente = self._cliente, None
+        if cliente is not None:
+            await cliente.close()
@@ -1,5 +1,5 @@
 import os
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 from Brain.Providers.BaseLLM import BaseLLMProvider
 
 try:
@@ -33,6 +33,15 @@ class OllamaDriver(BaseLLMProvider):
         # Configuração de Embedding Local
         self.embed_model_local = os.getenv("MODEL_EMBED_LOCAL", "nomic-embed-text")
 
+        # Um cliente por host (remoto e local), reaproveitado entre pedidos
+        self._clientes: Dict[str, "AsyncClient"] = {}
+
+    def _cliente(self, host: str) -> "AsyncClient":
+        cliente = self._clientes.get(host)
+        if cliente is None:
+            cliente = self._clientes[host] = AsyncClient(host=host)
+        return cliente
+
     async def initialize(self) -> bool:
         """
         Verifica se a biblioteca está disponível e valida o acesso aos serviços configurados.
@@ -71,24 +80,12 @@ class OllamaDriver(BaseLLMProvider):
         if not OLLAMA_AVAILABLE:
             return None
 
-        # Normaliza o prompt para texto puro (removendo formatos complexos ou imagens se houver)
-        text_only_prompt = prompt_parts
-        if isinstance(prompt_parts, list):
-            text_only_prompt = " ".join(
-                [p if isinstance(p, str) else "[Imagem omitida]" for p in prompt_parts]
-            )
+        messages = self._montar_mensagens(prompt_parts, system_instruction)
 
         # 1. TENTATIVA: OLLAMA REMOTO
         if self.remote_url and self.remote_model:
             try:
-                client = AsyncClient(host=self.remote_url)
-                messages = []
-                if system_instruction:
-                    messages.append(
-                        {"role": "system", "content": str(system_instruction)}
-                    )
-                messages.append({"role": "user", "content": text_only_prompt})
-
+                client = self._cliente(self.remote_url)
                 response = await client.chat(model=self.remote_model, messages=messages)
                 return f"{response['message']['content']}"
             except Exception as e:
@@ -98,12 +95,7 @@ class OllamaDriver(BaseLLMProvider):
 
         # 2. TENTATIVA: OLLAMA LOCAL
         try:
-            client = AsyncClient(host=self.local_url)
-            messages = []
-            if system_instruction:
-                messages.append({"role": "system", "content": str(system_instruction)})
-            messages.append({"role": "user", "content": text_only_prompt})
-
+            client = self._cliente(self.local_url)
             response = await client.chat(model=self.local_model, messages=messages)
             return f"{response['message']['content']}"
         except Exception as e:
@@ -111,6 +103,54 @@ class OllamaDriver(BaseLLMProvider):
 
         return None
 
+    async def generate_stream(
+        self, prompt_parts: any, system_instruction: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Streaming com a mesma ordem Remoto → Local. Só passa para o Local se o Remoto
+        falhar antes de entregar o primeiro pedaço.
+        """
+        if not OLLAMA_AVAILABLE:
+            return
+
+        messages = self._montar_mensagens(prompt_parts, system_instruction)
+        alvos = []
+        if self.remote_url and self.remote_model:
+            alvos.append(("Remoto", self.remote_url, self.remote_model))
+        alvos.append(("Local", self.local_url, self.local_model))
+
+        for rotulo, host, model in alvos:
+            entregou = False
+            try:
+                client = self._cliente(host)
+                async for parte in await client.chat(model=model, messages=messages, stream=True):
+                    conteudo = parte["message"]["content"]
+                    if conteudo:
+                        entregou = True
+                        yield conteudo
+                if entregou:
+                    return
+            except Exception as e:
+                if entregou:
+                    self.log.error(f"❌ [Ollama] Streaming interrompido no Ollama {rotulo}: {e}")
+                    return
+                self.log.warning(f"⚠️ [Ollama] Falha no streaming do Ollama {rotulo}: {e}")
+
+    @staticmethod
+    def _montar_mensagens(prompt_parts: any, system_instruction: Optional[str]) -> List[dict]:
+        # Normaliza o prompt para texto puro (removendo formatos complexos ou imagens se houver)
+        text_only_prompt = prompt_parts
+        if isinstance(prompt_parts, list):
+            text_only_prompt = " ".join(
+                [p if isinstance(p, str) else "[Imagem omitida]" for p in prompt_parts]
+            )
+
+        messages = []
+        if system_instruction:
+            messages.append({"role": "system", "content": str(system_instruction)})
+        messages.append({"role": "user", "content": text_only_prompt})
+        return messages
+
     async def get_embedding(self, text: str) -> List[float]:
         """
         Gera embeddings locais (geralmente usado como failover quando a nuvem do Gemini falha).
@@ -119,7 +159,7 @@ class OllamaDriver(BaseLLMProvider):
             return []
 
         try:
-            client = AsyncClient(host=self.local_url)
+            client = self._cliente(self.local_url)
             res = await client.embeddings(model=self.embed_model_local, prompt=text)
             return res["embedding"]
         except Exception as e:
@@ -127,3 +167,27 @@ class OllamaDriver(BaseLLMProvider):
                 f"❌ [Ollama] Erro crítico ao gravar memória local (Embedding): {e}"
             )
             return []
+
+    async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Lote num só pedido via `/api/embed`; versões antigas do cliente caem no padrão."""
+        if not OLLAMA_AVAILABLE or not texts:
+            return []
+
+        client = self._cliente(self.local_url)
+        if not hasattr(client, "embed"):
+            return await super().get_embeddings(texts)
+        try:
+            res = await client.embed(model=self.embed_model_local, input=list(texts))
+            return list(res["embeddings"])
+        except Exception as e:
+            self.log.error(f"❌ [Ollama] Erro ao gerar embeddings locais em lote: {e}")
+            return []
+
+    async def close(self):
+        clientes = list(self._clientes.values())
+        self._clientes.clear()
+        for cliente in clientes:
+            # O AsyncClient do ollama guarda um httpx.AsyncClient em `_client`
+            http = getattr(cliente, "_client", None)
+            if http is not None:
+                await http.aclose()
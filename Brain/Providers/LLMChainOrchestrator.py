@@ -1,22 +1,43 @@
+import time
+import asyncio
 import logging
-from typing import List, Optional
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 from Brain.Providers.BaseLLM import BaseLLMProvider
+from Brain.Providers._health import provider_health, TTFT
+from Brain.Providers._hedging import hedge_policy
+from Brain.Providers._scheduler import llm_scheduler, INTERATIVO
+from Brain.Core.Tracing import tracer
+from Brain.Core.SingleFlight import fingerprint, get_flight
 
 
 class LLMChainOrchestrator:
     """
     Orquestrador genérico de Modelos de Linguagem (LLM).
-    Gerencia uma cadeia linear de provedores com failover automático.
-    Pode ser instanciado múltiplas vezes (ex: Cadeia Principal, Cadeia Auxiliar).
+    Gerencia uma cadeia de provedores com failover automático, ordenada a cada
+    chamada pela saúde medida (`provider_health`): latência EWMA, taxa de erro e
+    disjuntor. Pode ser instanciado múltiplas vezes (ex: Cadeia Principal, Cadeia Auxiliar).
+    Todas as cadeias passam pela mesma fila de prioridades (`llm_scheduler`): cada
+    chamada declara a sua classe (`priority`), e respostas a usuários vão à frente.
     """
 
-    def __init__(self, name: str, providers: List[BaseLLMProvider], log_instance):
+    def __init__(
+        self,
+        name: str,
+        providers: List[BaseLLMProvider],
+        log_instance,
+        hedge: bool = False,
+    ):
         """
         :param name: Nome identificador da cadeia (ex: "Principal", "Resumos")
         :param providers: Lista ordenada de drivers priorizados (ex: [Gemini, Groq, Ollama])
         :param log_instance: Instância de Logger compartilhada do sistema
+        :param hedge: Dispara uma requisição de reserva quando o provedor demora (ver `_corrida`)
         """
         self.name = name
+        self.hedge = hedge
+        # Pedidos idênticos em curso (ex.: o mesmo prompt do roteador) partilham uma chamada
+        self._em_voo = get_flight(f"llm.{name}")
         self.providers = providers
         self.active_providers: List[BaseLLMProvider] = []
         self.log = log_instance
@@ -46,12 +67,117 @@ class LLMChainOrchestrator:
             f"✨ [Cadeia: {self.name}] Concluída! {len(self.active_providers)} de {len(self.providers)} provedores prontos para uso."
         )
 
+    def _em_ordem(self, serie: Optional[str] = None) -> List[BaseLLMProvider]:
+        """
+        Provedores ativos do mais para o menos promissor, sem os de disjuntor aberto.
+        Se todos estiverem abertos, tenta-os mesmo assim (melhor do que não responder).
+        `serie` escolhe a latência comparada (None = resposta inteira, `TTFT` = streaming).
+        """
+        ordem = provider_health.order(self.active_providers, key_of=lambda p: p.name, serie=serie)
+        disponiveis = [p for p in ordem if provider_health.available(p.name)]
+        return disponiveis or ordem
+
+    async def _corrida(
+        self,
+        tentar: Callable[[BaseLLMProvider], Awaitable[Any]],
+        descartar: Optional[Callable[[Any], Awaitable[None]]] = None,
+        serie: Optional[str] = None,
+    ) -> Tuple[Optional[BaseLLMProvider], Any]:
+        """
+        Percorre os provedores como a cascata: um de cada vez, o próximo só quando o
+        atual falha. Com `hedge`, se o provedor em curso passar do seu percentil de
+        latência recente, o próximo é disparado em paralelo (no máximo uma reserva
+        por pedido, e só com ficha no balde). Vence a primeira resposta válida; a
+        outra tarefa é cancelada.
+
+        `tentar(provider)` devolve o resultado ou None em caso de falha;
+        `descartar(resultado)` libera um resultado válido que chegou em segundo lugar.
+        `serie` é a série de latência usada na ordem e no atraso da reserva.
+        Devolve (provedor, resultado), ou (None, None) se todos falharem.
+        """
+        fila = self._em_ordem(serie)
+        pendentes: Dict[asyncio.Task, BaseLLMProvider] = {}
+        prazos: Dict[asyncio.Task, float] = {}
+        reserva: Optional[asyncio.Task] = None
+
+        pode_hedge = self.hedge and len(fila) > 1
+        if pode_hedge:
+            hedge_policy.count("pedidos")
+            hedge_policy.bucket.deposit()
+
+        def disparar() -> asyncio.Task:
+            provider = fila.pop(0)
+            task = asyncio.create_task(tentar(provider), name=f"llm:{provider.name}")
+            pendentes[task] = provider
+            if pode_hedge:
+                prazos[task] = time.monotonic() + hedge_policy.delay(provider.name, serie)
+            return task
+
+        try:
+            while pendentes or fila:
+                if not pendentes:
+                    disparar()
+
+                espera = None
+                if pode_hedge and reserva is None and fila and len(pendentes) == 1:
+                    (atual,) = pendentes
+                    espera = max(0.0, prazos[atual] - time.monotonic())
+
+                feitas, _ = await asyncio.wait(
+                    pendentes, timeout=espera, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not feitas:
+                    # O provedor em curso passou do percentil: hora da reserva
+                    if hedge_policy.bucket.take():
+                        hedge_policy.count("hedges")
+                        (atual,) = pendentes
+                        reserva = disparar()
+                        self.log.info(
+                            f"🏁 [Cadeia: {self.name}] {pendentes[atual].name} lento; disparando reserva em {pendentes[reserva].name}."
+                        )
+                    else:
+                        hedge_policy.count("negados")
+                        pode_hedge = False
+                    continue
+
+                vencedor = None
+                for task in feitas:
+                    provider = pendentes.pop(task)
+                    resultado = None if task.exception() else task.result()
+                    if not resultado:
+                        continue
+                    if vencedor is None:
+                        vencedor = (provider, resultado)
+                        if task is reserva:
+                            hedge_policy.count("vitorias_reserva")
+                    elif descartar is not None:
+                        await descartar(resultado)
+                if vencedor is not None:
+                    return vencedor
+            return None, None
+        finally:
+            # A perdedora (ou tudo, se quem chamou foi cancelado) é cancelada e esperada
+            for task in pendentes:
+                task.cancel()
+            if pendentes:
+                sobras = await asyncio.gather(*pendentes, return_exceptions=True)
+                if descartar is not None:
+                    for resultado in sobras:
+                        if resultado and not isinstance(resultado, BaseException):
+                            await descartar(resultado)
+
     async def generate_response(
-        self, prompt_parts: any, system_instruction: Optional[str] = None
+        self,
+        prompt_parts: any,
+        system_instruction: Optional[str] = None,
+        priority: str = INTERATIVO,
     ) -> str:
         """
-        Cascata Principal Dinâmica: Consome os provedores ativos na ordem estipulada.
+        Cascata Principal Dinâmica: Consome os provedores ativos do mais saudável ao menos.
         Se o primeiro falhar (ex: Rate Limit, rede descida), passa automaticamente para o próximo.
+        Chamadas idênticas simultâneas (mesmo prompt e instrução) partilham a mesma resposta.
+        `priority` é a classe na fila de LLM ("interativo", "roteador", "resumo", "fundo").
         """
         if not self.is_ready:
             await self.setup_chain()
@@ -59,19 +185,130 @@ class LLMChainOrchestrator:
         if not self.active_providers:
             return f"🤯 *[Cadeia: {self.name}] Todos os motores de IA estão offline ou desativados neste ambiente.*"
 
-        for provider in self.active_providers:
+        # Partes com imagem não têm impressão digital (None) e seguem sem agrupar
+        chave = fingerprint(prompt_parts, system_instruction)
+        return await self._em_voo.do(
+            chave, lambda: self._gerar_na_fila(priority, prompt_parts, system_instruction)
+        )
+
+    async def _gerar_na_fila(
+        self, priority: str, prompt_parts: any, system_instruction: Optional[str]
+    ) -> str:
+        # Dentro do single-flight: pedidos agrupados ocupam uma só vaga
+        async with llm_scheduler.slot(priority):
+            return await self._gerar(prompt_parts, system_instruction)
+
+    async def _gerar(self, prompt_parts: any, system_instruction: Optional[str]) -> str:
+
+        async def tentar(provider: BaseLLMProvider) -> Optional[str]:
+            provider_health.begin(provider.name)
+            inicio = time.perf_counter()
             try:
-                response = await provider.generate(prompt_parts, system_instruction)
+                with tracer.span("llm.tentativa", provider=provider.name):
+                    response = await provider.generate(prompt_parts, system_instruction)
+                decorrido = (time.perf_counter() - inicio) * 1000
                 if response:
+                    provider_health.success(provider.name, decorrido)
                     return response
+                provider_health.failure(provider.name, decorrido, "resposta vazia")
             except Exception as e:
+                provider_health.failure(provider.name, (time.perf_counter() - inicio) * 1000, e)
                 self.log.warning(
                     f"🔄 [Cadeia: {self.name}] Falha no provedor {provider.__class__.__name__}. Acionando failover... Erro: {e}"
                 )
-                continue  # Avança para o próximo da cadeia
+            return None
+
+        with tracer.span("llm.generate") as span:
+            provider, response = await self._corrida(tentar)
+            if provider is not None:
+                # Uma reserva cancelada também passa pelo span; quem conta é a vencedora
+                span.set_provider(provider.name)
+                return response
+            span.status = "error"
 
         return f"🤯 *[Cadeia: {self.name}] Meus sistemas falharam. Toda a esteira de IAs foi percorrida e nenhuma respondeu.*"
 
+    async def generate_stream(
+        self,
+        prompt_parts: any,
+        system_instruction: Optional[str] = None,
+        priority: str = INTERATIVO,
+    ) -> AsyncIterator[str]:
+        """
+        Versão em streaming da cascata. O failover (e o hedge) só acontece enquanto
+        nenhum texto foi entregue: a corrida é pelo primeiro pedaço e, depois dele, o
+        provedor fica até ao fim (o usuário já está a ler). As medidas vão por
+        `tracer.record`, porque um gerador não pode manter um span aberto entre
+        `yield`s. A latência do provedor vai para a série `TTFT` (tempo até o primeiro
+        pedaço), separada da resposta inteira medida por `generate_response`.
+        A vaga na fila de LLM fica ocupada até o stream terminar.
+        """
+        if not self.is_ready:
+            await self.setup_chain()
+
+        if not self.active_providers:
+            yield f"🤯 *[Cadeia: {self.name}] Todos os motores de IA estão offline ou desativados neste ambiente.*"
+            return
+
+        async with llm_scheduler.slot(priority) as vaga:
+            inicio_total = time.perf_counter()
+            inicios: Dict[str, float] = {}
+
+            async def primeiro_pedaco(provider: BaseLLMProvider):
+                """Abre o stream e espera o primeiro pedaço com texto: (gerador, pedaço) ou None."""
+                provider_health.begin(provider.name)
+                inicio = inicios[provider.name] = time.perf_counter()
+                pedacos = provider.generate_stream(prompt_parts, system_instruction)
+                erro = "resposta vazia"
+                try:
+                    async for pedaco in pedacos:
+                        if pedaco:
+                            ttft = (time.perf_counter() - inicio) * 1000
+                            tracer.record("llm.primeiro_token", ttft, provider=provider.name)
+                            provider_health.success(provider.name, ttft, serie=TTFT)
+                            return pedacos, pedaco
+                except asyncio.CancelledError:
+                    await pedacos.aclose()
+                    raise
+                except Exception as e:
+                    erro = e
+                    self.log.warning(
+                        f"🔄 [Cadeia: {self.name}] Falha no provedor {provider.__class__.__name__}. Acionando failover... Erro: {e}"
+                    )
+                decorrido = (time.perf_counter() - inicio) * 1000
+                provider_health.failure(provider.name, decorrido, erro, serie=TTFT)
+                tracer.record("llm.tentativa", decorrido, provider=provider.name, status="error")
+                return None
+
+            async def descartar(aberto):
+                await aberto[0].aclose()
+
+            provider, aberto = await self._corrida(primeiro_pedaco, descartar, serie=TTFT)
+            if provider is None:
+                tracer.record("llm.generate", (time.perf_counter() - inicio_total) * 1000, status="error")
+                yield f"🤯 *[Cadeia: {self.name}] Meus sistemas falharam. Toda a esteira de IAs foi percorrida e nenhuma respondeu.*"
+                return
+
+            pedacos, primeiro = aberto
+            vaga.first_output()
+            async with aclosing(pedacos):
+                yield primeiro
+                try:
+                    async for pedaco in pedacos:
+                        if pedaco:
+                            yield pedaco
+                except Exception as e:
+                    self.log.warning(
+                        f"⚠️ [Cadeia: {self.name}] Streaming de {provider.__class__.__name__} interrompido: {e}"
+                    )
+
+            tracer.record(
+                "llm.tentativa", (time.perf_counter() - inicios[provider.name]) * 1000, provider=provider.name
+            )
+            tracer.record("llm.generate", (time.perf_counter() - inicio_total) * 1000, provider=provider.name)
+            # O span aberto por quem consome (ex.: pipeline.total) fica com este provedor
+            tracer.set_provider(provider.name)
+
     async def get_embedding(self, text: str) -> List[float]:
         """
         Tenta gerar o embedding/vetor usando o primeiro provedor da cadeia que suporte essa função.
@@ -80,18 +317,44 @@ class LLMChainOrchestrator:
         if not self.is_ready:
             await self.setup_chain()
 
-        for provider in self.active_providers:
-            try:
-                embedding = await provider.get_embedding(text)
-                if (
-                    embedding
-                ):  # Se retornar uma lista populada com os floats, valida sucesso
-                    return embedding
-            except Exception as e:
-                self.log.warning(
-                    f"⚠️ [Cadeia: {self.name}] Falha ao gerar embedding com {provider.__class__.__name__}: {e}"
-                )
-                continue
+        with tracer.span("llm.embedding") as span:
+            for provider in self.active_providers:
+                try:
+                    embedding = await provider.get_embedding(text)
+                    if (
+                        embedding
+                    ):  # Se retornar uma lista populada com os floats, valida sucesso
+                        span.set_provider(provider.name)
+                        return embedding
+                except Exception as e:
+                    self.log.warning(
+                        f"⚠️ [Cadeia: {self.name}] Falha ao gerar embedding com {provider.__class__.__name__}: {e}"
+                    )
+                    continue
+            span.status = "error"
+
+        return []
+
+    async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Versão em lote de `get_embedding`: um vetor por texto, com o mesmo failover."""
+        if not texts:
+            return []
+        if not self.is_ready:
+            await self.setup_chain()
+
+        with tracer.span("llm.embedding_lote") as span:
+            for provider in self.active_providers:
+                try:
+                    vetores = await provider.get_embeddings(texts)
+                    if len(vetores) == len(texts) and all(vetores):
+                        span.set_provider(provider.name)
+                        return vetores
+                except Exception as e:
+                    self.log.warning(
+                        f"⚠️ [Cadeia: {self.name}] Falha ao gerar embeddings em lote com {provider.__class__.__name__}: {e}"
+                    )
+                    continue
+            span.status = "error"
 
         return []
 
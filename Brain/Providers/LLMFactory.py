@@ -1,4 +1,5 @@
 import os
+import atexit
 import logging
 from dotenv import load_dotenv
 
@@ -7,6 +8,8 @@ from Brain.Providers.LLMChainOrchestrator import LLMChainOrchestrator
 from Brain.Providers.Clients.GeminiProvider import GeminiDriver
 from Brain.Providers.Clients.GroqProvider import GroqDriver
 from Brain.Providers.Clients.OllamaProvider import OllamaDriver
+from Brain.Providers._health import provider_health
+from Brain.Memory.DataManager import data_manager
 
 # --- Configuração Segura de Logs ---
 try:
@@ -58,12 +61,32 @@ class LLMFactory:
         self.groq_driver = GroqDriver(self.log)
         self.ollama_driver = OllamaDriver(self.log)
 
+        # Saúde dos provedores sobrevive a reinícios (não precisa reaprender quem está lento)
+        self.health_path = None
+        if os.getenv("LLM_HEALTH_PERSIST", "true").lower() in ("1", "true", "yes"):
+            self.health_path = data_manager.folders["persistence"] / "llm_health.json"
+            if provider_health.load(self.health_path, data_manager.io.read):
+                self.log.info("🩺 Saúde dos provedores de IA restaurada do disco.")
+            atexit.register(self.salvar_saude)
+
     @classmethod
     def get_instance(cls):
         if cls._instance is None:
             cls._instance = cls()
         return cls._instance
 
+    def salvar_saude(self):
+        if self.health_path is not None:
+            provider_health.save(self.health_path, data_manager.io.save)
+
+    async def fechar(self):
+        """Fecha os clientes mantidos pelos drivers (conexões HTTP/gRPC)."""
+        for driver in (self.gemini_driver, self.groq_driver, self.ollama_driver):
+            try:
+                await driver.close()
+            except Exception as e:
+                self.log.warning(f"⚠️ Falha ao fechar {driver.__class__.__name__}: {e}")
+
     def create_chain(self, name: str, provider_types: list) -> LLMChainOrchestrator:
         """
         Gera uma cadeia customizada baseada em uma lista de strings.
@@ -85,11 +108,15 @@ class LLMFactory:
         )
 
     def get_default_principal_chain(self) -> LLMChainOrchestrator:
-        """Retorna a cadeia padrão (Camada 1 -> 1.5 -> 2 -> 3) da SamBot."""
+        """
+        Retorna a cadeia padrão (Camada 1 -> 1.5 -> 2 -> 3) da SamBot. É a das respostas
+        interativas, por isso é a única que pode usar hedge (`LLM_HEDGE`).
+        """
         return LLMChainOrchestrator(
             name="Principal",
             providers=[self.gemini_driver, self.groq_driver, self.ollama_driver],
             log_instance=self.log,
+            hedge=os.getenv("LLM_HEDGE", "false").lower() in ("1", "true", "yes"),
         )
 
     def get_default_auxiliary_chain(self) -> LLMChainOrchestrator:
@@ -0,0 +1,270 @@
+# Brain/Providers/_health.py
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger("SamBot.LLM.Health")
+
+# Estados do disjuntor
+FECHADO = "fechado"  # tráfego normal
+ABERTO = "aberto"  # ignorado até passar o tempo de espera
+MEIO_ABERTO = "meio-aberto"  # uma requisição de teste decide se fecha ou reabre
+
+# Latência assumida para quem ainda não tem medidas (ms)
+_PRIOR_MS = 1000.0
+
+# Série de latência do streaming (tempo até o primeiro pedaço), guardada em "<chave>:ttft"
+# para não se misturar com a resposta inteira das chamadas normais
+TTFT = "ttft"
+
+
+def serie_de(key: str, serie: Optional[str] = None) -> str:
+    """Chave onde fica a latência de `key` na série `serie` (None = resposta inteira)."""
+    return f"{key}:{serie}" if serie else key
+
+
+class ProviderHealth:
+    """Saúde de um provedor (ou de uma chave): EWMA de latência e de erro, falhas seguidas e disjuntor."""
+
+    __slots__ = (
+        "ewma_ms", "error_rate", "consecutive_failures", "successes", "failures",
+        "state", "opened_at", "cooldown", "probe_started", "last_error", "updated_at",
+    )
+
+    def __init__(self):
+        self.ewma_ms: Optional[float] = None
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.successes = 0
+        self.failures = 0
+        self.state = FECHADO
+        self.opened_at = 0.0
+        self.cooldown = 0.0
+        self.probe_started = 0.0
+        self.last_error = ""
+        self.updated_at = 0.0
+
+    @property
+    def samples(self) -> int:
+        return self.successes + self.failures
+
+    def expected_ms(self, ewma_ms: Optional[float] = None) -> float:
+        """
+        Latência esperada por resposta útil: cada erro custa uma tentativa inteira.
+        `ewma_ms` troca a latência própria pela de outra série (ex.: TTFT).
+        """
+        if ewma_ms is None:
+            ewma_ms = self.ewma_ms
+        base = ewma_ms if ewma_ms is not None else _PRIOR_MS
+        return base / max(0.1, 1.0 - self.error_rate)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {slot: getattr(self, slot) for slot in self.__slots__ if slot != "probe_started"}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProviderHealth":
+        health = cls()
+        for slot in cls.__slots__:
+            if slot in data and slot != "probe_started":
+                setattr(health, slot, data[slot])
+        return health
+
+
+class HealthRegistry:
+    """
+    Modelo de saúde partilhado por todas as cadeias. Chaves livres: "gemini", "groq",
+    "ollama" e, para o Gemini, uma por chave de API ("gemini#1", "gemini#2"...).
+
+    O disjuntor abre após `failure_threshold` falhas seguidas (ou taxa de erro acima
+    de `error_threshold` com amostras suficientes), fica aberto `cooldown` segundos,
+    passa a meio-aberto e deixa passar uma requisição de teste. Se o teste falhar,
+    reabre com o dobro do tempo (até `max_cooldown`).
+
+    A latência pode ir para uma série à parte (`serie`, ex.: `TTFT`): o disjuntor e a
+    taxa de erro continuam na chave do provedor, mas o EWMA e as latências recentes
+    ficam em "<chave>:<serie>", e quem ordena ou calcula percentis lê a série certa.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.2,
+        failure_threshold: int = 3,
+        error_threshold: float = 0.5,
+        min_samples: int = 10,
+        cooldown: float = 30.0,
+        max_cooldown: float = 600.0,
+        probe_timeout: float = 60.0,
+        order_bias: float = 1.0,
+    ):
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.error_threshold = error_threshold
+        self.min_samples = min_samples
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.probe_timeout = probe_timeout
+        self.order_bias = order_bias
+
+        self._lock = threading.Lock()
+        self._health: Dict[str, ProviderHealth] = {}
+        # Últimas latências de sucesso (não persistidas), para percentis recentes
+        self._recent: Dict[str, deque] = {}
+        self._dirty = False
+
+    def get(self, key: str) -> ProviderHealth:
+        with self._lock:
+            health = self._health.get(key)
+            if health is None:
+                health = self._health[key] = ProviderHealth()
+            return health
+
+    # --- DISJUNTOR ---
+    def available(self, key: str) -> bool:
+        """Pode receber tráfego agora? Um aberto que já cumpriu a espera passa a meio-aberto."""
+        health = self.get(key)
+        agora = time.time()
+        with self._lock:
+            if health.state == ABERTO and agora - health.opened_at >= health.cooldown:
+                health.state = MEIO_ABERTO
+                health.probe_started = 0.0
+                logger.info(f"🟡 [{key}] Disjuntor meio-aberto: a próxima requisição é de teste.")
+            if health.state == FECHADO:
+                return True
+            if health.state == MEIO_ABERTO:
+                return agora - health.probe_started >= self.probe_timeout
+            return False
+
+    def begin(self, key: str):
+        """Marca o início de uma tentativa; no meio-aberto ela é a única de teste."""
+        health = self.get(key)
+        with self._lock:
+            if health.state == MEIO_ABERTO:
+                health.probe_started = time.time()
+
+    def success(self, key: str, elapsed_ms: float, serie: Optional[str] = None):
+        health = self.get(key)
+        latencia = self.get(serie_de(key, serie))
+        with self._lock:
+            latencia.ewma_ms = (
+                elapsed_ms
+                if latencia.ewma_ms is None
+                else self.alpha * elapsed_ms + (1 - self.alpha) * latencia.ewma_ms
+            )
+            latencia.updated_at = time.time()
+            self._recent.setdefault(serie_de(key, serie), deque(maxlen=100)).append(elapsed_ms)
+            health.error_rate *= 1 - self.alpha
+            health.consecutive_failures = 0
+            health.successes += 1
+            health.updated_at = time.time()
+            if health.state != FECHADO:
+                health.state = FECHADO
+                health.cooldown = 0.0
+                logger.info(f"🟢 [{key}] Disjuntor fechado: provedor recuperado.")
+            self._dirty = True
+
+    def failure(self, key: str, elapsed_ms: float, error: str = "", serie: Optional[str] = None):
+        health = self.get(key)
+        latencia = self.get(serie_de(key, serie))
+        with self._lock:
+            # Uma falha lenta também ensina a latência (ex.: timeouts)
+            if elapsed_ms and latencia.ewma_ms is not None:
+                latencia.ewma_ms = self.alpha * elapsed_ms + (1 - self.alpha) * latencia.ewma_ms
+            health.error_rate = self.alpha + (1 - self.alpha) * health.error_rate
+            health.consecutive_failures += 1
+            health.failures += 1
+            health.last_error = str(error)[:200]
+            health.updated_at = time.time()
+
+            if health.state == MEIO_ABERTO:
+                self._abrir(key, health, min(self.max_cooldown, max(health.cooldown, self.base_cooldown) * 2))
+            elif health.state == FECHADO and (
+                health.consecutive_failures >= self.failure_threshold
+                or (health.samples >= self.min_samples and health.error_rate >= self.error_threshold)
+            ):
+                self._abrir(key, health, self.base_cooldown)
+            self._dirty = True
+
+    def _abrir(self, key: str, health: ProviderHealth, cooldown: float):
+        health.state = ABERTO
+        health.opened_at = time.time()
+        health.cooldown = cooldown
+        logger.warning(
+            f"🔴 [{key}] Disjuntor aberto por {cooldown:.0f}s "
+            f"({health.consecutive_failures} falhas seguidas, erro {health.error_rate:.0%})."
+        )
+
+    def recent_percentile(
+        self, key: str, pct: float, min_samples: int = 10, serie: Optional[str] = None
+    ) -> Optional[float]:
+        """Percentil das últimas latências de sucesso da série; None se ainda houver poucas."""
+        with self._lock:
+            amostras = sorted(self._recent.get(serie_de(key, serie), ()))
+        if len(amostras) < min_samples:
+            return None
+        idx = min(len(amostras) - 1, max(0, int(round(pct / 100 * len(amostras))) - 1))
+        return amostras[idx]
+
+    # --- ORDENAÇÃO ---
+    def order(
+        self, items: Sequence[Any], key_of: Callable[[Any], str], serie: Optional[str] = None
+    ) -> List[Any]:
+        """
+        Ordena por custo esperado, com a latência da `serie` pedida. A ordem declarada
+        funciona como preferência: a posição `i` multiplica o custo por
+        (1 + order_bias * i), então só se passa à frente de um provedor preferido quem
+        for claramente mais rápido ou mais confiável. Os que estão com o disjuntor
+        aberto vão para o fim (último recurso).
+        """
+        def custo(par):
+            posicao, item = par
+            chave = key_of(item)
+            aberto = 0 if self.available(chave) else 1
+            esperado = self.get(chave).expected_ms(self.get(serie_de(chave, serie)).ewma_ms)
+            return aberto, esperado * (1 + self.order_bias * posicao), posicao
+
+        return [item for _, item in sorted(enumerate(items), key=custo)]
+
+    # --- LEITURA E PERSISTÊNCIA ---
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {key: h.to_dict() for key, h in sorted(self._health.items())}
+
+    def save(self, path: Path, writer: Callable[[Path, Any], None], force: bool = False):
+        if not self._dirty and not force:
+            return
+        try:
+            writer(path, self.snapshot())
+            self._dirty = False
+        except Exception as e:
+            logger.error(f"❌ Falha ao gravar a saúde dos provedores: {e}")
+
+    def load(self, path: Path, reader: Callable[[Path], Any]) -> int:
+        try:
+            data = reader(path) or {}
+        except Exception as e:
+            logger.error(f"❌ Falha ao carregar a saúde dos provedores: {e}")
+            return 0
+        with self._lock:
+            for key, doc in data.items():
+                if isinstance(doc, dict):
+                    self._health[key] = ProviderHealth.from_dict(doc)
+        return len(data)
+
+
+def _criar_registro() -> HealthRegistry:
+    return HealthRegistry(
+        alpha=float(os.getenv("LLM_HEALTH_ALPHA", "0.2")),
+        failure_threshold=int(os.getenv("LLM_BREAKER_FAILURES", "3")),
+        error_threshold=float(os.getenv("LLM_BREAKER_ERROR_RATE", "0.5")),
+        cooldown=float(os.getenv("LLM_BREAKER_COOLDOWN", "30")),
+        max_cooldown=float(os.getenv("LLM_BREAKER_MAX_COOLDOWN", "600")),
+        order_bias=float(os.getenv("LLM_ORDER_BIAS", "1.0")),
+    )
+
+
+provider_health = _criar_registro()
@@ -0,0 +1,94 @@
+# Brain/Providers/_hedging.py
+
+import os
+import threading
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from Brain.Providers._health import provider_health, serie_de
+
+
+class TokenBucket:
+    """
+    Balde de fichas por requisição: cada pedido deposita `ratio` fichas (até `burst`)
+    e cada hedge gasta uma. Com ratio=0.1, no máximo ~10% dos pedidos viram duplos,
+    mesmo com um provedor lento durante horas.
+    """
+
+    def __init__(self, ratio: float = 0.1, burst: float = 3.0):
+        self.ratio = ratio
+        self.burst = burst
+        self.tokens = burst
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self.tokens = min(self.burst, self.tokens + self.ratio)
+
+    def take(self) -> bool:
+        with self._lock:
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return True
+            return False
+
+
+class HedgePolicy:
+    """
+    Quando disparar a requisição de reserva e quantas se podem gastar. O atraso é o
+    percentil `percentile` das latências recentes do provedor em curso (limitado a
+    [min_delay_ms, max_delay_ms]); sem amostras suficientes usa o dobro do EWMA. Em
+    streaming a corrida é pelo primeiro pedaço, então a série lida é a de TTFT.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95,
+        ratio: float = 0.1,
+        burst: float = 3.0,
+        min_delay_ms: float = 250,
+        max_delay_ms: float = 10000,
+        fallback_ms: float = 3000,
+    ):
+        self.percentile = percentile
+        self.min_delay_ms = min_delay_ms
+        self.max_delay_ms = max_delay_ms
+        self.fallback_ms = fallback_ms
+        self.bucket = TokenBucket(ratio, burst)
+        self.counters: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def delay(self, key: str, serie: Optional[str] = None) -> float:
+        """Segundos de espera pelo provedor `key` (na série `serie`) antes de disparar a reserva."""
+        ms = provider_health.recent_percentile(key, self.percentile, serie=serie)
+        if ms is None:
+            ewma = provider_health.get(serie_de(key, serie)).ewma_ms
+            ms = ewma * 2 if ewma is not None else self.fallback_ms
+        return min(self.max_delay_ms, max(self.min_delay_ms, ms)) / 1000
+
+    def count(self, evento: str):
+        with self._lock:
+            self.counters[evento] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            c = dict(self.counters)
+        pedidos = c.get("pedidos", 0)
+        hedges = c.get("hedges", 0)
+        return {
+            "pedidos": pedidos,
+            "hedges": hedges,
+            "negados": c.get("negados", 0),
+            "vitorias_reserva": c.get("vitorias_reserva", 0),
+            "hedge_rate": hedges / pedidos if pedidos else 0.0,
+            "win_rate": c.get("vitorias_reserva", 0) / hedges if hedges else 0.0,
+            "fichas": round(self.bucket.tokens, 2),
+        }
+
+
+hedge_policy = HedgePolicy(
+    percentile=float(os.getenv("LLM_HEDGE_PERCENTILE", "95")),
+    ratio=float(os.getenv("LLM_HEDGE_BUDGET", "0.1")),
+    burst=float(os.getenv("LLM_HEDGE_BURST", "3")),
+    min_delay_ms=float(os.getenv("LLM_HEDGE_MIN_DELAY_MS", "250")),
+)
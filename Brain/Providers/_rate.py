@@ -0,0 +1,217 @@
+# Brain/Providers/_rate.py
+
+import re
+import time
+import asyncio
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+_RETRY_EM = re.compile(r"retry in ([\d.]+)\s*s", re.IGNORECASE)
+_RETRY_SEGUNDOS = re.compile(r"retry_delay\s*\{\s*seconds:\s*(\d+)", re.IGNORECASE)
+
+
+class RateBucket:
+    """Balde que enche continuamente: `capacity` por minuto, nunca acima de `capacity`."""
+
+    __slots__ = ("capacity", "tokens", "rate", "updated")
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+
+    def refill(self, agora: float):
+        self.tokens = min(self.capacity, self.tokens + (agora - self.updated) * self.rate)
+        self.updated = agora
+
+    def wait_for(self, amount: float) -> float:
+        """Segundos até haver `amount` no balde (0 se já houver)."""
+        falta = min(amount, self.capacity) - self.tokens
+        return 0.0 if falta <= 0 else falta / self.rate
+
+    @property
+    def headroom(self) -> float:
+        return self.tokens / self.capacity if self.capacity else 0.0
+
+
+class _KeyState:
+    __slots__ = ("rpm", "tpm", "cooldown_until", "requests", "tokens_used", "rate_limited", "waits")
+
+    def __init__(self, rpm: float, tpm: float):
+        self.rpm = RateBucket(rpm)
+        self.tpm = RateBucket(tpm)
+        self.cooldown_until = 0.0
+        self.requests = 0
+        self.tokens_used = 0
+        self.rate_limited = 0
+        self.waits = 0
+
+
+class KeyScheduler:
+    """
+    Distribui pedidos entre chaves de API antes de baterem na cota. Cada chave (pelo
+    rótulo, ex.: "gemini#1") tem um balde de pedidos por minuto (RPM) e um de tokens
+    por minuto (TPM), configurados pelas cotas documentadas. `acquire` escolhe a
+    chave com mais folga; se todas estiverem cheias, espera até `max_wait` segundos
+    pela primeira que libertar, em vez de gastar um pedido que voltaria com 429.
+    Um 429 põe a chave de lado pelo tempo do `Retry-After` (ou `default_cooldown`).
+    """
+
+    def __init__(
+        self,
+        labels: Iterable[str],
+        rpm: float = 15,
+        tpm: float = 1_000_000,
+        max_wait: float = 2.0,
+        default_cooldown: float = 60.0,
+    ):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_wait = max_wait
+        self.default_cooldown = default_cooldown
+        self._lock = threading.Lock()
+        self._keys: Dict[str, _KeyState] = {label: _KeyState(rpm, tpm) for label in labels}
+
+    # --- RESERVA ---
+    def _tentar(self, tokens: float, candidatos: List[str], agora: float) -> Optional[str]:
+        melhor, folga = None, -1.0
+        for label in candidatos:
+            st = self._keys[label]
+            if st.cooldown_until > agora:
+                continue
+            st.rpm.refill(agora)
+            st.tpm.refill(agora)
+            if st.rpm.tokens < 1 or st.tpm.tokens < min(tokens, st.tpm.capacity):
+                continue
+            headroom = min(st.rpm.headroom, st.tpm.headroom)
+            if headroom > folga:
+                melhor, folga = label, headroom
+        if melhor is not None:
+            st = self._keys[melhor]
+            st.rpm.tokens -= 1
+            st.tpm.tokens -= min(tokens, st.tpm.capacity)
+            st.requests += 1
+        return melhor
+
+    def _proxima_vaga(self, tokens: float, candidatos: List[str], agora: float) -> float:
+        """Segundos até a primeira chave candidata ter espaço para este pedido."""
+        esperas = []
+        for label in candidatos:
+            st = self._keys[label]
+            esperas.append(
+                max(
+                    st.cooldown_until - agora,
+                    st.rpm.wait_for(1),
+                    st.tpm.wait_for(tokens),
+                )
+            )
+        return max(0.0, min(esperas)) if esperas else float("inf")
+
+    async def acquire(
+        self,
+        tokens: float = 1,
+        exclude: Iterable[str] = (),
+        eligible: Optional[Callable[[str], bool]] = None,
+    ) -> Optional[str]:
+        """
+        Reserva um pedido e `tokens` tokens na chave com mais folga e devolve o rótulo.
+        `eligible` filtra chaves (ex.: disjuntor aberto), mas se nenhuma passar o filtro
+        todas voltam a valer. Devolve None se nenhuma liberar dentro de `max_wait`.
+        """
+        excluidas = set(exclude)
+        candidatos = [label for label in self._keys if label not in excluidas]
+        if eligible is not None:
+            candidatos = [label for label in candidatos if eligible(label)] or candidatos
+        if not candidatos:
+            return None
+
+        inicio = time.monotonic()
+        esperou = False
+        while True:
+            with self._lock:
+                agora = time.monotonic()
+                label = self._tentar(tokens, candidatos, agora)
+                if label is not None:
+                    if esperou:
+                        self._keys[label].waits += 1
+                    return label
+                espera = self._proxima_vaga(tokens, candidatos, agora)
+
+            restante = self.max_wait - (time.monotonic() - inicio)
+            if espera > restante:
+                return None
+            esperou = True
+            await asyncio.sleep(max(espera, 0.01))
+
+    def settle(self, label: str, reserved: float, used: Optional[float]):
+        """Acerta o TPM com os tokens reais da resposta (a reserva foi uma estimativa)."""
+        with self._lock:
+            st = self._keys.get(label)
+            if st is None:
+                return
+            real = reserved if used is None else used
+            st.tokens_used += int(real)
+            if used is not None:
+                st.tpm.tokens = min(st.tpm.capacity, st.tpm.tokens + reserved - used)
+
+    def penalize(self, label: str, retry_after: Optional[float] = None) -> float:
+        """Recebeu 429: a chave fica de lado por `retry_after` (ou o padrão) e o RPM esvazia."""
+        espera = retry_after if retry_after is not None else self.default_cooldown
+        with self._lock:
+            st = self._keys.get(label)
+            if st is None:
+                return espera
+            st.cooldown_until = max(st.cooldown_until, time.monotonic() + espera)
+            st.rpm.tokens = 0.0
+            st.rate_limited += 1
+        return espera
+
+    def available(self) -> List[str]:
+        """Rótulos fora do castigo por 429 (sem reservar nada)."""
+        agora = time.monotonic()
+        with self._lock:
+            return [label for label, st in self._keys.items() if st.cooldown_until <= agora]
+
+    # --- LEITURA ---
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Utilização por chave (fração do balde em uso agora) e contadores."""
+        agora = time.monotonic()
+        resultado = {}
+        with self._lock:
+            for label, st in self._keys.items():
+                st.rpm.refill(agora)
+                st.tpm.refill(agora)
+                resultado[label] = {
+                    "rpm_util": round(1 - st.rpm.headroom, 3),
+                    "tpm_util": round(1 - st.tpm.headroom, 3),
+                    "cooldown_s": round(max(0.0, st.cooldown_until - agora), 1),
+                    "requests": st.requests,
+                    "tokens": st.tokens_used,
+                    "rate_limited": st.rate_limited,
+                    "waits": st.waits,
+                }
+        return resultado
+
+
+def retry_after_from(error: Exception) -> Optional[float]:
+    """Segundos pedidos pelo servidor num 429 (RetryInfo, cabeçalho Retry-After ou texto)."""
+    for detalhe in getattr(error, "details", None) or []:
+        atraso = getattr(detalhe, "retry_delay", None)
+        if atraso is not None:
+            return atraso.seconds + atraso.nanos / 1e9
+
+    resposta = getattr(error, "response", None)
+    cabecalho = getattr(resposta, "headers", {}).get("retry-after") if resposta is not None else None
+    if cabecalho:
+        try:
+            return float(cabecalho)
+        except ValueError:
+            pass
+
+    texto = str(error)
+    for padrao in (_RETRY_EM, _RETRY_SEGUNDOS):
+        achado = padrao.search(texto)
+        if achado:
+            return float(achado.group(1))
+    return None
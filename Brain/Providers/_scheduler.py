@@ -0,0 +1,294 @@
+# Brain/Providers/_scheduler.py
+
+import os
+import math
+import time
+import asyncio
+import logging
+import itertools
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from Brain.Providers._rate import RateBucket
+from Brain.Core.Tracing import tracer
+
+logger = logging.getLogger("SamBot.LLMScheduler")
+
+# Classes de prioridade (menor = mais urgente). As interativas têm alguém à espera no Discord.
+INTERATIVO = "interativo"
+ROTEADOR = "roteador"
+RESUMO = "resumo"
+FUNDO = "fundo"
+
+# classe: (prioridade, concorrência máxima, pedidos/min máximos ou None, interativa)
+CLASSES = {
+    INTERATIVO: (0, 8, None, True),
+    ROTEADOR: (1, 4, None, True),
+    RESUMO: (2, 2, 20, False),
+    FUNDO: (3, 1, 6, False),
+}
+
+
+def _percentil(valores: List[float], pct: float) -> float:
+    ordenados = sorted(valores)
+    idx = min(len(ordenados) - 1, max(0, int(round(pct / 100 * len(ordenados))) - 1))
+    return ordenados[idx]
+
+
+class _Classe:
+    __slots__ = ("nome", "prioridade", "limite", "taxa", "interativa", "em_curso",
+                 "fila", "max_fila", "concedidos", "esperas")
+
+    def __init__(self, nome: str, prioridade: int, limite: int, rpm: Optional[float], interativa: bool):
+        self.nome = nome
+        self.prioridade = prioridade
+        self.limite = limite
+        self.taxa = RateBucket(rpm) if rpm else None
+        self.interativa = interativa
+        self.em_curso = 0
+        self.fila = 0
+        self.max_fila = 0
+        self.concedidos = 0
+        self.esperas: Deque[float] = deque(maxlen=200)
+
+
+class _Pedido:
+    __slots__ = ("classe", "seq", "futuro", "pedido_em")
+
+    def __init__(self, classe: _Classe, seq: int, futuro: asyncio.Future):
+        self.classe = classe
+        self.seq = seq
+        self.futuro = futuro
+        self.pedido_em = time.monotonic()
+
+    def ordem(self) -> Tuple[int, int]:
+        return (self.classe.prioridade, self.seq)
+
+
+class Slot:
+    """Vaga concedida pelo `LLMScheduler` (gestor de contexto assíncrono)."""
+
+    __slots__ = ("scheduler", "classe", "pedido_em", "medido", "_ativa")
+
+    def __init__(self, scheduler: "LLMScheduler", classe: str):
+        self.scheduler = scheduler
+        self.classe = classe
+        self.pedido_em = 0.0
+        self.medido = False
+        self._ativa = False
+
+    async def __aenter__(self) -> "Slot":
+        self.pedido_em = time.monotonic()
+        await self.scheduler._acquire(self.classe)
+        self._ativa = True
+        return self
+
+    async def __aexit__(self, *exc):
+        self.first_output()
+        self._ativa = False
+        self.scheduler._release(self.classe)
+        return False
+
+    def first_output(self):
+        """
+        Marca o momento em que quem espera começou a ver a resposta. No streaming é o
+        primeiro pedaço; sem chamada explícita, conta o fim do pedido.
+        """
+        if self._ativa and not self.medido:
+            self.medido = True
+            self.scheduler._observar(self.classe, (time.monotonic() - self.pedido_em) * 1000)
+
+
+class LLMScheduler:
+    """
+    Fila única à frente das cadeias de LLM, por classe de prioridade. Cada classe
+    tem o seu limite de concorrência; as de segundo plano têm também um teto de
+    pedidos por minuto e nunca ocupam as últimas `reserve` vagas do total, que ficam
+    guardadas para o tráfego interativo. Quando vaga uma, vai para o pedido mais
+    urgente (e, dentro da classe, o mais antigo).
+
+    O p95 da latência interativa (do pedido até o primeiro texto) é vigiado numa
+    janela de `window` segundos: acima de `p95_target_ms`, a concorrência do segundo
+    plano cai para metade a cada ajuste, até parar; abaixo de 80% do alvo, volta aos
+    poucos. Sem tráfego interativo recente, o segundo plano corre livre.
+    """
+
+    def __init__(
+        self,
+        slots: int = 8,
+        reserve: int = 2,
+        p95_target_ms: float = 8000,
+        window: float = 120,
+        classes: Optional[Dict[str, Tuple[int, int, Optional[float], bool]]] = None,
+    ):
+        self.slots = slots
+        self.reserve = min(reserve, max(0, slots - 1))
+        self.p95_target_ms = p95_target_ms
+        self.window = window
+        self._classes: Dict[str, _Classe] = {
+            nome: _Classe(nome, *cfg) for nome, cfg in (classes or CLASSES).items()
+        }
+        self._lock = threading.Lock()
+        self._pendentes: List[_Pedido] = []
+        self._seq = itertools.count()
+        self._ocupadas = 0
+        self._interativas: Deque[Tuple[float, float]] = deque(maxlen=500)
+        self.factor = 1.0
+        self._ajustado_em = 0.0
+
+    def slot(self, classe: str = INTERATIVO) -> Slot:
+        if classe not in self._classes:
+            raise ValueError(f"Classe de prioridade desconhecida: {classe}")
+        return Slot(self, classe)
+
+    # --- CONCESSÃO ---
+    def _limite(self, c: _Classe) -> int:
+        return c.limite if c.interativa else math.ceil(c.limite * self.factor)
+
+    def _pode(self, c: _Classe, agora: float) -> bool:
+        livres = self.slots - self._ocupadas
+        if livres <= 0 or c.em_curso >= self._limite(c):
+            return False
+        if not c.interativa and livres <= self.reserve:
+            return False
+        if c.taxa is not None:
+            c.taxa.refill(agora)
+            if c.taxa.tokens < 1:
+                return False
+        return True
+
+    def _despachar(self):
+        """Concede vagas aos pedidos pendentes, do mais urgente ao menos."""
+        agora = time.monotonic()
+        with self._lock:
+            self._ajustar(agora)
+            restantes = []
+            for pedido in sorted(self._pendentes, key=_Pedido.ordem):
+                if pedido.futuro.done():
+                    continue
+                c = pedido.classe
+                if self._ocupadas < self.slots and self._pode(c, agora):
+                    self._ocupadas += 1
+                    c.em_curso += 1
+                    c.concedidos += 1
+                    c.fila -= 1
+                    if c.taxa is not None:
+                        c.taxa.tokens -= 1
+                    espera = (agora - pedido.pedido_em) * 1000
+                    c.esperas.append(espera)
+                    tracer.record(f"llm.fila.{c.nome}", espera)
+                    pedido.futuro.set_result(None)
+                else:
+                    restantes.append(pedido)
+            self._pendentes = restantes
+
+    async def _acquire(self, nome: str):
+        c = self._classes[nome]
+        futuro = asyncio.get_running_loop().create_future()
+        with self._lock:
+            self._pendentes.append(_Pedido(c, next(self._seq), futuro))
+            c.fila += 1
+            c.max_fila = max(c.max_fila, c.fila)
+        try:
+            while True:
+                self._despachar()
+                if futuro.done():
+                    return
+                try:
+                    # Revisita a cada segundo: o teto por minuto e o fator mudam sem ninguém sair
+                    await asyncio.wait_for(asyncio.shield(futuro), 1.0)
+                    return
+                except asyncio.TimeoutError:
+                    continue
+        except asyncio.CancelledError:
+            with self._lock:
+                concedido = futuro.done() and not futuro.cancelled()
+                if not concedido:
+                    futuro.cancel()
+                    c.fila -= 1
+            if concedido:
+                self._release(nome)
+            raise
+
+    def _release(self, nome: str):
+        with self._lock:
+            c = self._classes[nome]
+            c.em_curso -= 1
+            self._ocupadas -= 1
+        self._despachar()
+
+    # --- ADAPTAÇÃO ---
+    def _observar(self, nome: str, ms: float):
+        if self._classes[nome].interativa:
+            with self._lock:
+                self._interativas.append((time.monotonic(), ms))
+
+    def interactive_p95(self, agora: Optional[float] = None) -> Optional[float]:
+        """p95 (ms) da latência interativa na janela; None com menos de 5 amostras."""
+        agora = time.monotonic() if agora is None else agora
+        recentes = [ms for ts, ms in self._interativas if agora - ts <= self.window]
+        return _percentil(recentes, 95) if len(recentes) >= 5 else None
+
+    def _ajustar(self, agora: float):
+        """AIMD do fator do segundo plano, no máximo uma vez por segundo (chamado com o lock)."""
+        if agora - self._ajustado_em < 1.0:
+            return
+        self._ajustado_em = agora
+        anterior = self.factor
+        p95 = self.interactive_p95(agora)
+        if p95 is not None and p95 > self.p95_target_ms:
+            self.factor = self.factor / 2 if self.factor > 0.125 else 0.0
+        elif p95 is None or p95 < 0.8 * self.p95_target_ms:
+            self.factor = min(1.0, self.factor + 0.25)
+
+        if anterior > 0 and self.factor == 0:
+            logger.warning(
+                f"🐢 p95 interativo em {p95:.0f}ms (alvo {self.p95_target_ms:.0f}ms). Segundo plano em pausa."
+            )
+        elif anterior == 0 and self.factor > 0:
+            logger.info("🐇 Latência interativa normalizada. Segundo plano retomado.")
+
+    # --- LEITURA ---
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            p95 = self.interactive_p95()
+            classes = {}
+            for nome, c in self._classes.items():
+                esperas = list(c.esperas)
+                classes[nome] = {
+                    "queue": c.fila,
+                    "max_queue": c.max_fila,
+                    "running": c.em_curso,
+                    "limit": self._limite(c),
+                    "granted": c.concedidos,
+                    "wait_p50_ms": round(_percentil(esperas, 50), 1) if esperas else 0.0,
+                    "wait_p95_ms": round(_percentil(esperas, 95), 1) if esperas else 0.0,
+                }
+            return {
+                "slots": self.slots,
+                "busy": self._ocupadas,
+                "reserve": self.reserve,
+                "factor": self.factor,
+                "interactive_p95_ms": round(p95, 1) if p95 is not None else None,
+                "classes": classes,
+            }
+
+
+def _classes_do_ambiente() -> Dict[str, Tuple[int, int, Optional[float], bool]]:
+    """CLASSES com LLM_SCHED_LIMIT_<CLASSE> e LLM_SCHED_RPM_<CLASSE> (0 = sem teto) aplicados."""
+    classes = {}
+    for nome, (prioridade, limite, rpm, interativa) in CLASSES.items():
+        limite = int(os.getenv(f"LLM_SCHED_LIMIT_{nome.upper()}", limite))
+        rpm = float(os.getenv(f"LLM_SCHED_RPM_{nome.upper()}", rpm or 0)) or None
+        classes[nome] = (prioridade, limite, rpm, interativa)
+    return classes
+
+
+llm_scheduler = LLMScheduler(
+    slots=int(os.getenv("LLM_SCHED_SLOTS", "8")),
+    reserve=int(os.getenv("LLM_SCHED_INTERACTIVE_RESERVE", "2")),
+    p95_target_ms=float(os.getenv("LLM_SCHED_P95_TARGET_MS", "8000")),
+    window=float(os.getenv("LLM_SCHED_WINDOW", "120")),
+    classes=_classes_do_ambiente(),
+)
@@ -1,30 +1,28 @@
 import aiohttp
-import time
+
+from Brain.Memory.Cache import get_cache
+
 
 class CurrencyService:
     def __init__(self):
         self.api_url = "https://economia.awesomeapi.com.br/last/USD-BRL"
-        self._cache_rate = None
-        self._cache_time = 0
-        self._cache_duration = 7200  # 2 hora de cache para evitar muitas requisições
+        # 2 horas de cache para evitar muitas requisições
+        self._cache_rate = get_cache("currency.rates", max_entries=8, ttl=7200)
 
     async def get_usd_to_brl(self):
         """Retorna a cotação atual do Dólar para Real."""
-        if self._cache_rate and (time.time() - self._cache_time < self._cache_duration):
-            return self._cache_rate
-
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.api_url) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        rate = float(data['USDBRL']['bid'])
-                        
-                        self._cache_rate = rate
-                        self._cache_time = time.time()
-                        return rate
+            return await self._cache_rate.get_or_compute("USD-BRL", self._fetch_usd_to_brl)
         except Exception as e:
             print(f"❌ [Currency] Erro ao buscar cotação: {e}")
-            
+
         # Fallback se a API falhar (valor aproximado seguro)
-        return 6.00
\ No newline at end of file
+        return 6.00
+
+    async def _fetch_usd_to_brl(self) -> float:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(self.api_url) as resp:
+                if resp.status != 200:
+                    raise RuntimeError(f"API respondeu {resp.status}")
+                data = await resp.json()
+                return float(data['USDBRL']['bid'])
@@ -10,14 +10,17 @@ import json
 
 # Camada de Inteligência e Dados
 from Brain.Memory.DataManager import data_manager
+from Brain.Core.Tracing import tracer
 from Modules.Admin.Mods._appeals import AppealStartView
 
 try:
     # Importa a instância já inicializada para diagnósticos
     from Brain.Providers.LLMFactory import LLMFactory, llm_factory
+    from Brain.Providers._scheduler import llm_scheduler
 except ImportError:
     LLMFactory = None
     llm_factory = None
+    llm_scheduler = None
 
 try:
     from .Logger import Logger
@@ -64,6 +67,7 @@ class SamBot(commands.Bot):
 
         self.stats = {"messages_read": 0, "commands_used": 0, "voice_time_minutes": 0}
         self.stats_file = "logs/bot_stats.json"
+        self.latency_file = "logs/pipeline_latency.jsonl"
 
         self.log = Logger()
         self.agent = None
@@ -82,6 +86,8 @@ class SamBot(commands.Bot):
 
     async def setup_hook(self):
         self.log.info("🔌 Iniciando Main Loop e carregando módulos...")
+        # Migração do XP legado antes de qualquer cog ler ou gravar XP
+        await data_manager.aio.call(data_manager.migrate_legacy_xp)
         await self.carregar_cogs()
 
         self.agent = self.get_cog("CerebroIA")
@@ -198,6 +204,23 @@ class SamBot(commands.Bot):
         )
         await self.change_presence(status=discord.Status.dnd, activity=activity)
 
+    async def close(self):
+        """Grava os dados pendentes do DataManager e fecha os clientes de IA antes de desligar."""
+        if data_manager:
+            try:
+                # Passa pela fila da fachada: o que já estava enfileirado é gravado antes
+                await data_manager.aio.flush()
+                self.log.info("💾 Dados pendentes gravados em disco.")
+            except Exception as e:
+                self.log.error(f"❌ Falha ao gravar dados pendentes no desligamento: {e}")
+        # Fatos ainda na fila de aprendizado são extraídos antes de fechar os clientes de IA
+        pipeline = getattr(getattr(self, "agent", None), "pipeline", None)
+        if pipeline is not None:
+            await pipeline.aprendizado.drain()
+        if llm_factory:
+            await llm_factory.fechar()
+        await super().close()
+
     @tasks.loop(minutes=1)
     async def save_stats_loop(self):
         """Salva as estatísticas do bot a cada 1 minuto para o launcher conseguir ler."""
@@ -216,6 +239,9 @@ class SamBot(commands.Bot):
             "servers": len(self.guilds),
             "users": sum(g.member_count for g in self.guilds if g.member_count),
         }
+        # Profundidade da fila e espera por classe de prioridade do LLM
+        if llm_scheduler:
+            data_to_save["llm_queue"] = llm_scheduler.stats()
 
         try:
             os.makedirs("logs", exist_ok=True)
@@ -224,6 +250,14 @@ class SamBot(commands.Bot):
         except Exception:
             pass  # Ignora silenciosamente se o arquivo estiver em uso
 
+        # Percentis por etapa do pipeline (uma linha JSON por minuto, ficheiro rotativo)
+        if tracer.stats():
+            tracer.dump_rolling(self.latency_file)
+
+        # Saúde dos provedores de IA (só grava se mudou desde a última vez)
+        if llm_factory and data_manager:
+            await data_manager.aio.call(llm_factory.salvar_saude)
+
     @tasks.loop(minutes=30)
     async def status_loop(self):
         if self.is_music_playing:
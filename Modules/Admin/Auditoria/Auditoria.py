@@ -67,15 +67,9 @@ class AuditoriaPresetSelect(discord.ui.Select):
         )
 
     async def callback(self, interaction: discord.Interaction):
-        configs = data_manager.get_knowledge("guild_configs") or {}
-        if self.guild_id not in configs:
-            configs[self.guild_id] = {}
-        if "auditoria" not in configs[self.guild_id]:
-            configs[self.guild_id]["auditoria"] = {}
-
         nivel = int(self.values[0])
-        configs[self.guild_id]["auditoria"]["preset"] = nivel
-        data_manager.save_knowledge("guild_configs", configs)
+        with data_manager.guild_configs.edit(self.guild_id) as guild_cfg:
+            guild_cfg.setdefault("auditoria", {})["preset"] = nivel
         await interaction.response.send_message(
             f"✅ Preset de Auditoria atualizado para o **Nível {nivel}**.",
             ephemeral=True,
@@ -115,14 +109,8 @@ class AuditoriaCustomSelect(discord.ui.Select):
         )
 
     async def callback(self, interaction: discord.Interaction):
-        configs = data_manager.get_knowledge("guild_configs") or {}
-        if self.guild_id not in configs:
-            configs[self.guild_id] = {}
-        if "auditoria" not in configs[self.guild_id]:
-            configs[self.guild_id]["auditoria"] = {}
-
-        configs[self.guild_id]["auditoria"]["custom_flags"] = self.values
-        data_manager.save_knowledge("guild_configs", configs)
+        with data_manager.guild_configs.edit(self.guild_id) as guild_cfg:
+            guild_cfg.setdefault("auditoria", {})["custom_flags"] = list(self.values)
         await interaction.response.send_message(
             "✅ Filtros personalizados salvos!", ephemeral=True
         )
@@ -137,15 +125,9 @@ class AuditoriaCanalSelect(discord.ui.ChannelSelect):
         )
 
     async def callback(self, interaction: discord.Interaction):
-        configs = data_manager.get_knowledge("guild_configs") or {}
-        if self.guild_id not in configs:
-            configs[self.guild_id] = {}
-        if "auditoria" not in configs[self.guild_id]:
-            configs[self.guild_id]["auditoria"] = {}
-
         canal = self.values[0]
-        configs[self.guild_id]["auditoria"]["canal_id"] = canal.id
-        data_manager.save_knowledge("guild_configs", configs)
+        with data_manager.guild_configs.edit(self.guild_id) as guild_cfg:
+            guild_cfg.setdefault("auditoria", {})["canal_id"] = canal.id
         await interaction.response.send_message(
             f"✅ Logs configurados para o canal {canal.mention}.", ephemeral=True
         )
@@ -197,12 +179,11 @@ class AuditoriaCore(commands.Cog):
     @commands.has_permissions(manage_guild=True)
     async def configauditoria(self, ctx: commands.Context):
         guild_id = str(ctx.guild.id)
-        configs = data_manager.get_knowledge("guild_configs") or {}
-        audit_config = configs.get(guild_id, {}).get("auditoria", {})
+        audit_config = data_manager.guild_configs.get(guild_id).auditoria
 
-        canal_id = audit_config.get("canal_id")
-        preset = audit_config.get("preset", 1)
-        custom_flags = audit_config.get("custom_flags", [])
+        canal_id = audit_config.canal_id
+        preset = audit_config.preset
+        custom_flags = sorted(audit_config.custom_flags)
 
         canal_txt = f"<#{canal_id}>" if canal_id else "⚠️ Não configurado"
 
@@ -224,17 +205,12 @@ class AuditoriaCore(commands.Cog):
     async def _should_log(
         self, guild_id: int, event_level: int, flag_name: str
     ) -> tuple:
-        configs = data_manager.get_knowledge("guild_configs") or {}
-        config = configs.get(str(guild_id), {}).get("auditoria", {})
-        canal_id = config.get("canal_id")
+        # Chamado em todo evento do servidor: lê o snapshot tipado em RAM
+        config = data_manager.guild_configs.get(guild_id).auditoria
 
-        if not canal_id:
+        if not config.canal_id:
             return None, False
-        preset = config.get("preset", 1)
-
-        if preset == 6:
-            return canal_id, (flag_name in config.get("custom_flags", []))
-        return canal_id, (preset >= event_level)
+        return config.canal_id, config.should_log(event_level, flag_name)
 
     async def enviar_log(
         self, guild: discord.Guild, canal_id: int, embed: discord.Embed
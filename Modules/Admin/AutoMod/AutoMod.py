@@ -32,20 +32,17 @@ class AddWordModal(discord.ui.Modal, title="Adicionar Palavra Bloqueada"):
         self.bot = bot
 
     async def on_submit(self, interaction: discord.Interaction):
-        configs = data_manager.get_knowledge("guild_configs") or {}
-        if self.guild_id not in configs:
-            configs[self.guild_id] = {}
-        if "automod" not in configs[self.guild_id]:
-            configs[self.guild_id]["automod"] = {}
-        if "blocked_words" not in configs[self.guild_id]["automod"]:
-            configs[self.guild_id]["automod"]["blocked_words"] = []
-
         palavra_nova = self.palavra.value.lower().strip()
-        lista_palavras = configs[self.guild_id]["automod"]["blocked_words"]
 
-        if palavra_nova not in lista_palavras:
-            lista_palavras.append(palavra_nova)
-            data_manager.save_knowledge("guild_configs", configs)
+        with data_manager.guild_configs.edit(self.guild_id) as guild_cfg:
+            lista_palavras = guild_cfg.setdefault("automod", {}).setdefault(
+                "blocked_words", []
+            )
+            adicionada = palavra_nova not in lista_palavras
+            if adicionada:
+                lista_palavras.append(palavra_nova)
+
+        if adicionada:
             await interaction.response.send_message(
                 f"✅ A palavra **{palavra_nova}** foi adicionada à lista negra!",
                 ephemeral=True,
@@ -64,15 +61,10 @@ class AutoModConfigView(discord.ui.View):
         self.guild_id = str(ctx.guild.id)
 
     async def toggle_feature(self, interaction: discord.Interaction, feature: str):
-        configs = data_manager.get_knowledge("guild_configs") or {}
-        if self.guild_id not in configs:
-            configs[self.guild_id] = {}
-        if "automod" not in configs[self.guild_id]:
-            configs[self.guild_id]["automod"] = {}
-
-        atual = configs[self.guild_id]["automod"].get(feature, False)
-        configs[self.guild_id]["automod"][feature] = not atual
-        data_manager.save_knowledge("guild_configs", configs)
+        with data_manager.guild_configs.edit(self.guild_id) as guild_cfg:
+            am_config = guild_cfg.setdefault("automod", {})
+            atual = am_config.get(feature, False)
+            am_config[feature] = not atual
 
         estado = "LIGADO 🟢" if not atual else "DESLIGADO 🔴"
         await interaction.response.send_message(
@@ -147,16 +139,14 @@ class AutoModCore(commands.Cog):
     )
     @commands.has_permissions(manage_guild=True)
     async def configautomod(self, ctx: commands.Context):
-        configs = data_manager.get_knowledge("guild_configs") or {}
-        guild_id = str(ctx.guild.id)
-        am_config = configs.get(guild_id, {}).get("automod", {})
+        am_config = data_manager.guild_configs.get(ctx.guild.id).automod
 
-        anti_link = "🟢" if am_config.get("anti_link", False) else "🔴"
-        anti_invite = "🟢" if am_config.get("anti_invite", False) else "🔴"
-        anti_words = "🟢" if am_config.get("anti_words", False) else "🔴"
-        anti_spam = "🟢" if am_config.get("anti_spam", False) else "🔴"
+        anti_link = "🟢" if am_config.anti_link else "🔴"
+        anti_invite = "🟢" if am_config.anti_invite else "🔴"
+        anti_words = "🟢" if am_config.anti_words else "🔴"
+        anti_spam = "🟢" if am_config.anti_spam else "🔴"
 
-        lista_palavras = am_config.get("blocked_words", [])
+        lista_palavras = sorted(am_config.blocked_words)
         palavras_txt = ", ".join(lista_palavras) if lista_palavras else "Nenhuma."
 
         embed = discord.Embed(
@@ -180,25 +170,24 @@ class AutoModCore(commands.Cog):
         if message.author.guild_permissions.manage_messages:
             return
 
-        guild_id = str(message.guild.id)
-        configs = data_manager.get_knowledge("guild_configs") or {}
-        am_config = configs.get(guild_id, {}).get("automod", {})
+        # Snapshot em RAM: nenhuma leitura de disco por mensagem
+        am_config = data_manager.guild_configs.get(message.guild.id).automod
 
-        if not am_config:
+        if not am_config.enabled:
             return
 
         motivo_infracao = None
 
-        if am_config.get("anti_words") and self.words_handler and not motivo_infracao:
+        if am_config.anti_words and self.words_handler and not motivo_infracao:
             motivo_infracao = await self.words_handler.analisar(message, am_config)
 
-        if am_config.get("anti_invite") and self.invite_handler and not motivo_infracao:
+        if am_config.anti_invite and self.invite_handler and not motivo_infracao:
             motivo_infracao = await self.invite_handler.analisar(message, am_config)
 
-        if am_config.get("anti_link") and self.link_handler and not motivo_infracao:
+        if am_config.anti_link and self.link_handler and not motivo_infracao:
             motivo_infracao = await self.link_handler.analisar(message, am_config)
 
-        if am_config.get("anti_spam") and self.spam_handler and not motivo_infracao:
+        if am_config.anti_spam and self.spam_handler and not motivo_infracao:
             motivo_infracao = await self.spam_handler.analisar(message, am_config)
 
         if motivo_infracao:
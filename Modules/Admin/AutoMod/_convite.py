@@ -10,14 +10,15 @@ class InviteHandler:
             re.IGNORECASE,
         )
 
-    async def analisar(self, message: discord.Message, config: dict) -> str | None:
+    async def analisar(self, message: discord.Message, config) -> str | None:
         """
         Analisa a mensagem em busca de convites.
         Ignora se o canal, membro ou cargo estiver na whitelist.
+        `config` é o AutoModConfig tipado do servidor.
         """
-        canais_permitidos = config.get("invite_whitelist_channels", [])
-        cargos_permitidos = config.get("invite_whitelist_roles", [])
-        membros_permitidos = config.get("invite_whitelist_members", [])
+        canais_permitidos = config.invite_whitelist_channels
+        cargos_permitidos = config.invite_whitelist_roles
+        membros_permitidos = config.invite_whitelist_members
 
         # Checa se o canal está liberado (Ex: chat de divulgação)
         if message.channel.id in canais_permitidos:
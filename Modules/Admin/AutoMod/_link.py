@@ -4,6 +4,8 @@ import aiohttp
 import logging
 from urllib.parse import urlparse
 
+from Brain.Memory.Cache import get_cache
+
 
 class LinkHandler:
     def __init__(self):
@@ -13,16 +15,16 @@ class LinkHandler:
             r"(?:https?://|www\.)[^\s/$.?#].[^\s]*", re.IGNORECASE
         )
 
-        # O CACHE: Guarda os links já verificados na memória RAM
-        self.link_cache = {}
+        # O CACHE: Guarda os domínios já verificados na memória RAM (limitado, expira em 6h)
+        self.link_cache = get_cache("automod.links", max_entries=10_000, ttl=6 * 3600)
 
-    async def analisar(self, message: discord.Message, config: dict) -> str | None:
+    async def analisar(self, message: discord.Message, config) -> str | None:
         """
         Analisa a mensagem, ignora sites seguros e checa sites desconhecidos na API.
+        `config` é o AutoModConfig tipado do servidor.
         """
         # 1. VERIFICA WHITELISTS DE CANAIS
-        canais_permitidos = config.get("link_whitelist_channels", [])
-        if message.channel.id in canais_permitidos:
+        if message.channel.id in config.link_whitelist_channels:
             return None
 
         content = message.content.lower()
@@ -48,7 +50,7 @@ class LinkHandler:
         ]
 
         # 3. DOMÍNIOS BLOQUEADOS PELA STAFF
-        blacklist_local = config.get("link_blacklist_domains", [])
+        blacklist_local = config.link_blacklist_domains
 
         for link in links_encontrados:
             try:
@@ -77,36 +79,35 @@ class LinkHandler:
         """
         Consulta a API gratuita Sinking Yachts para golpes de Discord.
         """
-        # Se já checamos esse site antes, pega da memória RAM
-        if dominio in self.link_cache:
-            return self.link_cache[dominio]
-
-        # Endpoint gratuito da Sinking Yachts
-        api_url = f"https://phish.sinking.yachts/v2/check/{dominio}"
-        headers = {"accept": "application/json", "X-Identity": "SamBot-Security"}
-
+        # Se já checamos esse site antes, pega da memória RAM; vários usuários mandando
+        # o mesmo link ao mesmo tempo geram uma única consulta (single-flight)
         try:
-            # Colocamos um timeout de 4 segundos. Se a internet oscilar ou a API cair,
-            # o bot não trava e a mensagem do usuário é enviada normalmente.
-            async with aiohttp.ClientSession() as session:
-                async with session.get(api_url, headers=headers, timeout=4.0) as resp:
-                    if resp.status == 200:
-                        is_bad = (
-                            await resp.json()
-                        )  # Retorna booleano direto (true/false)
-
-                        # Prevenção caso a API retorne texto em vez de booleano
-                        if isinstance(is_bad, str):
-                            is_bad = is_bad.lower() == "true"
-
-                        # Salva a resposta no cache
-                        self.link_cache[dominio] = is_bad
-                        return is_bad
-                    else:
-                        # Se a API sobrecarregar, deixamos passar por segurança
-                        return False
-        except Exception as e:
+            return await self.link_cache.get_or_compute(
+                dominio, lambda: self._consultar_api(dominio)
+            )
+        except Exception:
             self.logger.warning(
                 f"⚠️ Erro ao consultar API de links para o domínio {dominio}. Passando direto."
             )
             return False
+
+    async def _consultar_api(self, dominio: str) -> bool:
+        """Consulta a API. Só respostas válidas vão para o cache; falhas levantam erro."""
+        # Endpoint gratuito da Sinking Yachts
+        api_url = f"https://phish.sinking.yachts/v2/check/{dominio}"
+        headers = {"accept": "application/json", "X-Identity": "SamBot-Security"}
+
+        # Colocamos um timeout de 4 segundos. Se a internet oscilar ou a API cair,
+        # o bot não trava e a mensagem do usuário é enviada normalmente.
+        async with aiohttp.ClientSession() as session:
+            async with session.get(api_url, headers=headers, timeout=4.0) as resp:
+                if resp.status != 200:
+                    # Se a API sobrecarregar, deixamos passar por segurança (sem cache)
+                    raise RuntimeError(f"API respondeu {resp.status}")
+
+                is_bad = await resp.json()  # Retorna booleano direto (true/false)
+
+                # Prevenção caso a API retorne texto em vez de booleano
+                if isinstance(is_bad, str):
+                    is_bad = is_bad.lower() == "true"
+                return bool(is_bad)
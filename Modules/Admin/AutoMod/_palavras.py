@@ -27,16 +27,16 @@ class WordsHandler:
 
         return texto
 
-    async def analisar(self, message: discord.Message, config: dict) -> str | None:
+    async def analisar(self, message: discord.Message, config) -> str | None:
         """
         Analisa a mensagem contra a lista negra de palavras.
+        `config` é o AutoModConfig tipado do servidor.
         """
         # 1. VERIFICA WHITELISTS DE CANAIS (Para não punir em chats de desabafo/livres)
-        canais_permitidos = config.get("words_whitelist_channels", [])
-        if message.channel.id in canais_permitidos:
+        if message.channel.id in config.words_whitelist_channels:
             return None
 
-        palavras_bloqueadas = config.get("blocked_words", [])
+        palavras_bloqueadas = config.blocked_words
         if not palavras_bloqueadas:
             return None
 
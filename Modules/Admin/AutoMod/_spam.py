@@ -1,39 +1,49 @@
 import time
 import discord
-from collections import defaultdict, deque
+from collections import deque
+
+from Brain.Memory.Cache import get_cache
 
 
 class SpamHandler:
     def __init__(self):
-        self.user_timestamps = defaultdict(lambda: deque(maxlen=10))
-        self.user_messages = defaultdict(lambda: deque(maxlen=5))
+        # Histórico por usuário: (timestamps, mensagens). Quem fica 10 min calado sai da RAM.
+        self.historicos = get_cache("automod.spam", max_entries=20_000, ttl=600)
+
+    def _historico(self, user_id: str):
+        historico = self.historicos.get(user_id)
+        if historico is None:
+            historico = (deque(maxlen=10), deque(maxlen=5))
+        # Regrava para renovar o TTL a cada mensagem
+        self.historicos.set(user_id, historico)
+        return historico
 
-    async def analisar(self, message: discord.Message, config: dict) -> str | None:
+    async def analisar(self, message: discord.Message, config) -> str | None:
         """
         Analisa a mensagem em busca de Flood e Repetição.
         Retorna o motivo da infração (string) ou None se estiver tudo OK.
+        `config` é o AutoModConfig tipado do servidor.
         """
         # 1. CHECAGEM DE CANAIS PERMITIDOS (Whitelist)
-        canais_permitidos = config.get("spam_whitelist", [])
-        if message.channel.id in canais_permitidos:
+        if message.channel.id in config.spam_whitelist:
             return None  # Canal ignorado pelo bot (ex: chat de spam, contagem, etc)
 
         user_id = str(message.author.id)
         agora = time.time()
         content = message.content.lower().strip()
+        historico_tempo, historico_msgs = self._historico(user_id)
 
         # 2. DEFINIÇÃO DE VARIÁVEIS DE CONFIGURAÇÃO (Com valores padrão seguros)
-        max_mensagens = config.get("spam_max_msgs", 5)  # Máximo de mensagens permitidas
-        janela_tempo = config.get("spam_time_window", 5.0)  # Dentro de quantos segundos
-        max_repeticoes = config.get(
-            "spam_max_reps", 3
+        max_mensagens = config.spam_max_msgs  # Máximo de mensagens permitidas
+        janela_tempo = config.spam_time_window  # Dentro de quantos segundos
+        max_repeticoes = (
+            config.spam_max_reps
         )  # Máximo de mensagens EXATAMENTE iguais seguidas
 
         # --- VERIFICAÇÃO 3: REPETIÇÃO EXATA (Padrão de texto) ---
         if (
             content
         ):  # Ignora mensagens vazias (ex: alguém enviando apenas um anexo/imagem)
-            historico_msgs = self.user_messages[user_id]
             historico_msgs.append(content)
 
             # Se o usuário enviou a mesma mensagem repetidas vezes
@@ -43,7 +53,6 @@ class SpamHandler:
                     return "Spam de Repetição (enviando o mesmo texto várias vezes)."
 
         # --- VERIFICAÇÃO 4: FLOOD (Mensagens rápidas demais) ---
-        historico_tempo = self.user_timestamps[user_id]
         historico_tempo.append(agora)
 
         # Filtra os timestamps mantendo apenas os que ocorreram dentro da nossa "janela de tempo"
@@ -1,6 +1,8 @@
 import discord
 from discord.ext import commands
 import logging
+from contextlib import contextmanager
+
 from Brain.Memory.DataManager import data_manager
 
 
@@ -11,17 +13,15 @@ class LevelAdmin(commands.Cog):
         self.bot = bot
         self.logger = logging.getLogger("SamBot.LevelAdmin")
 
-    def _get_config(self, guild_id: str):
-        configs = data_manager.get_knowledge("guild_configs") or {}
-        if guild_id not in configs:
-            configs[guild_id] = {}
-        if "leveling" not in configs[guild_id]:
-            configs[guild_id]["leveling"] = {
-                "rewards": {},  # "nivel": cargo_id
-                "no_xp_channels": [],  # [canal_id, canal_id]
-                "role_boosts": {},  # "cargo_id": 1.5 (Multiplicador)
-            }
-        return configs, configs[guild_id]["leveling"]
+    @contextmanager
+    def _edit_config(self, guild_id: str):
+        """Edita só o bloco `leveling` do servidor; a gravação fica a cargo do GuildConfigService."""
+        with data_manager.guild_configs.edit(guild_id) as guild_cfg:
+            level_config = guild_cfg.setdefault("leveling", {})
+            level_config.setdefault("rewards", {})  # "nivel": cargo_id
+            level_config.setdefault("no_xp_channels", [])  # [canal_id, canal_id]
+            level_config.setdefault("role_boosts", {})  # "cargo_id": 1.5 (Multiplicador)
+            yield level_config
 
     # ==========================================
     # PAINEL GERAL
@@ -32,21 +32,19 @@ class LevelAdmin(commands.Cog):
     )
     @commands.has_permissions(manage_guild=True)
     async def levelpainel(self, ctx: commands.Context):
-        configs, level_config = self._get_config(str(ctx.guild.id))
+        level_config = data_manager.guild_configs.get(ctx.guild.id).leveling
 
         embed = discord.Embed(
             title="⚙️ Painel de Configuração de Níveis", color=discord.Color.blurple()
         )
 
         # 1. Cargos de Recompensa
-        recompensas = level_config.get("rewards", {})
+        recompensas = level_config.rewards
         if recompensas:
             txt_recompensas = "\n".join(
                 [
                     f"**Nível {lvl}:** <@&{role_id}>"
-                    for lvl, role_id in sorted(
-                        recompensas.items(), key=lambda x: int(x[0])
-                    )
+                    for lvl, role_id in sorted(recompensas.items())
                 ]
             )
         else:
@@ -56,7 +54,7 @@ class LevelAdmin(commands.Cog):
         )
 
         # 2. Multiplicadores de XP (Boosts)
-        boosts = level_config.get("role_boosts", {})
+        boosts = level_config.role_boosts
         if boosts:
             txt_boosts = "\n".join(
                 [f"<@&{role_id}>: **{mult}x XP**" for role_id, mult in boosts.items()]
@@ -66,7 +64,7 @@ class LevelAdmin(commands.Cog):
         embed.add_field(name="🚀 Boosts de XP (Cargos)", value=txt_boosts, inline=False)
 
         # 3. Canais sem XP
-        canais = level_config.get("no_xp_channels", [])
+        canais = sorted(level_config.no_xp_channels)
         if canais:
             txt_canais = " ".join([f"<#{c_id}>" for c_id in canais])
         else:
@@ -91,13 +89,11 @@ class LevelAdmin(commands.Cog):
     async def levelrecompensa(
         self, ctx: commands.Context, nivel: int, cargo: discord.Role = None
     ):
-        configs, level_config = self._get_config(str(ctx.guild.id))
-
         if cargo is None:
             # Se não enviar o cargo, o bot assume que é para DELETAR a recompensa
-            if str(nivel) in level_config["rewards"]:
-                del level_config["rewards"][str(nivel)]
-                data_manager.save_knowledge("guild_configs", configs)
+            if nivel in data_manager.guild_configs.get(ctx.guild.id).leveling.rewards:
+                with self._edit_config(ctx.guild.id) as level_config:
+                    level_config["rewards"].pop(str(nivel), None)
                 return await ctx.send(
                     f"✅ Recompensa do **Nível {nivel}** removida com sucesso.",
                     ephemeral=True,
@@ -109,8 +105,8 @@ class LevelAdmin(commands.Cog):
                 )
 
         # Adiciona ou Atualiza (Edit) a recompensa
-        level_config["rewards"][str(nivel)] = cargo.id
-        data_manager.save_knowledge("guild_configs", configs)
+        with self._edit_config(ctx.guild.id) as level_config:
+            level_config["rewards"][str(nivel)] = cargo.id
         await ctx.send(
             f"✅ **Nível {nivel}** agora recompensa os membros com o cargo {cargo.mention}.",
             ephemeral=True,
@@ -127,13 +123,11 @@ class LevelAdmin(commands.Cog):
     async def levelboost(
         self, ctx: commands.Context, cargo: discord.Role, multiplicador: float
     ):
-        configs, level_config = self._get_config(str(ctx.guild.id))
-
         if multiplicador <= 1.0:
             # Se o multiplicador for 1.0 ou menor, nós deletamos o boost
-            if str(cargo.id) in level_config["role_boosts"]:
-                del level_config["role_boosts"][str(cargo.id)]
-                data_manager.save_knowledge("guild_configs", configs)
+            if cargo.id in data_manager.guild_configs.get(ctx.guild.id).leveling.role_boosts:
+                with self._edit_config(ctx.guild.id) as level_config:
+                    level_config["role_boosts"].pop(str(cargo.id), None)
                 return await ctx.send(
                     f"✅ Boost do cargo {cargo.mention} foi removido.", ephemeral=True
                 )
@@ -145,8 +139,8 @@ class LevelAdmin(commands.Cog):
         if multiplicador > 5.0:
             multiplicador = 5.0
 
-        level_config["role_boosts"][str(cargo.id)] = multiplicador
-        data_manager.save_knowledge("guild_configs", configs)
+        with self._edit_config(ctx.guild.id) as level_config:
+            level_config["role_boosts"][str(cargo.id)] = multiplicador
         await ctx.send(
             f"✅ Membros com o cargo {cargo.mention} agora ganharão **{multiplicador}x mais XP**!",
             ephemeral=True,
@@ -161,18 +155,19 @@ class LevelAdmin(commands.Cog):
     )
     @commands.has_permissions(manage_channels=True)
     async def levelcanal(self, ctx: commands.Context, canal: discord.TextChannel):
-        configs, level_config = self._get_config(str(ctx.guild.id))
+        with self._edit_config(ctx.guild.id) as level_config:
+            bloqueado = canal.id in level_config["no_xp_channels"]
+            if bloqueado:
+                level_config["no_xp_channels"].remove(canal.id)
+            else:
+                level_config["no_xp_channels"].append(canal.id)
 
-        if canal.id in level_config["no_xp_channels"]:
-            level_config["no_xp_channels"].remove(canal.id)
-            data_manager.save_knowledge("guild_configs", configs)
+        if bloqueado:
             await ctx.send(
                 f"✅ O canal {canal.mention} foi **desbloqueado** e voltou a dar XP.",
                 ephemeral=True,
             )
         else:
-            level_config["no_xp_channels"].append(canal.id)
-            data_manager.save_knowledge("guild_configs", configs)
             await ctx.send(
                 f"🔇 O canal {canal.mention} foi **bloqueado**. Ninguém ganhará XP lá.",
                 ephemeral=True,
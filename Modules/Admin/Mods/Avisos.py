@@ -18,13 +18,8 @@ class Avisos(commands.Cog):
     )
     @commands.has_permissions(manage_guild=True)
     async def configavisos(self, ctx: commands.Context, canal: discord.TextChannel):
-        configs = data_manager.get_knowledge("guild_configs") or {}
-        guild_id = str(ctx.guild.id)
-        if guild_id not in configs:
-            configs[guild_id] = {}
-
-        configs[guild_id]["avisos_channel"] = canal.id
-        data_manager.save_knowledge("guild_configs", configs)
+        with data_manager.guild_configs.edit(ctx.guild.id) as guild_cfg:
+            guild_cfg["avisos_channel"] = canal.id
 
         await ctx.send(
             f"✅ Mural de Avisos configurado com sucesso para o canal {canal.mention}.",
@@ -42,8 +37,7 @@ class Avisos(commands.Cog):
         """
         Gera um Embed profissional e envia para o canal de avisos do servidor (se configurado).
         """
-        configs = data_manager.get_knowledge("guild_configs") or {}
-        canal_id = configs.get(str(guild.id), {}).get("avisos_channel")
+        canal_id = data_manager.guild_configs.get(guild.id).avisos_channel
 
         if not canal_id:
             return  # Servidor não configurou o canal de avisos ainda
@@ -34,14 +34,6 @@ class ModPunicoes(commands.Cog):
         # Carrega o banco de dados de avisos
         guild_id = str(ctx.guild.id)
         user_id = str(membro.id)
-        configs = data_manager.get_knowledge("guild_configs") or {}
-
-        if guild_id not in configs:
-            configs[guild_id] = {}
-        if "warns" not in configs[guild_id]:
-            configs[guild_id]["warns"] = {}
-        if user_id not in configs[guild_id]["warns"]:
-            configs[guild_id]["warns"][user_id] = []
 
         # Adiciona o novo aviso
         novo_aviso = {
@@ -49,10 +41,10 @@ class ModPunicoes(commands.Cog):
             "motivo": motivo,
             "data": int(time.time()),
         }
-        configs[guild_id]["warns"][user_id].append(novo_aviso)
-        data_manager.save_knowledge("guild_configs", configs)
-
-        total_avisos = len(configs[guild_id]["warns"][user_id])
+        with data_manager.guild_configs.edit(guild_id) as guild_cfg:
+            avisos = guild_cfg.setdefault("warns", {}).setdefault(user_id, [])
+            avisos.append(novo_aviso)
+            total_avisos = len(avisos)
 
         embed = discord.Embed(title="⚠️ Membro Advertido", color=discord.Color.yellow())
         embed.description = f"**{membro.display_name}** recebeu seu aviso **#{total_avisos}**.\n**Motivo:** {motivo}"
@@ -109,10 +101,8 @@ class ModPunicoes(commands.Cog):
     )
     @commands.has_permissions(manage_messages=True)
     async def warns(self, ctx: commands.Context, membro: discord.Member):
-        configs = data_manager.get_knowledge("guild_configs") or {}
-        avisos = (
-            configs.get(str(ctx.guild.id), {}).get("warns", {}).get(str(membro.id), [])
-        )
+        guild_cfg = data_manager.guild_configs.raw(ctx.guild.id)
+        avisos = guild_cfg.get("warns", {}).get(str(membro.id), [])
 
         if not avisos:
             return await ctx.send(
@@ -143,24 +133,17 @@ class ModPunicoes(commands.Cog):
     async def unwarn(
         self, ctx: commands.Context, membro: discord.Member, numero_aviso: int
     ):
-        configs = data_manager.get_knowledge("guild_configs") or {}
         guild_id, user_id = str(ctx.guild.id), str(membro.id)
 
-        if (
-            guild_id not in configs
-            or "warns" not in configs[guild_id]
-            or user_id not in configs[guild_id]["warns"]
-        ):
+        if user_id not in data_manager.guild_configs.raw(guild_id).get("warns", {}):
             return await ctx.send(
                 f"❌ O membro não possui advertências registradas.", ephemeral=True
             )
 
-        avisos = configs[guild_id]["warns"][user_id]
-
         if numero_aviso == 0:
             # Opção Secreta: Digitar 0 apaga TODOS os avisos do usuário
-            configs[guild_id]["warns"][user_id] = []
-            data_manager.save_knowledge("guild_configs", configs)
+            with data_manager.guild_configs.edit(guild_id) as guild_cfg:
+                guild_cfg.setdefault("warns", {})[user_id] = []
             return await ctx.send(
                 f"✅ **Ficha Limpa!** Todos os avisos de {membro.mention} foram perdoados.",
                 ephemeral=True,
@@ -168,15 +151,18 @@ class ModPunicoes(commands.Cog):
 
         # O usuário digita 1, mas para a lista do python (array), é o index 0. Subtraímos 1.
         index = numero_aviso - 1
-        if index < 0 or index >= len(avisos):
+        removido = None
+        with data_manager.guild_configs.edit(guild_id) as guild_cfg:
+            avisos = guild_cfg.setdefault("warns", {}).setdefault(user_id, [])
+            if 0 <= index < len(avisos):
+                removido = avisos.pop(index)
+
+        if removido is None:
             return await ctx.send(
                 f"❌ Aviso `#{numero_aviso}` não existe. Verifique com `/warns`.",
                 ephemeral=True,
             )
 
-        removido = avisos.pop(index)
-        data_manager.save_knowledge("guild_configs", configs)
-
         await ctx.send(
             f"✅ O aviso **#{numero_aviso}** (\"{removido['motivo']}\") de {membro.mention} foi removido com sucesso.",
             ephemeral=True,
@@ -235,10 +221,9 @@ class ModPunicoes(commands.Cog):
                 user, reason=f"Desbanido por {ctx.author} - Motivo: {motivo}"
             )
 
-            configs = data_manager.get_knowledge("guild_configs") or {}
-            if "appeals" in configs.get(str(ctx.guild.id), {}):
-                configs[str(ctx.guild.id)]["appeals"].pop(str(user_id), None)
-                data_manager.save_knowledge("guild_configs", configs)
+            if str(user_id) in data_manager.guild_configs.raw(ctx.guild.id).get("appeals", {}):
+                with data_manager.guild_configs.edit(ctx.guild.id) as guild_cfg:
+                    guild_cfg["appeals"].pop(str(user_id), None)
 
             embed = discord.Embed(
                 title="🕊️ Membro Desbanido",
@@ -15,13 +15,8 @@ class AppealActionView(discord.ui.View):
         self.mod_id = str(mod_id)
 
     async def _update_appeal_status(self, status: str):
-        configs = data_manager.get_knowledge("guild_configs") or {}
-        if self.guild_id not in configs:
-            configs[self.guild_id] = {}
-        if "appeals" not in configs[self.guild_id]:
-            configs[self.guild_id]["appeals"] = {}
-        configs[self.guild_id]["appeals"][self.user_id] = status
-        data_manager.save_knowledge("guild_configs", configs)
+        with data_manager.guild_configs.edit(self.guild_id) as guild_cfg:
+            guild_cfg.setdefault("appeals", {})[self.user_id] = status
 
     async def _avisar_infrator(self, mensagem: str, cor: discord.Color):
         try:
@@ -192,15 +187,8 @@ class AppealStartView(discord.ui.View):
     async def btn_apelo(
         self, interaction: discord.Interaction, button: discord.ui.Button
     ):
-        configs = data_manager.get_knowledge("guild_configs") or {}
-
-        g_id = str(self.guild_id)
-
-        status = (
-            configs.get(g_id, {})
-            .get("appeals", {})
-            .get(str(interaction.user.id), "livre")
-        )
+        guild_cfg = data_manager.guild_configs.raw(self.guild_id)
+        status = guild_cfg.get("appeals", {}).get(str(interaction.user.id), "livre")
 
         if status == "permanente":
             return await interaction.response.send_message(
@@ -1,45 +1,25 @@
-import json
+import asyncio
 import logging
-import aiofiles
 from Brain.Memory.DataManager import data_manager
 
 
 class PlaylistManager:
     """
-    Gerencia playlists salvas localmente em JSON de forma assíncrona.
-    Usa o DataManager para garantir o caminho correto no Docker.
+    Gerencia playlists salvas localmente de forma assíncrona.
+    Usa o DataManager para garantir o caminho correto no Docker e o formato
+    de disco configurado (DATA_FORMAT); a leitura aceita o JSON antigo.
     """
 
     def __init__(self):
         self.logger = logging.getLogger("SamBot.Playlists.Manager")
         self.filepath = data_manager.folders["persistence"] / "playlists.json"
 
-    async def _ensure_file(self):
-        if not self.filepath.exists():
-            try:
-                async with aiofiles.open(self.filepath, "w", encoding="utf-8") as f:
-                    await f.write(json.dumps({}, indent=4))
-            except Exception as e:
-                self.logger.error(f"Erro ao criar arquivo de playlist: {e}")
-
     async def _load_data(self):
-        await self._ensure_file()
-        try:
-            async with aiofiles.open(self.filepath, "r", encoding="utf-8") as f:
-                content = await f.read()
-                if not content.strip():
-                    return {}
-                return json.loads(content)
-        except Exception as e:
-            self.logger.error(f"Erro ao carregar playlists: {e}")
-            return {}
+        # JsonIO devolve {} para ficheiro ausente, vazio ou corrompido (e regista o erro)
+        return await asyncio.to_thread(data_manager.io.read, self.filepath, dict)
 
     async def _save_data(self, data):
-        try:
-            async with aiofiles.open(self.filepath, "w", encoding="utf-8") as f:
-                await f.write(json.dumps(data, indent=4, ensure_ascii=False))
-        except Exception as e:
-            self.logger.error(f"Erro ao salvar playlists: {e}")
+        await asyncio.to_thread(data_manager.io.save, self.filepath, data)
 
     async def create_playlist(self, user_id: str, name: str, tracks: list):
         data = await self._load_data()
@@ -2,12 +2,20 @@ import discord
 from discord.ext import commands
 import logging
 import asyncio
+import time
 import uuid
 
 # Imports dos módulos internos
 from Brain.Providers.LLMFactory import LLMFactory
+from Brain.Providers._health import provider_health, TTFT
+from Brain.Providers._hedging import hedge_policy
+from Brain.Providers._scheduler import llm_scheduler
 from Brain.Memory.LongTerm.VectorStore import vector_store
 from Brain.Core.NightCycle import NightCycle
+from Brain.Memory.Cache import cache_manager
+from Brain.Core.Tracing import tracer
+from Brain.Core.SingleFlight import flight_stats
+from Brain.Core._response_cache import response_cache
 
 
 class Developer(commands.Cog):
@@ -25,21 +33,211 @@ class Developer(commands.Cog):
     @commands.command(name="infra", aliases=["status_llm"])
     @commands.is_owner()
     async def check_infrastructure(self, ctx):
-        """Exibe a configuração atual de Alta Disponibilidade (Remote/Local)."""
+        """Exibe a configuração de Alta Disponibilidade (Remote/Local) e a saúde de cada provedor."""
         embed = discord.Embed(
             title="🔧 Infraestrutura de IA", color=discord.Color.dark_grey()
         )
 
+        gemini = self.factory.gemini_driver
+        ollama = self.factory.ollama_driver
         embed.add_field(
             name="🖥️ Remote (Nuvem/API)",
-            value=f"Modelo: `{self.factory.model_name}`\nEmbed: `{self.factory.embed_model_cloud}`",
+            value=f"Modelo: `{gemini.model_name}`\nEmbed: `{gemini.embed_model_cloud}`",
             inline=False,
         )
         embed.add_field(
             name="💻 Local (Ollama/CPU)",
-            value=f"URL: `{self.factory.local_url}`\nFast: `{self.factory.local_model}`\nEmbed: `{self.factory.embed_model_local}`",
+            value=f"URL: `{ollama.local_url}`\nFast: `{ollama.local_model}`\nEmbed: `{ollama.embed_model_local}`",
             inline=False,
         )
+
+        # Saúde: um campo por provedor, com as chaves ("gemini#1"...) por baixo
+        icones = {"fechado": "🟢", "meio-aberto": "🟡", "aberto": "🔴"}
+        saude = provider_health.snapshot()
+        for nome in ("gemini", "groq", "ollama"):
+            linhas = []
+            for chave, st in saude.items():
+                # As séries de TTFT ("gemini:ttft") aparecem na linha do próprio provedor
+                if ":" in chave or (chave != nome and not chave.startswith(f"{nome}#")):
+                    continue
+                ewma = f"{st['ewma_ms']:.0f} ms" if st["ewma_ms"] is not None else "—"
+                ttft = saude.get(f"{chave}:{TTFT}", {}).get("ewma_ms")
+                if ttft is not None:
+                    ewma += f" • TTFT {ttft:.0f} ms"
+                linha = (
+                    f"{icones.get(st['state'], '⚪')} `{chave}` {ewma} • "
+                    f"erro `{st['error_rate']:.0%}` • seguidas `{st['consecutive_failures']}` • "
+                    f"✅ {st['successes']} ❌ {st['failures']}"
+                )
+                if st["state"] == "aberto":
+                    restante = st["opened_at"] + st["cooldown"] - time.time()
+                    linha += f" • reabre em `{max(0, restante):.0f}s`"
+                linhas.append(linha)
+            if linhas:
+                embed.add_field(name=f"🩺 {nome}", value="\n".join(linhas)[:1024], inline=False)
+
+        cotas = gemini.agendador.stats()
+        if cotas:
+            linhas = []
+            for rotulo, st in cotas.items():
+                linha = (
+                    f"`{rotulo}` RPM `{st['rpm_util']:.0%}` • TPM `{st['tpm_util']:.0%}` • "
+                    f"pedidos `{st['requests']}` • 429 `{st['rate_limited']}` • na fila `{st['waits']}`"
+                )
+                if st["cooldown_s"]:
+                    linha += f" • fora por `{st['cooldown_s']:.0f}s`"
+                linhas.append(linha)
+            embed.add_field(name="🔑 Cotas Gemini (uso agora)", value="\n".join(linhas)[:1024], inline=False)
+
+        hedge = hedge_policy.stats()
+        if hedge["pedidos"]:
+            embed.add_field(
+                name="🏁 Hedge",
+                value=(
+                    f"Disparados: `{hedge['hedges']}/{hedge['pedidos']}` (`{hedge['hedge_rate']:.0%}`) • "
+                    f"Reserva venceu: `{hedge['win_rate']:.0%}`\n"
+                    f"Negados pelo balde: `{hedge['negados']}` • Fichas: `{hedge['fichas']}`"
+                ),
+                inline=False,
+            )
+
+        fila = llm_scheduler.stats()
+        p95 = fila["interactive_p95_ms"]
+        linhas = [
+            f"Vagas: `{fila['busy']}/{fila['slots']}` (reserva interativa `{fila['reserve']}`) • "
+            f"p95 interativo: `{f'{p95:.0f}ms' if p95 is not None else '—'}` • "
+            f"segundo plano: `{fila['factor']:.0%}`"
+        ]
+        for nome, st in fila["classes"].items():
+            linhas.append(
+                f"`{nome}`: fila `{st['queue']}` (máx `{st['max_queue']}`) • "
+                f"em curso `{st['running']}/{st['limit']}` • "
+                f"espera p50/p95 `{st['wait_p50_ms']:.0f}/{st['wait_p95_ms']:.0f}ms`"
+            )
+        embed.add_field(name="🚦 Fila de LLM", value="\n".join(linhas)[:1024], inline=False)
+
+        cerebro = self.bot.get_cog("CerebroIA")
+        aprendizado = getattr(getattr(cerebro, "pipeline", None), "aprendizado", None)
+        if aprendizado is not None:
+            st = aprendizado.stats()
+            embed.add_field(
+                name="🧠 Aprendizado em lote",
+                value=(
+                    f"Fila: `{st['fila']}` • Lotes: `{st['lotes']}` • Fatos: `{st['fatos']}`\n"
+                    f"Duplicados: `{st['duplicados']}` • Descartadas (fila cheia): `{st['descartadas']}`"
+                ),
+                inline=False,
+            )
+
+        if not saude:
+            embed.set_footer(text="Sem medidas de saúde ainda (nenhuma chamada desde o arranque).")
+        await ctx.send(embed=embed)
+
+    @commands.command(name="caches")
+    @commands.is_owner()
+    async def check_caches(self, ctx):
+        """Mostra ocupação e acertos dos caches nomeados (após limpar os vencidos), o cache de respostas e o single-flight."""
+        removidas = cache_manager.purge_expired()
+        embed = discord.Embed(
+            title="🧊 Caches em Memória", color=discord.Color.dark_grey()
+        )
+        for nome, st in cache_manager.stats().items():
+            limite = st["max_entries"] if st["max_entries"] is not None else "∞"
+            embed.add_field(
+                name=nome,
+                value=(
+                    f"Entradas: `{st['entries']}/{limite}` • `{st['bytes'] / 1024:.1f} KB`\n"
+                    f"Hit: `{st['hit_rate']:.0%}` ({st['hits']}/{st['hits'] + st['misses']})\n"
+                    f"Evicções: `{st['evictions']}` • Expiradas: `{st['expirations']}`"
+                ),
+                inline=True,
+            )
+        # Cache de respostas: acertos servidos sem LLM e tokens que deixaram de ser gastos
+        rc = response_cache.stats()
+        ignoradas = ", ".join(f"{motivo} {n}" for motivo, n in sorted(rc["bypasses"].items()))
+        embed.add_field(
+            name="💬 Cache de respostas",
+            value=(
+                f"Hit: `{rc['hit_rate']:.0%}` ({rc['hits']}/{rc['lookups']}) • "
+                f"semânticos: `{rc['semantic_hits']}`\n"
+                f"Tokens poupados: `~{rc['saved_tokens']}`\n"
+                f"Ignoradas: `{ignoradas or 'nenhuma'}`"
+            ),
+            inline=False,
+        )
+        # Single-flight: chamadas idênticas simultâneas que não foram repetidas
+        voos = flight_stats()
+        if voos:
+            embed.add_field(
+                name="🛬 Single-flight (agrupadas/chamadas)",
+                value="\n".join(
+                    f"`{nome}`: `{st['coalesced']}/{st['calls']}` ({st['coalesced_rate']:.0%})"
+                    for nome, st in voos.items()
+                )[:1024],
+                inline=False,
+            )
+        embed.set_footer(text=f"{removidas} entradas vencidas removidas agora")
+        await ctx.send(embed=embed)
+
+    @commands.command(name="latencia", aliases=["latency", "spans"])
+    @commands.is_owner()
+    async def check_latency(self, ctx, acao: str = None):
+        """Percentis de latência por etapa do pipeline (`latencia reset` zera os histogramas)."""
+        if acao == "reset":
+            tracer.reset()
+            return await ctx.send("🧹 Histogramas de latência zerados.")
+
+        stats = tracer.stats()
+        if not stats:
+            return await ctx.send("ℹ️ Ainda não há spans registrados.")
+
+        embed = discord.Embed(
+            title="⏱️ Latência do Pipeline (p50 / p95 / p99)",
+            color=discord.Color.dark_grey(),
+        )
+        for nome, st in list(stats.items())[:25]:
+            linhas = [
+                f"`{st['p50_ms']:.0f}` / `{st['p95_ms']:.0f}` / `{st['p99_ms']:.0f}` ms • n={st['count']}"
+                + (f" • ❌ {st['errors']}" if st["errors"] else "")
+            ]
+            for provedor, sp in st.get("providers", {}).items():
+                linhas.append(
+                    f"↳ {provedor}: `{sp['p50_ms']:.0f}`/`{sp['p95_ms']:.0f}`/`{sp['p99_ms']:.0f}` n={sp['count']}"
+                )
+            embed.add_field(name=nome, value="\n".join(linhas)[:1024], inline=True)
+        desde = time.strftime("%d/%m %H:%M", time.localtime(tracer.started_at))
+        embed.set_footer(text=f"Desde {desde} • 'latencia reset' zera os histogramas")
+        await ctx.send(embed=embed)
+
+    @commands.command(name="roteador", aliases=["router"])
+    @commands.is_owner()
+    async def check_router(self, ctx):
+        """Quantas decisões de ferramentas cada camada do roteador tomou."""
+        cerebro = self.bot.get_cog("CerebroIA")
+        roteador = getattr(getattr(cerebro, "pipeline", None), "_router", None)
+        if roteador is None:
+            return await ctx.send("ℹ️ O roteador de ferramentas ainda não foi usado.")
+
+        st = roteador.stats()
+        total = st["total"] or 1
+        embed = discord.Embed(
+            title="🧭 Roteador de Ferramentas", color=discord.Color.dark_grey()
+        )
+        for tier in ("regex", "fuzzy", "classificador", "llm"):
+            n = st["tiers"].get(tier, 0)
+            embed.add_field(name=tier, value=f"`{n}` ({n / total:.0%})", inline=True)
+        embed.add_field(
+            name="Sem ferramenta",
+            value=f"`{st['sem_ferramenta']}` de `{st['total']}`",
+            inline=True,
+        )
+        embed.set_footer(
+            text=(
+                f"{st['regras']} rotas • {st['gatilhos']} gatilhos • "
+                f"aceite {roteador.accept:g} / rejeite {roteador.reject:g} / margem {roteador.margin:g}"
+                + (" • classificador ativo" if st["classificador"] else "")
+            )
+        )
         await ctx.send(embed=embed)
 
     @commands.command(name="llmtest")
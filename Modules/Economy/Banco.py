@@ -39,22 +39,23 @@ class Banco(commands.Cog):
     async def depositar(self, ctx: commands.Context, valor: str):
         user_id = str(ctx.author.id)
 
-        carteira = data_manager.get_user_data(user_id, "carteira", 0)
-        banco = data_manager.get_user_data(user_id, "banco", 0)
+        async with data_manager.transaction(user_id) as conta:
+            carteira = conta.get("carteira", 0)
+            banco = conta.get("banco", 0)
 
-        # Trata o valor (se é número ou "tudo")
-        quantia = await self._converter_valor(ctx, carteira, valor)
-        if not quantia:
-            return
+            # Trata o valor (se é número ou "tudo")
+            quantia = await self._converter_valor(ctx, carteira, valor)
+            if not quantia:
+                return
 
-        if quantia > carteira:
-            return await ctx.send(
-                f"❌ **Saldo Insuficiente!** Voce so possui {self.moeda_emoji} {carteira:,} na sua carteira."
-            )
+            if quantia > carteira:
+                return await ctx.send(
+                    f"❌ **Saldo Insuficiente!** Voce so possui {self.moeda_emoji} {carteira:,} na sua carteira."
+                )
 
-        # Efetua a transação
-        data_manager.set_user_data(user_id, "carteira", carteira - quantia)
-        data_manager.set_user_data(user_id, "banco", banco + quantia)
+            # Efetua a transação (gravada numa única escrita ao sair do bloco)
+            conta["carteira"] = carteira - quantia
+            conta["banco"] = banco + quantia
 
         embed = discord.Embed(
             title="🏦 Depósito Concluído", color=discord.Color.green()
@@ -72,21 +73,22 @@ class Banco(commands.Cog):
     async def sacar(self, ctx: commands.Context, valor: str):
         user_id = str(ctx.author.id)
 
-        carteira = data_manager.get_user_data(user_id, "carteira", 0)
-        banco = data_manager.get_user_data(user_id, "banco", 0)
+        async with data_manager.transaction(user_id) as conta:
+            carteira = conta.get("carteira", 0)
+            banco = conta.get("banco", 0)
 
-        quantia = await self._converter_valor(ctx, banco, valor)
-        if not quantia:
-            return
+            quantia = await self._converter_valor(ctx, banco, valor)
+            if not quantia:
+                return
 
-        if quantia > banco:
-            return await ctx.send(
-                f"❌ **Saldo Insuficiente!** So possui {self.moeda_emoji} {banco:,} no banco."
-            )
+            if quantia > banco:
+                return await ctx.send(
+                    f"❌ **Saldo Insuficiente!** So possui {self.moeda_emoji} {banco:,} no banco."
+                )
 
-        # Efetua a transação
-        data_manager.set_user_data(user_id, "banco", banco - quantia)
-        data_manager.set_user_data(user_id, "carteira", carteira + quantia)
+            # Efetua a transação
+            conta["banco"] = banco - quantia
+            conta["carteira"] = carteira + quantia
 
         embed = discord.Embed(
             title="🏧 Levantamento Concluído", color=discord.Color.blue()
@@ -118,19 +120,24 @@ class Banco(commands.Cog):
         user_id = str(ctx.author.id)
         target_id = str(membro.id)
 
-        carteira_remetente = data_manager.get_user_data(user_id, "carteira", 0)
+        # Trava os dois usuários sempre na mesma ordem para evitar deadlock entre pagamentos cruzados
+        primeiro, segundo = sorted([user_id, target_id])
+        async with data_manager.transaction(primeiro) as conta_a, data_manager.transaction(
+            segundo
+        ) as conta_b:
+            remetente = conta_a if primeiro == user_id else conta_b
+            destinatario = conta_b if primeiro == user_id else conta_a
 
-        if valor > carteira_remetente:
-            return await ctx.send(
-                f"❌ **Saldo Insuficiente!** Tem apenas {self.moeda_emoji} {carteira_remetente:,} na sua carteira. Use `+sacar` primeiro se o dinheiro estiver no banco."
-            )
+            carteira_remetente = remetente.get("carteira", 0)
 
-        # Pega a carteira do destinatário (cria com 0 se ele não existir ainda)
-        carteira_destinatario = data_manager.get_user_data(target_id, "carteira", 0)
+            if valor > carteira_remetente:
+                return await ctx.send(
+                    f"❌ **Saldo Insuficiente!** Tem apenas {self.moeda_emoji} {carteira_remetente:,} na sua carteira. Use `+sacar` primeiro se o dinheiro estiver no banco."
+                )
 
-        # Transação segura (deduz de um, adiciona noutro)
-        data_manager.set_user_data(user_id, "carteira", carteira_remetente - valor)
-        data_manager.set_user_data(target_id, "carteira", carteira_destinatario + valor)
+            # Transação segura (deduz de um, adiciona noutro)
+            remetente["carteira"] = carteira_remetente - valor
+            destinatario["carteira"] = destinatario.get("carteira", 0) + valor
 
         await ctx.send(
             f"💸 **Transferência Sucesso!** O utilizador {ctx.author.mention} enviou **{valor:,}** {self.moeda_emoji} para {membro.mention}!"
@@ -18,7 +18,7 @@ class Cassino(commands.Cog):
         self.logger = logging.getLogger("SamBot.Cassino")
         self.moeda_emoji = "🪙"
 
-    async def _validar_aposta(self, ctx, valor: int) -> bool:
+    async def _validar_aposta(self, ctx, valor: int, carteira: int) -> bool:
         """Função interna de segurança para evitar trapaças."""
         if valor <= 0:
             await ctx.send(
@@ -26,9 +26,6 @@ class Cassino(commands.Cog):
             )
             return False
 
-        user_id = str(ctx.author.id)
-        carteira = data_manager.get_user_data(user_id, "carteira", 0)
-
         if valor > carteira:
             await ctx.send(
                 f"❌ **Saldo Insuficiente!** Você tem apenas {self.moeda_emoji} {carteira:,} na carteira."
@@ -49,31 +46,37 @@ class Cassino(commands.Cog):
                 "❌ **Escolha inválida!** Use `+coinflip cara <valor>` ou `+coinflip coroa <valor>`."
             )
 
-        if not await self._validar_aposta(ctx, valor):
-            return
-
         user_id = str(ctx.author.id)
-        carteira = data_manager.get_user_data(user_id, "carteira", 0)
-
-        # O suspense da rolagem!
-        msg = await ctx.send(f"🪙 **Lançando a moeda ao ar...** (Apostando {valor:,})")
-        await asyncio.sleep(1.5)
 
-        # 50% de chance (Pode ajustar para 45% se quiser que a "casa" ganhe mais)
-        resultado = random.choice(["cara", "coroa"])
+        # A trava do usuário cobre o suspense: apostas simultâneas não usam saldo desatualizado
+        async with data_manager.transaction(user_id) as conta:
+            carteira = conta.get("carteira", 0)
+            if not await self._validar_aposta(ctx, valor, carteira):
+                return
 
-        if escolha == resultado:
-            # Vitória (Dobra o valor)
-            novo_saldo = carteira + valor
-            data_manager.set_user_data(user_id, "carteira", novo_saldo)
-            embed = discord.Embed(title="🎉 Você Venceu!", color=discord.Color.green())
-            embed.description = f"A moeda caiu em **{resultado.capitalize()}**!\nVocê ganhou **{valor:,}** {self.moeda_emoji}!"
-        else:
-            # Derrota (Perde o valor)
-            novo_saldo = carteira - valor
-            data_manager.set_user_data(user_id, "carteira", novo_saldo)
-            embed = discord.Embed(title="💸 Você Perdeu!", color=discord.Color.red())
-            embed.description = f"A moeda caiu em **{resultado.capitalize()}**...\nVocê perdeu os seus **{valor:,}** {self.moeda_emoji}."
+            # O suspense da rolagem!
+            msg = await ctx.send(
+                f"🪙 **Lançando a moeda ao ar...** (Apostando {valor:,})"
+            )
+            await asyncio.sleep(1.5)
+
+            # 50% de chance (Pode ajustar para 45% se quiser que a "casa" ganhe mais)
+            resultado = random.choice(["cara", "coroa"])
+
+            if escolha == resultado:
+                # Vitória (Dobra o valor)
+                novo_saldo = carteira + valor
+                embed = discord.Embed(
+                    title="🎉 Você Venceu!", color=discord.Color.green()
+                )
+                embed.description = f"A moeda caiu em **{resultado.capitalize()}**!\nVocê ganhou **{valor:,}** {self.moeda_emoji}!"
+            else:
+                # Derrota (Perde o valor)
+                novo_saldo = carteira - valor
+                embed = discord.Embed(title="💸 Você Perdeu!", color=discord.Color.red())
+                embed.description = f"A moeda caiu em **{resultado.capitalize()}**...\nVocê perdeu os seus **{valor:,}** {self.moeda_emoji}."
+
+            conta["carteira"] = novo_saldo
 
         embed.set_footer(text=f"Saldo atual: {novo_saldo:,}")
         await msg.edit(content=None, embed=embed)
@@ -84,32 +87,33 @@ class Cassino(commands.Cog):
         description="Gire a roleta de multiplicadores! Alto risco, alta recompensa.",
     )
     async def roleta(self, ctx: commands.Context, valor: int):
-        if not await self._validar_aposta(ctx, valor):
-            return
-
         user_id = str(ctx.author.id)
-        carteira = data_manager.get_user_data(user_id, "carteira", 0)
 
-        msg = await ctx.send(f"🎰 **Girando a Roleta...** (Apostando {valor:,})")
-        await asyncio.sleep(2)
+        async with data_manager.transaction(user_id) as conta:
+            carteira = conta.get("carteira", 0)
+            if not await self._validar_aposta(ctx, valor, carteira):
+                return
+
+            msg = await ctx.send(f"🎰 **Girando a Roleta...** (Apostando {valor:,})")
+            await asyncio.sleep(2)
 
-        # Tabela de probabilidades da Roleta
-        # 50% chance de perder tudo (0x)
-        # 30% chance de recuperar metade (0.5x)
-        # 12% chance de lucro leve (1.5x)
-        # 7% chance de lucro bom (3x)
-        # 1% chance de JACKPOT (10x)
-        opcoes = [0, 0.5, 1.5, 3, 10]
-        pesos = [50, 30, 12, 7, 1]
+            # Tabela de probabilidades da Roleta
+            # 50% chance de perder tudo (0x)
+            # 30% chance de recuperar metade (0.5x)
+            # 12% chance de lucro leve (1.5x)
+            # 7% chance de lucro bom (3x)
+            # 1% chance de JACKPOT (10x)
+            opcoes = [0, 0.5, 1.5, 3, 10]
+            pesos = [50, 30, 12, 7, 1]
 
-        multiplicador = random.choices(opcoes, weights=pesos, k=1)[0]
+            multiplicador = random.choices(opcoes, weights=pesos, k=1)[0]
 
-        # Remove o valor apostado e adiciona o prêmio
-        premio = int(valor * multiplicador)
-        lucro_liquido = premio - valor
-        novo_saldo = carteira + lucro_liquido
+            # Remove o valor apostado e adiciona o prêmio
+            premio = int(valor * multiplicador)
+            lucro_liquido = premio - valor
+            novo_saldo = carteira + lucro_liquido
 
-        data_manager.set_user_data(user_id, "carteira", novo_saldo)
+            conta["carteira"] = novo_saldo
 
         if multiplicador == 0:
             cor = discord.Color.red()
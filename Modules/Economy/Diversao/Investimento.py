@@ -65,37 +65,39 @@ class Investimentos(commands.Cog):
             )
 
         user_id = str(ctx.author.id)
-        banco = data_manager.get_user_data(user_id, "banco", 0)
-
         preco_unidade = ativos[ticker]["preco_atual"]
         custo_total = preco_unidade * quantidade
 
-        if custo_total > banco:
-            return await ctx.send(
-                f"❌ **Saldo Bancário Insuficiente!** A compra custa {self.moeda_emoji} {custo_total:,}, mas você só tem {self.moeda_emoji} {banco:,} no banco."
-            )
+        async with data_manager.transaction(user_id) as conta:
+            banco = conta.get("banco", 0)
 
-        # Deduz o dinheiro do banco
-        data_manager.set_user_data(user_id, "banco", banco - custo_total)
+            if custo_total > banco:
+                return await ctx.send(
+                    f"❌ **Saldo Bancário Insuficiente!** A compra custa {self.moeda_emoji} {custo_total:,}, mas você só tem {self.moeda_emoji} {banco:,} no banco."
+                )
 
-        # Atualiza o portfólio (Lógica de Preço Médio)
-        portfolio = data_manager.get_user_data(user_id, "portfolio", {})
+            # Deduz o dinheiro do banco
+            conta["banco"] = banco - custo_total
 
-        if ticker not in portfolio:
-            portfolio[ticker] = {"quantidade": quantidade, "preco_medio": preco_unidade}
-        else:
-            qtd_atual = portfolio[ticker]["quantidade"]
-            pm_atual = portfolio[ticker]["preco_medio"]
+            # Atualiza o portfólio (Lógica de Preço Médio)
+            portfolio = conta.setdefault("portfolio", {})
 
-            # Fórmula do Preço Médio
-            novo_pm = ((qtd_atual * pm_atual) + (quantidade * preco_unidade)) / (
-                qtd_atual + quantidade
-            )
+            if ticker not in portfolio:
+                portfolio[ticker] = {
+                    "quantidade": quantidade,
+                    "preco_medio": preco_unidade,
+                }
+            else:
+                qtd_atual = portfolio[ticker]["quantidade"]
+                pm_atual = portfolio[ticker]["preco_medio"]
 
-            portfolio[ticker]["quantidade"] += quantidade
-            portfolio[ticker]["preco_medio"] = round(novo_pm, 2)
+                # Fórmula do Preço Médio
+                novo_pm = ((qtd_atual * pm_atual) + (quantidade * preco_unidade)) / (
+                    qtd_atual + quantidade
+                )
 
-        data_manager.set_user_data(user_id, "portfolio", portfolio)
+                portfolio[ticker]["quantidade"] += quantidade
+                portfolio[ticker]["preco_medio"] = round(novo_pm, 2)
 
         embed = discord.Embed(title="🧾 Ordem Executada", color=discord.Color.green())
         embed.description = f"Você comprou **{quantidade}x {ticker}** com sucesso!\nCusto Total: {self.moeda_emoji} {custo_total:,}"
@@ -120,31 +122,30 @@ class Investimentos(commands.Cog):
             return await ctx.send(f"❌ Ticker desconhecido.")
 
         user_id = str(ctx.author.id)
-        portfolio = data_manager.get_user_data(user_id, "portfolio", {})
 
-        if ticker not in portfolio or portfolio[ticker]["quantidade"] < quantidade:
-            qtd_posse = portfolio.get(ticker, {}).get("quantidade", 0)
-            return await ctx.send(
-                f"❌ Você não tem cotas suficientes para vender! Você possui apenas **{qtd_posse}** de {ticker}."
-            )
+        async with data_manager.transaction(user_id) as conta:
+            portfolio = conta.setdefault("portfolio", {})
 
-        preco_mercado = ativos[ticker]["preco_atual"]
-        valor_venda = preco_mercado * quantidade
+            if ticker not in portfolio or portfolio[ticker]["quantidade"] < quantidade:
+                qtd_posse = portfolio.get(ticker, {}).get("quantidade", 0)
+                return await ctx.send(
+                    f"❌ Você não tem cotas suficientes para vender! Você possui apenas **{qtd_posse}** de {ticker}."
+                )
 
-        # Adiciona o dinheiro no banco
-        banco = data_manager.get_user_data(user_id, "banco", 0)
-        data_manager.set_user_data(user_id, "banco", banco + valor_venda)
+            preco_mercado = ativos[ticker]["preco_atual"]
+            valor_venda = preco_mercado * quantidade
 
-        # Calcula Lucro/Prejuízo da operação para mostrar na tela
-        preco_medio = portfolio[ticker]["preco_medio"]
-        lucro_prejuizo = (preco_mercado - preco_medio) * quantidade
+            # Adiciona o dinheiro no banco
+            conta["banco"] = conta.get("banco", 0) + valor_venda
 
-        # Atualiza a carteira
-        portfolio[ticker]["quantidade"] -= quantidade
-        if portfolio[ticker]["quantidade"] == 0:
-            del portfolio[ticker]  # Limpa o ativo se vendeu tudo
+            # Calcula Lucro/Prejuízo da operação para mostrar na tela
+            preco_medio = portfolio[ticker]["preco_medio"]
+            lucro_prejuizo = (preco_mercado - preco_medio) * quantidade
 
-        data_manager.set_user_data(user_id, "portfolio", portfolio)
+            # Atualiza a carteira
+            portfolio[ticker]["quantidade"] -= quantidade
+            if portfolio[ticker]["quantidade"] == 0:
+                del portfolio[ticker]  # Limpa o ativo se vendeu tudo
 
         cor = discord.Color.green() if lucro_prejuizo >= 0 else discord.Color.red()
         sinal = "+" if lucro_prejuizo >= 0 else ""
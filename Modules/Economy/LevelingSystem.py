@@ -10,6 +10,9 @@ from PIL import Image, ImageDraw, ImageFont
 from easy_pil import Editor, Canvas, Font, load_image_async
 
 from Brain.Memory.DataManager import data_manager
+from Brain.Memory.Cache import get_cache
+
+MENSAGEM_LEVEL_UP = "🎉 Parabéns {user}! Chegou o **Nível {level}**!"
 
 
 class LevelingSystem(commands.Cog):
@@ -18,7 +21,8 @@ class LevelingSystem(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.logger = logging.getLogger("SamBot.Leveling")
-        self.user_cache = {}
+        # Estado do anti-farm por usuário; após 1h sem falar a entrada expira (equivale a "nunca falou")
+        self.user_cache = get_cache("leveling.anti_farm", max_entries=50_000, ttl=3600)
 
         # Caminhos de Assets (PIL)
         self.base_dir = os.path.dirname(
@@ -49,10 +53,15 @@ class LevelingSystem(commands.Cog):
         guild_id = str(message.guild.id)
         agora = time.time()
 
-        configs = data_manager.get_knowledge("guild_configs") or {}
-        level_config = configs.get(guild_id, {}).get("leveling", {})
+        guild_config = data_manager.guild_configs.get(guild_id)
+        level_config = guild_config.leveling
+        level_up = guild_config.level_up
+
+        # Interruptor do painel /configxp (Niveis)
+        if not level_up.enabled:
+            return
 
-        if message.channel.id in level_config.get("no_xp_channels", []):
+        if message.channel.id in level_config.no_xp_channels:
             return
 
         content = message.content.strip()
@@ -72,7 +81,7 @@ class LevelingSystem(commands.Cog):
         if len(conteudo_limpo) <= 12:
             return
 
-        self.user_cache[user_id] = {"last_time": agora, "last_content": content}
+        self.user_cache.set(user_id, {"last_time": agora, "last_content": content})
 
         min_xp = max(1, int(len(conteudo_limpo) / 7))
         max_xp = max(1, int(len(conteudo_limpo) / 4))
@@ -80,46 +89,28 @@ class LevelingSystem(commands.Cog):
         if xp_ganho > 35:
             xp_ganho = 35
 
-        boosts = level_config.get("role_boosts", {})
-        maior_multiplicador = 1.0
-        for role in message.author.roles:
-            if str(role.id) in boosts:
-                mult = boosts[str(role.id)]
-                if mult > maior_multiplicador:
-                    maior_multiplicador = mult
+        maior_multiplicador = level_config.multiplier_for(
+            role.id for role in message.author.roles
+        )
 
         xp_ganho = int(xp_ganho * maior_multiplicador)
 
-        users_data = data_manager.get_knowledge("users") or {}
-        if guild_id not in users_data:
-            users_data[guild_id] = {}
-        if user_id not in users_data[guild_id]:
-            users_data[guild_id][user_id] = {"xp": 0, "mensagens": 0}
-        if "global" not in users_data:
-            users_data["global"] = {}
-        if user_id not in users_data["global"]:
-            users_data["global"][user_id] = {"xp": 0, "mensagens": 0}
-
-        xp_antigo_local = users_data[guild_id][user_id]["xp"]
-        users_data[guild_id][user_id]["xp"] += xp_ganho
-        users_data[guild_id][user_id]["mensagens"] += 1
-        users_data["global"][user_id]["xp"] += xp_ganho
-        users_data["global"][user_id]["mensagens"] += 1
-        xp_novo_local = users_data[guild_id][user_id]["xp"]
+        # Registro unificado: XP do servidor e global numa única escrita, na thread de disco
+        xp_antigo_local, xp_novo_local = await data_manager.aio.call(
+            data_manager.user_store.add_xp, user_id, guild_id, xp_ganho
+        )
 
         nivel_antigo = xp_antigo_local // 1000
         nivel_novo = xp_novo_local // 1000
 
         if nivel_novo > nivel_antigo:
-            await message.channel.send(
-                f"🎉 Parabéns {message.author.mention}! Chegou o **Nível {nivel_novo}**!",
-                delete_after=15.0,
-            )
+            await self._anunciar_nivel(message, level_up, nivel_novo)
 
-            recompensas = level_config.get("rewards", {})
-            cargo_id = recompensas.get(str(nivel_novo))
+            cargo_id = level_config.rewards.get(nivel_novo) or level_up.roles.get(
+                nivel_novo
+            )
             if cargo_id:
-                cargo = message.guild.get_role(int(cargo_id))
+                cargo = message.guild.get_role(cargo_id)
                 if cargo:
                     try:
                         await message.author.add_roles(
@@ -132,7 +123,20 @@ class LevelingSystem(commands.Cog):
                     except discord.Forbidden:
                         pass
 
-        data_manager.save_knowledge("users", users_data)
+    async def _anunciar_nivel(self, message: discord.Message, level_up, nivel: int):
+        """Mensagem de level up com o texto e o canal do /configxp (ou os padrões)."""
+        texto = (level_up.mensagem or MENSAGEM_LEVEL_UP).replace(
+            "{user}", message.author.mention
+        ).replace("{level}", str(nivel))
+
+        canal = message.guild.get_channel(level_up.canal_id) if level_up.canal_id else None
+        try:
+            if canal:
+                await canal.send(texto)
+            else:
+                await message.channel.send(texto, delete_after=15.0)
+        except discord.HTTPException as e:
+            self.logger.warning(f"Falha ao anunciar o nível de {message.author}: {e}")
 
     # ==========================================
     # CARTÃO VISUAL (PROFILE CARD)
@@ -146,26 +150,18 @@ class LevelingSystem(commands.Cog):
         membro = membro or ctx.author
         await ctx.defer()
 
-        users_data = data_manager.get_knowledge("users") or {}
         guild_id, user_id = str(ctx.guild.id), str(membro.id)
 
-        perfil_local = users_data.get(guild_id, {}).get(user_id, {"xp": 0})
-        xp_total = perfil_local["xp"]
+        # XP e posição saem do índice em RAM do registro unificado
+        xp_total, colocacao = await data_manager.aio.call(
+            data_manager.user_store.standing, user_id, guild_id
+        )
 
         nivel_atual = xp_total // 1000
         xp_progresso = xp_total % 1000
         percentual = xp_progresso / 1000.0
 
-        ranking_local = sorted(
-            users_data.get(guild_id, {}).items(),
-            key=lambda x: x[1].get("xp", 0),
-            reverse=True,
-        )
-        colocacao = next(
-            (i for i, v in enumerate(ranking_local, 1) if v[0] == user_id),
-            len(ranking_local) + 1,
-        )
-        if xp_total == 0:
+        if colocacao is None:
             colocacao = "N/A"
 
         try:
@@ -245,33 +241,19 @@ class LevelingSystem(commands.Cog):
         """Gera o ranking visual. Aceita 'local' ou 'global'."""
         await ctx.defer()
 
-        # Carrega dados unificados via data_manager
-        users_data = data_manager.get_knowledge("users") or {}
+        # Top 5 direto do índice do registro unificado (sem carregar a base inteira)
         is_global = tipo.lower() == "global"
-        fonte_dados = (
-            users_data.get("global", {})
-            if is_global
-            else users_data.get(str(ctx.guild.id), {})
+        top_5 = await data_manager.aio.call(
+            data_manager.user_store.leaderboard,
+            None if is_global else str(ctx.guild.id),
+            5,
         )
 
-        if not fonte_dados:
+        if not top_5:
             return await ctx.send(
                 "🕸️ Ninguém tem dados de XP salvos nesta categoria ainda!"
             )
 
-        # Extrai os dados e ordena do maior para o menor
-        tabela = []
-        for u_id, dados in fonte_dados.items():
-            xp = dados.get("xp", 0)
-            if xp > 0:
-                tabela.append((u_id, xp))
-
-        tabela.sort(key=lambda x: x[1], reverse=True)
-        top_5 = tabela[:5]
-
-        if not top_5:
-            return await ctx.send("Ninguém tem XP suficiente para aparecer no ranking.")
-
         # Inicia a tela de pintura usando easy_pil
         background = Editor(Canvas((900, 650), color="#141414"))
 
@@ -29,21 +29,20 @@ class Perfil(commands.Cog):
         # O ctx.defer() é obrigatório aqui para evitar timeout enquanto a imagem é gerada
         await ctx.defer()
 
-        # 1. Recuperação de Dados
-        carteira = data_manager.get_user_data(user_id, "carteira", 0)
-        banco = data_manager.get_user_data(user_id, "banco", 0)
-        xp = data_manager.get_user_data(user_id, "xp", 0)
-        bio = data_manager.get_user_data(
-            user_id, "bio", "Usa +setbio para mudares esta frase!"
-        )
-        emblemas = data_manager.get_user_data(user_id, "emblemas", ["🔰 Novato"])
+        # 1. Recuperação de Dados (registro unificado, uma única leitura)
+        registro = await data_manager.aio.call(data_manager.user_store.get, user_id)
+        carteira = registro.get("carteira", 0)
+        banco = registro.get("banco", 0)
+        xp = registro.get("xp", 0)
+        bio = registro.get("bio", "Usa +setbio para mudares esta frase!")
+        emblemas = registro.get("emblemas", ["🔰 Novato"])
 
         nivel = (xp // 1000) + 1
         xp_atual = xp % 1000
         percentagem_xp = (xp_atual / 1000) * 100
 
         # BUSCA O FUNDO ATIVO
-        bg_ativo = data_manager.get_user_data(user_id, "background_ativo", "padrao.png")
+        bg_ativo = registro.get("background_ativo", "padrao.png")
 
         # 2. Configuração do Fundo (Imagem vs Canvas)
         base_dir = Path(__file__).resolve().parent.parent.parent.parent
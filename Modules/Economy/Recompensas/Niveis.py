@@ -1,8 +1,6 @@
 import discord
 from discord.ext import commands
 import logging
-import random
-import time
 
 from Brain.Memory.DataManager import data_manager
 
@@ -25,12 +23,8 @@ class MsgModal(discord.ui.Modal, title="Mensagem de Level Up"):
         self.guild_id = guild_id
 
     async def on_submit(self, interaction: discord.Interaction):
-        configs = data_manager.get_knowledge("guild_configs") or {}
-        if self.guild_id not in configs:
-            configs[self.guild_id] = {}
-
-        configs[self.guild_id]["mensagem"] = self.mensagem.value
-        data_manager.save_knowledge("guild_configs", configs)
+        with data_manager.guild_configs.edit(self.guild_id) as guild_cfg:
+            guild_cfg["mensagem"] = self.mensagem.value
 
         await interaction.response.send_message(
             "✅ Mensagem de Level Up atualizada com sucesso!", ephemeral=True
@@ -53,13 +47,9 @@ class ConfigXPView(discord.ui.View):
     async def btn_toggle(
         self, interaction: discord.Interaction, button: discord.ui.Button
     ):
-        configs = data_manager.get_knowledge("guild_configs") or {}
-        if self.guild_id not in configs:
-            configs[self.guild_id] = {"enabled": True}
-
-        atual = configs[self.guild_id].get("enabled", True)
-        configs[self.guild_id]["enabled"] = not atual
-        data_manager.save_knowledge("guild_configs", configs)
+        with data_manager.guild_configs.edit(self.guild_id) as guild_cfg:
+            atual = guild_cfg.get("enabled", True)
+            guild_cfg["enabled"] = not atual
 
         estado = "LIGADO 🟢" if not atual else "DESLIGADO 🔴"
         await interaction.response.send_message(
@@ -86,12 +76,8 @@ class ConfigXPView(discord.ui.View):
         self, interaction: discord.Interaction, select: discord.ui.ChannelSelect
     ):
         canal = select.values[0]
-        configs = data_manager.get_knowledge("guild_configs") or {}
-        if self.guild_id not in configs:
-            configs[self.guild_id] = {}
-
-        configs[self.guild_id]["canal_id"] = canal.id
-        data_manager.save_knowledge("guild_configs", configs)
+        with data_manager.guild_configs.edit(self.guild_id) as guild_cfg:
+            guild_cfg["canal_id"] = canal.id
 
         await interaction.response.send_message(
             f"✅ Anúncios de nível serão enviados no canal {canal.mention}.",
@@ -126,14 +112,8 @@ class ConfigXPView(discord.ui.View):
             msg = await self.bot.wait_for("message", timeout=30.0, check=check)
             nivel_alvo = msg.content
 
-            configs = data_manager.get_knowledge("guild_configs") or {}
-            if self.guild_id not in configs:
-                configs[self.guild_id] = {}
-            if "roles" not in configs[self.guild_id]:
-                configs[self.guild_id]["roles"] = {}
-
-            configs[self.guild_id]["roles"][nivel_alvo] = cargo.id
-            data_manager.save_knowledge("guild_configs", configs)
+            with data_manager.guild_configs.edit(self.guild_id) as guild_cfg:
+                guild_cfg.setdefault("roles", {})[nivel_alvo] = cargo.id
 
             await interaction.followup.send(
                 f"✅ Feito! Quando alguém chegar no Nível {nivel_alvo}, ganhará o cargo {cargo.mention}.",
@@ -150,16 +130,18 @@ class ConfigXPView(discord.ui.View):
             )
 
 
-# --- SISTEMA DE XP PASSIVO (O MOTOR) ---
+# --- PAINEL DO SISTEMA DE XP ---
 
 
 class Niveis(commands.Cog):
-    """Gerencia o ganho de XP por chat e recompensas de nível."""
+    """
+    Configura o anúncio e as recompensas de nível. O XP em si é dado só pelo
+    LevelingSystem, que lê estas opções ao detectar o level up.
+    """
 
     def __init__(self, bot):
         self.bot = bot
         self.logger = logging.getLogger("SamBot.Niveis")
-        self.cooldowns = {}  # Guarda quando a pessoa mandou a última mensagem
 
     @commands.hybrid_command(
         name="configxp",
@@ -168,16 +150,14 @@ class Niveis(commands.Cog):
     @commands.has_permissions(manage_guild=True)
     async def configxp(self, ctx: commands.Context):
         """Abre o painel visual de configurações para admins."""
-        configs = data_manager.get_knowledge("guild_configs") or {}
-        guild_id = str(ctx.guild.id)
-        config_atual = configs.get(guild_id, {})
+        config_atual = data_manager.guild_configs.get(ctx.guild.id).level_up
 
-        estado = "🟢 Ligado" if config_atual.get("enabled", True) else "🔴 Desligado"
-        canal_id = config_atual.get("canal_id")
+        estado = "🟢 Ligado" if config_atual.enabled else "🔴 Desligado"
+        canal_id = config_atual.canal_id
         canal_txt = f"<#{canal_id}>" if canal_id else "No mesmo canal da mensagem"
-        msg_txt = config_atual.get("mensagem", "🎉 Parabéns {user}! Nível **{level}**!")
+        msg_txt = config_atual.mensagem or "🎉 Parabéns {user}! Chegou o **Nível {level}**!"
 
-        cargos = config_atual.get("roles", {})
+        cargos = dict(sorted(config_atual.roles.items()))
         cargos_txt = (
             "\n".join([f"**Nv {lvl}**: <@&{r_id}>" for lvl, r_id in cargos.items()])
             if cargos
@@ -196,84 +176,6 @@ class Niveis(commands.Cog):
         view = ConfigXPView(ctx, self.bot)
         await ctx.send(embed=embed, view=view)
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        if message.author.bot or not message.guild:
-            return
-
-        # Ignora mensagens que são comandos da bot
-        prefixos = await self.bot.get_prefix(message)
-        if type(prefixos) == str:
-            prefixos = [prefixos]
-        if any(message.content.startswith(p) for p in prefixos):
-            return
-
-        guild_id = str(message.guild.id)
-        user_id = str(message.author.id)
-
-        # 1. Verifica se o sistema está ligado no servidor
-        configs = data_manager.get_knowledge("guild_configs") or {}
-        config_guild = configs.get(guild_id, {})
-        if not config_guild.get("enabled", True):
-            return
-
-        # 2. Sistema de Cooldown (Ganha XP apenas a cada 60 segundos)
-        agora = time.time()
-        ultimo_xp = self.cooldowns.get(user_id, 0)
-
-        if agora - ultimo_xp < 60:
-            return  # Muito cedo para ganhar XP de novo (Evita spam)
-
-        self.cooldowns[user_id] = agora
-
-        # 3. Dá o XP e verifica Level Up
-        xp_antigo = data_manager.get_user_data(user_id, "xp", 0)
-        xp_ganho = random.randint(15, 25)  # Valor aleatório para dar dinamismo
-        xp_novo = xp_antigo + xp_ganho
-
-        data_manager.set_user_data(user_id, "xp", xp_novo)
-
-        nivel_antigo = (xp_antigo // 1000) + 1
-        nivel_novo = (xp_novo // 1000) + 1
-
-        # 4. ACONTECEU UM LEVEL UP!
-        if nivel_novo > nivel_antigo:
-            # Puxa as configs do servidor
-            msg_custom = config_guild.get(
-                "mensagem", "🎉 Parabéns {user}! Você alcançou o nível **{level}**!"
-            )
-            texto_final = msg_custom.replace("{user}", message.author.mention).replace(
-                "{level}", str(nivel_novo)
-            )
-
-            canal_id = config_guild.get("canal_id")
-            canal_envio = (
-                message.guild.get_channel(canal_id) if canal_id else message.channel
-            )
-
-            if canal_envio:
-                try:
-                    await canal_envio.send(texto_final)
-                except:
-                    pass
-
-            # 5. Entrega de Cargos (Recompensas)
-            roles_recompensa = config_guild.get("roles", {})
-            str_nivel = str(nivel_novo)
-
-            if str_nivel in roles_recompensa:
-                cargo_id = roles_recompensa[str_nivel]
-                cargo = message.guild.get_role(int(cargo_id))
-                if cargo:
-                    try:
-                        await message.author.add_roles(
-                            cargo, reason=f"Alcançou o nível {nivel_novo}"
-                        )
-                    except discord.Forbidden:
-                        self.logger.warning(
-                            f"Sem permissão para dar o cargo {cargo.name} no servidor {message.guild.name}."
-                        )
-
 
 async def setup(bot):
     await bot.add_cog(Niveis(bot))
@@ -135,7 +135,10 @@ class Work(commands.Cog):
         # 7. Pagamento e Salvamento de Dados
         saldo_atual = data_manager.get_user_data(user_id, "carteira", 0)
         data_manager.set_user_data(user_id, "carteira", saldo_atual + salario_final)
-        data_manager.set_user_data(user_id, "xp", xp_usuario + xp_ganho)
+        # XP pelo registro unificado (soma atômica, sem reescrever o que o chat já somou)
+        await data_manager.aio.call(
+            data_manager.user_store.add_xp, user_id, None, xp_ganho, 0
+        )
         data_manager.set_user_data(user_id, "ultimo_work", agora)
         data_manager.set_user_data(user_id, "maestrias", maestrias)
 
@@ -29,8 +29,7 @@ class WelcomeTestView(discord.ui.View):
                 "❌ Apenas quem executou o comando pode interagir.", ephemeral=True
             )
 
-        self.cog.configs[self.guild_id]["setup_done"] = True
-        self.cog._save_configs()
+        self.cog._set(self.guild_id, setup_done=True)
         await interaction.response.edit_message(
             content="🎉 **Configuração inicial finalizada com sucesso!**", view=None
         )
@@ -48,7 +47,7 @@ class WelcomeTestView(discord.ui.View):
         # Transição para a tela de edição
         view = WelcomeEditView(self.cog, self.ctx, self.guild_id)
         embeds = self.cog.get_preview_embeds(
-            self.ctx.guild, self.cog.configs[self.guild_id]
+            self.ctx.guild, self.cog._guild_data(self.guild_id)
         )
         await interaction.response.edit_message(
             content="⚙️ **Modo de Edição**\nSelecione no menu abaixo o que deseja alterar.",
@@ -121,11 +120,10 @@ class WelcomeEditView(discord.ui.View):
 
         # Se for o toggle da DM, altera direto
         if val == "dm_welcome":
-            atual = self.cog.configs[self.guild_id].get("dm_welcome", False)
-            self.cog.configs[self.guild_id]["dm_welcome"] = not atual
-            self.cog._save_configs()
+            with data_manager.guild_configs.edit(self.guild_id) as guild_cfg:
+                guild_cfg["dm_welcome"] = not guild_cfg.get("dm_welcome", False)
             embeds = self.cog.get_preview_embeds(
-                self.ctx.guild, self.cog.configs[self.guild_id]
+                self.ctx.guild, self.cog._guild_data(self.guild_id)
             )
             await interaction.response.edit_message(embeds=embeds, view=self)
             return
@@ -151,7 +149,7 @@ class WelcomeEditView(discord.ui.View):
                 "help_channel",
             ]:
                 if msg.channel_mentions:
-                    self.cog.configs[self.guild_id][val] = msg.channel_mentions[0].id
+                    self.cog._set(self.guild_id, **{val: msg.channel_mentions[0].id})
                 else:
                     return await interaction.followup.send(
                         "❌ Você não mencionou nenhum canal (Ex: `#geral`). Edição cancelada.",
@@ -161,17 +159,14 @@ class WelcomeEditView(discord.ui.View):
                 if msg.content.startswith("http://") or msg.content.startswith(
                     "https://"
                 ):
-                    self.cog.configs[self.guild_id][val] = msg.content.strip()
+                    self.cog._set(self.guild_id, **{val: msg.content.strip()})
                 else:
-                    self.cog.configs[self.guild_id][
-                        val
-                    ] = None  # Zera a imagem se mandar algo inválido
+                    # Zera a imagem se mandar algo inválido
+                    self.cog._set(self.guild_id, **{val: None})
                     await interaction.followup.send(
                         "⚠️ Link inválido. A imagem foi removida.", ephemeral=True
                     )
 
-            self.cog._save_configs()
-
             # Tenta apagar a mensagem do usuário pra deixar o chat limpo
             try:
                 await msg.delete()
@@ -180,7 +175,7 @@ class WelcomeEditView(discord.ui.View):
 
             # Atualiza o Embed Principal
             embeds = self.cog.get_preview_embeds(
-                self.ctx.guild, self.cog.configs[self.guild_id]
+                self.ctx.guild, self.cog._guild_data(self.guild_id)
             )
             if self.message:
                 await self.message.edit(embeds=embeds, view=self)
@@ -204,8 +199,7 @@ class WelcomeEditView(discord.ui.View):
                 "❌ Apenas quem executou pode interagir.", ephemeral=True
             )
 
-        self.cog.configs[self.guild_id]["setup_done"] = True
-        self.cog._save_configs()
+        self.cog._set(self.guild_id, setup_done=True)
         await interaction.response.edit_message(
             content="✅ **Configurações salvas! Sistema pronto.**", view=None
         )
@@ -221,14 +215,15 @@ class WelcomeSystem(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.invite_cache = {}  # Cache de convites: {guild_id: {invite_code: uses}}
-        self._load_configs()
 
-    def _load_configs(self):
-        dados = data_manager.get_knowledge("guild_configs")
-        self.configs = dados if isinstance(dados, dict) else {}
+    def _guild_data(self, guild_id) -> dict:
+        """Cópia das configurações de um servidor (só este, não o guild_configs inteiro)."""
+        return data_manager.guild_configs.raw(guild_id)
 
-    def _save_configs(self):
-        data_manager.save_knowledge("guild_configs", self.configs)
+    def _set(self, guild_id, **valores):
+        """Grava só as chaves alteradas, sem sobrescrever o que os outros painéis mudaram."""
+        with data_manager.guild_configs.edit(guild_id) as guild_cfg:
+            guild_cfg.update(valores)
 
     def get_preview_embeds(self, guild, guild_data):
         """Gera os Embeds de Teste (Como vai ficar na prática) e de Dashboard."""
@@ -392,14 +387,10 @@ class WelcomeSystem(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
-        guild_id = str(member.guild.id)
-        if guild_id not in self.configs or not self.configs[guild_id].get(
-            "welcome_enabled", False
-        ):
+        guild_data = self._guild_data(member.guild.id)
+        if not guild_data.get("welcome_enabled", False):
             return
 
-        guild_data = self.configs[guild_id]
-
         # 1. Enviar mensagem na DM se configurado (Requisito 3)
         if guild_data.get("dm_welcome", False):
             try:
@@ -478,13 +469,10 @@ class WelcomeSystem(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_remove(self, member: discord.Member):
-        guild_id = str(member.guild.id)
-        if guild_id not in self.configs or not self.configs[guild_id].get(
-            "welcome_enabled", False
-        ):
+        guild_data = self._guild_data(member.guild.id)
+        if not guild_data.get("welcome_enabled", False):
             return
 
-        guild_data = self.configs[guild_id]
         channel_id = guild_data.get("goodbye_channel")
         channel = member.guild.get_channel(channel_id) if channel_id else None
 
@@ -513,12 +501,7 @@ class WelcomeSystem(commands.Cog):
         name="ligar", description="Ativa o sistema de boas-vindas no servidor."
     )
     async def welcome_on(self, ctx: commands.Context):
-        guild_id = str(ctx.guild.id)
-        if guild_id not in self.configs:
-            self.configs[guild_id] = {}
-
-        self.configs[guild_id]["welcome_enabled"] = True
-        self._save_configs()
+        self._set(ctx.guild.id, welcome_enabled=True)
         await ctx.send(
             "✅ O sistema de boas-vindas e rastreador de convites foi **ativado**."
         )
@@ -527,10 +510,8 @@ class WelcomeSystem(commands.Cog):
         name="desligar", description="Desativa o sistema de boas-vindas no servidor."
     )
     async def welcome_off(self, ctx: commands.Context):
-        guild_id = str(ctx.guild.id)
-        if guild_id in self.configs:
-            self.configs[guild_id]["welcome_enabled"] = False
-            self._save_configs()
+        if self._guild_data(ctx.guild.id):
+            self._set(ctx.guild.id, welcome_enabled=False)
         await ctx.send("🛑 O sistema de boas-vindas foi **desativado**.")
 
     @welcome_group.command(
@@ -539,13 +520,15 @@ class WelcomeSystem(commands.Cog):
     )
     async def welcome_edit(self, ctx: commands.Context):
         guild_id = str(ctx.guild.id)
-        if guild_id not in self.configs:
-            self.configs[guild_id] = {"welcome_enabled": True}
+        guild_data = self._guild_data(guild_id)
+        if not guild_data:
+            self._set(guild_id, welcome_enabled=True)
+            guild_data = {"welcome_enabled": True}
 
         # Verifica se já concluiu alguma configuração antes
-        is_first_time = not self.configs[guild_id].get("setup_done", False)
+        is_first_time = not guild_data.get("setup_done", False)
 
-        embeds = self.get_preview_embeds(ctx.guild, self.configs[guild_id])
+        embeds = self.get_preview_embeds(ctx.guild, guild_data)
 
         if is_first_time:
             view = WelcomeTestView(self, ctx, guild_id)
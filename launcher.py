@@ -464,6 +464,7 @@ def run_logs_menu():
         print(f"  [ 2 ] ❌ Ver Logs de Erros Registrados")
         print(f"  [ 3 ] 🧹 Limpar Histórico de Logs locais")
         print(f"  [ 4 ] 📊 Ver Estatísticas Gerais do Bot")
+        print(f"  [ 5 ] ⏱️  Ver Latência do Pipeline (p50/p95/p99)")
         print(f"  [ 0 ] Voltar")
 
         choice = input(f"\n{C_BOLD}Escolha uma opção de diagnóstico: {C_RESET}").strip()
@@ -496,6 +497,7 @@ def run_logs_menu():
                     for log_file in [
                         "logs/sambot_general.log",
                         "logs/sambot_errors.log",
+                        "logs/pipeline_latency.jsonl",
                     ]:
                         if os.path.exists(log_file):
                             with open(log_file, "w", encoding="utf-8") as f:
@@ -541,10 +543,53 @@ def run_logs_menu():
                     f"{C_YELLOW}ℹ️ O arquivo de métricas ainda não foi gerado pelo Bot.{C_RESET}"
                 )
             input(f"\nPressione {C_YELLOW}ENTER{C_RESET} para retornar...")
+        elif choice == "5":
+            clear_screen()
+            show_pipeline_latency("logs/pipeline_latency.jsonl")
+            input(f"\nPressione {C_YELLOW}ENTER{C_RESET} para retornar...")
         elif choice == "0":
             break
 
 
+def show_pipeline_latency(filepath):
+    """Mostra o último snapshot de latências gravado pelo bot (uma linha JSON por minuto)."""
+    print(f"{C_CYAN}--- Latência por Etapa do Pipeline ({filepath}) ---{C_RESET}\n")
+    snapshot = None
+    try:
+        with open(filepath, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        snapshot = json.loads(line)
+                    except ValueError:
+                        continue
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"{C_RED}❌ Falha na leitura das latências: {e}{C_RESET}")
+        return
+
+    if not snapshot or not snapshot.get("spans"):
+        print(f"{C_YELLOW}ℹ️ O bot ainda não registrou latências (o ficheiro é gravado a cada minuto).{C_RESET}")
+        return
+
+    gravado = time.strftime("%d/%m %H:%M:%S", time.localtime(snapshot.get("ts", 0)))
+    desde = time.strftime("%d/%m %H:%M", time.localtime(snapshot.get("since", 0)))
+    print(f"  Snapshot de {gravado} (acumulado desde {desde})\n")
+    print(f"  {C_BOLD}{'etapa':<28}{'n':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'erros':>7}{C_RESET}")
+    for nome, st in snapshot["spans"].items():
+        cor = C_RED if st.get("p95_ms", 0) > 5000 else C_YELLOW if st.get("p95_ms", 0) > 1500 else C_GREEN
+        print(
+            f"  {nome:<28}{st.get('count', 0):>7}{cor}{st.get('p50_ms', 0):>8.0f}ms"
+            f"{st.get('p95_ms', 0):>7.0f}ms{st.get('p99_ms', 0):>7.0f}ms{C_RESET}{st.get('errors', 0):>7}"
+        )
+        for provedor, sp in st.get("providers", {}).items():
+            print(
+                f"    ↳ {provedor:<24}{sp.get('count', 0):>7}{sp.get('p50_ms', 0):>8.0f}ms"
+                f"{sp.get('p95_ms', 0):>7.0f}ms{sp.get('p99_ms', 0):>7.0f}ms{sp.get('errors', 0):>7}"
+            )
+
+
 def docker_menu():
     """Painel de controle avançado para o Docker Compose."""
     while True: